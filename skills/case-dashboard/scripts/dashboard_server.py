@@ -8,7 +8,8 @@
 启动：
     python3 .claude/skills/case-dashboard/scripts/dashboard_server.py    # 在项目根运行
     python3 dashboard_server.py --root /path/to/project --port 7879
-    环境变量：DASHBOARD_PORT / DASHBOARD_HOST / SUITAGENT_ROOT / CASE_STORE_PATH
+    python3 dashboard_server.py --watch 2                              # 后台每 2 秒轮询 case.yaml 变化
+    环境变量：DASHBOARD_PORT / DASHBOARD_HOST / SUITAGENT_ROOT / CASE_STORE_PATH / DASHBOARD_WATCH_INTERVAL
 
 然后浏览器打开 http://127.0.0.1:7879
 
@@ -19,11 +20,18 @@
   禁用 __file__.resolve()——本 skill 以符号链接安装，resolve 会穿透回 legal-skills 源仓库
 - 数据源：**V = case.yaml v4.0（canonical，case-progress 契约）**——M4 存量迁移（2026-08-15）
   已完成 8 案件全量迁移，A–D 遗留适配器已删除；原格式文件以 .legacy 归档于各案件目录
-- 写回：全部经 subprocess 调 case-progress 的 case_store CLI（--actor user，行级 source 保护）
+- 写回：全部经 case-progress 的 case_store（--actor user，行级 source 保护）——按路径进程内加载其库 API，
+  同一案件 150ms 内的连续点击合并为一次加锁读-改-写；库加载失败时回退 subprocess 调 CLI
+- 案件索引增量维护：按 case.yaml 的 (mtime, size, inode) 只重载变动案件，案件数增长时接口延迟基本不变
+- 接口缓存：ETag = 启动标识 + 索引 generation，未变则 304；同代 JSON 只组装一次，≥1KB 按需 gzip
+- 实时推送：GET /api/v1/events（SSE），case.yaml 变动时推送变动案件卡片差异，多页签不再各自全量轮询
 """
 
 import argparse
+import collections
 import datetime
+import gzip
+import importlib.util
 import json
 import os
 import re
@@ -40,6 +48,9 @@ import mimetypes
 
 import yaml
 
+# libyaml 可用时用 C 解析器（与 case_store 一致），否则退回纯 Python 的 SafeLoader
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # ---------------------------------------------------------------------------
 # 常量
 # ---------------------------------------------------------------------------
@@ -292,7 +303,7 @@ def load_case(case_dir):
     if not text:
         return case
     try:
-        data = yaml.safe_load(text)
+        data = yaml.load(text, Loader=_SafeLoader)
     except yaml.YAMLError:
         return case
     if detect_yaml_schema(data) == "V":
@@ -305,27 +316,134 @@ def load_case(case_dir):
 
 
 # ---------------------------------------------------------------------------
-# 案件索引（内存缓存，按需重建）
+# 案件索引（增量：按 case.yaml 的 mtime/size/inode 判定变化，只重载变动的案件）
 # ---------------------------------------------------------------------------
-_CASE_CACHE = None
-_CACHE_TS = 0
-_CACHE_TTL = 5  # 秒，文件频繁变动，缓存很短
+_STAT_TTL = 1.0  # 秒：未开启监视线程时，两次 stat 校验的最小间隔（stat 很便宜，YAML 解析才贵）
+_CHANGE_LOG = 256  # 保留的变更条数：SSE 断线重连（Last-Event-ID）在此范围内只补发差异
 
 
-def get_all_cases(force=False):
-    global _CASE_CACHE, _CACHE_TS
-    now = datetime.datetime.now().timestamp()
-    if force or _CASE_CACHE is None or (now - _CACHE_TS) > _CACHE_TTL:
-        cases = []
-        for entry in sorted(ROOT.iterdir()):
-            if entry.is_dir() and CASE_DIR_RE.match(entry.name):
+def _yaml_key(case_dir):
+    """case.yaml 的变化键 (mtime_ns, size, inode)；无档案返回 None。
+    case_store 以临时文件 + os.replace 原子写入，每次写入 inode 必变。"""
+    try:
+        st = os.stat(case_dir / "00 - 📅 日程管理" / "case.yaml")
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class CaseIndex:
+    """案件增量索引。refresh() 只 stat 各案件目录的 case.yaml，键不变则复用已解析的案件；
+    generation 在任一案件新增/删除/变动时递增（供 API 缓存判定）。线程安全。"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.generation = 0
+        self.watching = False
+        self._entries = {}   # 目录名 -> (yaml 键, canonical 案件)
+        self._cases = []
+        self._checked = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()   # generation 递增时唤醒 SSE 等待者
+        self._log = collections.deque(maxlen=_CHANGE_LOG)  # (generation, 变动案件 id, 删除案件 id)
+
+    def refresh(self):
+        """增量刷新，返回本次重新解析的案件目录名（新增或变动）；有新增/变动/删除时 generation 递增。"""
+        with self._lock:
+            try:
+                names = sorted(e.name for e in os.scandir(self.root)
+                               if CASE_DIR_RE.match(e.name) and e.is_dir())
+            except OSError:
+                names = []
+            entries, reloaded = {}, []
+            for name in names:
+                case_dir = self.root / name
+                key = _yaml_key(case_dir)
+                old = self._entries.get(name)
+                if old is not None and old[0] == key:
+                    entries[name] = old
+                    continue
                 try:
-                    cases.append(load_case(entry))
+                    entries[name] = (key, load_case(case_dir))
                 except Exception:  # noqa: BLE001
                     continue
-        _CASE_CACHE = cases
-        _CACHE_TS = now
-    return _CASE_CACHE
+                reloaded.append(name)
+            removed = self._entries.keys() - entries.keys()
+            bumped = bool(reloaded or removed or self._checked is None)
+            if bumped:
+                changed_ids = {entries[n][1]["id"] for n in reloaded}
+                removed_ids = {self._entries[n][1]["id"] for n in removed} - changed_ids
+                self._entries = entries
+                self._cases = [entries[n][1] for n in names if n in entries]
+                self.generation += 1
+                self._log.append((self.generation, changed_ids, removed_ids))
+            self._checked = time.monotonic()
+        if bumped:
+            with self._changed:
+                self._changed.notify_all()
+        return reloaded
+
+    def cases(self, force=False):
+        """当前案件列表。监视线程开启时直接读索引（由线程保持新鲜），否则按 _STAT_TTL 节流校验。"""
+        if force or self._checked is None or (
+                not self.watching and time.monotonic() - self._checked > _STAT_TTL):
+            self.refresh()
+        return self._cases
+
+    def changes_since(self, generation):
+        """generation 之后的差异 (变动 id 集, 删除 id 集)；早于变更日志保留范围时返回 None（需全量）。"""
+        with self._lock:
+            log = list(self._log)
+        if not log or log[0][0] > generation + 1:
+            return None
+        changed, removed = set(), set()
+        for gen, ch, rm in log:
+            if gen > generation:
+                changed = (changed - rm) | ch
+                removed = (removed - ch) | rm
+        return changed, removed
+
+    def wait(self, generation, timeout):
+        """阻塞至 generation 超过给定值或超时，返回当前 generation。
+        未开启监视线程时由等待者自己按 _STAT_TTL 节流刷新。"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._changed:
+                if self.generation > generation:
+                    return self.generation
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return self.generation
+                self._changed.wait(remaining if self.watching else min(remaining, _STAT_TTL))
+            if not self.watching:
+                self.cases()
+
+    def watch(self, interval):
+        """启动轮询监视线程（标准库零依赖，不用 inotify）：每 interval 秒 refresh 一次。"""
+        self.watching = True
+
+        def _loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception:  # noqa: BLE001 — 监视线程不因单次异常退出
+                    continue
+        threading.Thread(target=_loop, daemon=True).start()
+
+
+_INDEX = None
+
+
+def get_case_index():
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = CaseIndex(ROOT)
+    return _INDEX
+
+
+def get_all_cases(force=False):
+    return get_case_index().cases(force=force)
 
 
 def find_case_by_id(case_id):
@@ -339,18 +457,99 @@ def find_case_by_id(case_id):
 # 写回引擎（writable 来源）
 # ---------------------------------------------------------------------------
 
+_STORE_LIB = None         # 进程内加载的 case_store 模块；False = 加载失败，回退 subprocess
+_COALESCE_WINDOW = 0.15   # 秒：同一案件的连续点击在此窗口内合并为一次写入
+
+
+def load_case_store_lib():
+    """按 CASE_STORE 路径进程内加载 case_store 库 API（按文件路径加载，不依赖 sys.path/包结构，
+    符号链接安装同样可用）。写入仍走其 case_lock → 校验 → source 保护 → commit_write 全路径。"""
+    global _STORE_LIB
+    if _STORE_LIB is None:
+        _STORE_LIB = False
+        if CASE_STORE:
+            try:
+                spec = importlib.util.spec_from_file_location("case_store", CASE_STORE)
+                mod = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(mod)
+                if hasattr(mod, "set_statuses"):  # 旧版 case_store 只有 CLI
+                    _STORE_LIB = mod
+            except Exception as e:  # noqa: BLE001
+                print(f"⚠️  case_store 进程内加载失败，回退 subprocess：{e}", file=sys.stderr)
+    return _STORE_LIB or None
+
+
+class CaseWriteQueue:
+    """同一案件的连续任务切换合并为一次 set_statuses（一次 flock 读-改-写，同一任务以最后一次点击为准）。
+
+    批次内首个点击的请求线程做领头：等待合并窗口 → 按案件串行落盘 → 唤醒同批其他点击；
+    落盘期间的新点击进入下一批，批次按先后顺序生效。整批被拒时逐条重试，
+    一条非法点击只拒它自己。"""
+
+    def __init__(self, window=_COALESCE_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = {}     # 案件 id -> 待落盘批次
+        self._serial = {}      # 案件 id -> 落盘串行锁
+
+    def submit(self, lib, case_id, task_id, status):
+        with self._lock:
+            batch = self._pending.get(case_id)
+            leader = batch is None
+            if leader:
+                batch = self._pending[case_id] = {"changes": {}, "done": threading.Event(), "result": None}
+                serial = self._serial.setdefault(case_id, threading.Lock())
+            batch["changes"][task_id] = status
+        if leader:
+            time.sleep(self.window)
+            with serial:
+                with self._lock:
+                    del self._pending[case_id]
+                batch["result"] = self._flush(lib, case_id, batch["changes"])
+                batch["done"].set()
+        else:
+            batch["done"].wait()
+        ok, result = batch["result"][task_id]
+        if not ok:
+            return False, result
+        old, new = result
+        if old == new:
+            return True, f"{task_id}: 已是 {new}（连续点击已合并）"
+        return True, f"{task_id}: {old} → {new}"
+
+    @staticmethod
+    def _flush(lib, case_id, changes):
+        """返回 {task_id: (ok, (原状态, 新状态) 或错误信息)}。"""
+        try:
+            applied = lib.set_statuses(ROOT, case_id, list(changes.items()), actor="user", skip_unchanged=True)
+        except Exception as e:  # noqa: BLE001 — CaseStoreError（校验/source 保护）或 IO 错误
+            if len(changes) == 1:
+                return {tid: (False, str(e)) for tid in changes}
+            # set_statuses 整批不写：逐条重试，只拒被拒的那条
+            return {tid: CaseWriteQueue._flush(lib, case_id, {tid: st})[tid] for tid, st in changes.items()}
+        return {tid: (True, (old, new)) for tid, old, new in applied}
+
+
+_WRITE_QUEUE = CaseWriteQueue()
+
+
 def toggle_via_case_store(case, source_ref, target_status):
-    """V 案件写回：subprocess 调 case-progress 的 case_store（--actor user，人工点击）。"""
+    """V 案件写回：进程内调 case-progress 的 case_store 库（--actor user 语义，人工点击）；
+    库不可用时回退 subprocess 调 CLI。"""
     if not CASE_STORE:
         return False, "未找到 case_store.py（case-progress skill 未安装？）"
     target = "done" if target_status == "done" else "todo"
+    task_id = str(source_ref.get("task_id", ""))
+    lib = load_case_store_lib()
+    if lib:
+        return _WRITE_QUEUE.submit(lib, case["id"], task_id, target)
     cmd = [sys.executable, str(CASE_STORE), "--root", str(ROOT),
-           "set-status", case["id"], str(source_ref.get("task_id", "")), target, "--actor", "user"]
+           "set-status", case["id"], task_id, target, "--actor", "user"]
     r = subprocess.run(cmd, capture_output=True, text=True)
     return r.returncode == 0, (r.stdout.strip() or r.stderr.strip() or "ok")
 
 def toggle_task(case_id, source_ref, target_status):
-    """写回唯一路径：case_store CLI（--actor user）。path 由服务端权威推导，不信前端。"""
+    """写回唯一路径：case_store（库或 CLI，--actor user）。path 由服务端权威推导，不信前端。"""
     case = find_case_by_id(case_id)
     if not case:
         return False, "案件不存在"
@@ -541,8 +740,8 @@ def fetch_apple_events():
     return [], None, True
 
 
-def build_calendar():
-    """月历数据：期限（不含已抵消/已完成）+ 开庭，按日期分组。"""
+def build_calendar(apple=None):
+    """月历数据：期限（不含已抵消/已完成）+ 开庭，按日期分组。apple 为预取的 fetch_apple_events() 结果。"""
     days = {}
     for c in get_all_cases():
         for d in c["deadlines"]:
@@ -559,7 +758,7 @@ def build_calendar():
                 "kind": "hearing", "case_id": c["id"], "case_short": c["display_short"],
                 "name": f"{h.get('type')}·{h.get('subject')}", "place": h.get("place"),
                 "status": h.get("status"), "file": h.get("file", "")})
-    apple, apple_err, apple_pending = fetch_apple_events()
+    apple, apple_err, apple_pending = apple or fetch_apple_events()
     for a in apple:
         days.setdefault(a["date"], []).append({
             "kind": "apple", "case_id": None, "case_short": a["cal"],
@@ -609,39 +808,41 @@ def build_overview():
 
 
 def build_cases():
-    out = []
-    for c in get_all_cases():
-        counts = {"todo": 0, "in_progress": 0, "done": 0}
-        for t in c["tasks"]:
-            counts[t["status"]] = counts.get(t["status"], 0) + 1
-        nearest = None
-        for d in c["deadlines"]:
-            if d["days_left"] is not None and d["level"] != "none":
-                if nearest is None or (d["days_left"] < (nearest["days_left"] or 0)):
-                    nearest = d
-        next_hearing = None
-        for h in c.get("hearings") or []:
-            n = h.get("days_left")
-            if h.get("status") != "done" and n is not None and n >= 0:
-                if next_hearing is None or n < (next_hearing["days_left"] or 0):
-                    next_hearing = h
-        out.append({
-            "id": c["id"],
-            "display_name": c["display_name"],
-            "case_number": c["case_number"],
-            "cause": c["cause"],
-            "status": c["status"],
-            "lifecycle": c.get("lifecycle") or c["status"],
-            "stage": c["stage"],
-            "source_type": c["source_type"],
-            "data_quality": c["data_quality"],
-            "task_counts": counts,
-            "nearest_deadline": nearest,
-            "next_hearing": next_hearing,
-            "stale": c.get("stale", False),
-            "business": c.get("business", "诉讼"),
-        })
-    return out
+    return [case_summary(c) for c in get_all_cases()]
+
+
+def case_summary(c):
+    """案件列表卡片数据（/api/v1/cases 单行；SSE 差异推送同此结构）。"""
+    counts = {"todo": 0, "in_progress": 0, "done": 0}
+    for t in c["tasks"]:
+        counts[t["status"]] = counts.get(t["status"], 0) + 1
+    nearest = None
+    for d in c["deadlines"]:
+        if d["days_left"] is not None and d["level"] != "none":
+            if nearest is None or (d["days_left"] < (nearest["days_left"] or 0)):
+                nearest = d
+    next_hearing = None
+    for h in c.get("hearings") or []:
+        n = h.get("days_left")
+        if h.get("status") != "done" and n is not None and n >= 0:
+            if next_hearing is None or n < (next_hearing["days_left"] or 0):
+                next_hearing = h
+    return {
+        "id": c["id"],
+        "display_name": c["display_name"],
+        "case_number": c["case_number"],
+        "cause": c["cause"],
+        "status": c["status"],
+        "lifecycle": c.get("lifecycle") or c["status"],
+        "stage": c["stage"],
+        "source_type": c["source_type"],
+        "data_quality": c["data_quality"],
+        "task_counts": counts,
+        "nearest_deadline": nearest,
+        "next_hearing": next_hearing,
+        "stale": c.get("stale", False),
+        "business": c.get("business", "诉讼"),
+    }
 
 
 def build_case(case_id):
@@ -688,6 +889,55 @@ def build_project():
     return result
 
 
+# ---------------------------------------------------------------------------
+# API 响应缓存：ETag 由案件索引 generation 派生，同一代数据各接口只组装/序列化/压缩一次
+# ---------------------------------------------------------------------------
+_BOOT_ID = f"{os.getpid():x}{time.time_ns() // 1_000_000:x}"  # 重启后 generation 从头计数，旧 ETag 须全部失效
+_GZIP_MIN = 1024   # 字节：小于此不压缩
+_SSE_PING = 15     # 秒：SSE 心跳间隔（防代理/浏览器判定空闲断开）
+_PAYLOADS = {}     # 接口键 -> (etag, json 字节, gzip 字节或 None)
+_PAYLOADS_LOCK = threading.Lock()
+
+
+def cached_payload(key, builder, extra=""):
+    """返回 (etag, body, gz)；builder 返回 None（如案件不存在）时 body 为 None。
+    etag 在组装前取定：组装期间若数据又变，下次请求 generation 已前进，自然重建。"""
+    idx = get_case_index()
+    idx.cases()  # 节流 stat 校验，可能推进 generation
+    etag = f'W/"{_BOOT_ID}-{idx.generation}{extra}"'
+    with _PAYLOADS_LOCK:
+        hit = _PAYLOADS.get(key)
+    if hit and hit[0] == etag:
+        return hit
+    data = builder()
+    if data is None:
+        return etag, None, None
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    gz = gzip.compress(body, compresslevel=6) if len(body) >= _GZIP_MIN else None
+    entry = (etag, body, gz)
+    with _PAYLOADS_LOCK:
+        _PAYLOADS[key] = entry
+    return entry
+
+
+def _apple_tag(apple):
+    """日历接口的 ETag 附加段：苹果日历缓存时间戳 + 错误/pending 状态（这部分不随 generation 变）。"""
+    _, err, pending = apple
+    return f"-a{int(_APPLE_CACHE['ts'] * 1000):x}{'e' if err else ''}{'p' if pending else ''}"
+
+
+def case_diff_event(idx, since):
+    """SSE 差异载荷：since 代之后变动案件的列表卡片 + 删除的 id；超出变更日志则要求全量刷新。"""
+    diff = idx.changes_since(since)
+    if diff is None:
+        return {"generation": idx.generation, "full": True}
+    changed, removed = diff
+    cases = {c["id"]: c for c in idx.cases()}
+    return {"generation": idx.generation, "full": False,
+            "changed": [case_summary(cases[i]) for i in sorted(changed) if i in cases],
+            "removed": sorted(removed | {i for i in changed if i not in cases})}
+
+
 # ---------------------------------------------------------------------------
 # HTTP Handler
 # ---------------------------------------------------------------------------
@@ -712,6 +962,71 @@ class Handler(BaseHTTPRequestHandler):
         if body:
             self.wfile.write(body)
 
+    def _send_api(self, key, builder, extra=""):
+        """带 ETag/gzip 的 JSON 响应：If-None-Match 命中回 304，否则复用同代缓存的字节。"""
+        etag, body, gz = cached_payload(key, builder, extra)
+        if body is None:
+            self._send(404, {"error": "案件不存在"})
+            return
+        inm = [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]
+        if etag in inm or "*" in inm:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+        use_gz = gz is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        data = gz if use_gz else body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if use_gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  # 可缓存但每次回源校验 ETag
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self):
+        """SSE：case.yaml 变动即推送 event: cases（差异载荷），空闲时发心跳注释。
+        事件 id 为 "<启动标识>:<generation>"，断线重连据 Last-Event-ID 只补发差异。"""
+        idx = get_case_index()
+        idx.cases()
+        boot, _, last = (self.headers.get("Last-Event-ID") or "").partition(":")
+        gen = int(last) if boot == _BOOT_ID and last.isdigit() else None
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            if gen is None and self.headers.get("Last-Event-ID"):  # 服务已重启：让前端全量刷新
+                gen = idx.generation
+                self._write_event(gen, {"generation": gen, "full": True})
+            elif gen is None:
+                gen = idx.generation
+            self.wfile.flush()
+            while True:
+                new = idx.wait(gen, _SSE_PING)
+                if new == gen:
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                event = case_diff_event(idx, gen)
+                gen = event["generation"]
+                self._write_event(gen, event)
+        except OSError:  # 浏览器关闭页签/断网
+            return
+
+    def _write_event(self, gen, data):
+        payload = json.dumps(data, ensure_ascii=False)
+        self.wfile.write(f"id: {_BOOT_ID}:{gen}\nevent: cases\ndata: {payload}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
     def _read_body(self):
         length = int(self.headers.get("Content-Length", 0) or 0)
         if length == 0:
@@ -732,7 +1047,10 @@ class Handler(BaseHTTPRequestHandler):
                 self._send(200, text, "text/html; charset=utf-8")
             return
         if path == "/api/v1/overview":
-            self._send(200, build_overview())
+            self._send_api("overview", build_overview)
+            return
+        if path == "/api/v1/events":
+            self._stream_events()
             return
         if path == "/api/v1/grant-fda":
             subprocess.run(["open", "x-apple.systempreferences:com.apple.preference.security?Privacy_AllFiles"],
@@ -740,21 +1058,22 @@ class Handler(BaseHTTPRequestHandler):
             self._send(200, {"ok": True, "message": "已打开 系统设置→隐私与安全性→完全磁盘访问，请添加 ZCode"})
             return
         if path == "/api/v1/calendar":
-            self._send(200, build_calendar())
+            apple = fetch_apple_events()
+            self._send_api("calendar", lambda: build_calendar(apple), _apple_tag(apple))
             return
         if path == "/api/v1/focus":
-            self._send(200, build_focus())
+            self._send_api("focus", build_focus)
             return
         if path == "/api/v1/cases":
-            self._send(200, build_cases())
+            self._send_api("cases", build_cases)
             return
         if path == "/api/v1/project":
             self._send(200, build_project())
             return
         m = re.match(r"^/api/v1/case/(\w+)$", path)
         if m:
-            c = build_case(m.group(1))
-            self._send(200 if c else 404, c or {"error": "案件不存在"})
+            case_id = m.group(1)
+            self._send_api(f"case/{case_id}", lambda: build_case(case_id))
             return
         if path == "/api/v1/preview":
             qs = parse_qs(urlparse(self.path).query)
@@ -873,6 +1192,8 @@ def main():
     parser.add_argument("--root", default=None, help="项目根（默认 SUITAGENT_ROOT 或 cwd 向上发现）")
     parser.add_argument("--port", type=int, default=int(os.environ.get("DASHBOARD_PORT", DEFAULT_PORT)))
     parser.add_argument("--host", default=os.environ.get("DASHBOARD_HOST", DEFAULT_HOST))
+    parser.add_argument("--watch", type=float, default=float(os.environ.get("DASHBOARD_WATCH_INTERVAL", "0")),
+                        help="后台轮询 case.yaml 变化的间隔秒数（0=关闭，按请求节流校验）")
     args = parser.parse_args()
 
     global ROOT, CASE_STORE
@@ -881,6 +1202,7 @@ def main():
         print("❌ 未发现项目根：请 --root 指定（须为含 6 位数字开头案件目录的路径）", file=sys.stderr)
         sys.exit(1)
     CASE_STORE = find_case_store(ROOT)
+    store_mode = "进程内" if load_case_store_lib() else "subprocess"
 
     try:
         sys.stdout.reconfigure(line_buffering=True)  # 启动扫描结果立即显示
@@ -893,13 +1215,17 @@ def main():
     # 启动自检
     cases = get_all_cases(force=True)
     print(f"✅ 项目根: {ROOT}")
-    print(f"✅ 写入引擎: {CASE_STORE or '未找到（V 案件将无法写回）'}")
+    print(f"✅ 写入引擎: {f'{CASE_STORE}（{store_mode}）' if CASE_STORE else '未找到（V 案件将无法写回）'}")
     print(f"✅ 扫描到 {len(cases)} 个案件:")
     for c in cases:
         flag = {"V": "v4.0", "none": "仅目录"}[c["source_type"]]
         w = "可写" if any(t["writable"] for t in c["tasks"]) else "只读"
         print(f"   · [{c['id']}] {c['display_short']:<14} {flag:<10} {w}")
 
+    if args.watch > 0:
+        get_case_index().watch(args.watch)
+        print(f"✅ 案件监视: 每 {args.watch:g}s 轮询 case.yaml 变化")
+
     # 苹果日历：启动预热 + 定时刷新（默认 10 分钟，DASHBOARD_APPLECAL_INTERVAL 可调）
     # 抓取完全独立于页面访问——看板看到的永远是缓存里已就绪的数据
     def _prewarm():
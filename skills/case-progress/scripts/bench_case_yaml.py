@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+case.yaml 读写微基准
+在临时目录生成合成案件根（默认 500 案），对比 case.yaml 的加载/落盘开销：
+  - 加载：纯 Python SafeLoader（旧 yaml.safe_load） vs libyaml CSafeLoader（load_case）
+          vs CaseDoc 惰性视图（list/report 只取摘要所需的节）
+  - 落盘：纯 Python 输出（旧 yaml.dump） vs dump_case（libyaml，BMP 外字符自动回退）
+并校验三种加载结果与两种输出文本完全一致。
+
+用法：
+    python scripts/bench_case_yaml.py                      # 合成 500 案（纯 Python 基线较慢，约数分钟）
+    python scripts/bench_case_yaml.py --cases 200 --history 400 --repeat 5
+    python scripts/bench_case_yaml.py --root /path/to/项目根   # 对现有项目根只读测量
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))  # 字符串级路径（不 resolve）
+
+import case_store  # noqa: E402
+
+LEGACY_DUMP = dict(allow_unicode=True, sort_keys=False, default_flow_style=False, width=100)
+
+
+def build_root(root, n, history):
+    """合成案件根：v4 骨架 + 任务/期限/开庭/时间线/工时 + 长 更新历史（随写入次数增长的大节）。"""
+    rnd = random.Random(1)
+    for i in range(n):
+        cid = f"25{i:04d}"
+        name = f"{cid} 合成案件{i}"
+        d = root / name / "00 - 📅 日程管理"
+        d.mkdir(parents=True)
+        v = case_store._base_v4(cid, name, [])
+        v["案件基本信息"]["案件名称"] = f"合成案件{i}"
+        v["任务"] = [{"id": f"task_{j:03d}", "名称": f"任务{j}", "优先级": "中",
+                    "状态": rnd.choice(case_store.TRI_STATE), "source": "ai", "描述": "核对证据材料并整理目录" * 3}
+                   for j in range(20)]
+        v["法定期限"] = [{"类型": "举证期限", "名称": f"期限{j}",
+                      "截止日期": f"2026-{rnd.randint(9, 12):02d}-{rnd.randint(1, 28):02d}",
+                      "状态": "todo", "法律依据": "民事诉讼法第六十八条", "抵消标记": None, "source": "ai"}
+                     for j in range(3)]
+        v["开庭与听证"] = [{"事项": "一审开庭", "日期": f"2026-{rnd.randint(10, 12):02d}-{rnd.randint(1, 28):02d}",
+                       "状态": "todo", "source": "ai"}]
+        v["案件时间线"] = [{"日期": "2025-01-01", "事件类型": "法院立案", "事件": "法院受理立案", "source": "ai"}
+                      for _ in range(10)]
+        v["工时统计"] = {"总工时": 12.5, "工作记录": [
+            {"日期": "2025-03-01", "时长": 1.5, "内容": "阅卷并制作证据目录", "source": "user"} for _ in range(30)]}
+        v["更新历史"] = [{"时间": "2025-03-01 10:00:00", "操作者": "ai", "动作": "状态推进",
+                      "细节": f"task_{j % 20:03d}: todo → in_progress"} for j in range(history)]
+        (d / "case.yaml").write_text(yaml.dump(v, **LEGACY_DUMP), encoding="utf-8")
+
+
+def _best(func, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="case-progress case.yaml 读写微基准")
+    parser.add_argument("--root", help="现有项目根（只读）；缺省则在临时目录合成")
+    parser.add_argument("--cases", type=int, default=500, help="合成案件数（默认 500）")
+    parser.add_argument("--history", type=int, default=200, help="每案 更新历史 条数（默认 200）")
+    parser.add_argument("--repeat", type=int, default=1, help="重复次数，取最快一次（默认 1）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.root) if args.root else Path(tmp)
+        if not args.root:
+            build_root(root, args.cases, args.history)
+        paths = sorted(root.glob("*/" + case_store.CASE_YAML_GLOB))
+        if not paths:
+            print("❌ 未找到 case.yaml")
+            return 1
+        texts = [p.read_text(encoding="utf-8") for p in paths]
+        size = sum(len(t.encode("utf-8")) for t in texts)
+
+        legacy_docs = [yaml.load(t, Loader=yaml.SafeLoader) for t in texts]
+        mismatches = [str(p) for p, t, d in zip(paths, texts, legacy_docs)
+                      if yaml.load(t, Loader=case_store._SafeLoader) != d
+                      or dict(case_store.CaseDoc(p, t)) != d
+                      or case_store.dump_case(d) != yaml.dump(d, **LEGACY_DUMP)]
+
+        py_load = _best(lambda t: yaml.load(t, Loader=yaml.SafeLoader), texts, args.repeat)
+        c_load = _best(lambda t: yaml.load(t, Loader=case_store._SafeLoader), texts, args.repeat)
+        lazy = _best(lambda pt: case_store.case_summary(case_store.CaseDoc(*pt)), list(zip(paths, texts)), args.repeat)
+        py_dump = _best(lambda d: yaml.dump(d, **LEGACY_DUMP), legacy_docs, args.repeat)
+        c_dump = _best(case_store.dump_case, legacy_docs, args.repeat)
+
+    print(f"语料: {len(paths)} 份 case.yaml, 共 {size / 1024 / 1024:.1f} MB"
+          f"（libyaml: {'可用' if hasattr(yaml, 'CSafeLoader') else '不可用，C 路径即纯 Python'}）")
+    print(f"加载  纯 Python SafeLoader : {py_load * 1000:9.1f} ms")
+    print(f"加载  CSafeLoader（完整）  : {c_load * 1000:9.1f} ms  (x{py_load / c_load:.1f})")
+    print(f"加载  CaseDoc 摘要（惰性） : {lazy * 1000:9.1f} ms  (x{py_load / lazy:.1f})")
+    print(f"落盘  纯 Python 输出       : {py_dump * 1000:9.1f} ms")
+    print(f"落盘  dump_case            : {c_dump * 1000:9.1f} ms  (x{py_dump / c_dump:.1f})")
+    if mismatches:
+        print(f"⚠️  结果不一致: {len(mismatches)} 份，例如: {mismatches[0]}")
+        return 1
+    print("✅ 三种加载结果、两种输出文本完全一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,17 +27,38 @@
     schema 校验 → 行级 source 检查 → flock → 临时文件 + os.replace 原子替换
     每次成功写入追加 更新历史 并刷新 同步.最后同步时间
     注意：写入采用整文件 dump，yaml 注释不保留——填写指引以模板与 schema.md 为准（DEC-007）
+
+库调用（同一写入路径，供 case-dashboard server 进程内调用，免每次点击起解释器）：
+    add_task / set_status / set_statuses / add_deadline / set_stage / set_fields(root, 短码, ...)
+    拒绝时抛 CaseStoreError（CLI 入口转为 ❌ + 退出码 1）；set_statuses 把多次推进合并为一次加锁读-改-写
+
+案件注册表（项目根 .case_registry.json，运行时缓存，可随时删除）：
+    list / report 按 case.yaml 指纹只重解析变动案件，show 等定位免扫描根目录；commit_write 落盘后同步更新
+
+全所回扫（scan / extract 不带短码）：各案只读分析经进程池并行（--jobs，默认 min(CPU 数, 8)），
+    报告按案件顺序输出、--apply 写入仍在主进程串行；extract 的 pdftotext 文本按 (路径, size, mtime)
+    缓存于各案 00 目录 .text_cache.json
+
+视图渲染：render 不带短码 = 全部已迁移案件经进程池并行渲染（--jobs）；写入后的视图刷新按节渲染，
+    同一进程内（看板 server 等库调用方）源数据摘要未变的节直接复用上次片段
+
+YAML 读写：libyaml 可用时用 CSafeLoader / CSafeDumper（不可用退回纯 Python，输出逐字节一致；
+    含 BMP 外字符时落盘改用纯 Python 输出，避免 emoji 被转义）。只读路径（list/report 建表、show、
+    scan）经 CaseDoc 按顶层节惰性解析，不解析 更新历史 等大节；基准见 bench_case_yaml.py
 """
 
 import argparse
 import contextlib
 import datetime
 import fcntl
+import hashlib
 import json
 import os
+import pickle
 import re
 import sys
 import tempfile
+from collections.abc import Mapping
 from pathlib import Path
 
 import yaml
@@ -63,7 +84,15 @@ REQUIRED_SECTIONS = ("meta", "案件基本信息", "当事人与代理", "任务
 LIST_SECTIONS_WITH_SOURCE = ("任务", "法定期限", "案件时间线", "证据索引",
                              "开庭与听证", "审级记录")
 
-TODAY = datetime.date.today()
+
+
+def today():
+    """当天日期。逐次求值：看板进程内常驻调用库，不能在导入时定格。"""
+    return datetime.date.today()
+
+
+class CaseStoreError(Exception):
+    """写入被拒或档案不可读（参数非法 / schema 校验 / source 保护）。库调用方自行处理，CLI 入口转为 die。"""
 
 
 def die(msg, code=1):
@@ -87,6 +116,8 @@ def find_root(explicit=None):
     if CASE_DIR_RE.match(d.name):  # cwd 即案件目录 → 根为其父
         return d.parent
     for cand in [d, *d.parents]:
+        if (cand / REGISTRY_NAME).is_file():  # 已建注册表的项目根：免列目录
+            return cand
         try:
             if any(c.is_dir() and CASE_DIR_RE.match(c.name) for c in cand.iterdir()):
                 return cand
@@ -104,28 +135,171 @@ def case_dirs(root):
 
 
 def case_yaml_path(root, case_id):
+    hit = CaseRegistry(root).lookup(case_id)
+    if hit is not None:
+        return hit
     dirs = case_dirs(root)
     if case_id not in dirs:
-        die(f"案件不存在: {case_id}（可用: {', '.join(dirs) or '无'}）")
+        raise CaseStoreError(f"案件不存在: {case_id}（可用: {', '.join(dirs) or '无'}）")
     matches = sorted(dirs[case_id].glob(CASE_YAML_GLOB))
     if not matches:
-        die(f"案件 {case_id} 无 case.yaml（存量格式未迁移，M4 处理；新案件由 new-case v4.0 生成）")
+        raise CaseStoreError(f"案件 {case_id} 无 case.yaml（存量格式未迁移，M4 处理；新案件由 new-case v4.0 生成）")
     return matches[0]
 
 
+# libyaml 可用时走 C 实现（解析/输出约快一个数量级），否则退回纯 Python；两者安全子集语义一致
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+_DUMP_KW = dict(allow_unicode=True, sort_keys=False, default_flow_style=False, width=100)
+
+
 def load_case(path):
     try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=_SafeLoader)
     except yaml.YAMLError as e:
-        die(f"YAML 解析失败 {path}: {e}")
+        raise CaseStoreError(f"YAML 解析失败 {path}: {e}") from e
     if not isinstance(data, dict):
-        die(f"{path} 内容不是映射，请检查")
+        raise CaseStoreError(f"{path} 内容不是映射，请检查")
     return data
 
 
+def dump_case(data):
+    text = yaml.dump(data, Dumper=_SafeDumper, **_DUMP_KW)
+    if "\\U" in text and _SafeDumper is not yaml.SafeDumper:
+        # libyaml 即便 allow_unicode 也把 BMP 外字符（📅 等 emoji）转义成 \UXXXXXXXX，
+        # 数据等价但 yaml 不再可读——此时改用纯 Python 输出，保持原文件观感
+        text = yaml.dump(data, Dumper=yaml.SafeDumper, **_DUMP_KW)
+    return text
+
+
+class CaseDoc(Mapping):
+    """case.yaml 的只读惰性视图：按顶层节切分原文，某节首次被访问时才解析。
+
+    list/report/show/scan 只读少数几节（案件基本信息、任务、期限……），不必解析随写入次数
+    无限增长的 更新历史 等大节。切分依赖 case_store 自身的输出格式（顶层键顶格、块序列顶格
+    "- "）；原文含文档标记/指令/制表符、根不是映射、或某节无法单独解析（如跨节锚点）时，
+    整体退回一次完整解析，结果与 load_case 一致。写入路径仍用 load_case 取完整 dict。
+
+    只有引号纯量与流式集合能把续行写到顶格（续行形如 "键: 值" 时会被误认成顶层键）；
+    含可能未闭合的引号/括号行的节在切分时即解析校验，须恰好得到该节一个键，否则整体退回。
+    """
+
+    __slots__ = ("path", "_text", "_chunks", "_parsed")
+
+    _KEY_LINE = re.compile(r"^([^\s#\-'\"][^:]*?|'[^']*'|\"[^\"]*\")\s*:(?=\s|$)")
+    _PLAIN_RESERVED = {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+    _OPENER = re.compile(r"[\"'\[{]")
+
+    def __init__(self, path, text=None):
+        self.path = path
+        self._text = path.read_text(encoding="utf-8") if text is None else text
+        split = self._split(self._text)
+        if split is None:
+            self._load_all()
+        else:
+            self._chunks, self._parsed = split
+
+    @classmethod
+    def _key_name(cls, raw):
+        # case_store 输出的键都是中文/标识符式纯量，直接取原文；其余（引号、数字等）交给 YAML
+        if raw.isidentifier() and raw.lower() not in cls._PLAIN_RESERVED:
+            return raw
+        return next(iter(yaml.load(raw + ": null", Loader=_SafeLoader)))
+
+    @staticmethod
+    def _may_continue(line):
+        """该行是否可能打开跨行的引号纯量或流式集合（保守判断：宁可多报）。"""
+        s = line.rstrip()
+        if "[" in s or "{" in s:
+            return (any(c in s for c in "\"'#")
+                    or s.count("[") != s.count("]") or s.count("{") != s.count("}"))
+        if '"' in s:
+            bare = s.replace("\\\\", "").replace('\\"', "")
+            if "'" in s or bare.count('"') % 2 or not bare.endswith('"'):
+                return True
+        return "'" in s and (s.count("'") % 2 == 1 or not s.endswith("'"))
+
+    @classmethod
+    def _split(cls, text):
+        """顶层键 → 原文片段，以及切分时已校验解析的节；遇到无法安全切分的写法返回 None。"""
+        chunks, key, start, pos, suspect = {}, None, 0, 0, set()
+        for line in text.splitlines(keepends=True):
+            if line.startswith(("---", "...", "%", "\t")):
+                return None
+            head = line[:1]
+            if head in (" ", "#", "-", "\n", "\r"):
+                if key is None and head == "-":
+                    return None  # 根是序列
+            else:
+                m = cls._KEY_LINE.match(line)
+                if not m:
+                    return None
+                if key is not None:
+                    chunks[key] = text[start:pos]
+                try:
+                    key = cls._key_name(m.group(1))
+                except (yaml.YAMLError, TypeError, StopIteration):
+                    return None
+                if key in chunks:
+                    return None  # 同名顶层键：交给完整解析（后者覆盖）
+                start = pos
+            if head != "#" and cls._OPENER.search(line) and cls._may_continue(line):
+                suspect.add(key)
+            pos += len(line)
+        if key is None:
+            return None
+        chunks[key] = text[start:]
+        parsed = {}
+        for k in suspect:
+            value = cls._parse_chunk(chunks[k])
+            if value is None or next(iter(value)) != k:
+                return None
+            parsed[k] = value[k]
+        return chunks, parsed
+
+    @staticmethod
+    def _parse_chunk(chunk):
+        """单节原文 → {键: 值}；无法单独解析或不恰好一个键时返回 None。"""
+        try:
+            value = yaml.load(chunk, Loader=_SafeLoader)
+        except yaml.YAMLError:
+            return None
+        return value if isinstance(value, dict) and len(value) == 1 else None
+
+    def _load_all(self):
+        try:
+            data = yaml.load(self._text, Loader=_SafeLoader)
+        except yaml.YAMLError as e:
+            raise CaseStoreError(f"YAML 解析失败 {self.path}: {e}") from e
+        if not isinstance(data, dict):
+            raise CaseStoreError(f"{self.path} 内容不是映射，请检查")
+        self._chunks, self._parsed = None, data
+
+    def __getitem__(self, key):
+        if self._chunks is None or key in self._parsed:
+            return self._parsed[key]
+        value = self._parse_chunk(self._chunks[key])
+        if value is None:
+            self._load_all()
+            return self._parsed[key]
+        self._parsed[key] = value = next(iter(value.values()))
+        return value
+
+    def __iter__(self):
+        return iter(self._parsed if self._chunks is None else self._chunks)
+
+    def __len__(self):
+        return len(self._parsed if self._chunks is None else self._chunks)
+
+
+def load_case_doc(path):
+    """只读场景的惰性加载（见 CaseDoc）；写入请用 load_case。"""
+    return CaseDoc(path)
+
+
 def atomic_write(path, data):
     """临时文件 + os.replace 原子替换（单写者语义由 case_lock 保证）。"""
-    text = yaml.dump(data, allow_unicode=True, sort_keys=False, default_flow_style=False, width=100)
+    text = dump_case(data)
     fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".")
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as out:
@@ -146,7 +320,12 @@ def case_lock(yaml_path):
     锁文件为 <case.yaml>.lock（inode 稳定，不受 os.replace 影响；
     flock 由内核在进程退出时自动释放，无死锁残留）。运行时文件，不入库。
     """
-    lock_path = yaml_path.parent / (yaml_path.name + ".lock")
+    with _flock(yaml_path.parent / (yaml_path.name + ".lock")):
+        yield
+
+
+@contextlib.contextmanager
+def _flock(lock_path):
     with open(lock_path, "a+", encoding="utf-8") as lf:
         fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
         try:
@@ -155,6 +334,153 @@ def case_lock(yaml_path):
             fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
 
 
+# ---------------------------------------------------------------------------
+# 案件注册表：项目根 .case_registry.json（短码 → 目录/yaml/指纹/摘要）
+# list / report 只 stat 不解析，show 等定位免扫描根目录；指纹 = case.yaml 的 (mtime_ns, size, inode)，
+# 变化才重新解析该案件。commit_write 落盘后顺手更新本案条目；注册表缺失/损坏/版本不符时惰性重建。
+# 注册表只是加速缓存：一切判断以 case.yaml 为准，删掉它不丢任何数据。运行时文件，不入库。
+# ---------------------------------------------------------------------------
+REGISTRY_NAME = ".case_registry.json"
+REGISTRY_VERSION = 1
+
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def case_summary(data):
+    """注册表摘要：与日期无关的字段 + 期限/开庭的原始行（剩余天数在读取时按当天计算，跨日不失效）。"""
+    info = data.get("案件基本信息") or {}
+    stage, _ = resolve_stage(data)
+    tasks = data.get("任务") or []
+    return {
+        "名称": info.get("案件名称"),
+        "生命周期": info.get("生命周期状态"),
+        "阶段": stage,
+        "任务": {s: sum(1 for t in tasks if t.get("状态") == s) for s in TRI_STATE},
+        "法定期限": [{k: _json_scalar(d.get(k)) for k in ("类型", "名称", "截止日期", "状态", "法律依据", "抵消标记")}
+                    for d in data.get("法定期限") or []],
+        "开庭与听证": [{k: _json_scalar(h.get(k)) for k in ("事项", "日期", "状态")}
+                      for h in data.get("开庭与听证") or []],
+    }
+
+
+def _json_scalar(value):
+    """未加引号的日期（截止日期: 2026-11-01）由 YAML 解析为 date，摘要里统一存 ISO 字符串。"""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class CaseRegistry:
+    """项目根的案件注册表。entries: 短码 -> {目录, yaml(相对根), 指纹, 摘要 | 错误}。"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.path = self.root / REGISTRY_NAME
+        self.root_mtime = None
+        self.entries = {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(raw, dict) and raw.get("版本") == REGISTRY_VERSION and isinstance(raw.get("案件"), dict):
+            self.root_mtime = raw.get("根目录mtime")
+            self.entries = raw["案件"]
+
+    def lookup(self, case_id):
+        """短码 → case.yaml 路径（仅信任仍存在的文件；未命中返回 None，由调用方回退扫描）。"""
+        e = self.entries.get(case_id)
+        if not e or not e.get("yaml"):
+            return None
+        path = self.root / e["yaml"]
+        return path if path.is_file() else None
+
+    def sync(self):
+        """按需刷新：根目录 mtime 变了才重列案件目录；逐案 stat case.yaml，指纹变了才重新解析。"""
+        dirty = False
+        root_mtime = os.stat(self.root).st_mtime_ns
+        if root_mtime != self.root_mtime or not self.entries:
+            dirs = case_dirs(self.root)
+            entries = {}
+            for cid, d in dirs.items():
+                e = self.entries.get(cid)
+                entries[cid] = e if e and e.get("目录") == d.name else {"目录": d.name, "yaml": None, "指纹": None}
+            dirty = entries.keys() != self.entries.keys() or root_mtime != self.root_mtime
+            self.entries, self.root_mtime = entries, root_mtime
+        for cid, e in self.entries.items():
+            fp = _fingerprint(self.root / e["yaml"]) if e.get("yaml") else None
+            if fp is None:  # 未迁移或 00 目录变动：重新定位
+                matches = sorted((self.root / e["目录"]).glob(CASE_YAML_GLOB))
+                e["yaml"] = matches[0].relative_to(self.root).as_posix() if matches else None
+                fp = _fingerprint(matches[0]) if matches else None
+            if fp == e.get("指纹") and ("摘要" in e or "错误" in e or fp is None):
+                continue
+            self._fill(e, fp)
+            dirty = True
+        if dirty:
+            try:
+                with _flock(self.root / (REGISTRY_NAME + ".lock")):
+                    self.save()
+            except OSError:
+                pass  # 只读根目录：本次照常返回，只是不落缓存
+        return self
+
+    def _fill(self, e, fp, data=None):
+        e["指纹"] = fp
+        e.pop("摘要", None)
+        e.pop("错误", None)
+        if fp is None:
+            return
+        try:
+            e["摘要"] = case_summary(data if data is not None else load_case_doc(self.root / e["yaml"]))
+        except CaseStoreError as ex:
+            e["错误"] = str(ex)
+
+    def save(self):
+        payload = {"版本": REGISTRY_VERSION, "根目录mtime": self.root_mtime, "案件": self.entries}
+        fd, tmp = tempfile.mkstemp(dir=str(self.root), prefix=REGISTRY_NAME + ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                json.dump(payload, out, ensure_ascii=False, default=str)
+            os.replace(tmp, self.path)
+        except BaseException as e:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
+
+    def items(self):
+        """按目录名排序的 (短码, 条目)，与 case_dirs 的顺序一致。"""
+        return sorted(self.entries.items(), key=lambda kv: kv[1]["目录"])
+
+
+def _registry_note_write(path, data):
+    """commit_write 后更新注册表中本案条目（注册表不存在则不创建，留待 list/report 惰性建立）。"""
+    root = path.parent.parent.parent
+    reg_path = root / REGISTRY_NAME
+    if not reg_path.exists():
+        return
+    try:
+        with _flock(root / (REGISTRY_NAME + ".lock")):
+            reg = CaseRegistry(root)
+            cid = (data.get("meta") or {}).get("案件短码")
+            e = reg.entries.get(cid)
+            if e is None or e.get("目录") != path.parent.parent.name:
+                return  # 新案件/目录改名：下次 sync 按根目录 mtime 重建
+            e["yaml"] = path.relative_to(root).as_posix()
+            reg._fill(e, _fingerprint(path), data)
+            reg.save()
+    except OSError:
+        pass  # 注册表只是缓存，更新失败不影响写入（下次 sync 按指纹自愈）
+
+
 # ---------------------------------------------------------------------------
 # 校验（schema.md §5 六条规则的实现）
 # ---------------------------------------------------------------------------
@@ -233,18 +559,22 @@ def validate_data(data, case_id):
 # ---------------------------------------------------------------------------
 # 写入公共路径：校验 → source 检查（由各命令先行完成）→ 落盘 + 更新历史/同步
 # ---------------------------------------------------------------------------
-def commit_write(path, data, actor, action, detail):
+def commit_write(path, data, actor, action, detail=None):
+    """action 可为 [(动作, 细节), ...]：合并写入时一次落盘、逐条追加更新历史。"""
     errs, warns = validate_data(data, (data.get("meta") or {}).get("案件短码") or "?")
     if errs:
-        die("写入被 schema 校验拦截：\n  - " + "\n  - ".join(errs))
+        raise CaseStoreError("写入被 schema 校验拦截：\n  - " + "\n  - ".join(errs))
     data.setdefault("同步", {})["最后同步时间"] = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-    data.setdefault("更新历史", []).append({
-        "日期": TODAY.isoformat(),
-        "操作者": "case_store" if actor == "ai" else "case_store(user)",
-        "动作": action,
-        "细节": detail,
-    })
+    entries = action if isinstance(action, list) else [(action, detail)]
+    for act, det in entries:
+        data.setdefault("更新历史", []).append({
+            "日期": today().isoformat(),
+            "操作者": "case_store" if actor == "ai" else "case_store(user)",
+            "动作": act,
+            "细节": det,
+        })
     atomic_write(path, data)
+    _registry_note_write(path, data)
     _refresh_views(path, data, (data.get("meta") or {}).get("案件短码") or "?")
     for w in warns:
         print(f"⚠️ {w}")
@@ -260,7 +590,7 @@ def days_left(end):
     if not m or not m.group(1):
         return None
     try:
-        return (datetime.date.fromisoformat(str(end)) - TODAY).days
+        return (datetime.date.fromisoformat(str(end)) - today()).days
     except ValueError:
         return None
 
@@ -317,112 +647,174 @@ def build_show(data):
 # 子命令
 # ---------------------------------------------------------------------------
 def cmd_show(root, case_id, *_a, **_k):
-    data = load_case(case_yaml_path(root, case_id))
+    data = load_case_doc(case_yaml_path(root, case_id))
     print(json.dumps(build_show(data), ensure_ascii=False, indent=2))
 
 
 def cmd_list(root, *_a, **_k):
     out = []
-    for cid, d in case_dirs(root).items():
-        matches = sorted(d.glob(CASE_YAML_GLOB))
-        if not matches:
-            out.append({"案件": cid, "目录": d.name, "unmigrated": True})
+    for cid, e in CaseRegistry(root).sync().items():
+        if not e.get("yaml"):
+            out.append({"案件": cid, "目录": e["目录"], "unmigrated": True})
             continue
-        data = load_case(matches[0])
-        stage, _ = resolve_stage(data)
-        dl = [x for x in (deadline_display(d2) for d2 in data.get("法定期限") or [])
+        if "错误" in e:
+            raise CaseStoreError(e["错误"])
+        sm = e["摘要"]
+        dl = [x for x in (deadline_display(d2) for d2 in sm["法定期限"])
               if x["告警"] not in (None, "normal")]
         out.append({
-            "案件": cid, "名称": (data.get("案件基本信息") or {}).get("案件名称"),
-            "生命周期": (data.get("案件基本信息") or {}).get("生命周期状态"),
-            "阶段": stage,
-            "任务": {s: sum(1 for t in data.get("任务") or [] if t.get("状态") == s) for s in TRI_STATE},
+            "案件": cid, "名称": sm["名称"],
+            "生命周期": sm["生命周期"],
+            "阶段": sm["阶段"],
+            "任务": sm["任务"],
             "临期期限": len(dl),
         })
     print(json.dumps(out, ensure_ascii=False, indent=2))
 
 
-def cmd_add_task(root, case_id, args):
+# ---------------------------------------------------------------------------
+# 库 API：写入操作（CLI 子命令与 case-dashboard server 共用；拒绝时抛 CaseStoreError）
+# 每个函数 = 一次 case_lock 内的 读-改-写，经 commit_write 落盘
+# ---------------------------------------------------------------------------
+def add_task(root, case_id, title, priority="medium", deadline=None, owner=None, desc=None, actor="ai"):
+    """新增任务，返回新 task_id。"""
     path = case_yaml_path(root, case_id)
     with case_lock(path):
         data = load_case(path)
         tasks = data.setdefault("任务", [])
         existing = {int(m.group(1)) for t in tasks if (m := re.match(r"^task_(\d+)$", str(t.get("id") or "")))}
         new_id = f"task_{max(existing, default=0) + 1:03d}"
-        if args.priority not in PRIORITY:
-            die(f"--priority 枚举非法（{PRIORITY}）")
-        if args.deadline and not DATE_RE.match(args.deadline):
-            die("--deadline 须 YYYY-MM-DD")
-        tasks.append({"id": new_id, "名称": args.title, "状态": "todo", "优先级": args.priority,
-                      "截止日期": args.deadline, "负责人": args.owner, "描述": args.desc or "",
-                      "source": args.actor})
-        commit_write(path, data, args.actor, "新增任务", f"{new_id} {args.title}")
-    print(f"✅ 已新增任务 {new_id}（source={args.actor}）")
-
-
-def cmd_set_status(root, case_id, args):
+        if priority not in PRIORITY:
+            raise CaseStoreError(f"--priority 枚举非法（{PRIORITY}）")
+        if deadline and not DATE_RE.match(deadline):
+            raise CaseStoreError("--deadline 须 YYYY-MM-DD")
+        tasks.append({"id": new_id, "名称": title, "状态": "todo", "优先级": priority,
+                      "截止日期": deadline, "负责人": owner, "描述": desc or "",
+                      "source": actor})
+        commit_write(path, data, actor, "新增任务", f"{new_id} {title}")
+    return new_id
+
+
+def set_statuses(root, case_id, changes, actor="ai", skip_unchanged=False):
+    """一次加锁读-改-写推进多个任务；changes 为 [(task_id, 状态)]，同一任务以最后一次为准。
+
+    任一条被拒（枚举非法/任务不存在/source 保护）则整批不写。返回 [(task_id, 原状态, 新状态)]；
+    skip_unchanged=True 时状态未变的条目不写更新历史，全部未变则不落盘。
+    """
+    final = dict(changes)
     path = case_yaml_path(root, case_id)
     with case_lock(path):
         data = load_case(path)
-        if args.status not in TRI_STATE:
-            die(f"状态枚举非法（{TRI_STATE}）")
-        task = next((t for t in data.get("任务") or [] if t.get("id") == args.task_id), None)
-        if not task:
-            die(f"未找到任务 {args.task_id}（show 可查全部 id）")
-        if task.get("source") == "user" and args.actor != "user":
-            die(f"任务 {args.task_id} 由律师手工创建（source=user），AI 不得改写；"
-                f"请律师经看板操作，或 --actor user 显式代行")
-        old = task.get("状态")
-        task["状态"] = args.status
-        commit_write(path, data, args.actor, "推进任务", f"{args.task_id} {task.get('名称')}: {old} → {args.status}")
-    print(f"✅ {args.task_id}: {old} → {args.status}")
+        tasks = {t.get("id"): t for t in data.get("任务") or []}
+        applied, history = [], []
+        for task_id, status in final.items():
+            if status not in TRI_STATE:
+                raise CaseStoreError(f"状态枚举非法（{TRI_STATE}）")
+            task = tasks.get(task_id)
+            if not task:
+                raise CaseStoreError(f"未找到任务 {task_id}（show 可查全部 id）")
+            if task.get("source") == "user" and actor != "user":
+                raise CaseStoreError(f"任务 {task_id} 由律师手工创建（source=user），AI 不得改写；"
+                                     f"请律师经看板操作，或 --actor user 显式代行")
+            old = task.get("状态")
+            applied.append((task_id, old, status))
+            if skip_unchanged and old == status:
+                continue
+            task["状态"] = status
+            history.append(("推进任务", f"{task_id} {task.get('名称')}: {old} → {status}"))
+        if history:
+            commit_write(path, data, actor, history)
+    return applied
 
 
-def cmd_add_deadline(root, case_id, args):
+def set_status(root, case_id, task_id, status, actor="ai"):
+    """推进单个任务，返回原状态。"""
+    (_, old, _), = set_statuses(root, case_id, [(task_id, status)], actor)
+    return old
+
+
+def add_deadline(root, case_id, name, end, dtype=None, days=None, start=None, basis=None, actor="ai"):
+    """登记法定期限，返回写入的期限行。"""
     path = case_yaml_path(root, case_id)
     with case_lock(path):
         data = load_case(path)
-        if not args.end or not DATE_RE.match(args.end):
-            die("--end 必填且须 YYYY-MM-DD")
-        dtype = args.type
+        if not end or not DATE_RE.match(end):
+            raise CaseStoreError("--end 必填且须 YYYY-MM-DD")
         if not dtype:
-            dtype = next((t for t in DL_TYPE if t in args.name), "其他")
+            dtype = next((t for t in DL_TYPE if t in name), "其他")
         if dtype not in DL_TYPE:
-            die(f"--type 枚举非法（{DL_TYPE}）")
-        if args.start and not DATE_RE.match(args.start):
-            die("--start 须 YYYY-MM-DD")
-        row = {"类型": dtype, "名称": args.name, "天数": args.days, "起算日期": args.start,
-               "截止日期": args.end, "状态": "todo", "法律依据": args.basis,
-               "抵消标记": None, "source": args.actor}
+            raise CaseStoreError(f"--type 枚举非法（{DL_TYPE}）")
+        if start and not DATE_RE.match(start):
+            raise CaseStoreError("--start 须 YYYY-MM-DD")
+        row = {"类型": dtype, "名称": name, "天数": days, "起算日期": start,
+               "截止日期": end, "状态": "todo", "法律依据": basis,
+               "抵消标记": None, "source": actor}
         data.setdefault("法定期限", []).append(row)
-        commit_write(path, data, args.actor, "登记期限", f"{dtype}|{args.name} 截止 {args.end}")
-    print(f"✅ 已登记期限 {args.name}（截止 {args.end}，剩余 {days_left(args.end)} 天）")
+        commit_write(path, data, actor, "登记期限", f"{dtype}|{name} 截止 {end}")
+    return row
 
 
-def cmd_set_stage(root, case_id, args):
+def set_stage(root, case_id, stage, lock=False, unlock=False, actor="ai"):
+    """更新程序阶段（unlock=True 时只解锁），返回原阶段。"""
     path = case_yaml_path(root, case_id)
     with case_lock(path):
         data = load_case(path)
         info = data.setdefault("案件基本信息", {})
-        if args.stage not in STAGE:
-            die(f"程序阶段枚举非法（{STAGE}）")
-        if args.unlock:
-            if args.actor != "user":
-                die("解锁程序阶段属律师操作（--actor user）")
-            info["程序阶段锁定"] = False
-            commit_write(path, data, args.actor, "解锁程序阶段", f"原阶段 {info.get('程序阶段')}")
-            print("✅ 已解锁程序阶段")
-            return
-        if info.get("程序阶段锁定") and args.actor != "user":
-            die("程序阶段已锁定，AI 不得改写（律师可用 --actor user --unlock 解锁）")
+        if stage not in STAGE:
+            raise CaseStoreError(f"程序阶段枚举非法（{STAGE}）")
         old = info.get("程序阶段")
-        info["程序阶段"] = args.stage
-        if args.lock:
-            if args.actor != "user":
-                die("加锁属律师操作（--actor user --lock）")
+        if unlock:
+            if actor != "user":
+                raise CaseStoreError("解锁程序阶段属律师操作（--actor user）")
+            info["程序阶段锁定"] = False
+            commit_write(path, data, actor, "解锁程序阶段", f"原阶段 {old}")
+            return old
+        if info.get("程序阶段锁定") and actor != "user":
+            raise CaseStoreError("程序阶段已锁定，AI 不得改写（律师可用 --actor user --unlock 解锁）")
+        info["程序阶段"] = stage
+        if lock:
+            if actor != "user":
+                raise CaseStoreError("加锁属律师操作（--actor user --lock）")
             info["程序阶段锁定"] = True
-        commit_write(path, data, args.actor, "更新程序阶段" + ("（锁定）" if args.lock else ""),
-                     f"{old} → {args.stage}")
+        commit_write(path, data, actor, "更新程序阶段" + ("（锁定）" if lock else ""), f"{old} → {stage}")
+    return old
+
+
+def set_fields(root, case_id, patch, actor="ai"):
+    """深合并 patch 进 case.yaml（列表字段整体替换）。"""
+    path = case_yaml_path(root, case_id)
+    with case_lock(path):
+        data = load_case(path)
+        if data.get("案件基本信息", {}).get("生命周期状态") == CLOSED and actor != "user":
+            if "生命周期状态" in json.dumps(patch, ensure_ascii=False):
+                raise CaseStoreError("生命周期状态=已结案 的变更属律师操作（--actor user）")
+        if data.get("案件基本信息", {}).get("程序阶段锁定") and actor != "user":
+            if "程序阶段锁定" in json.dumps(patch, ensure_ascii=False):
+                raise CaseStoreError("程序阶段已锁定，其变更属律师操作（--actor user）")
+        _deep_merge(data, patch)
+        commit_write(path, data, actor, "字段补充", f"set-fields 合并 {len(patch)} 个顶层键")
+
+
+def cmd_add_task(root, case_id, args):
+    new_id = add_task(root, case_id, args.title, args.priority, args.deadline, args.owner, args.desc, args.actor)
+    print(f"✅ 已新增任务 {new_id}（source={args.actor}）")
+
+
+def cmd_set_status(root, case_id, args):
+    old = set_status(root, case_id, args.task_id, args.status, args.actor)
+    print(f"✅ {args.task_id}: {old} → {args.status}")
+
+
+def cmd_add_deadline(root, case_id, args):
+    add_deadline(root, case_id, args.name, args.end, args.type, args.days, args.start, args.basis, args.actor)
+    print(f"✅ 已登记期限 {args.name}（截止 {args.end}，剩余 {days_left(args.end)} 天）")
+
+
+def cmd_set_stage(root, case_id, args):
+    old = set_stage(root, case_id, args.stage, args.lock, args.unlock, args.actor)
+    if args.unlock:
+        print("✅ 已解锁程序阶段")
+        return
     print(f"✅ 程序阶段: {old} → {args.stage}" + ("（已锁定）" if args.lock else ""))
 
 
@@ -880,25 +1272,55 @@ def _party_line(p):
     return " ".join(b for b in bits if b)
 
 
-def render_md(data, case_id):
-    meta = data.get("meta") or {}
-    info = data.get("案件基本信息") or {}
-    pa = data.get("当事人与代理") or {}
-    tasks = data.get("任务") or []
-    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-    L = []
-    L.append(f"# {info.get('案件名称') or meta.get('目录标识') or case_id}")
-    L.append("")
-    lock = " 🔒" if info.get("程序阶段锁定") else ""
-    L.append(f"> **{info.get('生命周期状态')}** · {info.get('程序阶段')}{lock} · {meta.get('业务领域')}／{info.get('案件类型') or '—'}　"
-             f"案号：{meta.get('法院案号') or '—'}　管辖：{info.get('管辖法院') or '—'}　标的额：{_fmt_amt(info.get('标的额'))}")
-    L.append("")
-    if info.get("标的额备注"):
-        L.append(f"> 标的额口径：{info['标的额备注']}")
-        L.append("")
-    L.append(f"**生成时间**：{now}　**唯一真源**：`case.yaml`（本文件为自动生成的派生视图，请勿手改）")
-    L.append("")
+_VIEW_MEMO_CASES = 64  # 进程内最多记忆的案件数（看板 server 等常驻写入方）
+
+
+def _digest(src):
+    """节源数据摘要（pickle 与 dict 插入顺序一致，同值同序即同摘要；异序只会多渲染一次）。"""
+    return hashlib.blake2b(pickle.dumps(src, protocol=4), digest_size=16).hexdigest()
+
 
+class ViewCache:
+    """单案视图片段的进程内记忆：(视图/节) → (源数据摘要, 片段)。
+
+    一次写入通常只改一两节（推进一个任务只动 任务 节），其余节直接复用上次片段；
+    依赖当天日期的节（期限剩余天数、本月工时）把 today() 计入摘要。
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def fragment(self, view, name, src, build):
+        key = f"{view}/{name}"
+        digest = _digest(src)
+        e = self.entries.get(key)
+        if e and e[0] == digest:
+            return e[1]
+        value = build()
+        self.entries[key] = (digest, value)
+        return value
+
+
+_VIEW_CACHES = {}
+
+
+def _view_cache(d00):
+    """按案件 00 目录取进程内片段缓存（超出 _VIEW_MEMO_CASES 时淘汰最久未用的案件）。"""
+    key = str(d00)
+    cache = _VIEW_CACHES.pop(key, None) or ViewCache()
+    _VIEW_CACHES[key] = cache
+    while len(_VIEW_CACHES) > _VIEW_MEMO_CASES:
+        del _VIEW_CACHES[next(iter(_VIEW_CACHES))]
+    return cache
+
+
+def _fresh(view, name, src, build):
+    """无缓存时的片段构建（render --stdout 等一次性渲染）。"""
+    return build()
+
+
+def _md_parties(pa):
+    L = []
     if pa.get("我方当事人") or pa.get("对方当事人") or pa.get("律师") or pa.get("其他诉讼参与人"):
         L.append("## 当事人与代理")
         L.append("")
@@ -910,7 +1332,11 @@ def render_md(data, case_id):
         for p in pa.get("其他诉讼参与人") or []:
             L.append(f"- **{p.get('角色')}** {p.get('姓名')}" + (f"——{p['备注']}" if p.get("备注") else ""))
         L.append("")
+    return L
 
+
+def _md_tasks(tasks):
+    L = []
     if tasks:
         cnt = {s: sum(1 for t in tasks if t.get("状态") == s) for s in TRI_STATE}
         L.append(f"## 任务（待办 {cnt['todo']} / 进行 {cnt['in_progress']} / 完成 {cnt['done']}）")
@@ -929,8 +1355,11 @@ def render_md(data, case_id):
                 seg.append(f"——{t['描述']}")
             L.append("- " + " ".join(seg))
         L.append("")
+    return L
 
-    dls = data.get("法定期限") or []
+
+def _md_deadlines(dls):
+    L = []
     if dls:
         L.append("## 法定期限")
         L.append("")
@@ -943,8 +1372,11 @@ def render_md(data, case_id):
                                                   (f"{dl} 天" if dl is not None else "—"))
             L.append(f"| {_DL_MARK[lvl]} {d.get('类型')} | {d.get('名称')} | {d.get('截止日期')} | {left} | {d.get('法律依据') or '—'} |")
         L.append("")
+    return L
 
-    hearings = data.get("开庭与听证") or []
+
+def _md_hearings(hearings):
+    L = []
     if hearings:
         L.append("## 开庭与听证")
         L.append("")
@@ -954,8 +1386,11 @@ def render_md(data, case_id):
             loc = " / ".join(str(x) for x in (h.get("地点"), h.get("法庭")) if x) or "—"
             L.append(f"| {h.get('日期')} | {h.get('类型')} | {h.get('事项')} | {loc} | {'已进行' if h.get('状态') == 'done' else '已排期'} |")
         L.append("")
+    return L
 
-    tl = data.get("案件时间线") or []
+
+def _md_timeline(tl):
+    L = []
     if tl:
         L.append("## 案件时间线")
         L.append("")
@@ -964,8 +1399,11 @@ def render_md(data, case_id):
         for e in sorted(tl, key=lambda x: str(x.get("日期")), reverse=True):
             L.append(f"| {e.get('日期')} | {e.get('事件类型')} | {e.get('事项')} | {'✅' if e.get('状态') == 'done' else '⏳'} |")
         L.append("")
+    return L
 
-    ev = data.get("证据索引") or []
+
+def _md_evidence(ev):
+    L = []
     if ev:
         L.append("## 证据索引")
         L.append("")
@@ -974,8 +1412,11 @@ def render_md(data, case_id):
         for e in ev:
             L.append(f"| {e.get('名称')} | {e.get('类型')} | {e.get('证明目的') or '—'} | {'已收集' if e.get('状态') == 'done' else '待收集'} | {e.get('取证方式') or '—'} |")
         L.append("")
+    return L
 
-    fees = data.get("费用信息") or {}
+
+def _md_fees(fees):
+    L = []
     pay = fees.get("支出") or {}
     claims = fees.get("索赔与评估") or []
     if any((pay.get(k) or {}).get("金额") is not None for k in pay) or claims:
@@ -990,10 +1431,14 @@ def render_md(data, case_id):
         for c in claims:
             L.append(f"| 索赔：{c.get('项目')} | {_fmt_amt(c.get('金额'))} | {c.get('计算方式') or '—'} |")
         L.append("")
+    return L
+
 
+def _md_related(related, instances):
+    L = []
     for title, key, cols in (("关联案件", "关联案件", ("关系", "案号或目录", "说明")),
                              ("审级记录", "审级记录", ("审级", "法院案号", "承办法官", "结案"))):
-        rows = info.get(key) if key == "关联案件" else data.get(key)
+        rows = related if key == "关联案件" else instances
         rows = rows or []
         if rows:
             L.append(f"## {title}")
@@ -1007,8 +1452,11 @@ def render_md(data, case_id):
                 else:
                     L.append(f"| {r.get('关系')} | {r.get('案号或目录')} | {r.get('说明') or '—'} |")
             L.append("")
+    return L
 
-    fr = data.get("争议焦点与法律研究") or {}
+
+def _md_research(fr):
+    L = []
     if fr.get("争议焦点") or fr.get("法律研究"):
         L.append("## 争议焦点与法律研究")
         L.append("")
@@ -1018,11 +1466,14 @@ def render_md(data, case_id):
         for r in fr.get("法律研究") or []:
             L.append(f"- 法律研究：**{r.get('主题')}**（{st.get(r.get('状态'), '')}）")
         L.append("")
+    return L
 
-    wh = data.get("工时统计") or {}
+
+def _md_worklog(wh):
+    L = []
     wl = wh.get("工作记录") or []
     if wl:
-        month = TODAY.strftime("%Y-%m")
+        month = today().strftime("%Y-%m")
         msum = round(sum(float(r.get("时长") or 0) for r in wl if str(r.get("日期", "")).startswith(month)), 2)
         L.append(f"## 工时（累计 {wh.get('总工时', 0)}h · 本月 {msum}h · {len(wl)} 条记录）")
         L.append("")
@@ -1039,30 +1490,68 @@ def render_md(data, case_id):
             h = f"{r['时长']}h" if r.get("时长") is not None else "⏳待补"
             L.append(f"| {r.get('日期')} | {h} | {r.get('内容')} | {'·'.join(rel) or '—'} |")
         L.append("")
+    return L
 
-    L.append("---")
-    L.append(f"*case_store render · {now} · 任务/期限变更请经 /progress 命令或看板操作*")
-    return "\n".join(L) + "\n"
-
-
-def render_html(data, case_id):
-    e = lambda s: _html.escape(str(s if s is not None else "—"))
-
-    def table(headers, rows):
-        if not rows:
-            return ""
-        h = "".join(f"<th>{x}</th>" for x in headers)
-        b = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in r) + "</tr>" for r in rows)
-        return f"<table><thead><tr>{h}</tr></thead><tbody>{b}</tbody></table>"
 
+def render_md(data, case_id, cache=None):
+    """案件视图.md；传入 ViewCache 时各节按源数据摘要复用上次片段（页眉/页脚含生成时间，总是重建）。"""
+    frag = cache.fragment if cache else _fresh
     meta = data.get("meta") or {}
     info = data.get("案件基本信息") or {}
     pa = data.get("当事人与代理") or {}
     tasks = data.get("任务") or []
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-    name = info.get("案件名称") or case_id
+    L = []
+    L.append(f"# {info.get('案件名称') or meta.get('目录标识') or case_id}")
+    L.append("")
+    lock = " 🔒" if info.get("程序阶段锁定") else ""
+    L.append(f"> **{info.get('生命周期状态')}** · {info.get('程序阶段')}{lock} · {meta.get('业务领域')}／{info.get('案件类型') or '—'}　"
+             f"案号：{meta.get('法院案号') or '—'}　管辖：{info.get('管辖法院') or '—'}　标的额：{_fmt_amt(info.get('标的额'))}")
+    L.append("")
+    if info.get("标的额备注"):
+        L.append(f"> 标的额口径：{info['标的额备注']}")
+        L.append("")
+    L.append(f"**生成时间**：{now}　**唯一真源**：`case.yaml`（本文件为自动生成的派生视图，请勿手改）")
+    L.append("")
+
+    dls = data.get("法定期限") or []
+    hearings = data.get("开庭与听证") or []
+    tl = data.get("案件时间线") or []
+    ev = data.get("证据索引") or []
+    fees = data.get("费用信息") or {}
+    related, instances = info.get("关联案件"), data.get("审级记录")
+    fr = data.get("争议焦点与法律研究") or {}
+    wh = data.get("工时统计") or {}
+    body = [frag("md", name, src, lambda build=build, args=args: "\n".join(build(*args)))
+            for name, src, build, args in (
+                ("当事人与代理", pa, _md_parties, (pa,)),
+                ("任务", tasks, _md_tasks, (tasks,)),
+                ("法定期限", (dls, today()), _md_deadlines, (dls,)),
+                ("开庭与听证", hearings, _md_hearings, (hearings,)),
+                ("案件时间线", tl, _md_timeline, (tl,)),
+                ("证据索引", ev, _md_evidence, (ev,)),
+                ("费用", fees, _md_fees, (fees,)),
+                ("关联与审级", (related, instances), _md_related, (related, instances)),
+                ("争议焦点与法律研究", fr, _md_research, (fr,)),
+                ("工时", (wh, today()), _md_worklog, (wh,)))]
+    tail = ["---", f"*case_store render · {now} · 任务/期限变更请经 /progress 命令或看板操作*"]
+    # 各节片段为其行以 \n 连接的文本（空节为空串，跳过），与逐行拼接结果一致
+    return "\n".join(["\n".join(L), *(b for b in body if b), "\n".join(tail)]) + "\n"
+
+
+def _esc(s):
+    return _html.escape(str(s if s is not None else "—"))
+
+
+def _html_table(headers, rows):
+    if not rows:
+        return ""
+    h = "".join(f"<th>{x}</th>" for x in headers)
+    b = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in r) + "</tr>" for r in rows)
+    return f"<table><thead><tr>{h}</tr></thead><tbody>{b}</tbody></table>"
+
 
-    _CSS = """
+_VIEW_CSS = """
 body{font-family:-apple-system,'PingFang SC','Hiragino Sans GB','Microsoft YaHei',sans-serif;margin:0;background:#f4f1ea;color:#26211a}
 .topbar{position:sticky;top:0;z-index:9;background:rgba(255,253,248,.96);backdrop-filter:blur(6px);border-bottom:1px solid #e3dcc9;box-shadow:0 1px 10px rgba(90,70,20,.06)}
 .topbar-in{max-width:980px;margin:0 auto;padding:14px 24px 0}
@@ -1123,12 +1612,10 @@ tr:hover td{background:#faf6ea}
 @media print{nav{display:none}section{display:block!important;page-break-inside:avoid}.topbar{position:static}}
 """
 
-    life = info.get("生命周期状态") or "进行中"
-    bcls = "b-done" if life == "已结案" else ("b-talk" if life == "委托洽谈" else "b-run")
-    lock = ' <span class="lock">🔒 已锁定</span>' if info.get("程序阶段锁定") else ""
-    amt = "—" if info.get("标的额") is None else f"{info['标的额']:,.2f} 元"
 
-    # ---------- 页签1 概览 ----------
+def _html_overview(meta, info, pa, inst, fr):
+    e = _esc
+    amt = "—" if info.get("标的额") is None else f"{info['标的额']:,.2f} 元"
     ov = ['<div class="card"><h3>基本信息</h3><div class="grid">']
     for k, v in (("案号", meta.get("法院案号")), ("管辖法院", info.get("管辖法院")), ("标的额", amt),
                  ("律所案号", meta.get("律所案号")), ("律所立案", info.get("律所立案日期")),
@@ -1145,7 +1632,6 @@ tr:hover td{background:#faf6ea}
     if people:
         ov.append('<div class="card"><h3>当事人与代理</h3><ul class="people">' +
                   "".join(f'<li><span class="tag">{e(a)}</span>{e(b)}</li>' for a, b in people) + "</ul></div>")
-    inst = data.get("审级记录") or []
     if inst:
         rows = "".join(f"<tr><td>{e(r.get('审级'))}</td><td>{e(r.get('法院案号'))}</td><td>{e(r.get('承办法官'))}</td>"
                        f"<td>{e(r.get('立案日期'))}</td><td>{e(r.get('结案日期'))}（{e(r.get('结案方式'))}）</td></tr>"
@@ -1157,7 +1643,6 @@ tr:hover td{background:#faf6ea}
         ov.append('<div class="card"><h3>关联案件</h3><ul class="people">' +
                   "".join(f'<li><span class="tag">{e(r.get("关系"))}</span>{e(r.get("案号或目录"))}'
                           f'{"——" + e(r.get("说明")) if r.get("说明") else ""}</li>' for r in rel) + "</ul></div>")
-    fr = data.get("争议焦点与法律研究") or {}
     st = {"todo": "待识别", "in_progress": "分析中", "done": "已分析"}
     if fr.get("争议焦点") or fr.get("法律研究"):
         lis = "".join(f'<li><span class="tag">争议焦点</span>{e(f.get("名称"))}（{st.get(f.get("状态"), "")}）</li>'
@@ -1165,8 +1650,11 @@ tr:hover td{background:#faf6ea}
         lis += "".join(f'<li><span class="tag">法律研究</span>{e(r.get("主题"))}（{st.get(r.get("状态"), "")}）</li>'
                        for r in fr.get("法律研究") or [])
         ov.append('<div class="card"><h3>争议焦点与法律研究</h3><ul class="people">' + lis + "</ul></div>")
+    return "".join(ov)
 
-    # ---------- 页签2 任务看板 ----------
+
+def _html_tasks(tasks):
+    e = _esc
     tk = []
     if tasks:
         cnt = {s: sum(1 for t in tasks if t.get("状态") == s) for s in TRI_STATE}
@@ -1193,10 +1681,12 @@ tr:hover td{background:#faf6ea}
         tk.append("</div>")
     else:
         tk.append('<div class="card">暂无任务</div>')
+    return "".join(tk)
+
 
-    # ---------- 页签3 期限与开庭 ----------
+def _html_deadlines(dls, hearings):
+    e = _esc
     dl_html = []
-    dls = data.get("法定期限") or []
     if dls:
         dl_html.append('<div class="card"><h3>法定期限</h3><div class="dl-wrap">')
         for d in dls:
@@ -1217,7 +1707,6 @@ tr:hover td{background:#faf6ea}
                 f'<div class="dm">{e(d.get("类型"))} · 截止 {e(d.get("截止日期"))}'
                 + (f' · 起算 {e(d.get("起算日期"))}' if d.get("起算日期") else "") + '</div>' + basis + "</div></div>")
         dl_html.append("</div></div>")
-    hearings = data.get("开庭与听证") or []
     if hearings:
         rows = "".join(
             f"<tr><td><b>{e(h.get('日期'))}</b></td><td>{e(h.get('类型'))}</td><td>{e(h.get('事项'))}</td>"
@@ -1228,9 +1717,12 @@ tr:hover td{background:#faf6ea}
                        '<th>地点/法庭</th><th>状态</th></tr>' + rows + "</table></div>")
     if not dl_html:
         dl_html.append('<div class="card">暂无期限与开庭记录</div>')
+    return "".join(dl_html)
+
 
-    # ---------- 页签4 时间线 ----------
-    tl = sorted(data.get("案件时间线") or [], key=lambda x: str(x.get("日期")), reverse=True)
+def _html_timeline(tl):
+    e = _esc
+    tl = sorted(tl, key=lambda x: str(x.get("日期")), reverse=True)
     tl_html = ['<div class="card"><div class="tl">']
     for ev in tl:
         done = ev.get("状态") == "done"
@@ -1241,17 +1733,32 @@ tr:hover td{background:#faf6ea}
         tl_html.append("</div></div>")
     else:
         tl_html = ['<div class="card">暂无时间线</div>']
+    return "".join(tl_html)
 
-    # ---------- 页签5 证据与费用 ----------
+
+def _html_worklog(wh):
+    e = _esc
+    wl = wh.get("工作记录") or []
+    if not wl:
+        return '<div class="card">暂无工时记录（log-work 命令录入）</div>'
+    rows = [(e(r.get("日期")), f"{e(r.get('时长') if r.get('时长') is not None else '⏳待补')}{'h' if r.get('时长') is not None else ''}", e(r.get("内容")),
+             e("·".join(str(x) for x in (r.get("律师"), r.get("关联任务"),
+                 str(r.get("关联文件")).split("/")[-1] if r.get("关联文件") else None) if x) or "—"))
+            for r in sorted(wl, key=lambda x: str(x.get("日期")), reverse=True)]
+    return (f'<div class="card"><h3>工时</h3>'
+            f'<p class="meta" style="margin:0 0 8px">累计 <b>{e(wh.get("总工时"))}</b> 小时 · {len(wl)} 条记录</p>'
+            + _html_table(("日期", "时长", "工作内容", "关联"), rows) + "</div>")
+
+
+def _html_evidence_fees(evd, fees, total_hours):
+    e = _esc
     ef = []
-    evd = data.get("证据索引") or []
     if evd:
         rows = "".join(f"<tr><td>{e(x.get('名称'))}</td><td>{e(x.get('类型'))}</td><td>{e(x.get('证明目的'))}</td>"
                        f"<td>{'已收集' if x.get('状态') == 'done' else '待收集'}</td><td>{e(x.get('取证方式'))}</td></tr>"
                        for x in evd)
         ef.append('<div class="card"><h3>证据索引</h3><table><tr><th>名称</th><th>类型</th><th>证明目的</th>'
                   '<th>状态</th><th>取证</th></tr>' + rows + "</table></div>")
-    fees = data.get("费用信息") or {}
     pay, claims = fees.get("支出") or {}, fees.get("索赔与评估") or []
     frows = "".join(
         f"<tr><td>{e(k)}{('（' + e(v.get('计费方式')) + '）') if v.get('计费方式') else ''}</td>"
@@ -1262,30 +1769,49 @@ tr:hover td{background:#faf6ea}
     if frows:
         ef.append('<div class="card"><h3>费用</h3><table><tr><th>类别</th><th>金额</th><th>状态/口径</th></tr>'
                   + frows + "</table></div>")
-    wh = data.get("工时统计") or {}
-    if wh.get("总工时"):
-        ef.append(f'<div class="card"><h3>工时</h3>累计 {e(wh.get("总工时"))} 小时（明细见工时记录.md）</div>')
+    if total_hours:
+        ef.append(f'<div class="card"><h3>工时</h3>累计 {e(total_hours)} 小时（明细见工时记录.md）</div>')
     if not ef:
         ef.append('<div class="card">暂无证据与费用记录</div>')
+    return "".join(ef)
+
+
+def render_html(data, case_id, cache=None):
+    """案件视图.html（六个页签）；传入 ViewCache 时各页签正文按源数据摘要复用（顶栏含生成时间，总是重建）。"""
+    frag = cache.fragment if cache else _fresh
+    e = _esc
+    meta = data.get("meta") or {}
+    info = data.get("案件基本信息") or {}
+    pa = data.get("当事人与代理") or {}
+    tasks = data.get("任务") or []
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    name = info.get("案件名称") or case_id
 
+    life = info.get("生命周期状态") or "进行中"
+    bcls = "b-done" if life == "已结案" else ("b-talk" if life == "委托洽谈" else "b-run")
+    lock = ' <span class="lock">🔒 已锁定</span>' if info.get("程序阶段锁定") else ""
+
+    inst = data.get("审级记录") or []
+    fr = data.get("争议焦点与法律研究") or {}
+    dls = data.get("法定期限") or []
+    hearings = data.get("开庭与听证") or []
+    tl = data.get("案件时间线") or []
+    evd = data.get("证据索引") or []
+    fees = data.get("费用信息") or {}
+    claims = fees.get("索赔与评估") or []
     wh = data.get("工时统计") or {}
     wl = wh.get("工作记录") or []
-    wl_html = ""
-    if wl:
-        rows = [(e(r.get("日期")), f"{e(r.get('时长') if r.get('时长') is not None else '⏳待补')}{'h' if r.get('时长') is not None else ''}", e(r.get("内容")),
-                 e("·".join(str(x) for x in (r.get("律师"), r.get("关联任务"),
-                     str(r.get("关联文件")).split("/")[-1] if r.get("关联文件") else None) if x) or "—"))
-                for r in sorted(wl, key=lambda x: str(x.get("日期")), reverse=True)]
-        wl_html = (f'<div class="card"><h3>工时</h3>'
-                   f'<p class="meta" style="margin:0 0 8px">累计 <b>{e(wh.get("总工时"))}</b> 小时 · {len(wl)} 条记录</p>'
-                   + table(("日期", "时长", "工作内容", "关联"), rows) + "</div>")
-
-    tabs = [("ov", "概览", "", "".join(ov)),
-            ("tasks", "任务", str(len(tasks)), "".join(tk)),
-            ("dl", "期限与开庭", str(len(dls) + len(hearings)), "".join(dl_html)),
-            ("tl", "时间线", str(len(tl)), "".join(tl_html)),
-            ("wl", "工时", str(len(wl)), wl_html or '<div class="card">暂无工时记录（log-work 命令录入）</div>'),
-            ("ef", "证据与费用", str(len(evd) + len(claims)), "".join(ef))]
+
+    tabs = [("ov", "概览", "", frag("html", "概览", (meta, info, pa, inst, fr),
+                                    lambda: _html_overview(meta, info, pa, inst, fr))),
+            ("tasks", "任务", str(len(tasks)), frag("html", "任务", tasks, lambda: _html_tasks(tasks))),
+            ("dl", "期限与开庭", str(len(dls) + len(hearings)),
+             frag("html", "期限与开庭", (dls, hearings, today()), lambda: _html_deadlines(dls, hearings))),
+            ("tl", "时间线", str(len(tl)), frag("html", "时间线", tl, lambda: _html_timeline(tl))),
+            ("wl", "工时", str(len(wl)), frag("html", "工时", wh, lambda: _html_worklog(wh))),
+            ("ef", "证据与费用", str(len(evd) + len(claims)),
+             frag("html", "证据与费用", (evd, fees, wh.get("总工时")),
+                  lambda: _html_evidence_fees(evd, fees, wh.get("总工时"))))]
     nav = "".join(f'<button data-t="{tid}" class="{"on" if i == 0 else ""}">{label}'
                   + (f'<span class="n">{n}</span>' if n and n != "0" else "") + "</button>"
                   for i, (tid, label, n, _) in enumerate(tabs))
@@ -1294,7 +1820,7 @@ tr:hover td{background:#faf6ea}
 
     _HEAD = f"""<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
-<title>{e(name)} · 案件视图</title><style>{_CSS}</style></head><body>
+<title>{e(name)} · 案件视图</title><style>{_VIEW_CSS}</style></head><body>
 <div class="topbar"><div class="topbar-in">
 <div class="tb-row"><span class="tb-name">{e(name)}</span>
 <span class="badge {bcls}">{e(life)}</span>
@@ -1318,14 +1844,17 @@ document.querySelectorAll('nav button').forEach(function(b){
 
 
 def _refresh_views(path, data, case_id):
-    """commit_write 后刷新已存在的视图文件（不主动创建）。"""
+    """commit_write 后刷新已存在的视图文件（不主动创建）；同一进程内未变动的节复用上次片段。"""
     d00 = path.parent
     md_p, html_p = d00 / "案件视图.md", d00 / "案件视图.html"
     try:
+        if not (md_p.exists() or html_p.exists()):
+            return
+        cache = _view_cache(d00)
         if md_p.exists():
-            md_p.write_text(render_md(data, case_id), encoding="utf-8")
+            md_p.write_text(render_md(data, case_id, cache), encoding="utf-8")
         if html_p.exists():
-            html_p.write_text(render_html(data, case_id), encoding="utf-8")
+            html_p.write_text(render_html(data, case_id, cache), encoding="utf-8")
     except Exception as e:  # noqa: BLE001
         print(f"⚠️ 视图刷新失败（不影响写入）：{e}", file=sys.stderr)
 
@@ -1333,23 +1862,19 @@ def _refresh_views(path, data, case_id):
 def cmd_report(root, case_id, args):
     """期限预警摘要（SessionStart 注入用；单行紧凑输出）。"""
     rows = []
-    for cid, d in sorted(case_dirs(root).items()):
-        matches = sorted(d.glob(CASE_YAML_GLOB))
-        if not matches:
-            continue
-        try:
-            data = load_case(matches[0])
-        except SystemExit:
+    for cid, e in sorted(CaseRegistry(root).sync().entries.items()):
+        if "摘要" not in e:  # 未迁移或解析失败：跳过
             continue
-        if (data.get("案件基本信息") or {}).get("生命周期状态") == CLOSED:
+        data = e["摘要"]
+        if data["生命周期"] == CLOSED:
             continue
-        for dl_ in data.get("法定期限") or []:
+        for dl_ in data["法定期限"]:
             if dl_.get("抵消标记") or dl_.get("状态") == "done":
                 continue
             n = days_left(dl_.get("截止日期"))
             if n is not None and n <= args.days:
                 rows.append((n, cid, dl_.get("名称")))
-        for h in data.get("开庭与听证") or []:
+        for h in data["开庭与听证"]:
             if h.get("状态") == "done":
                 continue
             n = days_left(h.get("日期"))
@@ -1368,22 +1893,38 @@ def cmd_report(root, case_id, args):
         print(f"  … 另有 {len(rows) - 12} 项")
 
 
-def cmd_render(root, case_id, args):
-    path = case_yaml_path(root, case_id)
-    data = load_case(path)
-    d00 = path.parent
-    if args.stdout:
-        print(render_md(data, case_id), end="")
-        return
-    fmt = args.format
+def _render_case(cid, ypath, fmt):
+    """单案渲染（可在子进程运行）：写 00 目录视图文件，返回写出的文件名。"""
+    data = load_case(ypath)
+    d00 = ypath.parent
     wrote = []
     if fmt in ("md", "both"):
-        (d00 / "案件视图.md").write_text(render_md(data, case_id), encoding="utf-8")
+        (d00 / "案件视图.md").write_text(render_md(data, cid), encoding="utf-8")
         wrote.append("案件视图.md")
     if fmt in ("html", "both"):
-        (d00 / "案件视图.html").write_text(render_html(data, case_id), encoding="utf-8")
+        (d00 / "案件视图.html").write_text(render_html(data, cid), encoding="utf-8")
         wrote.append("案件视图.html")
-    print(f"✅ 已生成 {' 与 '.join(wrote)}（{d00}）；此后每次写入将自动刷新已存在的视图")
+    return wrote
+
+
+def cmd_render(root, case_id, args):
+    if case_id is None:  # 批量：全部已迁移案件经进程池并行渲染，按案件顺序汇报
+        if args.stdout:
+            raise CaseStoreError("--stdout 需指定案件短码")
+        targets = [(cid, path) for cid, e in CaseRegistry(root).sync().items()
+                   if e.get("yaml") and (path := root / e["yaml"]).is_file()]
+        results = _map_cases(_render_case, [(cid, path, args.format) for cid, path in targets],
+                             _jobs(args, len(targets)))
+        for (cid, _), wrote in zip(targets, results):
+            print(f"  · [{cid}] {' 与 '.join(wrote)}")
+        print(f"✅ 已渲染 {len(targets)} 个案件的视图；此后每次写入将自动刷新已存在的视图")
+        return
+    path = case_yaml_path(root, case_id)
+    if args.stdout:
+        print(render_md(load_case(path), case_id), end="")
+        return
+    wrote = _render_case(case_id, path, args.format)
+    print(f"✅ 已生成 {' 与 '.join(wrote)}（{path.parent}）；此后每次写入将自动刷新已存在的视图")
 
 
 WORK_FLOORS = {"文书": 1.0, "研究": 1.0, "核查": 0.5, "沟通": 0.5, "出庭": 2.0, "整理": 0.5, "其他": 0.5}
@@ -1425,7 +1966,7 @@ def cmd_log_work(root, case_id, args):
             die("时长须为数字（如 1.5）、auto（按类型下限）或 ?（待补录）")
         if hours <= 0 or hours > 24:
             die("时长须在 (0, 24] 小时")
-    date = args.date or TODAY.isoformat()
+    date = args.date or today().isoformat()
     if not DATE_RE.match(date):
         die("--date 须 YYYY-MM-DD")
     path = case_yaml_path(root, case_id)
@@ -1481,10 +2022,92 @@ def _pdf_text(path):
     return r.stdout
 
 
-def _extract_one_doc(path, want):
+# ---------------------------------------------------------------------------
+# 单案文书文本缓存：00 目录下 .text_cache.json（相对路径 → [size, mtime_ns] + pdftotext 文本或失败原因）
+# 夜间全所回扫不再对同一批法院 PDF 反复 pdftotext；文件改动/删除即失效。运行时文件，可随时删除。
+# ---------------------------------------------------------------------------
+TEXT_CACHE_NAME = ".text_cache.json"
+TEXT_CACHE_VERSION = 1
+
+
+class TextCache:
+    def __init__(self, cdir):
+        self.cdir = cdir
+        self.path = cdir / "00 - 📅 日程管理" / TEXT_CACHE_NAME
+        self.entries, self.used, self.dirty = {}, set(), False
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(raw, dict) and raw.get("版本") == TEXT_CACHE_VERSION and isinstance(raw.get("文件"), dict):
+            self.entries = raw["文件"]
+
+    def text(self, path):
+        """pdftotext 文本（命中缓存则不起子进程）；无文本层等 pdftotext 失败同样缓存并照原样抛出。"""
+        rel = path.relative_to(self.cdir).as_posix()
+        st = path.stat()
+        key = [st.st_size, st.st_mtime_ns]
+        self.used.add(rel)
+        e = self.entries.get(rel)
+        if e and e.get("key") == key:
+            if "error" in e:
+                raise RuntimeError(e["error"])
+            return e["text"]
+        try:
+            text = _pdf_text(path)
+        except RuntimeError as ex:  # pdftotext 非零退出：文件不变结果就不变（缺工具/超时不缓存）
+            self.entries[rel] = {"key": key, "error": str(ex)}
+            self.dirty = True
+            raise
+        self.entries[rel] = {"key": key, "text": text}
+        self.dirty = True
+        return text
+
+    def save(self):
+        """落盘（剔除本次未再出现的文件条目）；00 目录不存在或不可写时静默跳过。"""
+        stale = self.entries.keys() - self.used
+        if not (self.dirty or stale) or not self.path.parent.is_dir():
+            return
+        for rel in stale:
+            del self.entries[rel]
+        fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=TEXT_CACHE_NAME + ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                json.dump({"版本": TEXT_CACHE_VERSION, "文件": self.entries}, out, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _jobs(args, n):
+    """跨案件并行的进程数：--jobs 显式指定，否则 min(CPU 数, 案件数, 8)。"""
+    jobs = getattr(args, "jobs", None) or min(os.cpu_count() or 1, 8)
+    return max(1, min(jobs, n))
+
+
+def _map_cases(fn, items, jobs):
+    """按 items 顺序惰性产出 fn(*item)；jobs>1 时用进程池（各案只读分析互不依赖），不可用时退回串行。"""
+    if jobs <= 1 or len(items) <= 1:
+        return (fn(*item) for item in items)
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+    except (OSError, NotImplementedError):
+        return (fn(*item) for item in items)
+
+    def _gen():
+        with pool:
+            yield from pool.map(fn, *zip(*items))
+    return _gen()
+
+
+def _extract_one_doc(path, want, cache=None):
     """从一份 PDF（08 法院送达/06 文书等）抽取案号/立案日/开庭日/法庭/案由（返回 dict，conf 0-1）。"""
     try:
-        text = _pdf_text(path)
+        text = cache.text(path) if cache else _pdf_text(path)
     except Exception as e:  # noqa: BLE001
         return {"error": f"无法解析（{e}）", "_path": str(path)}
     out = {"_path": str(path), "_length": len(text)}
@@ -1520,41 +2143,22 @@ def cmd_extract(root, case_id, args):
     --apply 采信高置信（>=0.85）自动落盘；低置信列待确认。
     """
     targets = [(case_id, case_dirs(root)[case_id])] if case_id else sorted(case_dirs(root).items())
+    present = [(cdir, args.field) for _, cdir in targets if (cdir / "00 - 📅 日程管理" / "case.yaml").exists()]
+    results = _map_cases(_extract_findings, present, _jobs(args, len(present)))
     for cid, cdir in targets:
         ypath = cdir / "00 - 📅 日程管理" / "case.yaml"
         if not ypath.exists():
             print(f"· [{cid}] 无 case.yaml（迁移后未生成）")
             continue
-        data = load_case(ypath)
-        # 优先 08 法院送达（案号/立案日/开庭），其次 06 法律文书（案由）
-        scans = []
-        for sub in sorted(cdir.iterdir()):
-            m = re.match(r"^0[68] - ", sub.name)
-            if m and sub.is_dir():
-                for f in sub.rglob("*.pdf"):
-                    if f.is_file() and f.suffix.lower() == ".pdf" and ".legacy" not in f.name:
-                        scans.append(f)
-        if not scans:
+        n_scans, findings = next(results)
+        if not n_scans:
             print(f"· [{cid}] 08/06 目录无 PDF，跳过")
             continue
-        # 汇总各 PDF 抽取（按优先级：08 优先 06）
-        findings = {}  # field → {value, conf, sources}
-        for f in scans:
-            r = _extract_one_doc(f, args.field)
-            if "error" in r:
-                continue
-            for k, v in list(r.items()):
-                if k.startswith("_") or not isinstance(v, str) or not v:
-                    continue
-                conf = r.get(f"_{k}_conf", 0.5)
-                cur = findings.get(k)
-                if not cur or conf > cur["conf"]:
-                    findings[k] = {"value": v, "conf": conf, "_path": str(f.relative_to(cdir))}
         if not findings:
             print(f"· [{cid}] 抽取失败（PDF 多为扫描件，pdftotext 无文本层；建议 /progress 让主 Agent 视觉读）")
             continue
         # 输出报告
-        print(f"\n=== {cid} 文书内容抽取报告（扫了 {len(scans)} 份 PDF）===")
+        print(f"\n=== {cid} 文书内容抽取报告（扫了 {n_scans} 份 PDF）===")
         auto_updates, confirm_updates = {}, {}
         for f in ["医院案号", "医院立案日期", "开庭日", "开庭法院"]:
             if f in findings:
@@ -1591,12 +2195,44 @@ def cmd_extract(root, case_id, args):
             if applied:
                 data.setdefault("同步", {})["最后同步时间"] = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
                 data.setdefault("更新历史", []).append({
-                    "日期": TODAY.isoformat(), "操作者": "case_store", "动作": "文书抽取",
+                    "日期": today().isoformat(), "操作者": "case_store", "动作": "文书抽取",
                     "细节": f"pdftotext 抽取: {'; '.join(applied[:6])}" + (" 等更多" if len(applied) > 6 else "")})
                 commit_write(ypath, data, "ai", "文书抽取", f"采信 {len(applied)} 项")
                 print(f"  → 已落盘 {len(applied)} 项")
 
 
+def _extract_findings(cdir, field):
+    """单案只读抽取（可在子进程运行）：08/06 目录 PDF 逐份抽取后按置信度汇总，文本经 TextCache。
+    返回 (PDF 份数, findings)；findings: 字段 → {value, conf, _path}。"""
+    load_case(cdir / "00 - 📅 日程管理" / "case.yaml")  # 档案损坏时与串行版一样报错
+    # 优先 08 法院送达（案号/立案日/开庭），其次 06 法律文书（案由）
+    scans = []
+    for sub in sorted(cdir.iterdir()):
+        m = re.match(r"^0[68] - ", sub.name)
+        if m and sub.is_dir():
+            for f in sub.rglob("*.pdf"):
+                if f.is_file() and f.suffix.lower() == ".pdf" and ".legacy" not in f.name:
+                    scans.append(f)
+    if not scans:
+        return 0, {}
+    cache = TextCache(cdir)
+    # 汇总各 PDF 抽取（按优先级：08 优先 06）
+    findings = {}  # field → {value, conf, sources}
+    for f in scans:
+        r = _extract_one_doc(f, field, cache)
+        if "error" in r:
+            continue
+        for k, v in list(r.items()):
+            if k.startswith("_") or not isinstance(v, str) or not v:
+                continue
+            conf = r.get(f"_{k}_conf", 0.5)
+            cur = findings.get(k)
+            if not cur or conf > cur["conf"]:
+                findings[k] = {"value": v, "conf": conf, "_path": str(f.relative_to(cdir))}
+    cache.save()
+    return len(scans), findings
+
+
 def cmd_backfill_work(root, case_id, args):
     """按案件目录中已有工作产物倒推工时：日期×类型分组（文件名日期前缀优先，否则 mtime），
     同组多件合并为一条（大批量取证翻倍封顶）。默认 dry-run，--apply 落盘。"""
@@ -1649,7 +2285,7 @@ def cmd_backfill_work(root, case_id, args):
             wl.extend(recs)
             ws["总工时"] = round(sum(float(r["时长"]) for r in wl if r.get("时长") is not None), 2)
             data.setdefault("更新历史", []).append({
-                "日期": TODAY.isoformat(), "操作者": "case_store", "动作": "工时回补",
+                "日期": today().isoformat(), "操作者": "case_store", "动作": "工时回补",
                 "细节": f"按目录工作产物倒推 {len(recs)} 组 +{round(total_add, 1)}h（dry-run 复核后落盘）"})
             commit_write(ypath, data, "ai", "工时回补", f"{len(recs)} 组 +{round(total_add, 1)}h")
 
@@ -1660,13 +2296,14 @@ def cmd_scan(root, case_id, args):
     干湿分离：仅产出报告与建议，不主动落盘，确保数据安全。
     """
     targets = [(case_id, case_dirs(root)[case_id])] if case_id else sorted(case_dirs(root).items())
+    present = [(cid, cdir) for cid, cdir in targets if (cdir / "00 - 📅 日程管理" / "case.yaml").exists()]
+    reports = _map_cases(_scan_case, present, _jobs(args, len(present)))
     for cid, cdir in targets:
         ypath = cdir / "00 - 📅 日程管理" / "case.yaml"
         if not ypath.exists():
             print(f"· [{cid}] 无 case.yaml（迁移后未生成）")
             continue
-        data = load_case(ypath)
-        report = scan_one(cid, cdir, data)
+        report = next(reports)
         print(format_report(cid, report))
         if args.apply and (report.get("auto_updates") or report.get("confirm_updates")):
             with case_lock(ypath):
@@ -1679,12 +2316,17 @@ def cmd_scan(root, case_id, args):
                 if applied:
                     data.setdefault("同步", {})["最后同步时间"] = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
                     data.setdefault("更新历史", []).append({
-                        "日期": TODAY.isoformat(), "操作者": "case_store", "动作": "状态回扫",
+                        "日期": today().isoformat(), "操作者": "case_store", "动作": "状态回扫",
                         "细节": f"采纳推断: {'; '.join(applied[:6])}" + (" 等更多" if len(applied) > 6 else "")})
                     commit_write(ypath, data, "ai", "状态回扫", f"采纳 {len(applied)} 项推断")
                     print(f"  → 已落盘 {len(applied)} 项")
 
 
+def _scan_case(cid, cdir):
+    """单案只读回扫（可在子进程运行）：读 case.yaml + 枚举目录 → scan_one 报告。"""
+    return scan_one(cid, cdir, load_case_doc(cdir / "00 - 📅 日程管理" / "case.yaml"))
+
+
 def _set_path(data, dotted, value):
     """深合并/赋值：'meta.医院案号' → data['meta']['医院案号'] = value"""
     cur = data
@@ -1842,21 +2484,12 @@ def format_report(cid, r):
 
 def cmd_set_fields(root, case_id, args):
     """通用字段补充：深合并 JSON 进 case.yaml（列表字段整体替换，任务增改请用 add-task/set-status）。"""
-    path = case_yaml_path(root, case_id)
+    case_yaml_path(root, case_id)  # 案件不存在时先于读取 JSON 报错
     payload = getattr(args, "json_").lstrip("@")
     raw = getattr(args, "json_")
     src = Path(payload).read_text(encoding="utf-8") if payload != raw else raw
     patch = json.loads(src)
-    with case_lock(path):
-        data = load_case(path)
-        if data.get("案件基本信息", {}).get("生命周期状态") == CLOSED and args.actor != "user":
-            if "生命周期状态" in json.dumps(patch, ensure_ascii=False):
-                die("生命周期状态=已结案 的变更属律师操作（--actor user）")
-        if data.get("案件基本信息", {}).get("程序阶段锁定") and args.actor != "user":
-            if "程序阶段锁定" in json.dumps(patch, ensure_ascii=False):
-                die("程序阶段已锁定，其变更属律师操作（--actor user）")
-        _deep_merge(data, patch)
-        commit_write(path, data, args.actor, "字段补充", f"set-fields 合并 {len(patch)} 个顶层键")
+    set_fields(root, case_id, patch, args.actor)
     print(f"✅ 已合并 {len(patch)} 个顶层键（source 保护与校验已过）")
 
 
@@ -1910,7 +2543,7 @@ def cmd_migrate(root, case_id, args):
         d00 = cdir / "00 - 📅 日程管理"
         d00.mkdir(exist_ok=True)
         v["同步"]["最后同步时间"] = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        v["更新历史"].append({"日期": TODAY.isoformat(), "操作者": "case_store",
+        v["更新历史"].append({"日期": today().isoformat(), "操作者": "case_store",
                                  "动作": "存量迁移", "细节": f"来源 {kind} → v4.0（M4）"})
         atomic_write(d00 / "case.yaml", v)
         for key in ("yaml00", "yaml_root"):
@@ -1977,7 +2610,7 @@ def main():
     common(sp)
     sp.add_argument("json_", metavar="JSON", help="补充 JSON（@文件路径 或内联）")
     sp = sub.add_parser("render", help="生成案件视图（md/html，落 00 目录；写入后自动刷新已存在视图）")
-    common(sp)
+    sp.add_argument("case_id", nargs="?", default=None, metavar="案件短码（缺省=全部）")
     sp.add_argument("--format", choices=["md", "html", "both"], default="both")
     sp.add_argument("--stdout", action="store_true", help="打印 md 到终端（不写文件）")
     sp = sub.add_parser("report", help="期限预警摘要（n 天内临期期限与开庭）")
@@ -1998,6 +2631,9 @@ def main():
     sp = sub.add_parser("scan", help="状态回扫：扫描案件目录 → 推断阶段/立案日/任务进度 → 对比报告")
     sp.add_argument("case_id", nargs="?", default=None, metavar="案件短码（缺省=全部）")
     sp.add_argument("--apply", action="store_true", help="采纳报告中的建议落盘（默认只打印报告）")
+    for name in ("extract", "scan", "render"):
+        sub.choices[name].add_argument("--jobs", type=int, default=None,
+                                       help="跨案件并行进程数（默认 min(CPU 数, 8)；1=串行）")
     sp = sub.add_parser("backfill-work", help="按已有工作产物（文书/取证/研究）倒推回补工时")
     sp.add_argument("case_id", nargs="?", default=None, metavar="案件短码（缺省=全部）")
     sp.add_argument("--apply", action="store_true", help="真正写盘（默认 dry-run）")
@@ -2012,6 +2648,13 @@ def main():
 
     args = ap.parse_args()
     root = find_root(args.root)
+    try:
+        _dispatch(root, args)
+    except CaseStoreError as e:
+        die(str(e))
+
+
+def _dispatch(root, args):
     table = {"show": cmd_show, "list": cmd_list, "add-task": cmd_add_task,
              "set-status": cmd_set_status, "add-deadline": cmd_add_deadline,
              "set-stage": cmd_set_stage, "validate": cmd_validate, "migrate": cmd_migrate,
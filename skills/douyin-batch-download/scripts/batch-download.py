@@ -16,10 +16,17 @@
     # 采样下载（每个博主1个视频，用于快速更新统计数据）
     python scripts/batch-download.py --sample
 
+    # 调整并发与限速（默认取 config.yaml 的 batch 段）；中断后重跑同一命令即断点续跑
+    python scripts/batch-download.py --all --workers=4 --rate=10
+
+    # 查看批次队列进度
+    python scripts/batch-download.py --status
+
 特性：
     - 自动保存视频统计数据（点赞、评论、收藏、分享）
     - 零额外 API 请求（数据在下载时获取）
     - 使用博主昵称作为文件夹名
+    - 批量任务有界并发 + 按主机限速 + 持久化队列（见 download_queue.py）
 """
 
 import subprocess
@@ -45,6 +52,16 @@ from following import (
     get_user,
     update_fetch_time,
 )
+from download_queue import (
+    DONE,
+    FAILED,
+    PENDING,
+    DownloadQueue,
+    DownloadScheduler,
+    batch_settings,
+    format_duration,
+    print_status,
+)
 
 DOWNLOAD_SCRIPT = SKILL_DIR / "scripts" / "download-v2.py"
 DOWNLOADS_PATH = get_download_path()
@@ -175,8 +192,7 @@ def interactive_select():
         return
 
     if choice == "all":
-        download_all_users(users)
-        return
+        return download_all_users(users)
 
     # 解析选择的数字
     try:
@@ -193,43 +209,112 @@ def interactive_select():
             return
 
         print(f"\n📝 已选择 {len(selected)} 个博主")
-        download_selected_users(selected)
+        return download_selected_users(selected)
 
     except ValueError:
         print("❌ 无效的输入，请输入数字")
 
 
 def download_selected_users(users: list):
-    """下载选定的用户"""
-    total = len(users)
-    success = 0
-    failed = 0
+    """下载选定的用户（经由调度器，有界并发），返回是否全部成功"""
+    return run_batch(users, "selected", fresh=True)
 
-    for i, user in enumerate(users, 1):
-        uid = user.get("uid")
-        sec_user_id = user.get("sec_user_id", "")
-        name = user.get("nickname", user.get("name", "未知"))
 
-        print(f"\n[{i}/{total}] 处理: {name}")
+def run_batch(users: list, kind: str, max_counts: int = None, fresh: bool = False,
+              workers: int = None, rate: float = None) -> bool:
+    """通过 DownloadScheduler 执行一批下载
 
-        if download_user(uid, sec_user_id, name):
-            success += 1
-        else:
-            failed += 1
+    Args:
+        users: 本批次的用户列表
+        kind: 批次名（all / sample / selected），决定队列文件 logs/batch-queue-<kind>.json
+        max_counts: 每个博主最大下载数量
+        fresh: 丢弃未完成的旧队列，重新开始
+        workers: 并发数，None 表示取 config.yaml 的 batch.workers
+        rate: 每分钟启动上限，None 表示取 config.yaml 的 batch.rate_per_minute
+
+    Returns:
+        是否全部成功
+    """
+    settings = batch_settings(workers, rate)
+    queue = DownloadQueue(queue_path(kind))
+
+    if not fresh and queue.unfinished() and queue.data.get("max_counts") == max_counts:
+        recovered = queue.recover()
+        added = queue.extend(users)
+        c = queue.counts()
+        print(f"♻️  继续上次未完成的批次（创建于 {queue.data.get('created')}）")
+        print(f"   已完成 {c[DONE]}，剩余 {c[PENDING]}" + (f"，新增 {added}" if added else "")
+              + (f"，中断时运行中 {recovered} 个已退回排队" if recovered else ""))
+        print("   如需从头开始请加 --fresh")
+    else:
+        queue.reset(users, max_counts)
+    queue.save()
+
+    print(f"⚙️  并发 {settings['workers']} · 限速 {settings['rate_per_minute']:g} 次/分钟/主机"
+          f" · 失败重试 {settings['retries']} 次")
+    print(f"📋 队列文件: {queue.path}")
+    print("-" * 60)
+
+    scheduler = DownloadScheduler(
+        queue, DOWNLOAD_SCRIPT, SKILL_DIR, DOWNLOADS_PATH,
+        workers=settings["workers"],
+        rate_per_minute=settings["rate_per_minute"],
+        retries=settings["retries"],
+    )
+    try:
+        counts = scheduler.run()
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    # 各任务以 --no-sync 运行，整批结束后统一同步一次 db → following.json
+    if counts[DONE]:
+        subprocess.run([sys.executable, str(SKILL_DIR / "scripts" / "sync-following.py")], cwd=str(SKILL_DIR))
 
     print("\n" + "=" * 60)
-    print(f"✨ 批量下载完成: 成功 {success}，失败 {failed}")
+    print(f"✨ 批量下载完成: 成功 {counts[DONE]}，失败 {counts[FAILED]}（用时 {format_duration(time.monotonic() - scheduler.started_at)}）")
+    for task in queue.tasks:
+        if task["status"] == FAILED:
+            print(f"   ❌ {task['name']} 日志: {task['log']}")
     print(f"📁 下载目录: {DOWNLOADS_PATH}")
     print("=" * 60)
+    return counts[FAILED] == 0
+
 
+def queue_path(kind: str) -> Path:
+    """批次队列文件路径"""
+    return DOWNLOADS_PATH / "logs" / f"batch-queue-{kind}.json"
 
-def download_all_users(users: list = None, auto_confirm: bool = False, daemon: bool = False):
+
+def launch_detached(args: list):
+    """后台模式：以前台调度方式重新启动本脚本并脱离终端，输出写入日志"""
+    log_dir = DOWNLOADS_PATH / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / f"batch-{time.strftime('%Y%m%d-%H%M%S')}.log"
+    cmd = [sys.executable, "-u", str(Path(__file__).resolve()), *args, "--yes"]
+    with open(log_file, "w", encoding="utf-8") as f:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=str(SKILL_DIR),
+            stdout=f,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,  # 脱离父进程
+        )
+
+    print(f"✅ 已启动后台批量任务 (PID {proc.pid})")
+    print(f"   📁 日志: {log_file}")
+    print(f"   🔍 查看进度: tail -f {log_file}")
+    print("   📋 队列状态: python scripts/batch-download.py --status")
+
+
+def download_all_users(users: list = None, auto_confirm: bool = False, daemon: bool = False, **batch_opts):
     """下载全部用户
 
     Args:
         users: 用户列表，None 表示从 following.json 加载
         auto_confirm: 是否跳过确认
         daemon: 是否后台运行
+        batch_opts: 透传给 run_batch 的 fresh / workers / rate
     """
     if users is None:
         users = list_users()
@@ -238,44 +323,32 @@ def download_all_users(users: list = None, auto_confirm: bool = False, daemon: b
         print("📋 关注列表为空，请先添加用户")
         return
 
-    total = len(users)
-
     if daemon:
-        # 后台模式：直接启动所有任务
-        print(f"\n🚀 后台模式：准备启动全部 {total} 个下载任务")
-        print(f"📁 下载目录: {DOWNLOADS_PATH}")
-        print("-" * 60)
+        # 后台模式：整个调度器转入后台，并发与限速规则不变
+        launch_detached(["--all", *batch_argv(**batch_opts)])
+        return
 
-        task_ids = []
-        for user in users:
-            uid = user.get("uid")
-            sec_user_id = user.get("sec_user_id", "")
-            name = user.get("nickname", user.get("name", "未知"))
-            task_id = download_user(uid, sec_user_id, name, daemon=True)
-            if task_id:
-                task_ids.append((name, task_id))
+    print(f"\n📥 准备下载全部 {len(users)} 个博主")
+    print(f"📁 下载目录: {DOWNLOADS_PATH}")
+    print("-" * 60)
 
-        print("\n" + "=" * 60)
-        print(f"✅ 已启动 {len(task_ids)} 个后台任务")
-        print("-" * 60)
-        for name, task_id in task_ids:
-            print(f"   📺 {name}: {task_id}")
-        print("-" * 60)
-        print("🔍 查看所有日志: ls {}/logs/")
-        print("=" * 60)
-    else:
-        # 同步模式
-        print(f"\n📥 准备下载全部 {total} 个博主")
-        print(f"📁 下载目录: {DOWNLOADS_PATH}")
-        print("-" * 60)
+    if not auto_confirm:
+        confirm = input("确认开始？(y/N): ").strip().lower()
+        if confirm != "y":
+            print("❌ 已取消")
+            return
+
+    return run_batch(users, "all", **batch_opts)
 
-        if not auto_confirm:
-            confirm = input("确认开始？(y/N): ").strip().lower()
-            if confirm != "y":
-                print("❌ 已取消")
-                return
 
-        download_selected_users(users)
+def batch_argv(fresh: bool = False, workers: int = None, rate: float = None) -> list:
+    """调度参数 → 命令行参数（后台重启本脚本时使用）"""
+    args = ["--fresh"] if fresh else []
+    if workers:
+        args.append(f"--workers={workers}")
+    if rate:
+        args.append(f"--rate={rate:g}")
+    return args
 
 
 def download_by_uid(uid: str, max_counts: int = None, daemon: bool = False):
@@ -310,15 +383,16 @@ def download_by_uid(uid: str, max_counts: int = None, daemon: bool = False):
     else:
         print(f"\n📥 下载博主: {name} (UID: {uid})")
         print(f"📁 下载目录: {DOWNLOADS_PATH}")
-        download_user(uid, sec_user_id, name, max_counts)
+        return download_user(uid, sec_user_id, name, max_counts)
 
 
-def download_sample(auto_confirm: bool = False, daemon: bool = False):
+def download_sample(auto_confirm: bool = False, daemon: bool = False, **batch_opts):
     """每个用户只下载1个视频，用于快速更新数据
 
     Args:
         auto_confirm: 是否跳过确认
         daemon: 是否后台运行
+        batch_opts: 透传给 run_batch 的 fresh / workers / rate
     """
     users = list_users()
 
@@ -326,65 +400,42 @@ def download_sample(auto_confirm: bool = False, daemon: bool = False):
         print("📋 关注列表为空，请先添加用户")
         return
 
-    total = len(users)
-
     if daemon:
-        # 后台模式：直接启动所有任务
-        print(f"\n🚀 后台模式：准备启动 {total} 个采样下载任务")
-        print(f"📁 下载目录: {DOWNLOADS_PATH}")
-        print("-" * 60)
-
-        task_ids = []
-        for user in users:
-            uid = user.get("uid")
-            sec_user_id = user.get("sec_user_id", "")
-            name = user.get("nickname", user.get("name", "未知"))
-            task_id = download_user(uid, sec_user_id, name, max_counts=1, daemon=True)
-            if task_id:
-                task_ids.append((name, task_id))
-
-        print("\n" + "=" * 60)
-        print(f"✅ 已启动 {len(task_ids)} 个后台任务")
-        print("-" * 60)
-        for name, task_id in task_ids:
-            print(f"   📺 {name}: {task_id}")
-        print("-" * 60)
-        print("🔍 查看所有日志: ls {}/logs/")
-        print("=" * 60)
-    else:
-        # 同步模式
-        print(f"\n📥 采样下载：每个博主只下载 1 个视频")
-        print(f"   共 {total} 个博主")
-        print(f"📁 下载目录: {DOWNLOADS_PATH}")
-        print("-" * 60)
-
-        if not auto_confirm:
-            confirm = input("确认开始？(y/N): ").strip().lower()
-            if confirm != "y":
-                print("❌ 已取消")
-                return
+        launch_detached(["--sample", *batch_argv(**batch_opts)])
+        return
 
-        success = 0
-        failed = 0
+    print(f"\n📥 采样下载：每个博主只下载 1 个视频")
+    print(f"   共 {len(users)} 个博主")
+    print(f"📁 下载目录: {DOWNLOADS_PATH}")
+    print("-" * 60)
 
-        for i, user in enumerate(users, 1):
-            uid = user.get("uid")
-            sec_user_id = user.get("sec_user_id", "")
-            name = user.get("nickname", user.get("name", "未知"))
+    if not auto_confirm:
+        confirm = input("确认开始？(y/N): ").strip().lower()
+        if confirm != "y":
+            print("❌ 已取消")
+            return
 
-            print(f"\n[{i}/{total}] 采样下载: {name}")
+    return run_batch(users, "sample", max_counts=1, **batch_opts)
 
-            if download_user(uid, sec_user_id, name, max_counts=1):
-                success += 1
-            else:
-                failed += 1
 
-        print("\n" + "=" * 60)
-    print(f"✨ 采样下载完成: 成功 {success}，失败 {failed}")
-    print("=" * 60)
+def parse_batch_opts() -> dict:
+    """从 sys.argv 取出 --fresh / --workers=N / --rate=N"""
+    opts = {"fresh": False, "workers": None, "rate": None}
+    for arg in list(sys.argv[1:]):
+        if arg == "--fresh":
+            opts["fresh"] = True
+        elif arg.startswith("--workers="):
+            opts["workers"] = int(arg.split("=", 1)[1])
+        elif arg.startswith("--rate="):
+            opts["rate"] = float(arg.split("=", 1)[1])
+        else:
+            continue
+        sys.argv.remove(arg)
+    return opts
 
 
 def main():
+    """返回进程退出码：有下载失败时为 1"""
     # 检查是否有 --yes 参数（跳过确认）
     auto_confirm = "--yes" in sys.argv
     if auto_confirm:
@@ -395,22 +446,30 @@ def main():
     if daemon_mode:
         sys.argv.remove("--daemon")
 
+    batch_opts = parse_batch_opts()
+
     if len(sys.argv) < 2:
-        interactive_select()
-        return
+        return 1 if interactive_select() is False else 0
 
     action = sys.argv[1]
+    result = None
 
     if action == "--all":
-        download_all_users(auto_confirm=auto_confirm, daemon=daemon_mode)
+        result = download_all_users(auto_confirm=auto_confirm, daemon=daemon_mode, **batch_opts)
     elif action == "--sample":
         # 每个用户只下载1个视频，用于更新数据
-        download_sample(auto_confirm=auto_confirm, daemon=daemon_mode)
+        result = download_sample(auto_confirm=auto_confirm, daemon=daemon_mode, **batch_opts)
+    elif action == "--status":
+        kinds = [k for k in ("all", "sample", "selected") if queue_path(k).exists()]
+        if not kinds:
+            print(f"📋 暂无批次记录: {DOWNLOADS_PATH / 'logs'}")
+        for kind in kinds:
+            print_status(DownloadQueue(queue_path(kind)))
     elif action == "--uid":
         if len(sys.argv) < 3:
             print("用法: python scripts/batch-download.py --uid <UID>")
-            return
-        download_by_uid(sys.argv[2], daemon=daemon_mode)
+            return 1
+        result = download_by_uid(sys.argv[2], daemon=daemon_mode)
     else:
         print(f"❌ 未知参数: {action}")
         print("用法:")
@@ -418,9 +477,15 @@ def main():
         print("  python scripts/batch-download.py --all      # 全量下载")
         print("  python scripts/batch-download.py --sample   # 采样下载（每个1个视频）")
         print("  python scripts/batch-download.py --uid <UID> # 指定博主")
+        print("  python scripts/batch-download.py --status   # 查看批次队列进度")
         print("  --daemon                                # 后台运行模式")
+        print("  --workers=N                             # 并发数（默认 config.yaml batch.workers）")
+        print("  --rate=N                                # 每分钟启动上限（默认 batch.rate_per_minute）")
+        print("  --fresh                                 # 丢弃未完成队列，从头开始")
         print("  --yes                                   # 跳过确认直接执行")
+        return 1
+    return 1 if result is False else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
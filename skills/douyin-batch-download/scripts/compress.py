@@ -10,17 +10,29 @@
 - 默认直接替换原文件（节省空间）
 - 可选保留原文件（使用 --keep）
 - 智能跳过小文件（避免压缩后变大）
+- 并行压缩（并发数按 CPU / 硬件编码器自动确定，可用 --jobs 指定）
+- 任务台账：记录 源文件指纹/大小 → 输出，已处理的文件（含改名、移动后）不再重复压缩或 ffprobe
 
 用法：
     python scripts/compress.py                          # 压缩全部视频
     python scripts/compress.py --user <folder>          # 压缩指定用户视频
     python scripts/compress.py --file <video.mp4>        # 压缩单个文件
     python scripts/compress.py --keep                    # 保留原文件
+    python scripts/compress.py --jobs 4                  # 4 路并行
+    python scripts/compress.py --encoder auto            # 优先使用硬件编码器
+    python scripts/compress.py --force                   # 忽略台账，重新压缩
+
+台账存于 douyin_users.db 的 compress_jobs 表。文件指纹 = 大小 + 头/中/尾各 64KB 的 blake2b，
+与文件名无关；路径、大小、mtime 均未变时直接命中，不读文件内容。
 """
 
 import subprocess
 import sys
 import os
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import argparse
 
@@ -29,7 +41,8 @@ SKILL_DIR = Path(__file__).parent.parent.resolve()
 os.chdir(SKILL_DIR)
 
 # 导入统一配置模块
-from utils.config import get_download_path
+from utils.config import get_download_path, load_config
+from utils.db import get_conn
 
 DOWNLOADS_PATH = get_download_path()
 
@@ -41,6 +54,13 @@ SMALL_FILE_THRESHOLD = 5 * 1024 * 1024  # 5MB
 # 原因：激进模式会降低分辨率，对已低分辨率视频无意义
 LOW_RESOLUTION_THRESHOLD = 720  # 720p 高度
 
+# 文件指纹采样块大小（头/中/尾各一块）
+FINGERPRINT_CHUNK = 64 * 1024
+
+# 硬件编码器（--encoder auto 时按顺序取第一个可用的）；硬件编码器并发会话数有限
+HW_ENCODERS = ("h264_videotoolbox", "h264_nvenc", "h264_qsv")
+HW_JOBS = 2
+
 
 def check_ffmpeg():
     """检查 ffmpeg 是否安装"""
@@ -61,7 +81,8 @@ def get_video_info(video_path):
         result = subprocess.run([
             "ffprobe", "-v", "quiet",
             "-print_format", "json",
-            "-show_format", "-show_streams",
+            "-show_entries", "format=size,duration:stream=codec_type,height",
+            "-select_streams", "v:0",
             str(video_path)
         ], capture_output=True, text=True)
 
@@ -90,95 +111,308 @@ def format_size(bytes_size):
     return f"{bytes_size:.2f} TB"
 
 
-def compress_video(input_path, output_path, replace=True, crf=32, preset="fast", skip_small=True, aggressive=True):
-    """
-    压缩视频
+def available_encoders():
+    """ffmpeg 编译进来的 H.264 编码器"""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return set()
+    return {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1 and "264" in line.split()[1]}
 
-    参数:
-        input_path: 输入视频路径
-        output_path: 输出视频路径
-        replace: 是否替换原文件 (默认True，节省空间)
-        crf: 压缩质量 (0-51, 越小质量越好, 默认32, 推荐28-38)
-        preset: 压缩速度预设 (ultrafast, superfast, veryfast, faster, fast, medium, slow, slower, veryslow)
-        skip_small: 是否跳过小文件 (默认True)
-        aggressive: 激进压缩模式 (默认False), 牺牲质量获得更高压缩率
-    """
-    info = get_video_info(input_path)
-    original_size = info["size"] if info else 0
-    height = info.get("height", 0) if info else 0
 
-    print(f"  压缩: {input_path.name}")
-    print(f"    原始大小: {format_size(original_size)}, 分辨率: {height}p")
+def resolve_encoder(name):
+    """auto → 第一个可用的硬件编码器，否则 libx264"""
+    if name != "auto":
+        return name
+    encoders = available_encoders()
+    return next((e for e in HW_ENCODERS if e in encoders), "libx264")
+
+
+def default_jobs(encoder):
+    """默认并发数：硬件编码器受会话数限制；libx264 自身多线程，按 CPU 核数分几路"""
+    if encoder in HW_ENCODERS:
+        return HW_JOBS
+    return max(1, min(4, (os.cpu_count() or 1) // 2))
+
 
-    # 跳过小文件（避免压缩后反而变大）
-    if skip_small and original_size < SMALL_FILE_THRESHOLD:
-        print(f"    跳过 (文件小于 {format_size(SMALL_FILE_THRESHOLD)})")
-        return None  # 返回 None 表示跳过
+def encoder_args(encoder, crf, preset, threads=0):
+    """视频编码参数；硬件编码器没有 crf，按近似的质量参数映射"""
+    if encoder == "h264_videotoolbox":
+        return ["-c:v", encoder, "-q:v", str(max(1, min(100, round(100 - crf * 1.6))))]
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-rc", "vbr", "-cq", str(crf)]
+    if encoder == "h264_qsv":
+        return ["-c:v", encoder, "-global_quality", str(crf)]
+    args = ["-c:v", "libx264", "-crf", str(crf), "-preset", preset]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
 
-    # 跳过低分辨率视频（避免对已低分辨率视频进行压缩）
-    if aggressive and height > 0 and height < LOW_RESOLUTION_THRESHOLD:
-        print(f"    跳过 (分辨率 {height}p 已低于阈值 {LOW_RESOLUTION_THRESHOLD}p)")
-        return None  # 返回 None 表示跳过
 
-    # ffmpeg 命令
+def encode(input_path, output_path, crf=32, preset="fast", aggressive=True, encoder="libx264", threads=0):
+    """调用 ffmpeg 编码，返回 (是否成功, stderr)
+
+    参数:
+        crf: 压缩质量 (0-51, 越小质量越好, 默认32, 推荐28-38)
+        preset: 压缩速度预设 (ultrafast ~ veryslow)，仅 libx264 使用
+        aggressive: 激进压缩模式，降低分辨率与音频码率，牺牲质量获得更高压缩率
+        encoder: 视频编码器 (libx264 或硬件编码器)
+        threads: libx264 线程数 (0 为 ffmpeg 默认)，并行压缩时按并发数均分 CPU
+    """
+    cmd = ["ffmpeg", "-nostdin", "-i", str(input_path), *encoder_args(encoder, crf, preset, threads)]
     if aggressive:
         # 激进模式：降低分辨率 + 降低音频码率
-        cmd = [
-            "ffmpeg", "-i", str(input_path),
-            "-c:v", "libx264",
-            "-crf", str(crf),
-            "-preset", preset,
-            "-vf", "scale=iw/2:ih/2",  # 降低分辨率到一半
-            "-c:a", "aac",
-            "-b:a", "64k",  # 降低音频码率
-            "-movflags", "+faststart",
-            "-y",
-            str(output_path)
-        ]
+        cmd += ["-vf", "scale=iw/2:ih/2", "-c:a", "aac", "-b:a", "64k"]
     else:
         # 标准模式
-        cmd = [
-            "ffmpeg", "-i", str(input_path),
-            "-c:v", "libx264",
-            "-crf", str(crf),
-            "-preset", preset,
-            "-c:a", "aac",
-            "-b:a", "128k",
-            "-movflags", "+faststart",
-            "-y",
-            str(output_path)
-        ]
+        cmd += ["-c:a", "aac", "-b:a", "128k"]
+    cmd += ["-movflags", "+faststart", "-y", str(output_path)]
 
     result = subprocess.run(cmd, capture_output=True, text=True)
+    return result.returncode == 0, result.stderr
 
-    if result.returncode != 0:
-        print(f"    ✗ 压缩失败: {result.stderr}")
-        return False
 
-    # 获取压缩后大小
-    compressed_info = get_video_info(output_path)
-    compressed_size = compressed_info["size"] if compressed_info else 0
+def is_already_compressed(video_path):
+    """检查视频是否已经是压缩版"""
+    # 简单判断：文件名包含 compressed 或 compressed_ 前缀
+    return "compressed" in video_path.stem.lower()
 
-    # 计算压缩率
-    if original_size > 0 and compressed_size > 0:
-        ratio = (1 - compressed_size / original_size) * 100
-        print(f"    压缩后: {format_size(compressed_size)} (压缩率: {ratio:.1f}%)")
 
-    # 如果需要替换原文件
+def output_path_for(video, replace):
+    """压缩输出路径：替换模式写临时文件，保留模式生成 xxx_compressed.mp4"""
     if replace:
-        input_path.unlink()
-        output_path.rename(input_path)
-        print(f"    已替换原文件")
-    else:
-        print(f"    输出: {output_path}")
+        return video.parent / f"{video.stem}.tmp.mp4"
+    return video.parent / f"{video.stem}_compressed.mp4"
 
-    return True
 
+# ---------- 任务台账 ----------
 
-def is_already_compressed(video_path):
-    """检查视频是否已经是压缩版"""
-    # 简单判断：文件名包含 compressed 或 compressed_ 前缀
-    return "compressed" in video_path.stem.lower()
+def file_fingerprint(path, size):
+    """内容指纹：大小 + 头/中/尾各 64KB（与文件名、路径无关，改名/移动后仍能识别）"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode())
+    with open(path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - FINGERPRINT_CHUNK // 2), max(0, size - FINGERPRINT_CHUNK)}):
+            f.seek(offset)
+            h.update(f.read(FINGERPRINT_CHUNK))
+    return h.hexdigest()
+
+
+def ensure_ledger_schema():
+    """确保 compress_jobs 台账表存在
+
+    source_hash 为源文件指纹；path / path_size / path_mtime 记录当前代表该任务的文件
+    （替换模式下即压缩后的文件），用于免读内容的快速命中；output_hash 用于识别压缩产物本身。
+    """
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS compress_jobs (
+                source_hash TEXT PRIMARY KEY,
+                source_size INTEGER,
+                height INTEGER,
+                duration REAL,
+                status TEXT,
+                error TEXT,
+                output_hash TEXT,
+                output_size INTEGER,
+                output_path TEXT,
+                encoder TEXT,
+                crf INTEGER,
+                preset TEXT,
+                aggressive INTEGER,
+                path TEXT,
+                path_size INTEGER,
+                path_mtime REAL,
+                updated_at INTEGER
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_compress_path ON compress_jobs(path)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_compress_output ON compress_jobs(output_hash)")
+
+
+JOB_COLUMNS = ("source_hash", "source_size", "height", "duration", "status", "error", "output_hash", "output_size",
+               "output_path", "encoder", "crf", "preset", "aggressive", "path", "path_size", "path_mtime", "updated_at")
+
+
+class Ledger:
+    """台账的内存视图：按路径、源指纹、输出指纹三种方式查找"""
+
+    def __init__(self):
+        ensure_ledger_schema()
+        self.by_hash = {}
+        self.by_path = {}
+        self.by_output = {}
+        for row in get_conn().execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM compress_jobs"):
+            self._index(dict(zip(JOB_COLUMNS, row)))
+
+    def _index(self, job):
+        self.by_hash[job["source_hash"]] = job
+        if job.get("path"):
+            self.by_path[job["path"]] = job
+        if job.get("output_hash"):
+            self.by_output[job["output_hash"]] = job
+
+    def lookup(self, video, st):
+        """返回 (台账记录或 None, 指纹)；路径+大小+mtime 命中时不读文件"""
+        job = self.by_path.get(str(video))
+        if job and job["path_size"] == st.st_size and job["path_mtime"] == st.st_mtime:
+            return job, job["output_hash"] if job["status"] == "done" and job["output_path"] == job["path"] \
+                else job["source_hash"]
+        fingerprint = file_fingerprint(video, st.st_size)
+        job = self.by_hash.get(fingerprint) or self.by_output.get(fingerprint)
+        if job:
+            # 改名/移动后重新命中：更新路径，下次走快速路径
+            self.save(job, path=str(video), path_size=st.st_size, path_mtime=st.st_mtime)
+        return job, fingerprint
+
+    def save(self, job, **fields):
+        job.update(fields, updated_at=int(time.time()))
+        conn = get_conn()
+        with conn:
+            conn.execute(f"INSERT OR REPLACE INTO compress_jobs ({', '.join(JOB_COLUMNS)}) "
+                         f"VALUES ({', '.join('?' * len(JOB_COLUMNS))})", [job.get(c) for c in JOB_COLUMNS])
+        self._index(job)
+        return job
+
+
+def skip_reason(size, height, skip_small, aggressive):
+    """是否跳过（返回原因文本）"""
+    if skip_small and size < SMALL_FILE_THRESHOLD:
+        return f"文件小于 {format_size(SMALL_FILE_THRESHOLD)}"
+    if aggressive and height and height < LOW_RESOLUTION_THRESHOLD:
+        return f"分辨率 {height}p 已低于阈值 {LOW_RESOLUTION_THRESHOLD}p"
+    return None
+
+
+def plan_jobs(videos, ledger, replace=True, skip_small=True, aggressive=True, force=False, encoder="libx264",
+              crf=32, preset="fast"):
+    """对照台账筛出需要压缩的文件，返回 (待压缩任务, 跳过统计)"""
+    pending, skipped = [], {}
+
+    def skip(reason):
+        skipped[reason] = skipped.get(reason, 0) + 1
+
+    for video in videos:
+        # 跳过已经是压缩版的文件，以及上次中断残留的临时输出
+        if is_already_compressed(video) or video.name.endswith(".tmp.mp4"):
+            skip("已压缩")
+            continue
+        try:
+            st = video.stat()
+        except OSError:
+            continue
+        job, fingerprint = ledger.lookup(video, st)
+        if job and not force:
+            if job["status"] == "done":
+                skip("已压缩")
+                continue
+            # 探测结果已在台账中，按当前参数重新判断，无需再 ffprobe
+            if job["status"] == "skipped":
+                reason = skip_reason(job["source_size"], job["height"], skip_small, aggressive)
+                if reason:
+                    skip(reason)
+                    continue
+        if job and fingerprint != job["source_hash"]:
+            # 命中的是压缩产物（force 时）：以当前文件为新源
+            job = None
+        if not job:
+            job = {"source_hash": fingerprint, "source_size": st.st_size}
+
+        # 小文件只看 stat 大小即可判断，不必 ffprobe
+        reason = skip_reason(st.st_size, 0, skip_small, False)
+        if reason is None and aggressive and job.get("height") is None:
+            info = get_video_info(video)
+            job["height"] = info["height"] if info else 0
+            job["duration"] = info["duration"] if info else None
+        reason = reason or skip_reason(st.st_size, job.get("height"), skip_small, aggressive)
+        if reason:
+            ledger.save(job, status="skipped", error=reason, path=str(video), path_size=st.st_size,
+                        path_mtime=st.st_mtime)
+            skip(reason)
+            continue
+
+        job.update(encoder=encoder, crf=crf, preset=preset, aggressive=int(aggressive))
+        pending.append((video, output_path_for(video, replace), job))
+    return pending, skipped
+
+
+def run_jobs(pending, ledger, replace=True, jobs=1, encoder="libx264", crf=32, preset="fast", aggressive=True):
+    """并行执行压缩任务，每完成一个即写入台账（中断后重跑只处理剩余文件）"""
+    threads = max(1, (os.cpu_count() or 1) // jobs) if encoder == "libx264" else 0
+    counts = {"success": 0, "failed": 0, "saved": 0}
+    stop = threading.Event()  # Ctrl+C 后置位：不再启动新的 ffmpeg
+
+    def work(video, output, job):
+        ok, stderr = encode(video, output, crf, preset, aggressive, job["encoder"], threads)
+        # ffmpeg 因 SIGINT 退出时主线程可能尚未置位 stop，以 stderr 中的 "received signal" 兜底
+        interrupted = stop.is_set() or "received signal" in (stderr or "")
+        if not ok and job["encoder"] != "libx264" and not interrupted:
+            # 硬件编码器在 ffmpeg 中可见不代表设备可用，回退软件编码
+            job["encoder"] = "libx264"
+            ok, stderr = encode(video, output, crf, preset, aggressive, "libx264", threads)
+        if not ok:
+            output.unlink(missing_ok=True)
+            return False, stderr.strip().splitlines()[-1:] if stderr else []
+        if replace:
+            os.replace(output, video)
+            return True, video
+        return True, output
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(work, *item): item for item in pending}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                video, output, job = futures[future]
+                try:
+                    ok, result = future.result()
+                except OSError as e:
+                    ok, result = False, [str(e)]
+                prefix = f"  [{done}/{len(pending)}]"
+                if not ok:
+                    counts["failed"] += 1
+                    ledger.save(job, status="failed", error="; ".join(result))
+                    print(f"{prefix} ✗ {video.name}: {'; '.join(result)}")
+                    continue
+                st = result.stat()
+                current = video.stat()  # 替换模式下即压缩产物，保留模式下为原文件
+                ledger.save(job, status="done", error=None,
+                            output_hash=file_fingerprint(result, st.st_size), output_size=st.st_size,
+                            output_path=str(result),
+                            path=str(video), path_size=current.st_size, path_mtime=current.st_mtime)
+                counts["success"] += 1
+                counts["saved"] += job["source_size"] - st.st_size
+                ratio = (1 - st.st_size / job["source_size"]) * 100 if job["source_size"] else 0
+                print(f"{prefix} ✓ {video.name}: {format_size(job['source_size'])} → "
+                      f"{format_size(st.st_size)} (压缩率: {ratio:.1f}%)")
+        except KeyboardInterrupt:
+            # 运行中的 ffmpeg 同样收到 SIGINT 退出，各任务自行删除未完成的输出（不再回退软件编码）
+            stop.set()
+            for future in futures:
+                future.cancel()
+            print("\n已中断：已完成的文件记录在台账中，重新运行将跳过它们")
+            raise
+    return counts
+
+
+def compress_videos(videos, replace=True, skip_small=True, jobs=None, encoder="libx264", force=False,
+                    crf=32, preset="fast", aggressive=True):
+    """台账筛选 + 并行压缩 + 汇总"""
+    encoder = resolve_encoder(encoder)
+    jobs = jobs or default_jobs(encoder)
+    ledger = Ledger()
+
+    started = time.monotonic()
+    pending, skipped = plan_jobs(videos, ledger, replace, skip_small, aggressive, force, encoder, crf, preset)
+    print(f"待压缩 {len(pending)} 个，跳过 {sum(skipped.values())} 个"
+          + (f"（{', '.join(f'{k} {v}' for k, v in skipped.items())}）" if skipped else ""))
+    if not pending:
+        return
+    print(f"编码器: {encoder}，并发: {jobs}\n")
+
+    counts = run_jobs(pending, ledger, replace, jobs, encoder, crf, preset, aggressive)
+    print(f"\n完成: {counts['success']} 成功, {sum(skipped.values())} 跳过, {counts['failed']} 失败"
+          f"，节省 {format_size(max(0, counts['saved']))}，用时 {time.monotonic() - started:.1f}s")
 
 
 def compress_user_dir(user_dir, replace=True, skip_small=True, **kwargs):
@@ -187,51 +421,24 @@ def compress_user_dir(user_dir, replace=True, skip_small=True, **kwargs):
         print(f"目录不存在: {user_dir}")
         return
 
-    mp4_files = list(user_dir.glob("*.mp4"))
+    mp4_files = sorted(user_dir.glob("*.mp4"))
     if not mp4_files:
         print(f"没有找到视频文件: {user_dir}")
         return
 
     print(f"\n处理用户目录: {user_dir.name}")
     print(f"找到 {len(mp4_files)} 个视频文件\n")
-
-    success_count = 0
-    skipped_count = 0
-    failed_count = 0
-
-    for video in mp4_files:
-        # 跳过已经是压缩版的文件
-        if is_already_compressed(video):
-            print(f"  跳过 (已压缩): {video.name}")
-            skipped_count += 1
-            print()
-            continue
-
-        if replace:
-            output = video.parent / f"{video.stem}.tmp.mp4"
-        else:
-            output = video.parent / f"{video.stem}_compressed.mp4"
-
-        result = compress_video(video, output, replace, skip_small=skip_small, **kwargs)
-        if result is True:
-            success_count += 1
-        elif result is False:
-            failed_count += 1
-        else:  # None - 跳过
-            skipped_count += 1
-
-        print()
-
-    print(f"完成: {success_count} 成功, {skipped_count} 跳过, {failed_count} 失败")
+    compress_videos(mp4_files, replace, skip_small, **kwargs)
 
 
 def compress_all(replace=True, skip_small=True, **kwargs):
-    """压缩下载目录下所有用户的视频"""
+    """压缩下载目录下所有用户的视频（所有目录的文件进同一个并行队列）"""
     if not DOWNLOADS_PATH.exists():
         print(f"下载目录不存在: {DOWNLOADS_PATH}")
         return
 
-    user_dirs = [d for d in DOWNLOADS_PATH.iterdir() if d.is_dir()]
+    # 隐藏目录（如批量调度器的 .staging）里是下载中的文件，不处理
+    user_dirs = [d for d in DOWNLOADS_PATH.iterdir() if d.is_dir() and not d.name.startswith(".")]
     if not user_dirs:
         print("没有找到用户目录")
         return
@@ -239,8 +446,8 @@ def compress_all(replace=True, skip_small=True, **kwargs):
     print(f"下载目录: {DOWNLOADS_PATH}")
     print(f"找到 {len(user_dirs)} 个用户目录\n")
 
-    for user_dir in sorted(user_dirs):
-        compress_user_dir(user_dir, replace, skip_small, **kwargs)
+    videos = [video for user_dir in sorted(user_dirs) for video in sorted(user_dir.glob("*.mp4"))]
+    compress_videos(videos, replace, skip_small, **kwargs)
 
 
 def main():
@@ -256,6 +463,9 @@ def main():
   %(prog)s --aggressive               # 激进压缩模式 (牺牲质量，压缩率70-80%%)
   %(prog)s --crf 38 --preset medium   # 指定压缩质量和速度
   %(prog)s --no-skip-small            # 不跳过小文件
+  %(prog)s --jobs 4                   # 4 路并行（默认按 CPU / 编码器自动确定）
+  %(prog)s --encoder auto             # 优先使用硬件编码器（VideoToolbox / NVENC / QSV）
+  %(prog)s --force                    # 忽略台账，已压缩过的文件也重新压缩
         """
     )
 
@@ -295,7 +505,32 @@ def main():
         help="激进压缩模式 (牺牲质量获得更高压缩率，适合视频仅作留存用途)"
     )
 
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="并行压缩数 (默认: config.yaml compression.workers，未配置时按 CPU / 编码器自动确定)"
+    )
+    parser.add_argument(
+        "--encoder",
+        help="视频编码器: libx264 / auto / h264_videotoolbox / h264_nvenc / h264_qsv "
+             "(默认: config.yaml compression.encoder，未配置时 libx264)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略任务台账，重新压缩已处理过的文件"
+    )
+
     args = parser.parse_args()
+    compression = load_config().get("compression") or {}
+    options = dict(
+        crf=args.crf,
+        preset=args.preset,
+        aggressive=args.aggressive,
+        jobs=args.jobs or compression.get("workers"),
+        encoder=args.encoder or compression.get("encoder") or "libx264",
+        force=args.force,
+    )
 
     # 是否跳过小文件
     skip_small = not args.no_skip_small
@@ -324,21 +559,16 @@ def main():
             print(f"文件不存在: {file_path}")
             sys.exit(1)
 
-        if replace:
-            output = file_path.parent / f"{file_path.stem}.tmp.mp4"
-        else:
-            output = file_path.parent / f"{file_path.stem}_compressed.mp4"
-
-        compress_video(file_path, output, replace, args.crf, args.preset, skip_small, args.aggressive)
+        compress_videos([file_path], replace, skip_small, **options)
 
     elif args.user:
         # 压缩指定用户目录
         user_dir = DOWNLOADS_PATH / args.user
-        compress_user_dir(user_dir, replace, skip_small, crf=args.crf, preset=args.preset, aggressive=args.aggressive)
+        compress_user_dir(user_dir, replace, skip_small, **options)
 
     else:
         # 压缩全部
-        compress_all(replace, skip_small, crf=args.crf, preset=args.preset, aggressive=args.aggressive)
+        compress_all(replace, skip_small, **options)
 
 
 if __name__ == "__main__":
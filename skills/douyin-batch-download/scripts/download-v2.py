@@ -12,6 +12,7 @@
 用法：
     python scripts/download-v2.py <主页URL>
     python scripts/download-v2.py <主页URL> --max-counts=10
+    python scripts/download-v2.py <主页URL> --staging=<目录> --no-sync   # 批量调度器并发调用
 
 优势：
 - 不增加额外 API 请求（数据在下载时已获取）
@@ -20,7 +21,6 @@
 """
 
 import shutil
-import sqlite3
 import asyncio
 import sys
 import yaml
@@ -42,6 +42,11 @@ from utils.config import (
     sanitize_folder_name,
     load_config,
 )
+from utils.db import (
+    ensure_video_metadata_schema,
+    get_conn,
+    upsert_video_metadata,
+)
 
 # 导入 F2 模块
 from f2.apps.douyin.handler import DouyinHandler
@@ -101,55 +106,25 @@ def get_f2_kwargs() -> dict:
 
 def create_video_metadata_table():
     """确保视频元数据表存在"""
-    db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS video_metadata (
-            aweme_id TEXT PRIMARY KEY,
-            uid TEXT NOT NULL,
-            nickname TEXT,
-            desc TEXT,
-            create_time INTEGER,
-            duration INTEGER,
-            digg_count INTEGER DEFAULT 0,
-            comment_count INTEGER DEFAULT 0,
-            collect_count INTEGER DEFAULT 0,
-            share_count INTEGER DEFAULT 0,
-            play_count INTEGER DEFAULT 0,
-            local_filename TEXT,
-            file_size INTEGER,
-            fetch_time INTEGER
-        )
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_video_uid ON video_metadata(uid)
-    """)
-
-    # 添加 nickname 列（如果不存在）
-    try:
-        cursor.execute("ALTER TABLE video_metadata ADD COLUMN nickname TEXT")
-    except sqlite3.OperationalError:
-        pass  # 列已存在
+    ensure_video_metadata_schema()
+
 
-    conn.commit()
-    conn.close()
+# 下载时写入的列（local_filename / file_size 由 extract-metadata 维护，不覆盖）
+RAW_METADATA_COLUMNS = (
+    "aweme_id", "uid", "nickname", "desc", "create_time", "duration",
+    "digg_count", "comment_count", "collect_count", "share_count", "play_count",
+    "fetch_time",
+)
 
 
 def save_video_metadata_from_raw(raw_data: dict, nickname: str = ""):
-    """从原始 API 响应中提取并保存视频统计数据"""
+    """从原始 API 响应中提取并保存视频统计数据（每页一次批量 upsert）"""
     aweme_list = raw_data.get("aweme_list", [])
     if not aweme_list:
         return 0
 
-    db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-
     fetch_time = int(datetime.now().timestamp())
-    saved_count = 0
+    rows = []
 
     for video in aweme_list:
         aweme_id = video.get("aweme_id", "")
@@ -159,39 +134,29 @@ def save_video_metadata_from_raw(raw_data: dict, nickname: str = ""):
         # 从原始数据中获取统计信息
         stats = video.get("statistics", {}) or {}
         author = video.get("author", {}) or {}
-        video_nickname = author.get("nickname", nickname)
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO video_metadata
-            (aweme_id, uid, nickname, desc, create_time, duration,
-             digg_count, comment_count, collect_count, share_count, play_count,
-             fetch_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            aweme_id,
-            author.get("uid", ""),
-            video_nickname,
-            video.get("desc", ""),
-            video.get("create_time", 0),
-            video.get("video", {}).get("duration", 0) if video.get("video") else 0,
-            stats.get("digg_count", 0),
-            stats.get("comment_count", 0),
-            stats.get("collect_count", 0),
-            stats.get("share_count", 0),
-            stats.get("play_count", 0),
-            fetch_time
-        ))
-        saved_count += 1
-
-    conn.commit()
-    conn.close()
-    return saved_count
-
-
-def reorganize_files(nickname: str, uid: str) -> str:
-    """整理文件到下载目录/{博主昵称}/"""
+
+        rows.append({
+            "aweme_id": aweme_id,
+            "uid": author.get("uid", ""),
+            "nickname": author.get("nickname", nickname),
+            "desc": video.get("desc", ""),
+            "create_time": video.get("create_time", 0),
+            "duration": video.get("video", {}).get("duration", 0) if video.get("video") else 0,
+            "digg_count": stats.get("digg_count", 0),
+            "comment_count": stats.get("comment_count", 0),
+            "collect_count": stats.get("collect_count", 0),
+            "share_count": stats.get("share_count", 0),
+            "play_count": stats.get("play_count", 0),
+            "fetch_time": fetch_time,
+        })
+
+    return upsert_video_metadata(rows, RAW_METADATA_COLUMNS)
+
+
+def reorganize_files(nickname: str, uid: str, work_path: Path = None) -> str:
+    """整理文件到下载目录/{博主昵称}/（work_path 为 F2 下载根，默认即下载目录）"""
     downloads_path = get_download_path()
-    old_path = downloads_path / "douyin" / "post" / nickname
+    old_path = (work_path or downloads_path) / "douyin" / "post" / nickname
 
     if not old_path.exists():
         return None
@@ -233,19 +198,33 @@ def update_last_fetch_time(uid: str, nickname: str = ""):
         pass
 
 
+def refresh_library_index(folder_path: Path):
+    """把刚整理好的博主目录同步进本地视频库索引（generate-data 无需再重扫该目录）"""
+    try:
+        from library_index import refresh_dir
+        refresh_dir(get_download_path(), folder_path)
+    except Exception as e:
+        print(f"  [警告] 视频库索引未更新: {e}")
+
+
 def run_sync():
     """运行 sync-following.py"""
     import subprocess
     subprocess.run([sys.executable, str(SKILL_DIR / "scripts" / "sync-following.py")])
 
 
-async def download_with_stats(url: str, max_counts: int = None):
+async def download_with_stats(url: str, max_counts: int = None, staging: str = None, sync: bool = True) -> bool:
     """
     使用 F2 API 下载视频并保存统计数据
 
     Args:
         url: 用户主页 URL
         max_counts: 最大下载数量
+        staging: 独立的 F2 临时下载根（批量调度器并发时每个任务一个，互不清理对方的文件）
+        sync: 完成后是否运行 sync-following.py（调度器在整批结束后统一同步一次）
+
+    Returns:
+        是否成功
     """
     # 获取配置
     kwargs = get_f2_kwargs()
@@ -255,9 +234,11 @@ async def download_with_stats(url: str, max_counts: int = None):
         kwargs["max_counts"] = max_counts
 
     downloads_path = get_download_path()
+    work_path = Path(staging) if staging else downloads_path
+    kwargs["path"] = str(work_path)
 
     # 清理临时目录
-    f2_temp_path = downloads_path / "douyin"
+    f2_temp_path = work_path / "douyin"
     if f2_temp_path.exists():
         shutil.rmtree(f2_temp_path)
         print("[清理] F2 临时目录")
@@ -277,7 +258,7 @@ async def download_with_stats(url: str, max_counts: int = None):
 
     if not sec_user_id:
         print("[错误] 无法解析用户 ID")
-        return
+        return False
 
     print(f"[信息] sec_user_id: {sec_user_id[:30]}...")
 
@@ -285,12 +266,14 @@ async def download_with_stats(url: str, max_counts: int = None):
     async with AsyncUserDB(str(get_db_path())) as db:
         user_path = await handler.get_or_add_user_data(kwargs, sec_user_id, db)
 
-    # 从数据库获取用户信息（昵称）
-    conn = sqlite3.connect(str(get_db_path()))
-    cursor = conn.cursor()
-    cursor.execute("SELECT uid, nickname FROM user_info_web ORDER BY ROWID DESC LIMIT 1")
-    user_info = cursor.fetchone()
-    conn.close()
+    # 从数据库获取用户信息（昵称）；按 sec_user_id 精确查找，
+    # 并发下载时"最后插入的一行"可能属于别的任务
+    conn = get_conn()
+    user_info = conn.execute(
+        "SELECT uid, nickname FROM user_info_web WHERE sec_user_id = ?", (sec_user_id,)
+    ).fetchone()
+    if not user_info:
+        user_info = conn.execute("SELECT uid, nickname FROM user_info_web ORDER BY ROWID DESC LIMIT 1").fetchone()
 
     uid = user_info[0] if user_info else ""
     nickname = user_info[1] if user_info else ""
@@ -333,24 +316,29 @@ async def download_with_stats(url: str, max_counts: int = None):
 
     # 整理文件
     print("[整理] 重新组织文件...")
-    post_path = downloads_path / "douyin" / "post"
+    post_path = work_path / "douyin" / "post"
     folder_name = None
     if post_path.exists():
         for folder in post_path.iterdir():
             if folder.is_dir():
-                folder_name = reorganize_files(folder.name, uid)
+                folder_name = reorganize_files(folder.name, uid, work_path)
+    if staging:
+        shutil.rmtree(work_path, ignore_errors=True)
 
-    # 更新 last_fetch_time
+    # 更新 last_fetch_time 与视频库索引
     if folder_name:
         update_last_fetch_time(uid, nickname or folder_name)
+        refresh_library_index(downloads_path / folder_name)
 
     # 同步 following.json
-    print("[同步] 更新 following.json...")
-    run_sync()
+    if sync:
+        print("[同步] 更新 following.json...")
+        run_sync()
 
     print(f"\n[完成] 共下载 {total_downloaded} 个视频")
     if folder_name:
         print(f"[位置] {downloads_path / folder_name}")
+    return True
 
 
 async def main():
@@ -371,12 +359,18 @@ async def main():
     # 解析参数
     max_counts = None
     task_id = None  # 任务 ID（守护模式使用）
+    staging = None  # 独立临时下载根（批量调度器使用）
+    sync = True
 
     for arg in sys.argv[2:]:
         if arg.startswith("--max-counts="):
             max_counts = int(arg.split("=")[1])
         elif arg.startswith("--task-id="):
             task_id = arg.split("=")[1]
+        elif arg.startswith("--staging="):
+            staging = arg.split("=", 1)[1]
+        elif arg == "--no-sync":
+            sync = False
 
     # 守护进程模式：立即输出进度信息后开始下载
     if daemon_mode and task_id:
@@ -399,12 +393,13 @@ async def main():
         print(f"[守护模式] 任务 {task_id} 已启动")
         print(f"[日志] {log_file}")
 
-    await download_with_stats(url, max_counts)
+    ok = await download_with_stats(url, max_counts, staging, sync)
 
     # 守护进程模式：关闭日志文件
     if daemon_mode and task_id:
         log_handle.close()
+    return 0 if ok is not False else 1
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量下载调度器 - 有界并发 + 按主机限速 + 可断点续跑的持久化队列
+
+batch-download.py 的 --all / --sample / 多选下载都经由本模块：
+
+- 并发：固定 N 个工作线程，每个线程一次只跑一个 download-v2.py 子进程
+  （各任务使用独立的 F2 临时目录 --staging，互不清理对方的文件）
+- 限速：按主机（www.douyin.com）限制任务启动频率，避免几百个博主同时打 API 被风控
+- 优先级：从未获取过的博主最先，其余按 last_fetch_time 由旧到新
+- 持久化：队列状态写入 下载目录/logs/batch-queue-<批次>.json，每次状态变化都落盘；
+  中断（Ctrl+C / 断电）后再次运行同一批次会跳过已完成的博主，从断点继续
+- 进度：定期输出汇总（完成/运行/失败/排队、已用时间、预计剩余），--status 可随时查看
+
+配置（config/config.yaml，可被命令行参数覆盖）：
+
+    batch:
+      workers: 3            # 并发下载数
+      rate_per_minute: 12   # 同一主机每分钟最多启动的任务数
+      retries: 1            # 失败后重试次数（指数退避）
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from utils.config import load_config
+
+DEFAULT_WORKERS = 3
+DEFAULT_RATE_PER_MINUTE = 12
+DEFAULT_RETRIES = 1
+RETRY_BACKOFF = 30          # 首次重试等待秒数，之后每次翻倍
+PROGRESS_INTERVAL = 15      # 汇总进度输出间隔（秒）
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+def batch_settings(workers: Optional[int] = None, rate: Optional[float] = None) -> dict:
+    """读取 config.yaml 的 batch 段，命令行参数优先"""
+    conf = load_config().get("batch") or {}
+    return {
+        "workers": max(1, int(workers or conf.get("workers") or DEFAULT_WORKERS)),
+        "rate_per_minute": float(rate or conf.get("rate_per_minute") or DEFAULT_RATE_PER_MINUTE),
+        "retries": max(0, int(conf.get("retries", DEFAULT_RETRIES))),
+    }
+
+
+def user_url(user: dict) -> str:
+    """博主主页 URL（优先 sec_user_id）"""
+    sec_user_id = user.get("sec_user_id") or ""
+    if sec_user_id.startswith("MS4w"):
+        return f"https://www.douyin.com/user/{sec_user_id}"
+    return f"https://www.douyin.com/user/{user.get('uid')}"
+
+
+class HostRateLimiter:
+    """按主机的任务启动限速：同一主机相邻两次启动至少间隔 60/rate 秒"""
+
+    def __init__(self, rate_per_minute: float):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.next_slot: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, host: str, stop: threading.Event) -> bool:
+        """预约下一个启动时隙并等待到点；stop 被置位时提前返回 False"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        return not stop.wait(max(0.0, slot - time.monotonic()))
+
+
+class DownloadQueue:
+    """持久化任务队列：{批次, 创建时间, 参数, 任务: [...]}，每次状态变化原子落盘"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.data = {"batch": path.stem, "created": None, "max_counts": None, "tasks": []}
+        self.lock = threading.RLock()
+        if path.exists():
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+
+    @property
+    def tasks(self) -> List[dict]:
+        return self.data["tasks"]
+
+    def unfinished(self) -> int:
+        return sum(1 for t in self.tasks if t["status"] in (PENDING, RUNNING))
+
+    def reset(self, users: List[dict], max_counts: Optional[int]):
+        """新建批次：按陈旧度排序（从未获取 > 最久未获取）"""
+        self.data = {"batch": self.path.stem, "created": datetime.now().isoformat(),
+                     "max_counts": max_counts, "tasks": []}
+        self.extend(users)
+
+    def extend(self, users: List[dict]) -> int:
+        """追加队列里还没有的博主（续跑时关注列表可能新增了人），返回新增数"""
+        known = {t["uid"] for t in self.tasks}
+        added = 0
+        for user in users:
+            uid = user.get("uid")
+            if not uid or uid in known:
+                continue
+            known.add(uid)
+            self.tasks.append({
+                "uid": uid,
+                "name": user.get("nickname") or user.get("name") or uid,
+                "url": user_url(user),
+                "last_fetch_time": user.get("last_fetch_time"),
+                "status": PENDING,
+                "attempts": 0,
+                "not_before": 0,
+                "started": None,
+                "finished": None,
+                "log": None,
+            })
+            added += 1
+        self.tasks.sort(key=lambda t: (t["status"] != PENDING, t["last_fetch_time"] or ""))
+        return added
+
+    def recover(self) -> int:
+        """上次中断时仍在运行的任务退回排队，返回数量"""
+        n = 0
+        for t in self.tasks:
+            if t["status"] == RUNNING:
+                t["status"] = PENDING
+                n += 1
+        return n
+
+    def save(self):
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.path)
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def counts(self) -> Dict[str, int]:
+        c = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for t in self.tasks:
+            c[t["status"]] += 1
+        return c
+
+
+class DownloadScheduler:
+    """有界并发执行 DownloadQueue 中的任务"""
+
+    def __init__(self, queue: DownloadQueue, download_script: Path, skill_dir: Path, downloads_path: Path,
+                 workers: int, rate_per_minute: float, retries: int):
+        self.queue = queue
+        self.download_script = download_script
+        self.skill_dir = skill_dir
+        self.downloads_path = downloads_path
+        self.workers = workers
+        self.retries = retries
+        self.limiter = HostRateLimiter(rate_per_minute)
+        self.stop = threading.Event()
+        self.procs: Dict[str, subprocess.Popen] = {}
+        self.print_lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.durations: List[float] = []
+
+    def log(self, msg: str):
+        with self.print_lock:
+            print(msg, flush=True)
+
+    def _next_task(self) -> Optional[dict]:
+        """取下一个可执行任务（排队顺序即优先级）；只剩退避中的任务时等待，全部结束返回 None"""
+        while not self.stop.is_set():
+            with self.queue.lock:
+                now = time.time()
+                pending = [t for t in self.queue.tasks if t["status"] == PENDING]
+                if not pending:
+                    return None
+                ready = next((t for t in pending if t["not_before"] <= now), None)
+                if ready:
+                    ready["status"] = RUNNING
+                    self.queue.save()
+                    return ready
+                wait = min(t["not_before"] for t in pending) - now
+            self.stop.wait(min(wait, 5))
+        return None
+
+    def _run_task(self, task: dict) -> int:
+        task_id = f"douyin-{task['uid']}-{int(time.time())}"
+        log_dir = self.downloads_path / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        log_file = log_dir / f"{task_id}.log"
+        staging = self.downloads_path / ".staging" / task_id
+        cmd = [sys.executable, str(self.download_script), task["url"], f"--staging={staging}", "--no-sync"]
+        if self.queue.data.get("max_counts") is not None:
+            cmd.append(f"--max-counts={self.queue.data['max_counts']}")
+        with self.queue.lock:
+            task["started"] = datetime.now().isoformat()
+            task["log"] = str(log_file)
+            task["attempts"] += 1
+            self.queue.save()
+        with open(log_file, "w", encoding="utf-8") as out:
+            out.write(f"[任务创建] {task_id}\n[UID] {task['uid']}\n[昵称] {task['name']}\n[URL] {task['url']}\n")
+            out.write(f"[时间] {time.strftime('%Y-%m-%d %H:%M:%S')}\n" + "=" * 60 + "\n")
+            out.flush()
+            proc = subprocess.Popen(cmd, cwd=str(self.skill_dir), stdout=out, stderr=subprocess.STDOUT)
+            self.procs[task["uid"]] = proc
+            try:
+                return proc.wait()
+            finally:
+                self.procs.pop(task["uid"], None)
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _worker(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            host = urlparse(task["url"]).netloc
+            if not self.limiter.acquire(host, self.stop):
+                with self.queue.lock:
+                    task["status"] = PENDING
+                    self.queue.save()
+                return
+            began = time.monotonic()
+            code = self._run_task(task)
+            if self.stop.is_set():  # 被中断：退回排队，下次续跑
+                with self.queue.lock:
+                    task["status"] = PENDING
+                    task["attempts"] -= 1
+                    self.queue.save()
+                return
+            with self.queue.lock:
+                task["finished"] = datetime.now().isoformat()
+                task["returncode"] = code
+                if code == 0:
+                    task["status"] = DONE
+                    self.durations.append(time.monotonic() - began)
+                elif task["attempts"] <= self.retries:
+                    task["status"] = PENDING
+                    task["not_before"] = time.time() + RETRY_BACKOFF * 2 ** (task["attempts"] - 1)
+                else:
+                    task["status"] = FAILED
+                self.queue.save()
+            if code == 0:
+                self.log(f"  ✅ {task['name']}")
+            else:
+                retry = "，稍后重试" if task["status"] == PENDING else ""
+                self.log(f"  ❌ {task['name']}（退出码 {code}{retry}）日志: {task['log']}")
+
+    def progress_line(self) -> str:
+        c = self.queue.counts()
+        total = len(self.queue.tasks)
+        elapsed = time.monotonic() - self.started_at
+        line = (f"[进度] 完成 {c[DONE]}/{total} · 运行 {c[RUNNING]} · 失败 {c[FAILED]} · "
+                f"排队 {c[PENDING]} · 已用 {format_duration(elapsed)}")
+        if self.durations and c[PENDING] + c[RUNNING]:
+            avg = sum(self.durations) / len(self.durations)
+            line += f" · 预计剩余 {format_duration(avg * (c[PENDING] + c[RUNNING]) / self.workers)}"
+        return line
+
+    def run(self) -> Dict[str, int]:
+        """阻塞执行至队列清空；Ctrl+C 终止运行中的子进程并保留断点"""
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for th in threads:
+            th.start()
+        try:
+            while any(th.is_alive() for th in threads):
+                for th in threads:
+                    th.join(timeout=PROGRESS_INTERVAL / len(threads))
+                if any(th.is_alive() for th in threads):
+                    self.log(self.progress_line())
+        except KeyboardInterrupt:
+            self.stop.set()
+            for proc in list(self.procs.values()):
+                proc.terminate()
+            for th in threads:
+                th.join(timeout=10)
+            self.queue.recover()
+            self.queue.save()
+            self.log(f"\n⏸️  已中断，队列已保存: {self.queue.path}")
+            self.log("   再次运行同一命令即从断点继续")
+            raise
+        return self.queue.counts()
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds // 60 % 60:02d}m"
+
+
+def print_status(queue: DownloadQueue):
+    """打印持久化队列的当前状态（后台批次运行中也可查看）"""
+    if not queue.tasks:
+        print(f"📋 没有批次记录: {queue.path}")
+        return
+    c = queue.counts()
+    print(f"📋 批次 {queue.data.get('batch')}（创建于 {queue.data.get('created')}）")
+    print(f"   完成 {c[DONE]}/{len(queue.tasks)} · 运行 {c[RUNNING]} · 失败 {c[FAILED]} · 排队 {c[PENDING]}")
+    for t in queue.tasks:
+        if t["status"] == RUNNING:
+            print(f"   ⏳ {t['name']}（第 {t['attempts']} 次）日志: {t['log']}")
+    for t in queue.tasks:
+        if t["status"] == FAILED:
+            print(f"   ❌ {t['name']} 日志: {t['log']}")
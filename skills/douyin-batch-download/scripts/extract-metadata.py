@@ -32,44 +32,19 @@ from typing import Dict, List
 SKILL_DIR = Path(__file__).parent.parent.resolve()
 os.chdir(SKILL_DIR)
 
-DB_PATH = SKILL_DIR / "douyin_users.db"
+from utils.db import (
+    ensure_video_metadata_schema,
+    get_conn,
+    upsert_video_metadata,
+)
+
 F2_VIDEO_DB_PATH = SKILL_DIR / "douyin_videos.db"
 CONFIG_PATH = SKILL_DIR / "config" / "config.yaml"
 
 
 def create_metadata_table():
     """创建视频元数据表"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS video_metadata (
-            aweme_id TEXT PRIMARY KEY,
-            uid TEXT NOT NULL,
-            desc TEXT,
-            create_time INTEGER,
-            duration INTEGER,
-            digg_count INTEGER DEFAULT 0,
-            comment_count INTEGER DEFAULT 0,
-            collect_count INTEGER DEFAULT 0,
-            share_count INTEGER DEFAULT 0,
-            play_count INTEGER DEFAULT 0,
-            local_filename TEXT,
-            file_size INTEGER,
-            fetch_time INTEGER
-        )
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_video_uid ON video_metadata(uid)
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_video_digg ON video_metadata(digg_count DESC)
-    """)
-
-    conn.commit()
-    conn.close()
+    ensure_video_metadata_schema()
     print("✅ 元数据表已创建/验证")
 
 
@@ -157,43 +132,29 @@ def scan_local_videos() -> Dict[str, Dict]:
     return videos
 
 
+# 本脚本写入的列（nickname 由 download-v2.py 维护，不覆盖）
+METADATA_COLUMNS = (
+    "aweme_id", "uid", "desc", "create_time", "duration",
+    "digg_count", "comment_count", "collect_count", "share_count", "play_count",
+    "local_filename", "file_size", "fetch_time",
+)
+METADATA_DEFAULTS = {
+    "uid": "", "desc": "", "create_time": 0, "duration": 0,
+    "digg_count": 0, "comment_count": 0, "collect_count": 0, "share_count": 0, "play_count": 0,
+    "local_filename": "", "file_size": 0,
+}
+
+
 def save_metadata(videos: List[Dict]):
-    """保存元数据到数据库"""
+    """保存元数据到数据库（单事务批量 upsert）"""
     if not videos:
         print("⚠️ 没有视频元数据需要保存")
         return
 
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
-
     fetch_time = int(datetime.now().timestamp())
-
-    for video in videos:
-        cursor.execute("""
-            INSERT OR REPLACE INTO video_metadata
-            (aweme_id, uid, desc, create_time, duration,
-             digg_count, comment_count, collect_count, share_count, play_count,
-             local_filename, file_size, fetch_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            video.get("aweme_id"),
-            video.get("uid", ""),
-            video.get("desc", ""),
-            video.get("create_time", 0),
-            video.get("duration", 0),
-            video.get("digg_count", 0),
-            video.get("comment_count", 0),
-            video.get("collect_count", 0),
-            video.get("share_count", 0),
-            video.get("play_count", 0),
-            video.get("local_filename", ""),
-            video.get("file_size", 0),
-            fetch_time
-        ))
-
-    conn.commit()
-    conn.close()
-    print(f"✅ 已保存 {len(videos)} 条视频元数据")
+    rows = [{**METADATA_DEFAULTS, **video, "fetch_time": fetch_time} for video in videos]
+    saved = upsert_video_metadata(rows, METADATA_COLUMNS)
+    print(f"✅ 已保存 {saved} 条视频元数据")
 
 
 def get_cookie_from_config() -> str:
@@ -210,11 +171,7 @@ def get_cookie_from_config() -> str:
 def get_sec_user_id_from_db(uid: str) -> str:
     """从数据库获取 sec_user_id"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        cursor.execute("SELECT sec_user_id FROM user_info_web WHERE uid = ?", (uid,))
-        result = cursor.fetchone()
-        conn.close()
+        result = get_conn().execute("SELECT sec_user_id FROM user_info_web WHERE uid = ?", (uid,)).fetchone()
         return result[0] if result else ""
     except Exception:
         return ""
@@ -327,8 +284,7 @@ async def fetch_video_stats_from_user_page(sec_user_id: str, delay: float = 2.0)
 
 def get_stats_summary() -> Dict:
     """获取统计摘要"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
+    cursor = get_conn().cursor()
 
     # 视频总数
     cursor.execute("SELECT COUNT(*) FROM video_metadata")
@@ -350,8 +306,7 @@ def get_stats_summary() -> Dict:
         ORDER BY total_diggs DESC
     """)
     user_stats = cursor.fetchall()
-
-    conn.close()
+    cursor.close()
 
     return {
         "total_videos": total_videos,
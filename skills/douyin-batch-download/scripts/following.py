@@ -6,8 +6,10 @@ following.json 统一读写模块
 数据格式: {users: [{uid, nickname, folder, ...}, ...]}
 """
 
+import contextlib
 import json
-import sqlite3
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -16,6 +18,12 @@ from typing import Optional
 SKILL_DIR = Path(__file__).parent.parent.resolve()
 FOLLOWING_PATH = SKILL_DIR / "config" / "following.json"
 DB_PATH = SKILL_DIR / "douyin_users.db"
+LOCK_PATH = SKILL_DIR / "config" / ".following.lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows 无 flock：退化为不加锁（单进程使用不受影响）
+    fcntl = None
 
 # 导入配置工具
 try:
@@ -48,11 +56,39 @@ def load_following() -> dict:
     return {"users": []}
 
 
+@contextlib.contextmanager
+def following_lock():
+    """following.json 读-改-写的进程间互斥
+
+    批量下载调度器会并发运行多个 download-v2.py，各自回写 last_fetch_time；
+    不加锁时后写者会用旧快照覆盖先写者的更新。同一进程内不可嵌套使用。
+    """
+    if fcntl is None:
+        yield
+        return
+    LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_PATH, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
 def save_following(data: dict):
-    """保存 following.json"""
+    """保存 following.json（临时文件 + 原子替换，并发读取方不会读到半个文件）"""
     FOLLOWING_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(FOLLOWING_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    fd, tmp = tempfile.mkstemp(dir=str(FOLLOWING_PATH.parent), prefix=".following.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, FOLLOWING_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def _find_user_index(data: dict, uid: str) -> int:
@@ -90,6 +126,11 @@ def add_user(uid: str, info: dict, merge: bool = True) -> bool:
     Returns:
         True=新增, False=更新已有用户
     """
+    with following_lock():
+        return _add_user_locked(uid, info, merge)
+
+
+def _add_user_locked(uid: str, info: dict, merge: bool) -> bool:
     data = load_following()
     index = _find_user_index(data, uid)
 
@@ -132,14 +173,15 @@ def add_user(uid: str, info: dict, merge: bool = True) -> bool:
 
 def remove_user(uid: str) -> bool:
     """删除用户，返回是否成功"""
-    data = load_following()
-    index = _find_user_index(data, uid)
-
-    if index >= 0:
-        del data["users"][index]
-        save_following(data)
-        return True
-    return False
+    with following_lock():
+        data = load_following()
+        index = _find_user_index(data, uid)
+
+        if index >= 0:
+            del data["users"][index]
+            save_following(data)
+            return True
+        return False
 
 
 def update_fetch_time(uid: str, nickname: str = ""):
@@ -149,18 +191,19 @@ def update_fetch_time(uid: str, nickname: str = ""):
         uid: 用户 ID
         nickname: 用户昵称（可选，用于更新 folder 字段）
     """
-    data = load_following()
-    index = _find_user_index(data, uid)
+    with following_lock():
+        data = load_following()
+        index = _find_user_index(data, uid)
 
-    if index >= 0:
-        data["users"][index]["last_fetch_time"] = datetime.now().isoformat()
-        # 如果提供了 nickname，也更新 folder
-        if nickname:
-            data["users"][index]["folder"] = sanitize_folder_name(nickname)
-            # 如果 nickname 字段为空，也更新它
-            if not data["users"][index].get("nickname"):
-                data["users"][index]["nickname"] = nickname
-        save_following(data)
+        if index >= 0:
+            data["users"][index]["last_fetch_time"] = datetime.now().isoformat()
+            # 如果提供了 nickname，也更新 folder
+            if nickname:
+                data["users"][index]["folder"] = sanitize_folder_name(nickname)
+                # 如果 nickname 字段为空，也更新它
+                if not data["users"][index].get("nickname"):
+                    data["users"][index]["nickname"] = nickname
+            save_following(data)
 
 
 def create_empty_user(uid: str, sec_user_id: str = "") -> dict:
@@ -193,8 +236,8 @@ def update_user_info_from_db(uid: str, last_fetch_time: str = None) -> bool:
         是否成功更新
     """
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
+        from utils.db import get_conn
+        cursor = get_conn().cursor()
 
         # 先尝试用 uid 查找
         cursor.execute("""
@@ -213,7 +256,7 @@ def update_user_info_from_db(uid: str, last_fetch_time: str = None) -> bool:
             """, (uid,))
             result = cursor.fetchone()
 
-        conn.close()
+        cursor.close()
 
         if not result:
             return False
@@ -3,9 +3,20 @@
 """
 数据生成脚本 - 扫描下载目录和 following.json，生成前端可用数据
 包含视频元数据（点赞、评论、收藏、分享数）
+
+用法：
+    python scripts/generate-data.py              # 增量更新视频库索引并生成 data.js
+    python scripts/generate-data.py --sharded    # data.js 只含博主列表，视频按博主分片按需加载
+    python scripts/generate-data.py --full       # 丢弃索引，全量重扫下载目录
+
+输出：
+    data.js                  window.APP_DATA（博主列表、汇总；默认同时内嵌全部视频）
+    data/users/<博主>.js     每个博主一个分片：window.APP_SHARDS[folder] = [视频...]
+                             页面用 window.loadUserVideos(folder) 按需加载（file:// 下以 <script> 注入）
 """
+import argparse
+import hashlib
 import json
-import re
 import sqlite3
 import sys
 import os
@@ -21,7 +32,10 @@ from utils.config import (
     get_download_path,
     get_db_path,
     get_following_path,
+    sanitize_folder_name,
 )
+from utils.db import ensure_video_metadata_schema, fetch_video_metadata, get_conn
+from library_index import update_index
 
 # 技能目录
 SKILL_DIR = Path(__file__).parent.parent.resolve()
@@ -30,6 +44,7 @@ DOWNLOADS_PATH = get_download_path()
 FOLLOWING_PATH = get_following_path()
 DB_PATH = get_db_path()
 OUTPUT_PATH = DOWNLOADS_PATH / "data.js"
+SHARD_DIR = "data/users"  # 相对 DOWNLOADS_PATH
 
 # index.html 模板位置
 INDEX_TEMPLATE = SKILL_DIR / "downloads" / "index.html"
@@ -47,42 +62,6 @@ def copy_index_template():
     return False
 
 
-def extract_aweme_id(filename: str) -> str:
-    """从文件名提取 aweme_id
-
-    文件名格式: {时间戳}_{描述}_{aweme_id}_video.mp4
-    例如: 2023-09-11 20-55-58_描述_7277551294787620150_video.mp4
-
-    注意：描述中可能包含下划线，所以需要找所有纯数字段，然后选择合适的
-    aweme_id 通常是 18-19 位数字，以 7 开头
-    """
-    stem = Path(filename).stem
-
-    # 移除末尾的 _video
-    stem = re.sub(r'_video$', '', stem)
-
-    # 找所有纯数字段
-    parts = stem.split("_")
-    numeric_parts = []
-
-    for part in parts:
-        part = part.strip()
-        # 检查是否是纯数字且长度 >= 15 (aweme_id 通常是 18-19 位)
-        if part.isdigit() and len(part) >= 15:
-            numeric_parts.append(part)
-
-    # 如果找到纯数字段，返回最长的那个（应该是 aweme_id）
-    if numeric_parts:
-        return max(numeric_parts, key=len)
-
-    # 回退方案：使用正则表达式找最长的数字串（15位以上）
-    matches = re.findall(r'\d{15,}', stem)
-    if matches:
-        return max(matches, key=len)
-
-    return stem  # 最后返回文件名
-
-
 def format_size(bytes_size):
     """格式化文件大小"""
     if bytes_size < 1024:
@@ -104,95 +83,149 @@ def format_number(num):
 
 
 def get_video_metadata():
-    """从数据库获取视频元数据"""
-    if not DB_PATH.exists():
-        return {}
-
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
-
+    """从数据库获取视频元数据（以 aweme_id 为键）"""
     try:
-        # 检查 video_metadata 表是否存在
-        cursor.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name='video_metadata'
-        """)
-        if not cursor.fetchone():
-            conn.close()
-            return {}
-
-        cursor.execute("""
-            SELECT
-                aweme_id, uid, nickname, desc, create_time, duration,
-                digg_count, comment_count, collect_count, share_count, play_count,
-                local_filename, file_size, fetch_time
-            FROM video_metadata
-        """)
-        rows = cursor.fetchall()
-        conn.close()
-
-        # 以 aweme_id 为键建立索引
-        metadata = {}
-        for row in rows:
-            aweme_id = row[0]
-            metadata[aweme_id] = {
-                "uid": row[1] or "",
-                "nickname": row[2] or "",
-                "desc": row[3] or "",
-                "create_time": row[4] or 0,
-                "duration": row[5] or 0,
-                "digg_count": row[6] or 0,
-                "comment_count": row[7] or 0,
-                "collect_count": row[8] or 0,
-                "share_count": row[9] or 0,
-                "play_count": row[10] or 0,
-                "local_filename": row[11] or "",
-                "file_size": row[12] or 0,
-                "fetch_time": row[13] or 0,
-            }
-        return metadata
+        metadata = fetch_video_metadata()
     except sqlite3.OperationalError:
-        conn.close()
         return {}
+    text_fields = ("uid", "nickname", "desc", "local_filename")
+    for meta in metadata.values():
+        for key, value in meta.items():
+            if value is None:
+                meta[key] = "" if key in text_fields else 0
+    return metadata
+
+
+# 索引 LEFT JOIN 元数据：m.aweme_id 非空即"有统计数据"
+VIDEO_QUERY = """
+    SELECT f.path, f.folder, f.size, f.aweme_id, m.aweme_id,
+           m.digg_count, m.comment_count, m.collect_count, m.share_count, m.play_count,
+           m.desc, m.create_time, m.duration, m.nickname
+    FROM library_files f
+    LEFT JOIN video_metadata m ON m.aweme_id = f.aweme_id
+"""
 
 
-def scan_videos_from_root(metadata: dict):
-    """扫描下载目录下所有子目录中的视频文件"""
-    videos = []
-    # 扫描所有子目录中的 mp4 文件
-    for video_file in sorted(DOWNLOADS_PATH.rglob("*.mp4")):
-        stat = video_file.stat()
-        # 获取视频文件的直接父目录名作为 folder (即博主昵称)
-        parent_dir = video_file.parent.name
-
-        # 提取 aweme_id
-        aweme_id = extract_aweme_id(video_file.name)
+def video_entry(row) -> dict:
+    """索引行 → 前端视频对象（字段与原先逐文件扫描时一致）"""
+    (path, folder, size, aweme_id, meta_id,
+     digg, comment, collect, share, play, desc, create_time, duration, nickname) = row
+    video_data = {
+        "name": path.rsplit("/", 1)[-1][:-len(".mp4")],  # 索引只收录 .mp4
+        "aweme_id": aweme_id,
+        "size": size,
+        "folder": folder,
+    }
 
-        video_data = {
-            "name": video_file.stem,
-            "aweme_id": aweme_id,
-            "size": stat.st_size,
-            "folder": parent_dir,
+    # 合并元数据
+    if meta_id is not None:
+        video_data["stats"] = {
+            "digg_count": digg or 0,
+            "comment_count": comment or 0,
+            "collect_count": collect or 0,
+            "share_count": share or 0,
+            "play_count": play or 0,
         }
+        video_data["desc"] = desc or ""
+        video_data["create_time"] = create_time or 0
+        video_data["duration"] = duration or 0
+        if nickname:
+            video_data["nickname"] = nickname
+    return video_data
 
-        # 合并元数据
-        if aweme_id in metadata:
-            meta = metadata[aweme_id]
-            video_data["stats"] = {
-                "digg_count": meta["digg_count"],
-                "comment_count": meta["comment_count"],
-                "collect_count": meta["collect_count"],
-                "share_count": meta["share_count"],
-                "play_count": meta["play_count"],
-            }
-            video_data["desc"] = meta["desc"]
-            video_data["create_time"] = meta["create_time"]
-            video_data["duration"] = meta["duration"]
-            if meta["nickname"]:
-                video_data["nickname"] = meta["nickname"]
 
-        videos.append(video_data)
-    return videos
+def scan_videos_from_root():
+    """下载目录下所有视频（来自增量索引，不再逐个 stat）"""
+    return [video_entry(row) for row in get_conn().execute(VIDEO_QUERY + " ORDER BY f.path")]
+
+
+def shard_file(folder: str) -> str:
+    """博主分片的相对路径（昵称清理后 + 短哈希，避免清理后重名）"""
+    digest = hashlib.blake2b(folder.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{SHARD_DIR}/{sanitize_folder_name(folder)}-{digest}.js"
+
+
+def write_shards(force: bool = False) -> dict:
+    """按博主写分片，签名（文件数/大小/mtime/元数据抓取时间）未变的分片跳过
+
+    Returns:
+        folder -> {"file", "video_count", "total_size", "with_stats", "stats"}
+    """
+    conn = get_conn()
+    signatures = {
+        folder: "|".join(str(v) for v in rest)
+        for folder, *rest in conn.execute("""
+            SELECT f.folder, COUNT(*), SUM(f.size), MAX(f.mtime), COUNT(m.aweme_id),
+                   MAX(m.fetch_time), TOTAL(m.digg_count)
+            FROM library_files f
+            LEFT JOIN video_metadata m ON m.aweme_id = f.aweme_id
+            GROUP BY f.folder
+        """)
+    }
+    existing = {folder: (signature, file, summary) for folder, signature, file, summary in
+                conn.execute("SELECT folder, signature, file, summary FROM library_shards")}
+
+    shards, written = {}, 0
+    for folder, signature in signatures.items():
+        old = existing.get(folder)
+        if (not force and old and old[0] == signature and old[2]
+                and (DOWNLOADS_PATH / old[1]).exists()):
+            shards[folder] = json.loads(old[2])
+            continue
+
+        videos = [video_entry(row) for row in
+                  conn.execute(VIDEO_QUERY + " WHERE f.folder = ? ORDER BY f.path", (folder,))]
+        rel = shard_file(folder)
+        path = DOWNLOADS_PATH / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("window.APP_SHARDS = window.APP_SHARDS || {};\n")
+            f.write(f"window.APP_SHARDS[{json.dumps(folder, ensure_ascii=False)}] = ")
+            f.write(json.dumps(videos, ensure_ascii=False, separators=(",", ":")))
+            f.write(";\n")
+        os.replace(tmp, path)
+
+        summary = {
+            "file": rel,
+            "video_count": len(videos),
+            "total_size": sum(v["size"] for v in videos),
+            "with_stats": sum(1 for v in videos if "stats" in v),
+            "stats": calculate_user_stats(videos),
+        }
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO library_shards (folder, signature, file, summary) VALUES (?, ?, ?, ?)",
+                         (folder, signature, rel, json.dumps(summary, ensure_ascii=False)))
+        shards[folder] = summary
+        written += 1
+
+    # 清理已消失博主的分片
+    for folder, (_, file, _) in existing.items():
+        if folder not in signatures:
+            (DOWNLOADS_PATH / file).unlink(missing_ok=True)
+            with conn:
+                conn.execute("DELETE FROM library_shards WHERE folder = ?", (folder,))
+
+    print(f"分片: {len(shards)} 个博主，重写 {written} 个")
+    return shards
+
+
+# data.js 中的按需加载函数：以 <script> 注入分片（file:// 下 fetch 不可用）
+SHARD_LOADER = """
+window.APP_SHARDS = window.APP_SHARDS || {};
+window.loadUserVideos = function (folder) {
+  if (window.APP_SHARDS[folder]) return Promise.resolve(window.APP_SHARDS[folder]);
+  var shard = (window.APP_DATA.shards || {})[folder];
+  if (!shard) return Promise.resolve([]);
+  return new Promise(function (resolve, reject) {
+    var s = document.createElement("script");
+    s.src = shard.file;
+    s.onload = function () { resolve(window.APP_SHARDS[folder] || []); };
+    s.onerror = reject;
+    document.head.appendChild(s);
+  });
+};
+"""
 
 
 def scan_user_videos(user_folder: str, metadata: dict):
@@ -263,6 +296,11 @@ def calculate_user_stats(videos: list) -> dict:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="生成 Web 界面数据文件")
+    parser.add_argument("--sharded", action="store_true", help="data.js 不内嵌视频列表，仅按博主分片")
+    parser.add_argument("--full", action="store_true", help="丢弃索引，全量重扫下载目录并重写所有分片")
+    args = parser.parse_args()
+
     print("开始生成数据文件...")
 
     # 1. 读取 following.json
@@ -273,25 +311,30 @@ def main():
     with open(FOLLOWING_PATH, "r", encoding="utf-8") as f:
         following = json.load(f)
 
-    # 2. 获取视频元数据
-    metadata = get_video_metadata()
-    print(f"从数据库读取 {len(metadata)} 条视频元数据")
+    # 2. 增量更新视频库索引（目录 mtime 未变的目录不重新列出）
+    ensure_video_metadata_schema()
+    index_stats = update_index(DOWNLOADS_PATH, full=args.full)
+    print(f"索引: {index_stats['dirs']} 个目录，重扫 {index_stats['rescanned']} 个，"
+          f"新增/变化 {index_stats['changed']} 个视频，移除 {index_stats['removed']} 个")
+
+    # 3. 按博主写分片（未变化的跳过），汇总来自分片摘要
+    shards = write_shards(force=args.full)
 
-    # 3. 初始化数据结构
+    # 4. 初始化数据结构
     data = {
         "generated_at": datetime.now().isoformat(),
         "download_path": str(DOWNLOADS_PATH),
+        "sharded": args.sharded,
+        "shards": {folder: {"file": s["file"], "video_count": s["video_count"]} for folder, s in shards.items()},
         "users": [],
         "videos": []
     }
 
-    # 4. 先扫描根目录下的所有视频
-    all_videos = scan_videos_from_root(metadata)
-
     # 5. 构建用户数据
     # 支持两种 following.json 格式：
     #   - 旧格式：单个用户对象，uid 作为键
     #   - 新格式：users 数组
+    empty = {"video_count": 0, "stats": calculate_user_stats([])}
 
     if following.get("users") and isinstance(following["users"], list):
         # 新格式：users 是数组
@@ -303,30 +346,33 @@ def main():
             if not uid:
                 continue
 
-            # 从根目录扫描结果中筛选该用户的视频（按 folder 匹配）
-            user_videos = [v for v in all_videos if v["folder"] == folder]
-            user_stats = calculate_user_stats(user_videos)
+            # 该用户的视频（按 folder 匹配）汇总自分片
+            shard = shards.get(folder, empty)
 
             data["users"].append({
                 "uid": uid,
                 "name": nickname,
                 "folder": folder,
                 "avatar_url": user.get("avatar_url", ""),
-                "video_count": len(user_videos),
-                "stats": user_stats
+                "video_count": shard["video_count"],
+                "stats": shard["stats"]
             })
     else:
         # 旧格式：单个用户对象，uid 作为键
+        metadata = None
         for uid, user_info in following.items():
             # 跳过非用户字段（如"说明"）
             if isinstance(user_info, dict) and user_info.get("uid"):
                 nickname = user_info.get("nickname", user_info.get("name", ""))
                 folder = user_info.get("folder", nickname or uid)
 
-                # 从根目录扫描结果中筛选该用户的视频（按 folder 匹配）
-                user_videos = [v for v in all_videos if v["folder"] == folder]
+                # 索引中该用户的视频（按 folder 匹配）
+                user_videos = [video_entry(row) for row in
+                               get_conn().execute(VIDEO_QUERY + " WHERE f.folder = ? ORDER BY f.path", (folder,))]
 
                 # 同时从用户目录扫描（如果存在）
+                if metadata is None:
+                    metadata = get_video_metadata()
                 subdir_videos = scan_user_videos(folder, metadata)
                 user_videos.extend(subdir_videos)
 
@@ -341,21 +387,26 @@ def main():
                     "stats": user_stats
                 })
 
-    data["videos"] = all_videos
+    if not args.sharded:
+        data["videos"] = scan_videos_from_root()
 
     # 6. 计算总大小和总统计
-    total_size = sum(v["size"] for v in data["videos"])
-    videos_with_stats = sum(1 for v in data["videos"] if "stats" in v)
-    total_diggs = sum(v.get("stats", {}).get("digg_count", 0) for v in data["videos"])
+    total_videos = sum(s["video_count"] for s in shards.values())
+    total_size = sum(s["total_size"] for s in shards.values())
+    videos_with_stats = sum(s["with_stats"] for s in shards.values())
+    total_diggs = sum(s["stats"]["total_diggs"] for s in shards.values())
 
     # 7. 写入 data.js
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+    tmp = OUTPUT_PATH.with_name(OUTPUT_PATH.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         f.write("// 自动生成 - " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n")
-        f.write(f"// 视频总数: {len(data['videos'])}, 有统计: {videos_with_stats}, 总点赞: {format_number(total_diggs)}\n")
+        f.write(f"// 视频总数: {total_videos}, 有统计: {videos_with_stats}, 总点赞: {format_number(total_diggs)}\n")
         f.write("window.APP_DATA = ")
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))  # dumps 走 C 编码器
         f.write(";\n")
+        f.write(SHARD_LOADER)
+    os.replace(tmp, OUTPUT_PATH)
 
     # 8. 复制 index.html 模板
     copied = copy_index_template()
@@ -363,7 +414,7 @@ def main():
     print(f"✅ 数据已生成: {OUTPUT_PATH}")
     print(f"   下载目录: {DOWNLOADS_PATH}")
     print(f"   博主: {len(data['users'])}")
-    print(f"   视频: {len(data['videos'])}")
+    print(f"   视频: {total_videos}" + ("（按博主分片，未内嵌）" if args.sharded else ""))
     print(f"   有统计数据的视频: {videos_with_stats}")
     print(f"   总大小: {format_size(total_size)}")
     print(f"   总点赞: {format_number(total_diggs)}")
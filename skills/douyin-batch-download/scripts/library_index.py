@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地视频库增量索引
+
+generate-data.py 原先每次 rglob 整个下载目录并 stat 每个 mp4；本模块把文件清单
+（相对路径、大小、mtime、aweme_id）持久化到 douyin_users.db：
+
+- library_dirs：每个目录的 mtime_ns 与父目录；目录 mtime 未变 → 其直接文件与子目录清单未变，
+  跳过 listdir/stat，只沿已知子目录继续（10 万视频、几百个博主目录时只需 stat 几百个目录）
+- library_files：mp4 清单，与 video_metadata 同库，生成数据时直接 LEFT JOIN
+- library_shards：每个博主分片的签名与摘要，签名未变的分片不重写
+
+目录 mtime 只反映增删/改名，原地改写文件不会触发；刚修改过（2 秒内）的目录不记录 mtime，
+下次必然重扫。下载器整理完文件后调用 refresh_dir 即时更新对应目录；--full 强制全量重建。
+"""
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.db import get_conn
+
+# 目录 mtime 距今不足该秒数时不记录（同一时间片内的后续写入无法通过 mtime 察觉）
+RACY_WINDOW = 2.0
+
+
+def extract_aweme_id(filename: str) -> str:
+    """从文件名提取 aweme_id
+
+    文件名格式: {时间戳}_{描述}_{aweme_id}_video.mp4
+    例如: 2023-09-11 20-55-58_描述_7277551294787620150_video.mp4
+
+    注意：描述中可能包含下划线，所以需要找所有纯数字段，然后选择合适的
+    aweme_id 通常是 18-19 位数字，以 7 开头
+    """
+    stem = Path(filename).stem
+
+    # 移除末尾的 _video
+    stem = re.sub(r'_video$', '', stem)
+
+    # 找所有纯数字段
+    parts = stem.split("_")
+    numeric_parts = []
+
+    for part in parts:
+        part = part.strip()
+        # 检查是否是纯数字且长度 >= 15 (aweme_id 通常是 18-19 位)
+        if part.isdigit() and len(part) >= 15:
+            numeric_parts.append(part)
+
+    # 如果找到纯数字段，返回最长的那个（应该是 aweme_id）
+    if numeric_parts:
+        return max(numeric_parts, key=len)
+
+    # 回退方案：使用正则表达式找最长的数字串（15位以上）
+    matches = re.findall(r'\d{15,}', stem)
+    if matches:
+        return max(matches, key=len)
+
+    return stem  # 最后返回文件名
+
+
+def ensure_library_schema():
+    """确保索引表存在"""
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS library_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS library_dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS library_files (
+                path TEXT PRIMARY KEY,
+                dir TEXT NOT NULL,
+                folder TEXT NOT NULL,
+                size INTEGER,
+                mtime REAL,
+                aweme_id TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS library_shards (
+                folder TEXT PRIMARY KEY,
+                signature TEXT,
+                file TEXT,
+                summary TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_library_dirs_parent ON library_dirs(parent)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_library_files_dir ON library_files(dir)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_library_files_folder ON library_files(folder)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_library_files_aweme ON library_files(aweme_id)")
+
+
+def _reset(root: Path):
+    conn = get_conn()
+    with conn:
+        for table in ("library_dirs", "library_files", "library_shards"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("INSERT OR REPLACE INTO library_meta (key, value) VALUES ('root', ?)", (str(root),))
+
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+
+def _scan_dir(root: Path, rel: str) -> Tuple[Optional[int], List[str], Dict[str, Tuple[int, float]]]:
+    """列出单个目录：返回 (mtime_ns, 子目录, {mp4 相对路径: (size, mtime)})；目录不存在时 mtime_ns 为 None"""
+    path = root / rel if rel else root
+    try:
+        st = os.stat(path)
+        entries = list(os.scandir(path))
+    except (FileNotFoundError, NotADirectoryError):
+        return None, [], {}
+    subdirs, files = [], {}
+    for entry in entries:
+        if entry.name.startswith("."):  # .staging（调度器临时目录）等隐藏目录
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(_join(rel, entry.name))
+            elif entry.name.endswith(".mp4") and entry.is_file():
+                s = entry.stat()
+                files[_join(rel, entry.name)] = (s.st_size, s.st_mtime)
+        except OSError:
+            continue
+    mtime_ns = st.st_mtime_ns if time.time() - st.st_mtime > RACY_WINDOW else -1
+    return mtime_ns, subdirs, files
+
+
+def _apply_dir(root: Path, rel: str, parent: Optional[str], mtime_ns: int,
+               files: Dict[str, Tuple[int, float]]) -> Tuple[int, int]:
+    """把单个目录的扫描结果写入索引，返回 (新增/变化数, 删除数)"""
+    conn = get_conn()
+    old = {path: (size, mtime) for path, size, mtime in
+           conn.execute("SELECT path, size, mtime FROM library_files WHERE dir = ?", (rel,))}
+    folder = Path(rel).name if rel else root.name
+    changed = [(path, rel, folder, size, mtime, extract_aweme_id(Path(path).name))
+               for path, (size, mtime) in files.items() if old.get(path) != (size, mtime)]
+    removed = [(path,) for path in old if path not in files]
+    with conn:
+        if changed:
+            conn.executemany("""
+                INSERT OR REPLACE INTO library_files (path, dir, folder, size, mtime, aweme_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, changed)
+        if removed:
+            conn.executemany("DELETE FROM library_files WHERE path = ?", removed)
+        conn.execute("INSERT OR REPLACE INTO library_dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                     (rel, parent, mtime_ns))
+    return len(changed), len(removed)
+
+
+def _drop_dirs(rels: Iterable[str]) -> int:
+    """从索引删除已不存在的目录，返回随之删除的文件数"""
+    rels = [(rel,) for rel in rels]
+    if not rels:
+        return 0
+    conn = get_conn()
+    with conn:
+        removed = conn.executemany("DELETE FROM library_files WHERE dir = ?", rels).rowcount
+        conn.executemany("DELETE FROM library_dirs WHERE path = ?", rels)
+    return removed
+
+
+def update_index(root: Path, full: bool = False) -> Dict[str, int]:
+    """增量更新整个下载目录的索引
+
+    Returns:
+        统计：dirs（目录数）、rescanned（重新列出的目录数）、changed、removed
+    """
+    ensure_library_schema()
+    conn = get_conn()
+    row = conn.execute("SELECT value FROM library_meta WHERE key = 'root'").fetchone()
+    if full or not row or row[0] != str(root):
+        _reset(root)
+
+    known: Dict[str, int] = {}
+    children: Dict[str, List[str]] = {}
+    for path, parent, mtime_ns in conn.execute("SELECT path, parent, mtime_ns FROM library_dirs"):
+        known[path] = mtime_ns
+        if parent is not None:
+            children.setdefault(parent, []).append(path)
+
+    stats = {"dirs": 0, "rescanned": 0, "changed": 0, "removed": 0}
+    seen = set()
+    stack: List[Tuple[str, Optional[str]]] = [("", None)]
+    while stack:
+        rel, parent = stack.pop()
+        path = root / rel if rel else root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        seen.add(rel)
+        stats["dirs"] += 1
+        if known.get(rel) == mtime_ns:
+            stack.extend((child, rel) for child in children.get(rel, ()))
+            continue
+        mtime_ns, subdirs, files = _scan_dir(root, rel)
+        if mtime_ns is None:
+            seen.discard(rel)
+            continue
+        changed, removed = _apply_dir(root, rel, parent, mtime_ns, files)
+        stats["rescanned"] += 1
+        stats["changed"] += changed
+        stats["removed"] += removed
+        stack.extend((child, rel) for child in subdirs)
+
+    stats["removed"] += _drop_dirs(rel for rel in known if rel not in seen)
+    return stats
+
+
+def refresh_dir(root: Path, directory: Path) -> bool:
+    """下载器整理完文件后即时更新单个目录（目录不在 root 下或索引尚未建立时忽略）"""
+    try:
+        rel = directory.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return False
+    rel = "" if rel == "." else rel
+    ensure_library_schema()
+    row = get_conn().execute("SELECT value FROM library_meta WHERE key = 'root'").fetchone()
+    if not row or row[0] != str(root):
+        return False
+    mtime_ns, subdirs, files = _scan_dir(root, rel)
+    if mtime_ns is None:
+        return False
+    parent = None if not rel else ("" if "/" not in rel else rel.rsplit("/", 1)[0])
+    # 子目录清单只由 update_index 维护：清单有变化时不记录 mtime，下次重新列出该目录
+    known = {path for (path,) in get_conn().execute("SELECT path FROM library_dirs WHERE parent = ?", (rel,))}
+    _apply_dir(root, rel, parent, mtime_ns if set(subdirs) == known else -1, files)
+    return True
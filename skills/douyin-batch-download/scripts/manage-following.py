@@ -26,7 +26,6 @@
 import sys
 import re
 import asyncio
-import sqlite3
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -47,6 +46,7 @@ from following import (
     create_empty_user,
     FOLLOWING_PATH,
 )
+from utils.db import get_conn
 
 DOWNLOADS_PATH = SKILL_DIR / "downloads"
 DB_PATH = SKILL_DIR / "douyin_users.db"
@@ -101,8 +101,7 @@ def fetch_user_info_via_f2(url: str) -> dict:
 
     # 3. 从数据库读取用户信息（根据 sec_user_id 或 uid 查询）
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
+        cursor = get_conn().cursor()
 
         # 优先用 sec_user_id 查询，因为 URL 中通常只有这个
         if sec_id_from_url:
@@ -126,7 +125,7 @@ def fetch_user_info_via_f2(url: str) -> dict:
             """)
 
         row = cursor.fetchone()
-        conn.close()
+        cursor.close()
 
         if not row:
             print(f"     ❌ 数据库中未找到用户信息")
@@ -251,24 +250,19 @@ def remove_user_cmd(uid: str):
     db_cleaned = False
     if DB_PATH.exists():
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            # 删除 user_info_web 中的记录
-            cursor.execute("DELETE FROM user_info_web WHERE uid = ?", (uid,))
-            user_deleted = cursor.rowcount
-
-            # 也尝试用 sec_user_id 删除
-            if sec_user_id:
-                cursor.execute("DELETE FROM user_info_web WHERE sec_user_id = ?", (sec_user_id,))
-                user_deleted += cursor.rowcount
-
-            # 删除 video_metadata 中的记录
-            cursor.execute("DELETE FROM video_metadata WHERE uid = ?", (uid,))
-            video_deleted = cursor.rowcount
-
-            conn.commit()
-            conn.close()
+            conn = get_conn()
+            with conn:  # 单事务
+                # 删除 user_info_web 中的记录
+                user_deleted = conn.execute("DELETE FROM user_info_web WHERE uid = ?", (uid,)).rowcount
+
+                # 也尝试用 sec_user_id 删除
+                if sec_user_id:
+                    user_deleted += conn.execute(
+                        "DELETE FROM user_info_web WHERE sec_user_id = ?", (sec_user_id,)
+                    ).rowcount
+
+                # 删除 video_metadata 中的记录
+                video_deleted = conn.execute("DELETE FROM video_metadata WHERE uid = ?", (uid,)).rowcount
 
             if user_deleted > 0 or video_deleted > 0:
                 print(f"🗑️ 已清理数据库: 用户记录 {user_deleted} 条, 视频记录 {video_deleted} 条")
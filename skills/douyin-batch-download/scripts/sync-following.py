@@ -23,6 +23,7 @@ SKILL_DIR = Path(__file__).parent.parent.resolve()
 os.chdir(SKILL_DIR)
 
 from following import (
+    following_lock,
     load_following,
     save_following,
     add_user,
@@ -30,6 +31,7 @@ from following import (
     get_user,
     FOLLOWING_PATH,
 )
+from utils.db import get_conn
 
 DB_PATH = SKILL_DIR / "douyin_users.db"
 HTML_PATH = SKILL_DIR / "downloads" / "index.html"
@@ -41,15 +43,10 @@ VIDEO_ROOT = Path.home() / "Downloads" / "抖音视频下载"
 def get_user_info_from_db(uid):
     """从 F2 数据库获取用户信息"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        cursor.execute("""
+        return get_conn().execute("""
             SELECT uid, sec_user_id, nickname, avatar_url, signature, follower_count, following_count
             FROM user_info_web WHERE uid = ?
-        """, (uid,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        """, (uid,)).fetchone()
     except Exception:
         return None
 
@@ -89,19 +86,25 @@ def main():
         print(f"未找到 db: {DB_PATH}")
         return
 
+    # 全量重建期间持锁：并发下载进程回写的 last_fetch_time 不会被旧快照覆盖
+    with following_lock():
+        rebuild()
+
+
+def rebuild():
+    """db → following.json 全量重建（调用方持 following_lock）"""
     # 加载旧数据(按 sec_user_id 保留 last_fetch_time 等扩展字段)
     old_data = load_following()
     old_users = {u.get("sec_user_id"): u for u in old_data.get("users", [])}
 
     # 从 db 全量读博主(db 是真值,含 peer_type)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    rows = conn.execute("""
+    cursor = get_conn().cursor()
+    cursor.row_factory = sqlite3.Row
+    rows = cursor.execute("""
         SELECT uid, sec_user_id, nickname, avatar_url, signature,
                follower_count, following_count, peer_type
         FROM user_info_web
     """).fetchall()
-    conn.close()
 
     new_users = []
     for r in rows:
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一数据库访问层（douyin_users.db）
+
+所有脚本通过本模块访问数据库，而不是各自 sqlite3.connect：
+- 每个进程一个长连接（get_conn），退出时自动关闭
+- WAL 模式 + busy_timeout：并发下载器写入时，generate-data 等读取方不阻塞、不报 database is locked
+- video_metadata 建表/索引集中在 ensure_video_metadata_schema（uid / fetch_time 索引，aweme_id 为主键）
+- upsert_video_metadata：executemany 批量写入，一批一个事务；
+  只更新传入的列（下载时写统计数据不会清空 extract-metadata 写入的 local_filename / file_size）
+
+F2 自身（AsyncUserDB）另开连接写 user_info_web，WAL 为数据库文件级设置，对其同样生效。
+"""
+
+import atexit
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from utils.config import get_db_path
+
+BUSY_TIMEOUT = 30  # 秒：写锁被占用时的等待上限
+
+VIDEO_METADATA_COLUMNS = (
+    "aweme_id", "uid", "nickname", "desc", "create_time", "duration",
+    "digg_count", "comment_count", "collect_count", "share_count", "play_count",
+    "local_filename", "file_size", "fetch_time",
+)
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_schema_ready = False
+
+
+def get_conn() -> sqlite3.Connection:
+    """进程内共享的数据库连接（首次调用时打开并设置 WAL）"""
+    global _conn
+    with _lock:
+        if _conn is None:
+            db_path = get_db_path()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL 下 NORMAL 即可保证一致性
+            _conn = conn
+            atexit.register(close)
+        return _conn
+
+
+def close():
+    """关闭共享连接（进程退出时自动调用）"""
+    global _conn, _schema_ready
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+            _schema_ready = False
+
+
+def _quote(columns: Iterable[str]) -> str:
+    """列名加双引号（desc 是 SQL 关键字）"""
+    return ", ".join(f'"{c}"' for c in columns)
+
+
+def table_exists(name: str) -> bool:
+    row = get_conn().execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_video_metadata_schema():
+    """确保 video_metadata 表、列与索引存在（每进程只执行一次）"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS video_metadata (
+                aweme_id TEXT PRIMARY KEY,
+                uid TEXT NOT NULL,
+                nickname TEXT,
+                desc TEXT,
+                create_time INTEGER,
+                duration INTEGER,
+                digg_count INTEGER DEFAULT 0,
+                comment_count INTEGER DEFAULT 0,
+                collect_count INTEGER DEFAULT 0,
+                share_count INTEGER DEFAULT 0,
+                play_count INTEGER DEFAULT 0,
+                local_filename TEXT,
+                file_size INTEGER,
+                fetch_time INTEGER
+            )
+        """)
+        # 旧版 extract-metadata 建的表没有 nickname 列
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(video_metadata)")}
+        if "nickname" not in columns:
+            conn.execute("ALTER TABLE video_metadata ADD COLUMN nickname TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_video_uid ON video_metadata(uid)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_video_fetch_time ON video_metadata(fetch_time)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_video_digg ON video_metadata(digg_count DESC)")
+        # F2 的用户表按 uid / sec_user_id 查询（表由 F2 创建，存在时才补索引）
+        if table_exists("user_info_web"):
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_user_uid ON user_info_web(uid)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_user_sec_uid ON user_info_web(sec_user_id)")
+    _schema_ready = True
+
+
+def upsert_video_metadata(rows: Iterable[Dict], columns: Iterable[str]) -> int:
+    """批量写入 video_metadata（单事务 executemany）
+
+    Args:
+        rows: 每行一个 dict，缺失的列取 None
+        columns: 本次写入的列（必须包含 aweme_id）；已有记录只更新这些列
+
+    Returns:
+        写入行数
+    """
+    columns = list(columns)
+    unknown = set(columns) - set(VIDEO_METADATA_COLUMNS)
+    if "aweme_id" not in columns or unknown:
+        raise ValueError(f"无效的列: {sorted(unknown) or '缺少 aweme_id'}")
+
+    params: List[tuple] = [tuple(row.get(c) for c in columns) for row in rows if row.get("aweme_id")]
+    if not params:
+        return 0
+
+    ensure_video_metadata_schema()
+    updates = ", ".join(f'"{c}" = excluded."{c}"' for c in columns if c != "aweme_id")
+    sql = (f"INSERT INTO video_metadata ({_quote(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+           f"ON CONFLICT(aweme_id) DO UPDATE SET {updates}")
+    conn = get_conn()
+    with conn:
+        conn.executemany(sql, params)
+    return len(params)
+
+
+def fetch_video_metadata(uid: Optional[str] = None) -> Dict[str, Dict]:
+    """读取 video_metadata，返回 aweme_id -> 字段 dict（uid 为空时读全表）"""
+    if not get_db_path().exists() or not table_exists("video_metadata"):
+        return {}
+    sql = f"SELECT {_quote(VIDEO_METADATA_COLUMNS)} FROM video_metadata"
+    args: tuple = ()
+    if uid:
+        sql += " WHERE uid = ?"
+        args = (uid,)
+    metadata = {}
+    for row in get_conn().execute(sql, args):
+        record = dict(zip(VIDEO_METADATA_COLUMNS, row))
+        metadata[record.pop("aweme_id")] = record
+    return metadata
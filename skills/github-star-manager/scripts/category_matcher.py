@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+分类关键词匹配器 - 预编译 Aho–Corasick 自动机
+
+StarTracker._match_category 原先对每个仓库、每个分类重新拼接匹配文本，再逐个关键词做子串查找，
+仓库数 × 关键词数次扫描。本模块在每次运行开始时把所有分类关键词编译成一个 Aho–Corasick 自动机，
+每个仓库只扫描一遍匹配文本，得分与原实现完全一致：
+
+- 匹配文本为 "{language} {description} {topics} {name} {full_name}"（小写），关键词子串命中得 3 分
+- 关键词同时是 language 的子串时再加 2 分
+- 取得分最高的分类，同分时取配置顺序靠前的
+
+由于 language 是匹配文本的前缀，"命中 language" 必然 "命中文本"：得分只可能是 5 / 3 / 0，
+因此结果 = language 命中的第一个分类，否则文本命中的第一个分类。language 取值很少，其结果按值缓存。
+
+使用：
+    python category_matcher.py --benchmark          # 合成 10k 仓库，对比原实现的耗时与结果
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class CategoryMatcher:
+    """把分类关键词编译为 Aho–Corasick 自动机，返回与 _match_category 相同的分类"""
+
+    def __init__(self, categories: Iterable[Dict]):
+        self.categories: List[Dict] = list(categories)
+
+        # 关键词 -> 包含它的第一个分类的序号（只需要最靠前的分类）
+        first_index: Dict[str, int] = {}
+        self._empty_keyword_index: Optional[int] = None  # 空关键词是任何字符串的子串
+        for index, cat in enumerate(self.categories):
+            for kw in cat.get('keywords') or []:
+                kw = kw.lower()
+                if not kw:
+                    if self._empty_keyword_index is None:
+                        self._empty_keyword_index = index
+                    continue
+                first_index.setdefault(kw, index)
+
+        self._build(first_index)
+        self._language_cache: Dict[str, Optional[int]] = {}
+
+    def _build(self, first_index: Dict[str, int]):
+        """构建 goto / fail 表；每个状态只记录其输出关键词中最靠前的分类序号"""
+        goto: List[Dict[str, int]] = [{}]
+        best: List[Optional[int]] = [None]
+        for kw, index in first_index.items():
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    best.append(None)
+                state = nxt
+            best[state] = index if best[state] is None else min(best[state], index)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != nxt else 0
+                # 输出集合沿 fail 链继承：合并为最小分类序号
+                inherited = best[fail[nxt]]
+                if inherited is not None and (best[nxt] is None or inherited < best[nxt]):
+                    best[nxt] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def _first_hit(self, text: str) -> Optional[int]:
+        """扫描一遍 text，返回命中关键词所属分类的最小序号"""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found = self._empty_keyword_index
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            index = best[state]
+            if index is not None and (found is None or index < found):
+                found = index
+                if found == 0:
+                    break
+        return found
+
+    def _language_hit(self, language: str) -> Optional[int]:
+        if language not in self._language_cache:
+            self._language_cache[language] = self._first_hit(language)
+        return self._language_cache[language]
+
+    def match(self, repo: Dict) -> Optional[Dict]:
+        """返回仓库的最佳分类（无关键词命中时返回 None）"""
+        language = (repo.get('language') or '').lower()
+        if language:
+            index = self._language_hit(language)
+            if index is not None:
+                return self.categories[index]
+
+        description = (repo.get('description') or '').lower()
+        topics = ' '.join(t.lower() for t in repo.get('topics', []))
+        name = repo.get('name', '').lower()
+        full_name = repo.get('full_name', '').lower()
+        index = self._first_hit(f"{language} {description} {topics} {name} {full_name}")
+        return self.categories[index] if index is not None else None
+
+
+# ==================== 基准测试 ====================
+
+def legacy_match(repo: Dict, categories_map: Dict[str, Dict]) -> Optional[Dict]:
+    """原 StarTracker._match_category 实现（逐分类、逐关键词子串扫描），仅用于基准对比"""
+    language = (repo.get('language') or '').lower()
+    description = (repo.get('description') or '').lower()
+    topics = [t.lower() for t in repo.get('topics', [])]
+    name = repo.get('name', '').lower()
+    full_name = repo.get('full_name', '').lower()
+
+    best_match = None
+    best_score = 0
+    for cat_id, cat in categories_map.items():
+        score = 0
+        keywords = cat.get('keywords', [])
+        repo_keywords = f"{language} {description} {' '.join(topics)} {name} {full_name}"
+        for kw in keywords:
+            if kw.lower() in repo_keywords:
+                score += 3
+                break
+        if language and any(kw.lower() in language for kw in keywords):
+            score += 2
+        if score > 0 and score > best_score:
+            best_match = cat
+            best_score = score
+    return best_match
+
+
+def synthetic_data(repo_count: int, category_count: int, seed: int = 42):
+    """生成合成分类与仓库数据（关键词与 topics 取自同一词表，保证有真实命中）"""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = sorted({"".join(rng.choices(letters, k=rng.randint(2, 10))) for _ in range(4000)})
+    vocab += ["ai", "llm", "agent", "cli", "web", "python", "rust", "go", "react", "docker"]
+    languages = ["Python", "Go", "Rust", "TypeScript", "JavaScript", "C++", "Java", "Swift", "Kotlin", None]
+
+    categories = [
+        {"id": f"cat-{i}", "name": f"分类 {i}", "keywords": rng.sample(vocab, rng.randint(3, 15))}
+        for i in range(category_count)
+    ]
+    repos = []
+    for i in range(repo_count):
+        owner, name = rng.choice(vocab), rng.choice(vocab)
+        repos.append({
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "language": rng.choice(languages),
+            "description": " ".join(rng.choices(vocab, k=rng.randint(3, 25))) if i % 7 else None,
+            "topics": rng.sample(vocab, rng.randint(0, 10)),
+        })
+    return categories, repos
+
+
+def benchmark(repo_count: int = 10000, category_count: int = 100) -> int:
+    categories, repos = synthetic_data(repo_count, category_count)
+    categories_map = {cat["id"]: cat for cat in categories}
+    keyword_count = sum(len(cat["keywords"]) for cat in categories)
+    print(f"📊 合成数据: {repo_count} 个仓库, {category_count} 个分类, {keyword_count} 个关键词")
+
+    start = time.perf_counter()
+    expected = [legacy_match(repo, categories_map) for repo in repos]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = CategoryMatcher(categories_map.values())
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [matcher.match(repo) for repo in repos]
+    match_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a is not b)
+    matched = sum(1 for a in actual if a is not None)
+    print(f"   原实现:   {legacy_time * 1000:.0f} ms")
+    print(f"   自动机:   {match_time * 1000:.0f} ms（构建 {build_time * 1000:.1f} ms），"
+          f"加速 {legacy_time / max(match_time + build_time, 1e-9):.1f}x")
+    print(f"   命中分类: {matched}/{repo_count}，结果不一致: {mismatches}")
+    return 0 if mismatches == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分类关键词匹配器")
+    parser.add_argument("--benchmark", action="store_true", help="合成数据基准测试（对比原实现）")
+    parser.add_argument("--repos", type=int, default=10000, help="合成仓库数 (默认: 10000)")
+    parser.add_argument("--categories", type=int, default=100, help="合成分类数 (默认: 100)")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.print_help()
+        return 1
+    return benchmark(args.repos, args.categories)
+
+
+if __name__ == "__main__":
+    exit(main())
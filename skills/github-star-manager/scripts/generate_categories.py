@@ -66,6 +66,12 @@ class CategoryGenerator:
         self.json_path = json_path or self.DEFAULT_JSON_PATH
         self.categories_path = categories_path or self.DEFAULT_CATEGORIES_PATH
 
+        # topic -> 分组的倒排索引（同一 topic 出现在多个分组时取靠前的分组）
+        self._topic_index: Dict[str, str] = {}
+        for group_id, topics in self.TOPIC_GROUPS.items():
+            for topic in topics:
+                self._topic_index.setdefault(topic, group_id)
+
     def load_json_data(self) -> Optional[Dict]:
         """加载 JSON 数据"""
         if not self.json_path.exists():
@@ -97,11 +103,7 @@ class CategoryGenerator:
 
     def find_matching_group(self, topic: str) -> Optional[str]:
         """找到 topic 所属的分组"""
-        topic_lower = topic.lower()
-        for group_id, topics in self.TOPIC_GROUPS.items():
-            if topic_lower in topics:
-                return group_id
-        return None
+        return self._topic_index.get(topic.lower())
 
     def generate_categories_from_topics(self, topics_counter: Counter, existing_categories: List[Dict]) -> Tuple[List[Dict], List[str]]:
         """根据 topics 频率生成分类
@@ -0,0 +1,233 @@
+"""
+GitHub API 请求客户端 - 连接池、条件请求缓存与配额感知调度
+
+StarTracker 原先对每个仓库直接调用 requests.get：逐个串行、每次新建连接、没有缓存。
+本模块统一处理：
+- 连接池：进程内一个 requests.Session，连接池大小与并发数一致，5xx/连接错误自动重试
+- 条件请求：GET 响应的 ETag 与正文缓存到 output/http_cache/，下次带 If-None-Match，
+  304 直接返回缓存正文（304 不计入 API 配额）
+- 配额感知：记录响应头 X-RateLimit-Remaining / X-RateLimit-Reset，剩余配额低于保留值时
+  所有线程暂停到配额重置；403/429 限流响应按 Retry-After / Reset 等待后重试
+- 有界并发：map() 用固定大小线程池执行每仓库请求，结果按输入顺序返回
+- GraphQL：graphql() 发送批量查询（配额按 graphql 资源单独计算）
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 30       # 秒
+RATE_LIMIT_RESERVE = 20    # 剩余配额低于该值时暂停（为其他工具留余量）
+MAX_RATE_LIMIT_WAIT = 900  # 单次最长等待（秒）；超出时不再等待，请求照常发出并按失败处理
+RATE_LIMIT_RETRIES = 2     # 被限流后的重试次数
+
+# 缓存响应时保留的响应头（分页依赖 Link）
+CACHED_HEADERS = ("Content-Type", "Link")
+
+
+class GitHubClient:
+    """共享 Session 的 GitHub API 客户端（线程安全）"""
+
+    def __init__(self, headers: Dict[str, str], cache_dir: Optional[Path] = None,
+                 max_workers: int = DEFAULT_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self.cache_dir = cache_dir
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset({"GET"}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        # resource（core / graphql）-> (limit, remaining, reset 时间戳)
+        self._limits: Dict[str, Tuple[int, int, float]] = {}
+        self._warned_exhausted = False
+        self.stats = {"requests": 0, "not_modified": 0, "rate_limited": 0}
+
+    # ==================== 请求 ====================
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            use_cache: bool = True, **kwargs) -> requests.Response:
+        """GET 请求；有 ETag 缓存时发条件请求，304 返回缓存正文（状态码 200）"""
+        headers = dict(headers or {})
+        cache_file = self._cache_file(url, headers) if use_cache and self.cache_dir else None
+        entry = self._load_cached(cache_file) if cache_file else None
+        if entry:
+            headers["If-None-Match"] = entry["etag"]
+
+        response = self.request("GET", url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return self._from_cache(entry, response)
+        if response.status_code == 200 and cache_file:
+            self._store(cache_file, response)
+        return response
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求（配额不足时等待；被限流时等待后重试）"""
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        resource = "graphql" if url.rstrip("/").endswith("/graphql") else "core"
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self._throttle(resource)
+            response = self.session.request(method, url, **kwargs)
+            with self._lock:
+                self.stats["requests"] += 1
+            self._record_rate_limit(resource, response)
+
+            wait = self._rate_limited_wait(response)
+            if wait is None or attempt == RATE_LIMIT_RETRIES or wait > MAX_RATE_LIMIT_WAIT:
+                return response
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            print(f"  ⏳ 触发 GitHub 限流，{int(wait)} 秒后重试: {url}")
+            time.sleep(wait)
+        return response
+
+    def graphql(self, url: str, query: str, variables: Optional[Dict] = None) -> Tuple[Optional[Dict], List, int]:
+        """执行 GraphQL 查询，返回 (data, errors, HTTP 状态码)
+
+        GraphQL 可能部分成功：data 中个别字段为 null，同时 errors 说明原因（如仓库不存在）。
+        """
+        response = self.request("POST", url, json={"query": query, "variables": variables or {}})
+        if response.status_code != 200:
+            return None, [], response.status_code
+        try:
+            payload = response.json()
+        except ValueError:
+            return None, [], response.status_code
+        return payload.get("data"), payload.get("errors") or [], response.status_code
+
+    def map(self, func: Callable, items: Iterable, workers: Optional[int] = None) -> List:
+        """用有界线程池并发执行 func(item)，按输入顺序返回结果"""
+        items = list(items)
+        workers = min(workers or self.max_workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+
+    def summary(self) -> str:
+        """请求统计（用于命令结束时输出）"""
+        with self._lock:
+            stats = dict(self.stats)
+            limits = dict(self._limits)
+        line = f"API 请求 {stats['requests']} 次，304 缓存命中 {stats['not_modified']} 次"
+        if stats["rate_limited"]:
+            line += f"，限流重试 {stats['rate_limited']} 次"
+        for resource in ("core", "graphql"):
+            if resource in limits:
+                limit, remaining, _ = limits[resource]
+                line += f"，{resource} 剩余配额 {remaining}/{limit}"
+        return line
+
+    # ==================== 配额 ====================
+
+    def _record_rate_limit(self, resource: str, response: requests.Response):
+        headers = response.headers
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._lock:
+            self._limits[resource] = (limit, remaining, reset_at)
+
+    def _throttle(self, resource: str):
+        """剩余配额低于保留值时等待重置；每放行一个请求先预扣一次配额，避免并发线程集体超发"""
+        while True:
+            with self._lock:
+                state = self._limits.get(resource)
+                if state is None:
+                    return
+                limit, remaining, reset_at = state
+                reserve = min(RATE_LIMIT_RESERVE, limit // 10)
+                wait = reset_at - time.time() + 1
+                if remaining > reserve or wait <= 0:
+                    if wait <= 0:
+                        remaining = limit
+                    self._limits[resource] = (limit, remaining - 1, reset_at)
+                    return
+                if wait > MAX_RATE_LIMIT_WAIT:
+                    if not self._warned_exhausted:
+                        self._warned_exhausted = True
+                        print(f"  ⚠ GitHub API 配额即将耗尽（剩余 {remaining}），"
+                              f"{int(wait / 60)} 分钟后重置，后续请求可能失败")
+                    return
+            print(f"  ⏳ API 配额剩余 {remaining}，等待 {int(wait)} 秒至重置...")
+            time.sleep(min(wait, 60))
+
+    @staticmethod
+    def _rate_limited_wait(response: requests.Response) -> Optional[float]:
+        """被限流时返回应等待的秒数，否则返回 None"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset_at = float(response.headers.get("X-RateLimit-Reset", 0))
+            return max(reset_at - time.time(), 0) + 1
+        return None
+
+    # ==================== ETag 缓存 ====================
+
+    def _cache_file(self, url: str, headers: Dict[str, str]) -> Path:
+        accept = headers.get("Accept") or self.session.headers.get("Accept", "")
+        key = hashlib.sha1(f"{accept}\n{url}".encode("utf-8")).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _load_cached(path: Path) -> Optional[Dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _store(path: Path, response: requests.Response):
+        etag = response.headers.get("ETag")
+        if not etag:
+            return
+        entry = {
+            "etag": etag,
+            "url": response.url,
+            "headers": {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers},
+            "body": response.text,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # 缓存写入失败不影响本次结果
+
+    @staticmethod
+    def _from_cache(entry: Dict, not_modified: requests.Response) -> requests.Response:
+        cached = requests.Response()
+        cached.status_code = 200
+        cached._content = entry["body"].encode("utf-8")
+        cached.encoding = "utf-8"
+        cached.headers.update(not_modified.headers)
+        cached.headers.update(entry.get("headers", {}))
+        cached.url = entry.get("url", not_modified.url)
+        cached.request = not_modified.request
+        return cached
@@ -11,6 +11,7 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 from star_tracker import StarTracker
+from github_client import DEFAULT_WORKERS
 import dashboard_generator
 
 # 加载 .env 配置文件（从 assets/ 目录）
@@ -49,9 +50,10 @@ def init_command(tracker: StarTracker, args):
             f.write(f"**用户**: {args.user}\n")
             f.write(f"**生成时间**: {tracker.get_readme.__self__}\n\n")
 
+            readmes = tracker.map_repos(tracker.get_readme, [r["full_name"] for r in repos[:20]])
             for i, repo in enumerate(repos[:20], 1):
                 print(f"[{i}/{min(20, len(repos))}] {repo['full_name']}")
-                readme = tracker.get_readme(repo["full_name"])
+                readme = readmes[repo["full_name"]]
                 summary = tracker.summarize_with_ai(repo, readme)
 
                 f.write(f"## {i}. [{repo['full_name']}]({repo['html_url']})\n\n")
@@ -95,10 +97,13 @@ def check_command(tracker: StarTracker, args):
     # 新增 star 的项目：刷新元数据以确保 description/language 等字段完整
     if new_repos:
         print(f"\n🔄 新增 Star 检测到，正在刷新元数据...")
+        # GraphQL 同步的仓库（带 latest_release 字段）已是实时数据，只刷新 REST 获取的
+        fresh_map = tracker.refresh_repos_metadata(
+            [r["full_name"] for r in new_repos if r.get("full_name") and "latest_release" not in r])
         for repo in new_repos:
             full_name = repo.get("full_name")
             if full_name:
-                fresh_data = tracker.refresh_repo_metadata(full_name)
+                fresh_data = fresh_map.get(full_name)
                 if fresh_data:
                     # 用最新 API 数据更新 current_map 和 current_repos 中的条目
                     repo["description"] = fresh_data.get("description")
@@ -178,13 +183,16 @@ def export_command(tracker: StarTracker, args):
     repos = tracker.get_starred_repos(args.user, limit=args.limit or 9999)
     print(f"获取到 {len(repos)} 个项目")
 
-    # 获取每个项目的详细信息
-    export_data = []
-    for i, repo in enumerate(repos, 1):
-        print(f"[{i}/{len(repos)}] {repo['full_name']}", end='\r')
+    # 最新 release 与健康度：GraphQL 同步时已随列表返回；REST 模式下并发逐仓库获取
+    # （共享连接池，未变化的请求走 ETag 缓存）
+    if any("latest_release" not in repo for repo in repos):
+        print(f"正在获取 Release 与健康度（并发 {tracker.client.max_workers}）...")
+    releases = tracker.client.map(tracker.release_for, repos)
+    healths = tracker.client.map(tracker.health_for, repos)
 
+    export_data = []
+    for repo, release, health in zip(repos, releases, healths):
         # 获取最新 release 信息
-        release = tracker.get_latest_release(repo['full_name'])
         has_new_release = False
         if release:
             # 检查 release 是否是最近的（7天内）
@@ -195,9 +203,6 @@ def export_command(tracker: StarTracker, args):
             except:
                 pass
 
-        # 获取项目健康度
-        health = tracker.get_repo_health(repo['full_name'])
-
         export_data.append({
             'id': repo['id'],
             'full_name': repo['full_name'],
@@ -516,12 +521,17 @@ def main():
     parser.add_argument("--summarize", action="store_true", help="是否使用 AI 生成项目摘要")
     parser.add_argument("--no-ai", action="store_true", help="强制不使用 AI，使用基础摘要替代")
     parser.add_argument("--output", "-o", help="报告输出文件路径")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"并发请求数 (默认: {DEFAULT_WORKERS})")
+    parser.add_argument("--api", choices=["auto", "graphql", "rest"], default="auto",
+                        help="同步方式：auto 有 Token 时用 GraphQL 批量查询，失败回退 REST；"
+                             "graphql 只用 GraphQL，无 Token 或查询失败即报错；rest 只用 REST (默认: auto)")
 
     args = parser.parse_args()
 
     # 初始化追踪器
     github_token = os.getenv("GITHUB_PAT")
-    tracker = StarTracker(github_token)
+    tracker = StarTracker(github_token, max_workers=args.workers, api_mode=args.api)
 
     # 如果没有提供用户名，尝试从 Token 自动获取
     username = args.user
@@ -570,6 +580,8 @@ def main():
             batch_unstar_command(tracker, args)
         elif args.batch_star:
             batch_star_command(tracker, args)
+        if tracker.client.stats["requests"]:
+            print(f"\n📡 {tracker.client.summary()}")
         return 0
     except KeyboardInterrupt:
         print("\n\n⚠️ 操作已取消")
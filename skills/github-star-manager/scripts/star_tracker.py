@@ -6,10 +6,47 @@ GitHub Star 追踪器 - 核心分析模块
 import os
 import json
 import yaml
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Set
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from github_client import GitHubClient, DEFAULT_WORKERS
+from category_matcher import CategoryMatcher
+
+# GraphQL 单次查询的仓库数（starredRepositories 每页上限 100；按名批量查询用别名拼接）
+GRAPHQL_PAGE_SIZE = 100
+GRAPHQL_BATCH_SIZE = 50
+
+# 与 REST 仓库对象对应的字段（_repo_from_graphql 负责转换为 REST 格式）
+GRAPHQL_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  databaseId name nameWithOwner url description homepageUrl
+  createdAt updatedAt pushedAt
+  stargazerCount forkCount diskUsage visibility
+  isFork isArchived isTemplate hasWikiEnabled hasDiscussionsEnabled
+  owner { login avatarUrl }
+  primaryLanguage { name }
+  licenseInfo { spdxId }
+  defaultBranchRef { name }
+  watchers { totalCount }
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  latestRelease { tagName name publishedAt url }
+}
+"""
+
+GRAPHQL_STARRED_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    starredRepositories(first: $first, after: $after, orderBy: {field: STARRED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      edges { starredAt node { ...RepoFields } }
+    }
+  }
+}
+""" + GRAPHQL_REPO_FIELDS
 
 
 class StarTracker:
@@ -24,9 +61,13 @@ class StarTracker:
     CATEGORIES_FILE = CONFIG_DIR / "categories.yaml"
     TAGS_FILE = CONFIG_DIR / "tags.json"
     SETTINGS_FILE = CONFIG_DIR / "user_settings.json"
+    HTTP_CACHE_DIR = CACHE_DIR / "http_cache"  # ETag 条件请求缓存
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, max_workers: int = DEFAULT_WORKERS,
+                 api_mode: str = "auto"):
         self.github_token = github_token or os.getenv("GITHUB_PAT")
+        # auto：有 Token 时用 GraphQL 批量同步（失败回退 REST）；graphql：只用 GraphQL，失败即报错；rest：只用 REST
+        self.api_mode = api_mode
         self.user = None
         self._auth_username = None
         self.headers = {"Accept": "application/vnd.github.v3+json"}
@@ -37,6 +78,9 @@ class StarTracker:
         self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
         self.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
+        # 共享连接池 + ETag 缓存 + 配额感知（所有 API 请求都经过它）
+        self.client = GitHubClient(self.headers, self.HTTP_CACHE_DIR, max_workers=max_workers)
+
         # 加载配置文件
         self.categories = self._load_categories()
         self.tags = self._load_tags()
@@ -47,7 +91,9 @@ class StarTracker:
         if self.CATEGORIES_FILE.exists():
             try:
                 with open(self.CATEGORIES_FILE, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f)
+                    data = yaml.safe_load(f)
+                # generate_categories.py 生成的文件格式为 {"categories": [...], "_meta": {...}}
+                return data.get('categories', []) if isinstance(data, dict) else data
             except Exception:
                 pass
         # 返回默认分类
@@ -121,7 +167,7 @@ class StarTracker:
 
         try:
             url = f"{self.API_BASE}/user"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
 
             if response.status_code == 200:
                 user_data = response.json()
@@ -143,7 +189,6 @@ class StarTracker:
             include_starred_at: 是否获取 starred_at 时间（需要 Token 且只能获取自己的）
         """
         repos = []
-        page = 1
         per_page = 100  # GitHub API 每页最大 100
         categories_map = self.get_categories_map()
 
@@ -156,6 +201,13 @@ class StarTracker:
             and auth_user.lower() == username.lower()
         )
 
+        if self.use_graphql():
+            graphql_repos = self._get_starred_repos_graphql(username, limit)
+            if graphql_repos is not None:
+                return self._assign_categories(graphql_repos, categories_map)
+            self._graphql_fallback("GraphQL 获取 Star 列表失败")
+            print("⚠ GraphQL 同步失败，回退到 REST API")
+
         if can_get_starred_at:
             # 使用特殊 API 获取带 starred_at 的数据（只能获取自己的）
             starred_headers = self.headers.copy()
@@ -164,23 +216,33 @@ class StarTracker:
         else:
             starred_headers = self.headers
 
-        while True:
-            # 使用 /user/starred 获取自己的（带 starred_at），否则用 /users/{username}/starred
-            if can_get_starred_at:
-                url = f"{self.API_BASE}/user/starred?page={page}&per_page={per_page}"
-            else:
-                url = f"{self.API_BASE}/users/{username}/starred?page={page}&per_page={per_page}"
-
-            response = requests.get(url, headers=starred_headers)
+        # 使用 /user/starred 获取自己的（带 starred_at），否则用 /users/{username}/starred
+        if can_get_starred_at:
+            base_url = f"{self.API_BASE}/user/starred?per_page={per_page}"
+        else:
+            base_url = f"{self.API_BASE}/users/{username}/starred?per_page={per_page}"
 
+        def fetch_page(page: int):
+            response = self.client.get(f"{base_url}&page={page}", headers=starred_headers)
             if response.status_code != 200:
                 print(f"警告: 获取 Star 列表失败 (状态码: {response.status_code})")
-                break
-
-            data = response.json()
-            if not data:
-                break
-
+                return None, response
+            return response.json(), response
+
+        # 第 1 页的 Link 头给出总页数，其余页并发获取（按页序合并，遇到失败页即停止）
+        pages = []
+        data, response = fetch_page(1)
+        if data:
+            pages.append(data)
+            last_url = response.links.get("last", {}).get("url", "")
+            last_page = int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+            last_page = min(last_page, -(-limit // per_page))
+            for data in self.client.map(lambda p: fetch_page(p)[0], range(2, last_page + 1)):
+                if not data:
+                    break
+                pages.append(data)
+
+        for data in pages:
             # 处理带 starred_at 的响应格式
             for item in data:
                 if can_get_starred_at and "repo" in item:
@@ -192,61 +254,189 @@ class StarTracker:
                     repo = item
                 repos.append(repo)
 
-            page += 1
+        # 获取数量已足够
+        repos = repos[:limit]
 
-            # 获取数量已足够
-            if len(repos) >= limit:
-                repos = repos[:limit]
-                break
+        return self._assign_categories(repos, categories_map)
 
-        # 为每个仓库匹配分类
+    def _assign_categories(self, repos: List[Dict], categories_map: Dict[str, Dict]) -> List[Dict]:
+        """为每个仓库匹配分类（关键词自动机每次同步只编译一次）"""
+        matcher = CategoryMatcher(categories_map.values())
         for repo in repos:
-            category = self._match_category(repo, categories_map)
+            category = matcher.match(repo)
             if category:
                 repo['category'] = category
             repo['matched_keywords'] = category.get('keywords', []) if category else []
 
         return repos
 
+    # ==================== GraphQL 批量同步 ====================
+
+    def use_graphql(self) -> bool:
+        """是否使用 GraphQL（GraphQL API 必须认证；--api graphql 未配置 Token 时报错）"""
+        if self.api_mode == "rest":
+            return False
+        if not self.github_token:
+            if self.api_mode == "graphql":
+                raise RuntimeError("--api graphql 需要配置 GITHUB_PAT（GraphQL API 必须认证）")
+            return False
+        return True
+
+    def _graphql_fallback(self, reason: str):
+        """GraphQL 失败时：auto 模式由调用方回退 REST，--api graphql 直接报错"""
+        if self.api_mode == "graphql":
+            raise RuntimeError(f"{reason}（--api graphql 不回退 REST）")
+
+    def _get_starred_repos_graphql(self, username: str, limit: int) -> Optional[List[Dict]]:
+        """通过 GraphQL 获取 Star 列表：每次查询 100 个仓库，同时带回 starredAt、topics、
+        最新 Release、pushedAt、description 等字段，后续无需逐仓库 REST 请求
+
+        Returns:
+            REST 格式的仓库列表；查询失败时返回 None（由调用方回退 REST）
+        """
+        url = f"{self.API_BASE}/graphql"
+        repos: List[Dict] = []
+        cursor = None
+        page_size = GRAPHQL_PAGE_SIZE
+        print("✓ 使用 GraphQL 批量获取 Star 列表")
+
+        while len(repos) < limit:
+            first = min(page_size, limit - len(repos))
+            data, errors, status = self.client.graphql(
+                url, GRAPHQL_STARRED_QUERY, {"login": username, "first": first, "after": cursor})
+            if status in (502, 504) and page_size > 25:
+                # 查询过重时 GitHub 返回 502/504，缩小每页数量后重试当前页
+                page_size //= 2
+                continue
+            starred = ((data or {}).get("user") or {}).get("starredRepositories")
+            if starred is None:
+                message = errors[0].get("message") if errors else f"状态码 {status}"
+                print(f"警告: GraphQL 获取 Star 列表失败 ({message})")
+                return None
+
+            for edge in starred["edges"]:
+                repos.append(self._repo_from_graphql(edge["node"], edge.get("starredAt")))
+
+            page_info = starred["pageInfo"]
+            if not page_info["hasNextPage"]:
+                break
+            cursor = page_info["endCursor"]
+
+        return repos[:limit]
+
+    def fetch_repos_graphql(self, repo_full_names: List[str]) -> Optional[Dict[str, Optional[Dict]]]:
+        """按名称批量获取仓库元数据（每次查询用别名拼接 50 个仓库）
+
+        Returns:
+            full_name -> REST 格式仓库数据（不存在时为 None）；查询失败时返回 None
+        """
+        url = f"{self.API_BASE}/graphql"
+        results: Dict[str, Optional[Dict]] = {}
+        names = list(dict.fromkeys(repo_full_names))
+
+        for start in range(0, len(names), GRAPHQL_BATCH_SIZE):
+            batch = names[start:start + GRAPHQL_BATCH_SIZE]
+            fields = []
+            variables = {}
+            for i, full_name in enumerate(batch):
+                owner, _, name = full_name.partition("/")
+                variables[f"o{i}"], variables[f"n{i}"] = owner, name
+                fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+            params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+            query = f"query({params}) {{\n  " + "\n  ".join(fields) + "\n}\n" + GRAPHQL_REPO_FIELDS
+
+            data, errors, status = self.client.graphql(url, query, variables)
+            if data is None:
+                message = errors[0].get("message") if errors else f"状态码 {status}"
+                print(f"  ⚠ GraphQL 批量获取元数据失败 ({message})")
+                return None
+            for i, full_name in enumerate(batch):
+                node = data.get(f"r{i}")
+                results[full_name] = self._repo_from_graphql(node) if node else None
+
+        return results
+
+    @staticmethod
+    def _repo_from_graphql(node: Dict, starred_at: Optional[str] = None) -> Dict:
+        """GraphQL Repository 节点 → REST 仓库格式（附带 latest_release）"""
+        owner = node.get("owner") or {}
+        release = node.get("latestRelease")
+        repo = {
+            "id": node.get("databaseId"),
+            "name": node.get("name"),
+            "full_name": node.get("nameWithOwner"),
+            "owner": {"login": owner.get("login"), "avatar_url": owner.get("avatarUrl")},
+            "html_url": node.get("url"),
+            "description": node.get("description"),
+            "homepage": node.get("homepageUrl") or None,
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt"),
+            "pushed_at": node.get("pushedAt"),
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "watchers_count": (node.get("watchers") or {}).get("totalCount", 0),
+            # REST 的 open_issues_count 包含未关闭的 PR
+            "open_issues_count": ((node.get("issues") or {}).get("totalCount", 0)
+                                  + (node.get("pullRequests") or {}).get("totalCount", 0)),
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "topics": [t["topic"]["name"] for t in (node.get("repositoryTopics") or {}).get("nodes", [])],
+            "license": {"spdx_id": node["licenseInfo"].get("spdxId")} if node.get("licenseInfo") else None,
+            "visibility": (node.get("visibility") or "").lower() or None,
+            "fork": node.get("isFork", False),
+            "archived": node.get("isArchived", False),
+            "is_template": node.get("isTemplate", False),
+            "has_wiki": node.get("hasWikiEnabled", False),
+            "has_discussions": node.get("hasDiscussionsEnabled", False),
+            "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+            "size": node.get("diskUsage") or 0,
+            # 最新 Release 已随查询返回（与 REST releases/latest 同口径：不含草稿和预发布）
+            "latest_release": {
+                "tag_name": release.get("tagName"),
+                "name": release.get("name"),
+                "published_at": release.get("publishedAt"),
+                "html_url": release.get("url"),
+            } if release else None,
+        }
+        if starred_at:
+            repo["starred_at"] = starred_at
+        return repo
+
+    def release_for(self, repo: Dict) -> Optional[Dict]:
+        """仓库的最新 Release：GraphQL 数据已包含时直接使用，否则走 REST"""
+        if "latest_release" in repo:
+            return repo["latest_release"]
+        return self.get_latest_release(repo["full_name"])
+
+    def health_for(self, repo: Dict) -> Dict:
+        """仓库健康度：GraphQL 数据已包含全部字段时直接使用，否则走 REST"""
+        if "latest_release" in repo:
+            return self._health_from(repo)
+        return self.get_repo_health(repo["full_name"])
+
+    def refresh_repos_metadata(self, repo_full_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """批量刷新仓库元数据：优先 GraphQL（每 50 个仓库一次查询），失败或未认证时并发 REST"""
+        if self.use_graphql() and repo_full_names:
+            results = self.fetch_repos_graphql(repo_full_names)
+            if results is not None:
+                for full_name, data in results.items():
+                    if data is None:
+                        print(f"  ⚠ 仓库不存在或已删除: {full_name}")
+                return results
+            self._graphql_fallback("GraphQL 批量获取元数据失败")
+        return self.map_repos(self.refresh_repo_metadata, repo_full_names)
+
     def _match_category(self, repo: Dict, categories_map: Dict[str, Dict]) -> Optional[Dict]:
-        """根据仓库信息匹配合适分类"""
-        # 收集仓库的所有可匹配信息
-        language = (repo.get('language') or '').lower()
-        description = (repo.get('description') or '').lower()
-        topics = [t.lower() for t in repo.get('topics', [])]
-        name = repo.get('name', '').lower()
-        full_name = repo.get('full_name', '').lower()
-
-        # 检查每个分类的匹配度
-        best_match = None
-        best_score = 0
-
-        for cat_id, cat in categories_map.items():
-            score = 0
-            keywords = cat.get('keywords', [])
-
-            # 检查关键词匹配
-            repo_keywords = f"{language} {description} {' '.join(topics)} {name} {full_name}"
-            for kw in keywords:
-                if kw.lower() in repo_keywords:
-                    score += 3
-                    break  # 关键词匹配得高分，不再检查其他
-
-            # 检查语言匹配
-            if language and any(kw.lower() in language for kw in keywords):
-                score += 2
-
-            # 最低要求至少有一个关键词匹配
-            if score > 0 and score > best_score:
-                best_match = cat
-                best_score = score
-
-        return best_match
+        """根据仓库信息匹配合适分类
+
+        评分规则见 category_matcher：关键词命中得 3 分，同时命中 language 再加 2 分，取最高分分类。
+        批量匹配请用 _assign_categories（只编译一次自动机）。
+        """
+        return CategoryMatcher(categories_map.values()).match(repo)
 
     def get_latest_release(self, repo_full_name: str) -> Optional[Dict]:
         """获取项目的最新 Release"""
         url = f"{self.API_BASE}/repos/{repo_full_name}/releases/latest"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
 
         if response.status_code == 200:
             return response.json()
@@ -256,7 +446,7 @@ class StarTracker:
         """获取最近的 Commit"""
         since = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
         url = f"{self.API_BASE}/repos/{repo_full_name}/commits?since={since}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url, use_cache=False)  # since 每次不同，缓存无法复用
 
         if response.status_code == 200:
             return response.json()
@@ -265,22 +455,26 @@ class StarTracker:
     def get_repo_health(self, repo_full_name: str) -> Dict:
         """获取项目健康度指标"""
         url = f"{self.API_BASE}/repos/{repo_full_name}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
 
         if response.status_code == 200:
-            data = response.json()
-            return {
-                "stars": data.get("stargazers_count", 0),
-                "forks": data.get("forks_count", 0),
-                "open_issues": data.get("open_issues_count", 0),
-                "updated_at": data.get("updated_at"),
-                "pushed_at": data.get("pushed_at"),
-                "language": data.get("language"),
-                "has_wiki": data.get("has_wiki"),
-                "has_pages": data.get("has_pages"),
-            }
+            return self._health_from(response.json())
         return {}
 
+    @staticmethod
+    def _health_from(data: Dict) -> Dict:
+        """从 REST 格式仓库数据提取健康度指标"""
+        return {
+            "stars": data.get("stargazers_count", 0),
+            "forks": data.get("forks_count", 0),
+            "open_issues": data.get("open_issues_count", 0),
+            "updated_at": data.get("updated_at"),
+            "pushed_at": data.get("pushed_at"),
+            "language": data.get("language"),
+            "has_wiki": data.get("has_wiki"),
+            "has_pages": data.get("has_pages"),
+        }
+
     def refresh_repo_metadata(self, repo_full_name: str) -> Optional[Dict]:
         """刷新单个仓库的最新元数据（description、language 等）
 
@@ -293,7 +487,7 @@ class StarTracker:
             包含最新元数据的字典，失败时返回 None
         """
         url = f"{self.API_BASE}/repos/{repo_full_name}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
 
         if response.status_code == 200:
             return response.json()
@@ -343,7 +537,7 @@ class StarTracker:
     def retry_null_descriptions(self, repos: List[Dict]) -> List[Dict]:
         """对 description 为 null 的项目重新抓取元数据
 
-        逐个调用 GitHub API 获取最新仓库信息，用返回的 description 替换 null 值。
+        并发调用 GitHub API 获取最新仓库信息，用返回的 description 替换 null 值。
         同时刷新 language、topics 等可能变化的元数据字段。
 
         Args:
@@ -352,7 +546,8 @@ class StarTracker:
         Returns:
             更新后的仓库列表
         """
-        null_repos = [r for r in repos if r.get("description") is None]
+        # GraphQL 同步的仓库（带 latest_release 字段）本身就是实时数据，重试也只会得到同样的 null
+        null_repos = [r for r in repos if r.get("description") is None and "latest_release" not in r]
         if not null_repos:
             return repos
 
@@ -361,13 +556,14 @@ class StarTracker:
         still_null = []
 
         repo_map = {r["full_name"]: i for i, r in enumerate(repos)}
+        fresh_map = self.refresh_repos_metadata([r["full_name"] for r in null_repos if r.get("full_name")])
 
         for repo in null_repos:
             full_name = repo.get("full_name")
             if not full_name:
                 continue
 
-            fresh_data = self.refresh_repo_metadata(full_name)
+            fresh_data = fresh_map[full_name]
             if fresh_data:
                 idx = repo_map[full_name]
                 # 更新 description
@@ -401,14 +597,22 @@ class StarTracker:
     def get_readme(self, repo_full_name: str) -> str:
         """获取 README 内容"""
         url = f"{self.API_BASE}/repos/{repo_full_name}/readme"
-        response = requests.get(url, headers=self.headers)
+        # raw 媒体类型直接返回正文，省去再请求 download_url 的一次往返
+        response = self.client.get(url, headers={"Accept": "application/vnd.github.raw"})
 
         if response.status_code == 200:
-            content_url = response.json().get("download_url")
-            if content_url:
-                readme_res = requests.get(content_url)
-                # 限制长度防止过长
-                return readme_res.text[:6000]
+            # 限制长度防止过长
+            return response.text[:6000]
+        return ""
+
+    def map_repos(self, func, repo_full_names: List[str]) -> Dict[str, object]:
+        """对多个仓库并发执行单仓库请求（如 get_latest_release），返回 full_name -> 结果
+
+        并发数由 StarTracker(max_workers=...) 决定，请求共享连接池与 ETag 缓存，
+        API 配额不足时自动暂停到重置。
+        """
+        names = list(dict.fromkeys(repo_full_names))
+        return dict(zip(names, self.client.map(func, names)))
 
     def add_star(self, repo_full_name: str) -> tuple[bool, str]:
         """为仓库添加 Star（需要 repo_deployment 权限）
@@ -423,7 +627,7 @@ class StarTracker:
             return False, "需要 GitHub Token"
 
         url = f"{self.API_BASE}/user/starred/{repo_full_name}"
-        response = requests.put(url, headers=self.headers)
+        response = self.client.request("PUT", url)
 
         if response.status_code == 204:
             return True, f"✓ 已 Star: {repo_full_name}"
@@ -604,7 +808,7 @@ README 内容（前6000字）:
     def get_commits_between_releases(self, repo_full_name: str, limit: int = 10) -> List[Dict]:
         """获取两个版本之间的 commits"""
         url = f"{self.API_BASE}/repos/{repo_full_name}/commits?per_page={limit}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
         if response.status_code == 200:
             return response.json()
         return []
@@ -668,8 +872,10 @@ README 内容（前6000字）:
         # 检查有 Release 的项目
         report_lines.append("## 版本更新")
         release_count = 0
+        tracked = [repo["full_name"] for repo in repos[:30]]
+        releases = dict(zip(tracked, self.client.map(self.release_for, repos[:30])))
         for repo in repos[:30]:
-            release = self.get_latest_release(repo["full_name"])
+            release = releases[repo["full_name"]]
             if release:
                 published = release.get("published_at", "")[:10]
                 # 检查是否是最近发布的
@@ -688,11 +894,14 @@ README 内容（前6000字）:
         # 活跃项目
         report_lines.append("## 活跃项目（本周有更新）")
         active_count = 0
+        recent_commits = self.map_repos(lambda name: self.get_recent_commits(name, days=days), tracked)
+        active = [repo for repo in repos[:30] if len(recent_commits[repo["full_name"]]) >= 3]
+        healths = dict(zip([repo["full_name"] for repo in active], self.client.map(self.health_for, active)))
         for repo in repos[:30]:
-            commits = self.get_recent_commits(repo["full_name"], days=days)
+            commits = recent_commits[repo["full_name"]]
             if len(commits) >= 3:
                 active_count += 1
-                health = self.get_repo_health(repo["full_name"])
+                health = healths[repo["full_name"]]
                 language = health.get("language", "未知")
                 report_lines.append(
                     f"### [{repo['full_name']}]({repo['html_url']})\n"
@@ -721,7 +930,7 @@ README 内容（前6000字）:
             return False, "需要 GitHub Token 才能执行此操作"
 
         url = f"{self.API_BASE}/user/starred/{repo_full_name}"
-        response = requests.put(url, headers=self.headers)
+        response = self.client.request("PUT", url)
 
         if response.status_code == 204:
             return True, f"✓ 已 Star: {repo_full_name}"
@@ -745,7 +954,7 @@ README 内容（前6000字）:
             return False, "需要 GitHub Token 才能执行此操作"
 
         url = f"{self.API_BASE}/user/starred/{repo_full_name}"
-        response = requests.delete(url, headers=self.headers)
+        response = self.client.request("DELETE", url)
 
         if response.status_code == 204:
             return True, f"✓ 已取消 Star: {repo_full_name}"
@@ -767,7 +976,7 @@ README 内容（前6000字）:
             return False
 
         url = f"{self.API_BASE}/user/starred/{repo_full_name}"
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
         return response.status_code == 204
 
     def batch_unstar(self, repo_list: List[str], dry_run: bool = True) -> tuple[int, int, List[str]]:
@@ -6,19 +6,21 @@ from __future__ import annotations
 import argparse
 import io
 import math
-import shutil
+import os
 import sys
-import tempfile
+import time
 import uuid
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 
 def load_deps() -> None:
     try:
-        import pypdf  # noqa: F401
-        import fitz  # noqa: F401
+        load_fitz()
         from PIL import Image  # noqa: F401
     except ImportError as exc:
         print(f"Missing dependency: {exc}", file=sys.stderr)
@@ -26,12 +28,21 @@ def load_deps() -> None:
         raise SystemExit(1) from exc
 
 
+def load_fitz() -> Any:
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz
+    return fitz
+
+
 # A4 sizes in points
 A4_PORTRAIT = (595.0, 842.0)
 A4_LANDSCAPE = (842.0, 595.0)
 A4_RATIO = math.sqrt(2)  # height / width ≈ 1.414
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+PREFETCH_PER_JOB = 2  # images decoded ahead of the assembler per worker thread
 
 
 def collect_inputs(paths: list[str], sort: str) -> list[Path]:
@@ -74,76 +85,327 @@ def compute_split_height(img_w: int, img_h: int, override: int | None) -> tuple[
     return int(round(img_w * A4_RATIO)), "a4_ratio"
 
 
-def split_image(img_path: Path, split_height: int, tmp_dir: Path) -> list[Path]:
-    """Split a single image into N segments of split_height pixels each.
-
-    Short images (height <= split_height) are returned as-is (single element list).
-    Output paths are inside tmp_dir; the caller is responsible for tmp_dir lifecycle.
+def image_item(
+    img_path: Path, img_w: int, img_h: int, clip: tuple[int, int] | None = None
+) -> dict[str, Any]:
+    """Layout item for an image (or a horizontal band of it when clip=(top, bottom))."""
+    height = clip[1] - clip[0] if clip else img_h
+    return {
+        "kind": "image",
+        "path": img_path,
+        "width": float(img_w),
+        "height": float(height),
+        "source_size": (img_w, img_h),
+        "clip": clip,
+    }
+
+
+def slice_image(img_path: Path, img_w: int, img_h: int, split_height: int) -> list[dict[str, Any]]:
+    """Describe N segments of split_height pixels each as clip regions of one image.
+
+    Nothing is decoded or written here: every segment is later drawn from the single
+    embedded copy of the image with a clip rectangle (see assemble_pdf).
     """
-    from PIL import Image
-
-    img = Image.open(img_path)
-    w, h = img.size
-    if h <= split_height:
-        img.close()
-        return [img_path]
-
-    segments: list[Path] = []
-    n_segments = math.ceil(h / split_height)
-    stem = img_path.stem
-    # Preserve original extension for the split files
-    ext = img_path.suffix if img_path.suffix else ".png"
+    segments: list[dict[str, Any]] = []
+    n_segments = math.ceil(img_h / split_height)
     for i in range(n_segments):
         top = i * split_height
-        bottom = min(top + split_height, h)
-        crop = img.crop((0, top, w, bottom))
-        seg_path = tmp_dir / f"{stem}_{i + 1:03d}{ext}"
-        crop.save(seg_path)
-        segments.append(seg_path)
-    img.close()
+        bottom = min(top + split_height, img_h)
+        segments.append(image_item(img_path, img_w, img_h, clip=(top, bottom)))
     return segments
 
 
-def img_to_pdf_page(img_path: Path) -> tuple[Any, float, float]:
-    """Convert an image file to a single-page PDF. Returns (page_object, width, height)."""
-    import fitz
-    from pypdf import PdfReader
+def probe_image(img_path: Path) -> tuple[int, int] | None:
+    """Read image dimensions from the file header without decoding pixels."""
+    from PIL import Image as PILImage
+
+    try:
+        with PILImage.open(img_path) as probe:
+            return probe.size
+    except Exception as exc:
+        print(f"Warning: 跳过 {img_path}（{exc}）", file=sys.stderr)
+        return None
 
-    doc = fitz.open(str(img_path))
-    img_page = doc[0]
-    w, h = img_page.rect.width, img_page.rect.height
 
-    pdf_doc = fitz.open()
-    pdf_page = pdf_doc.new_page(width=w, height=h)
-    pdf_page.insert_image(pdf_page.rect, filename=str(img_path))
-    buf = io.BytesIO()
-    pdf_doc.save(buf)
-    pdf_doc.close()
-    doc.close()
-    buf.seek(0)
+def pdf_page_items(pdf_path: Path) -> list[dict[str, Any]]:
+    """Layout items for every page of a PDF."""
+    fitz = load_fitz()
 
-    reader = PdfReader(buf)
-    page_obj = reader.pages[0]
-    # Keep reader alive via page_obj attribute to prevent GC of BytesIO
-    page_obj._reader_ref = reader  # type: ignore[attr-defined]
-    page_obj._buf_ref = buf  # type: ignore[attr-defined]
-    return page_obj, w, h
+    with fitz.open(str(pdf_path)) as doc:
+        return [
+            {"kind": "pdf", "path": pdf_path, "page": page.number,
+             "width": page.rect.width, "height": page.rect.height}
+            for page in doc
+        ]
 
 
-def pdf_to_page_readers(pdf_path: Path) -> list[tuple[Any, float, float]]:
-    """Read each page of a PDF as a (reader, w, h) tuple."""
-    from pypdf import PdfReader
+def default_jobs() -> int:
+    """Default number of image pre-decoding threads."""
+    return max(1, min(os.cpu_count() or 1, 8))
 
-    reader = PdfReader(str(pdf_path))
-    pages = []
-    for page in reader.pages:
-        w, h = float(page.mediabox.width), float(page.mediabox.height)
-        pages.append((page, w, h))
-    return pages
+
+def png_stream(data: bytes) -> dict[str, Any] | None:
+    """Reuse a PNG's compressed pixel data as a PDF image stream, without decoding.
+
+    PNG IDAT data is a zlib stream with per-row filters, which PDF reads natively
+    as FlateDecode with /Predictor 15. Only 8-bit, non-interlaced grayscale/RGB
+    files without transparency qualify; returns None for anything else.
+    """
+    if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return None
+    pos = 8
+    header = None
+    idat: list[bytes] = []
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], "big")
+        kind = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = body
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind in (b"tRNS", b"PLTE"):
+            return None
+        elif kind == b"IEND":
+            break
+    if header is None or not idat:
+        return None
+
+    width = int.from_bytes(header[0:4], "big")
+    height = int.from_bytes(header[4:8], "big")
+    bit_depth, color_type, interlace = header[8], header[9], header[12]
+    if bit_depth != 8 or color_type not in (0, 2) or interlace:
+        return None
+    colors = 3 if color_type == 2 else 1
+    return {
+        "width": width,
+        "height": height,
+        "colorspace": "/DeviceRGB" if colors == 3 else "/DeviceGray",
+        "data": b"".join(idat),
+        "decode_parms": f"<</Predictor 15/Colors {colors}/BitsPerComponent 8/Columns {width}>>",
+        "alpha": None,
+    }
+
+
+def flate_stream(img: Any, size: tuple[int, int] | None = None) -> dict[str, Any]:
+    """Decode pixels (optionally resized to size) and deflate them for a PDF image stream.
+
+    Transparency becomes a separate grayscale soft mask.
+    """
+    from PIL import Image as PILImage
+
+    if img.mode not in ("RGB", "RGBA", "L"):
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    if size is not None:
+        img = img.resize(size, PILImage.LANCZOS)
+    alpha = None
+    if img.mode == "RGBA":
+        alpha = zlib.compress(img.getchannel("A").tobytes())
+        img = img.convert("RGB")
+    return {
+        "width": img.width,
+        "height": img.height,
+        "colorspace": "/DeviceRGB" if img.mode == "RGB" else "/DeviceGray",
+        "data": zlib.compress(img.tobytes()),
+        "decode_parms": None,
+        "alpha": alpha,
+    }
+
+
+def prepare_image(img_path: Path, target_width: int | None) -> dict[str, Any]:
+    """Turn an image file into something the assembler can embed without further work.
+
+    Runs on the prefetch threads (Pillow and zlib release the GIL):
+    - JPEG: bytes passed through; PyMuPDF embeds them as DCTDecode unchanged
+    - 8-bit grayscale/RGB PNG: compressed pixel data reused as-is (see png_stream)
+    - everything else (RGBA/palette PNG, WebP): decoded and deflated here
+    - images wider than target_width: downscaled, JPEG sources re-encoded as JPEG
+    """
+    from PIL import Image as PILImage
+
+    data = img_path.read_bytes()
+    with PILImage.open(io.BytesIO(data)) as img:
+        if not target_width or img.width <= target_width:
+            if img.format == "JPEG":
+                return {"jpeg": data}
+            stream = png_stream(data) if img.format == "PNG" else None
+            return {"flate": stream if stream is not None else flate_stream(img)}
+
+        size = (target_width, max(1, round(img.height * target_width / img.width)))
+        if img.format != "JPEG":
+            return {"flate": flate_stream(img, size)}
+        img.draft(img.mode, size)  # let the JPEG decoder scale down by 1/2–1/8 first
+        buf = io.BytesIO()
+        img.resize(size, PILImage.LANCZOS).save(buf, "JPEG", quality=90)
+        return {"jpeg": buf.getvalue()}
+
+
+def embed_stream(doc: Any, dictionary: str, data: bytes, keys: dict[str, str]) -> int:
+    """Add a stream object whose data is already compressed; returns its xref."""
+    xref = doc.get_new_xref()
+    doc.update_object(xref, dictionary)
+    doc.update_stream(xref, data, new=True, compress=False)
+    # update_stream drops /Filter and /DecodeParms, so set them afterwards
+    for key, value in keys.items():
+        doc.xref_set_key(xref, key, value)
+    return xref
+
+
+def place_image(page: Any, rect: Any, prepared: dict[str, Any]) -> int:
+    """Draw a prepared image into rect on page; returns the image xref for reuse."""
+    if "jpeg" in prepared:
+        return page.insert_image(rect, stream=prepared["jpeg"])
+
+    image = prepared["flate"]
+    doc = page.parent
+    size = f"/Width {image['width']}/Height {image['height']}/BitsPerComponent 8"
+    dictionary = f"<</Type/XObject/Subtype/Image{size}/ColorSpace{image['colorspace']}"
+    if image["alpha"] is not None:
+        smask = embed_stream(
+            doc, f"<</Type/XObject/Subtype/Image{size}/ColorSpace/DeviceGray>>",
+            image["alpha"], {"Filter": "/FlateDecode"},
+        )
+        dictionary += f"/SMask {smask} 0 R"
+    keys = {"Filter": "/FlateDecode"}
+    if image["decode_parms"]:
+        keys["DecodeParms"] = image["decode_parms"]
+    xref = embed_stream(doc, dictionary + ">>", image["data"], keys)
+    page.insert_image(rect, xref=xref)
+    return xref
+
+
+def prefetch(func: Callable[[Any], Any], items: list[Any], jobs: int) -> Iterator[Any]:
+    """Yield func(item) in input order from a thread pool.
+
+    At most jobs × PREFETCH_PER_JOB results are held at once, so decoded images
+    never pile up ahead of the assembler.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending: deque = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= jobs * PREFETCH_PER_JOB:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def target_widths(pages: list[dict[str, Any]], max_dpi: float) -> dict[Path, int]:
+    """Pixel width each image needs so that no placement exceeds max_dpi.
+
+    Only images wider than that are listed; segments of one image share its width.
+    """
+    needed: dict[Path, int] = {}
+    source_widths: dict[Path, int] = {}
+    for page in pages:
+        for item, rect in page["placements"]:
+            if item["kind"] != "image":
+                continue
+            src_w = item["source_size"][0]
+            shown_w_pt = (rect[2] - rect[0]) * src_w / item["width"]
+            width = math.ceil(shown_w_pt / 72 * max_dpi)
+            needed[item["path"]] = max(needed.get(item["path"], 0), width)
+            source_widths[item["path"]] = src_w
+    return {path: width for path, width in needed.items() if width < source_widths[path]}
+
+
+def assemble_pdf(pages: list[dict[str, Any]], output_path: Path, jobs: int, max_dpi: float) -> None:
+    """Write laid-out pages straight into one PyMuPDF document.
+
+    Each image is read (and, if needed, re-encoded) once by the prefetch pool and
+    embedded once: whole images with insert_image, split segments via a carrier page
+    shown with a clip rectangle, PDF pages via show_pdf_page from a source opened
+    once. Nothing is written to disk except the final output.
+    """
+    fitz = load_fitz()
+
+    targets = target_widths(pages, max_dpi) if max_dpi else {}
+    order = list(dict.fromkeys(
+        item["path"]
+        for page in pages
+        for item, _ in page["placements"]
+        if item["kind"] == "image"
+    ))
+    streams = prefetch(lambda p: prepare_image(p, targets.get(p)), order, jobs)
+
+    # Segments still to be drawn per split image; its carrier is closed after the last one
+    pending_segments = Counter(
+        item["path"]
+        for page in pages
+        for item, _ in page["placements"]
+        if item["kind"] == "image" and item["clip"] is not None
+    )
+
+    out = fitz.open()
+    carriers: dict[Path, Any] = {}  # split image -> one-page document holding the full image
+    image_xrefs: dict[Path, int] = {}
+    sources: dict[Path, Any] = {}
+    try:
+        for page in pages:
+            page_w, page_h = page["size"]
+            new_page = out.new_page(width=page_w, height=page_h)
+            for item, rect in page["placements"]:
+                rect = fitz.Rect(rect)
+                path = item["path"]
+
+                if item["kind"] == "pdf":
+                    if path not in sources:
+                        sources[path] = fitz.open(str(path))
+                    new_page.show_pdf_page(rect, sources[path], item["page"])
+                    continue
+
+                clip = item["clip"]
+                if clip is None:
+                    if path in image_xrefs:
+                        new_page.insert_image(rect, xref=image_xrefs[path])
+                    else:
+                        image_xrefs[path] = place_image(new_page, rect, next(streams))
+                    continue
+
+                src_w, src_h = item["source_size"]
+                if path not in carriers:
+                    carrier = fitz.open()
+                    carrier_page = carrier.new_page(width=src_w, height=src_h)
+                    place_image(carrier_page, carrier_page.rect, next(streams))
+                    carriers[path] = carrier
+                new_page.show_pdf_page(rect, carriers[path], 0, clip=fitz.Rect(0, clip[0], src_w, clip[1]))
+                pending_segments[path] -= 1
+                if not pending_segments[path]:
+                    carriers.pop(path).close()
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        out.save(str(output_path), garbage=1, deflate=True)
+    finally:
+        streams.close()
+        for doc in [*sources.values(), *carriers.values()]:
+            doc.close()
+        out.close()
+
+
+def report_usage(started: float) -> None:
+    """Print wall time and peak resident memory of this run."""
+    line = f"   用时 {time.perf_counter() - started:.2f}s"
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB on Linux
+        peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        line += f"，峰值内存 {peak_mb:.0f} MB"
+    print(line)
 
 
-def img_to_vertical_page(img_path: Path, page_w_pt: float, margin_pt: float) -> tuple[Any, float, float]:
-    """Build a single-page PDF sized as page_w_pt wide × image-aspect-scaled tall.
+def layout_vertical(items: list[dict[str, Any]], page_w_pt: float, margin_pt: float) -> list[dict[str, Any]]:
+    """One image per page sized page_w_pt wide × image-aspect-scaled tall.
 
     Treats image pixels as PDF points (1 px = 1 pt) — typical phone screenshot
     is 1080×5000 px, which becomes a 1080×5000 pt page when fully scaled. The image
@@ -151,73 +413,47 @@ def img_to_vertical_page(img_path: Path, page_w_pt: float, margin_pt: float) ->
     height is the scaled image height + 2*margin_pt. Force portrait orientation
     (height is always >= usable_w because the source is a long screenshot).
     """
-    from PIL import Image as PILImage
-    import fitz
-    from pypdf import PdfReader
-
-    pil_img = PILImage.open(img_path)
-    img_w, img_h = pil_img.size
-    pil_img.close()
-
     usable_w = page_w_pt - 2 * margin_pt
     if usable_w <= 0:
         raise ValueError(f"margin={margin_pt} too large for page width={page_w_pt}")
-    scale = usable_w / img_w
-    scaled_h = img_h * scale
-    page_h = scaled_h + 2 * margin_pt
-
-    doc = fitz.open()
-    page = doc.new_page(width=page_w_pt, height=page_h)
-    img_rect = fitz.Rect(margin_pt, margin_pt, margin_pt + usable_w, margin_pt + scaled_h)
-    page.insert_image(img_rect, filename=str(img_path))
-
-    buf = io.BytesIO()
-    doc.save(buf)
-    doc.close()
-    buf.seek(0)
 
-    reader = PdfReader(buf)
-    page_obj = reader.pages[0]
-    page_obj._reader_ref = reader  # type: ignore[attr-defined]
-    page_obj._buf_ref = buf  # type: ignore[attr-defined]
-    return page_obj, page_w_pt, page_h
+    pages = []
+    for item in items:
+        scale = usable_w / item["width"]
+        scaled_h = item["height"] * scale
+        page_h = scaled_h + 2 * margin_pt
+        rect = (margin_pt, margin_pt, margin_pt + usable_w, margin_pt + scaled_h)
+        pages.append({"size": (page_w_pt, page_h), "placements": [(item, rect)]})
+    return pages
 
 
 def build_pdf_vertical(
-    image_paths: list[Path],
+    items: list[dict[str, Any]],
     output_path: Path,
     margin: float,
     dry_run: bool,
+    jobs: int = 1,
+    max_dpi: float = 0,
 ) -> dict[str, Any]:
     """Vertical mode: one image per page, page height follows image aspect ratio.
 
-    image_paths: list of image file paths. PDF inputs are not supported in vertical
-    mode (PDFs already have natural page boundaries — caller should split PDFs to
-    images first if they want each PDF page to be its own long page).
+    items: image items only. PDF inputs are not supported in vertical mode (PDFs
+    already have natural page boundaries — caller should split PDFs to images first
+    if they want each PDF page to be its own long page).
     """
-    from pypdf import PdfWriter
-
-    writer = PdfWriter()
     page_w = A4_PORTRAIT[0]
-    total = len(image_paths)
-    output_pages = 0
-    total_page_h = 0.0
-
-    for img_path in image_paths:
-        page_obj, pw, ph = img_to_vertical_page(img_path, page_w, margin)
-        writer.add_page(page_obj)
-        output_pages += 1
-        total_page_h += ph
+    total = len(items)
+    pages = layout_vertical(items, page_w, margin)
+    output_pages = len(pages)
 
     if dry_run:
+        total_page_h = sum(page["size"][1] for page in pages)
         avg_h = total_page_h / output_pages if output_pages else 0
         print(f"Dry run (vertical): {total} items → {output_pages} pages")
         print(f"  Page width: {page_w}pt, avg height: {avg_h:.0f}pt")
         return {"total_items": total, "output_pages": output_pages, "dry_run": True}
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("wb") as f:
-        writer.write(f)
+    assemble_pdf(pages, output_path, jobs, max_dpi)
 
     print(f"✅ {total}张 → {output_pages}页PDF（vertical 模式，每页一张，页面高度自适应）")
     print(f"   {output_path}")
@@ -240,7 +476,7 @@ def compute_grid(per_page: int, page_size: tuple[float, float], margin: float) -
     return {"cols": cols, "gap": gap, "cell_w": cell_w, "cell_h": cell_h}
 
 
-def pick_page_size(items: list[tuple[Any, float, float]], per_page: int, orientation: str) -> tuple[float, float]:
+def pick_page_size(items: list[dict[str, Any]], per_page: int, orientation: str) -> tuple[float, float]:
     """Determine output page size based on content orientation."""
     if orientation == "landscape":
         return A4_LANDSCAPE
@@ -251,34 +487,22 @@ def pick_page_size(items: list[tuple[Any, float, float]], per_page: int, orienta
     if per_page >= 2:
         return A4_LANDSCAPE
 
-    landscape_count = sum(1 for _, w, h in items if w > h)
+    landscape_count = sum(1 for item in items if item["width"] > item["height"])
     portrait_count = len(items) - landscape_count
     return A4_LANDSCAPE if landscape_count > portrait_count else A4_PORTRAIT
 
 
-def build_pdf(
-    items: list[tuple[Any, float, float]],
-    output_path: Path,
-    per_page: int,
-    margin: float,
-    orientation: str,
-    dry_run: bool,
-) -> dict[str, Any]:
-    """Build the output PDF with N items per page."""
-    from pypdf import PdfWriter, Transformation
-
-    writer = PdfWriter()
-    total = len(items)
-    output_pages = 0
-    stats: dict[str, int] = {"landscape": 0, "portrait": 0}
-
-    for start in range(0, total, per_page):
+def layout_nup(
+    items: list[dict[str, Any]], per_page: int, margin: float, orientation: str
+) -> list[dict[str, Any]]:
+    """Place items N per page; rects are (x0, y0, x1, y1) in PDF points, top-left origin."""
+    pages = []
+    for start in range(0, len(items), per_page):
         chunk = items[start:start + per_page]
 
         # per-page=1 且 orientation=auto 时，每页独立判断横竖
         if per_page == 1 and orientation == "auto":
-            _, img_w, img_h = chunk[0]
-            if img_w > img_h:
+            if chunk[0]["width"] > chunk[0]["height"]:
                 cur_page_size = A4_LANDSCAPE
             else:
                 cur_page_size = A4_PORTRAIT
@@ -287,27 +511,45 @@ def build_pdf(
 
         grid = compute_grid(per_page, cur_page_size, margin)
         a4_w, a4_h = cur_page_size
-        orient_label = "横版" if a4_w > a4_h else "竖版"
-        stats[orient_label] = stats.get(orient_label, 0) + 1
+        cell_w = grid["cell_w"]
+        cell_h = grid["cell_h"]
+        gap = grid.get("gap", margin)
 
-        new_page = writer.add_blank_page(width=a4_w, height=a4_h)
-
-        for col_idx, (page_obj, img_w, img_h) in enumerate(chunk):
-            cell_w = grid["cell_w"]
-            cell_h = grid["cell_h"]
-            gap = grid.get("gap", margin)
-
-            scale = min(cell_w / img_w, cell_h / img_h)
-            scaled_w = img_w * scale
-            scaled_h = img_h * scale
+        placements = []
+        for col_idx, item in enumerate(chunk):
+            scale = min(cell_w / item["width"], cell_h / item["height"])
+            scaled_w = item["width"] * scale
+            scaled_h = item["height"] * scale
 
             tx = gap + col_idx * (cell_w + gap) + (cell_w - scaled_w) / 2
             ty = margin + (cell_h - scaled_h) / 2
+            placements.append((item, (tx, ty, tx + scaled_w, ty + scaled_h)))
+
+        pages.append({
+            "size": cur_page_size,
+            "orient": "横版" if a4_w > a4_h else "竖版",
+            "placements": placements,
+        })
+    return pages
 
-            op = Transformation().scale(scale, scale).translate(tx, ty)
-            new_page.merge_transformed_page(page_obj, op)
 
-        output_pages += 1
+def build_pdf(
+    items: list[dict[str, Any]],
+    output_path: Path,
+    per_page: int,
+    margin: float,
+    orientation: str,
+    dry_run: bool,
+    jobs: int = 1,
+    max_dpi: float = 0,
+) -> dict[str, Any]:
+    """Build the output PDF with N items per page."""
+    total = len(items)
+    pages = layout_nup(items, per_page, margin, orientation)
+    output_pages = len(pages)
+    stats: dict[str, int] = {"landscape": 0, "portrait": 0}
+    for page in pages:
+        stats[page["orient"]] = stats.get(page["orient"], 0) + 1
 
     if dry_run:
         print(f"Dry run: {total} items → {output_pages} pages ({per_page}/page)")
@@ -316,9 +558,7 @@ def build_pdf(
                 print(f"  A4 {orient}: {count} 页")
         return {"total_items": total, "output_pages": output_pages, "dry_run": True}
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("wb") as f:
-        writer.write(f)
+    assemble_pdf(pages, output_path, jobs, max_dpi)
 
     orient_summary = "、".join(f"{k}{v}页" for k, v in stats.items() if v)
     print(f"✅ {total}张 → {output_pages}页PDF（每页{per_page}张，{orient_summary}，margin={margin}pt）")
@@ -337,8 +577,11 @@ def process(
     mode: str = "nup",
     split: bool = False,
     split_height: int | None = None,
+    jobs: int = 1,
+    max_dpi: float = 0,
 ) -> int:
     load_deps()
+    started = time.perf_counter()
 
     collected = collect_inputs(paths, sort)
     if not collected:
@@ -369,90 +612,78 @@ def process(
                 f"⚠️ vertical 模式不处理 PDF 输入（{len(pdf_paths)} 个 PDF 已跳过）："
                 "PDF 自带分页，如需长页请先转图片"
             )
-        if not image_paths:
+        image_items = []
+        for p in image_paths:
+            size = probe_image(p)
+            if size is not None:
+                image_items.append(image_item(p, *size))
+        if not image_items:
             print("No image files to process in vertical mode.", file=sys.stderr)
             return 1
 
-        build_pdf_vertical(image_paths, out_path, margin, dry_run)
+        build_pdf_vertical(image_items, out_path, margin, dry_run, jobs=jobs, max_dpi=max_dpi)
+        report_usage(started)
         return 0
 
     # --- N-up mode (default) ---
 
-    split_tmp_dir: Path | None = None
-    processed_paths: list[Path] = list(collected)
-
-    if split:
-        try:
-            split_tmp_dir = Path(tempfile.mkdtemp(prefix="img2pdf-splits-"))
-        except OSError as exc:
-            print(f"Failed to create temp dir: {exc}", file=sys.stderr)
-            return 1
-
-        from PIL import Image as PILImage
-
-        new_paths: list[Path] = []
-        for p in collected:
-            if p.suffix.lower() == ".pdf":
-                new_paths.append(p)
-                continue
-            try:
-                with PILImage.open(p) as probe:
-                    img_w, img_h = probe.size
-            except Exception as exc:
-                print(f"Warning: 跳过 {p}（{exc}）", file=sys.stderr)
-                continue
-
-            try:
-                actual_h, source = compute_split_height(img_w, img_h, split_height)
-            except ValueError as exc:
-                print(f"Error: {exc}", file=sys.stderr)
-                if split_tmp_dir is not None:
-                    shutil.rmtree(split_tmp_dir, ignore_errors=True)
-                return 1
-
-            if img_h <= actual_h:
-                print(f"图片 {p.name} 高度 {img_h}px，未触发切割")
-                new_paths.append(p)
-                continue
-
-            segments = split_image(p, actual_h, split_tmp_dir)
-            print(
-                f"  切割 {p.name} ({img_w}×{img_h}px) → {len(segments)} 段 "
-                f"({source} 段高={actual_h}px)"
-            )
-            new_paths.extend(segments)
-
-        if len(collected) > 0 and len(new_paths) > len(collected) * 5:
-            print(
-                f"⚠️ 切割后段数 {len(new_paths)} 远超原图数 {len(collected)} × 5，"
-                "建议调大 --split-height"
-            )
+    items: list[dict[str, Any]] = []
+    unit_count = 0  # inputs after splitting (a PDF counts once)
+    for p in collected:
+        if p.suffix.lower() == ".pdf":
+            items.extend(pdf_page_items(p))
+            unit_count += 1
+            continue
 
-        processed_paths = new_paths
+        size = probe_image(p)
+        if size is None:
+            continue
+        img_w, img_h = size
 
-    try:
-        items: list[tuple[Any, float, float]] = []
-        for p in processed_paths:
-            if p.suffix.lower() == ".pdf":
-                items.extend(pdf_to_page_readers(p))
-            else:
-                items.append(img_to_pdf_page(p))
+        if not split:
+            items.append(image_item(p, img_w, img_h))
+            unit_count += 1
+            continue
 
-        if not items:
-            print("No valid pages to process.", file=sys.stderr)
+        try:
+            actual_h, source = compute_split_height(img_w, img_h, split_height)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
             return 1
 
-        if per_page == 0:
-            portrait_count = sum(1 for _, w, h in items if h > w)
-            landscape_count = len(items) - portrait_count
-            per_page = 3 if portrait_count >= landscape_count else 1
-            print(f"Auto: 竖版{portrait_count}张、横版{landscape_count}张 → 每页{per_page}张")
+        if img_h <= actual_h:
+            print(f"图片 {p.name} 高度 {img_h}px，未触发切割")
+            items.append(image_item(p, img_w, img_h))
+            unit_count += 1
+            continue
+
+        segments = slice_image(p, img_w, img_h, actual_h)
+        print(
+            f"  切割 {p.name} ({img_w}×{img_h}px) → {len(segments)} 段 "
+            f"({source} 段高={actual_h}px)"
+        )
+        items.extend(segments)
+        unit_count += len(segments)
+
+    if split and len(collected) > 0 and unit_count > len(collected) * 5:
+        print(
+            f"⚠️ 切割后段数 {unit_count} 远超原图数 {len(collected)} × 5，"
+            "建议调大 --split-height"
+        )
+
+    if not items:
+        print("No valid pages to process.", file=sys.stderr)
+        return 1
+
+    if per_page == 0:
+        portrait_count = sum(1 for item in items if item["height"] > item["width"])
+        landscape_count = len(items) - portrait_count
+        per_page = 3 if portrait_count >= landscape_count else 1
+        print(f"Auto: 竖版{portrait_count}张、横版{landscape_count}张 → 每页{per_page}张")
 
-        build_pdf(items, out_path, per_page, margin, orientation, dry_run)
-        return 0
-    finally:
-        if split_tmp_dir is not None and split_tmp_dir.exists():
-            shutil.rmtree(split_tmp_dir, ignore_errors=True)
+    build_pdf(items, out_path, per_page, margin, orientation, dry_run, jobs=jobs, max_dpi=max_dpi)
+    report_usage(started)
+    return 0
 
 
 def main() -> int:
@@ -468,6 +699,8 @@ def main() -> int:
     parser.add_argument("--sort", choices=["name", "time", "none"], default="name", help="Sort order for directory inputs (default: name)")
     parser.add_argument("--split", action="store_true", help="Split long screenshots into segments before layout (nup mode only)")
     parser.add_argument("--split-height", type=int, default=None, help="Override split segment height in px (default: A4 ratio = img_w × √2). Ignored in vertical mode.")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(), help="Threads for reading/re-encoding images ahead of PDF assembly (default: min(CPU count, 8))")
+    parser.add_argument("--max-dpi", type=float, default=0, help="Downscale images whose effective resolution in their cell exceeds this DPI (default: 0 = keep original pixels)")
     parser.add_argument("--dry-run", action="store_true", help="Preview without writing")
     args = parser.parse_args()
 
@@ -477,6 +710,10 @@ def main() -> int:
         parser.error("--per-page must be 1, 2, 3, 4, or omit for auto")
     if args.split_height is not None and args.split_height <= 0:
         parser.error("--split-height must be a positive integer")
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.max_dpi < 0:
+        parser.error("--max-dpi must be >= 0")
 
     return process(
         args.input,
@@ -489,6 +726,8 @@ def main() -> int:
         mode=args.mode,
         split=args.split,
         split_height=args.split_height,
+        jobs=args.jobs,
+        max_dpi=args.max_dpi,
     )
 
 
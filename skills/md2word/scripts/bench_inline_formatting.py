@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行内格式解析微基准
+对比旧版多正则 + O(n²) 重叠消解实现与当前 parse_formatted_text 的耗时，并校验两者输出一致。
+
+用法：
+    python scripts/bench_inline_formatting.py                  # 默认使用 contract-copilot 合同类型参考文档
+    python scripts/bench_inline_formatting.py a.md b.md --repeat 20
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from formatter import INLINE_FORMAT_PATTERNS, parse_formatted_text  # noqa: E402
+
+DEFAULT_CORPUS_DIR = SCRIPT_DIR.parents[1] / "contract-copilot" / "references" / "contract-types"
+
+
+def legacy_parse_formatted_text(text, format_patterns):
+    """v1.2.1 及之前的 parse_formatted_text 实现，仅作基准与回归对照，不在转换路径中使用"""
+
+    if not text:
+        return []
+
+    parts = []
+    current_pos = 0
+
+    all_matches = []
+    for pattern, format_dict in format_patterns:
+        for match in re.finditer(pattern, text):
+            all_matches.append({
+                'start': match.start(),
+                'end': match.end(),
+                'text': match.group(1),
+                'format': format_dict,
+                'full_match': match.group(0)
+            })
+
+    all_matches.sort(key=lambda x: x['start'])
+
+    filtered_matches = []
+    for match in all_matches:
+        overlap = False
+        for existing in filtered_matches:
+            if (match['start'] < existing['end'] and match['end'] > existing['start']):
+                if len(match['full_match']) > len(existing['full_match']):
+                    filtered_matches.remove(existing)
+                    filtered_matches.append(match)
+                overlap = True
+                break
+        if not overlap:
+            filtered_matches.append(match)
+
+    filtered_matches.sort(key=lambda x: x['start'])
+
+    for match in filtered_matches:
+        if current_pos < match['start']:
+            normal_text = text[current_pos:match['start']]
+            if normal_text:
+                parts.append((normal_text, {}))
+        parts.append((match['text'], match['format']))
+        current_pos = match['end']
+
+    if current_pos < len(text):
+        remaining_text = text[current_pos:]
+        if remaining_text:
+            parts.append((remaining_text, {}))
+
+    if not parts:
+        parts.append((text, {}))
+
+    return parts
+
+
+def collect_segments(paths):
+    """按转换路径的粒度（段落行 / 表格单元格 / <br> 分段）切分 Markdown"""
+    segments = []
+    for path in paths:
+        for line in Path(path).read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            cells = line.strip('|').split('|') if line.startswith('|') else [line]
+            for cell in cells:
+                segments.extend(re.split(r'<br\s*/?>', cell.strip(), flags=re.IGNORECASE))
+    return [s for s in segments if s]
+
+
+def _time(func, segments, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for segment in segments:
+            func(segment, INLINE_FORMAT_PATTERNS)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='md2word 行内格式解析微基准')
+    parser.add_argument('files', nargs='*', help='Markdown 文件（默认取 contract-copilot 合同类型参考文档）')
+    parser.add_argument('--repeat', type=int, default=10, help='重复次数，取最快一次（默认 10）')
+    args = parser.parse_args()
+
+    paths = args.files or sorted(DEFAULT_CORPUS_DIR.rglob('*.md'))
+    if not paths:
+        print('❌ 未找到基准语料，请显式传入 Markdown 文件')
+        return 1
+
+    segments = collect_segments(paths)
+    mismatches = [s for s in segments
+                  if legacy_parse_formatted_text(s, INLINE_FORMAT_PATTERNS) != parse_formatted_text(s, INLINE_FORMAT_PATTERNS)]
+
+    legacy = _time(legacy_parse_formatted_text, segments, args.repeat)
+    current = _time(parse_formatted_text, segments, args.repeat)
+
+    print(f'语料: {len(paths)} 个文件, {len(segments)} 个文本段')
+    print(f'旧实现: {legacy * 1000:.2f} ms')
+    print(f'新实现: {current * 1000:.2f} ms  (x{legacy / current:.1f})' if current else '新实现: 0 ms')
+    if mismatches:
+        print(f'⚠️  输出不一致: {len(mismatches)} 段，例如: {mismatches[0]!r}')
+        return 1
+    print('✅ 输出与旧实现完全一致')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
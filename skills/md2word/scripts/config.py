@@ -275,6 +275,8 @@ def get_fallback_config() -> Config:
             'max_width_cm': 14.2,
             'target_dpi': 400,
             'show_caption': True,
+            'remote_cache_dir': None,
+            'download_workers': 6,
         },
         'horizontal_rule': {
             'character': '─',
@@ -14,6 +14,27 @@ from docx.oxml.shared import OxmlElement
 # 导入配置模块
 from config import Config, get_config
 
+# 行内格式标记（正文段落与表格单元格共用）
+INLINE_FORMAT_PATTERNS = [
+    (r'\*\*\*(.*?)\*\*\*', {'bold': True, 'italic': True}),
+    (r'___(.*?)___', {'bold': True, 'italic': True}),
+    (r'\*\*(.*?)\*\*', {'bold': True}),
+    (r'__(.*?)__', {'bold': True}),
+    (r'(?<!\*)\*([^*\n]+?)\*(?!\*)', {'italic': True}),
+    (r'(?<!_)_([^_\n]+?)_(?!_)', {'italic': True}),
+    (r'<strong>(.*?)</strong>', {'bold': True}),
+    (r'<b>(.*?)</b>', {'bold': True}),
+    (r'<em>(.*?)</em>', {'italic': True}),
+    (r'<i>(.*?)</i>', {'italic': True}),
+    (r'<u>(.*?)</u>', {'underline': True}),
+    (r'~~(.*?)~~', {'strikethrough': True}),
+    (r'<s>(.*?)</s>', {'strikethrough': True}),
+    (r'<del>(.*?)</del>', {'strikethrough': True}),
+    (r'<strike>(.*?)</strike>', {'strikethrough': True}),
+    (r'`([^`\n]+)`', {'code': True}),
+    (r'\$([^$\n]+?)\$', {'math': True}),  # LaTeX数学公式支持
+]
+
 
 def convert_quotes_to_chinese(text):
     """将英文引号转换为中文引号（交替状态机版）
@@ -115,25 +136,7 @@ def parse_text_formatting(paragraph, text, title_level=0, is_quote=False):
     segments = re.split(r'<br\s*/?>', text, flags=re.IGNORECASE)
 
     # 使用正则表达式解析所有格式标记
-    format_patterns = [
-        (r'\*\*\*(.*?)\*\*\*', {'bold': True, 'italic': True}),
-        (r'___(.*?)___', {'bold': True, 'italic': True}),
-        (r'\*\*(.*?)\*\*', {'bold': True}),
-        (r'__(.*?)__', {'bold': True}),
-        (r'(?<!\*)\*([^*\n]+?)\*(?!\*)', {'italic': True}),
-        (r'(?<!_)_([^_\n]+?)_(?!_)', {'italic': True}),
-        (r'<strong>(.*?)</strong>', {'bold': True}),
-        (r'<b>(.*?)</b>', {'bold': True}),
-        (r'<em>(.*?)</em>', {'italic': True}),
-        (r'<i>(.*?)</i>', {'italic': True}),
-        (r'<u>(.*?)</u>', {'underline': True}),
-        (r'~~(.*?)~~', {'strikethrough': True}),
-        (r'<s>(.*?)</s>', {'strikethrough': True}),
-        (r'<del>(.*?)</del>', {'strikethrough': True}),
-        (r'<strike>(.*?)</strike>', {'strikethrough': True}),
-        (r'`([^`\n]+)`', {'code': True}),
-        (r'\$([^$\n]+?)\$', {'math': True}),  # LaTeX数学公式支持
-    ]
+    format_patterns = INLINE_FORMAT_PATTERNS
 
     for idx, segment in enumerate(segments):
         text_parts = parse_formatted_text(segment, format_patterns)
@@ -145,70 +148,95 @@ def parse_text_formatting(paragraph, text, title_level=0, is_quote=False):
             paragraph.add_run().add_break()
 
 
+def _inline_trigger(pattern):
+    """返回行内格式正则的首个字面字符（用于快速跳过不含该字符的文本），无法确定时返回 None"""
+    body = re.sub(r'^\(\?<[!=][^)]*\)', '', pattern)
+    if body.startswith('\\') and len(body) > 1:
+        return None if body[1].isalnum() else body[1]
+    if body and body[0] not in '([.^$|?+*{\\' and not body[0].isalnum():
+        return body[0]
+    return None
+
+
+_COMPILED_INLINE = {}
+
+
+def _compile_inline(pattern):
+    """按正则字符串缓存编译结果与触发字符，整个进程只编译一次"""
+    entry = _COMPILED_INLINE.get(pattern)
+    if entry is None:
+        entry = (re.compile(pattern), _inline_trigger(pattern))
+        _COMPILED_INLINE[pattern] = entry
+    return entry
+
+
 def parse_formatted_text(text, format_patterns):
-    """解析带格式的文本，返回(文本, 格式)的列表"""
+    """解析带格式的文本，返回(文本, 格式)的列表
+
+    单趟扫描实现：
+    1. 每个格式正则只编译一次，并按首个字面字符（``*`` ``_`` ``<`` ``~`` `` ` `` ``$``）
+       做门控——文本中没有该字符的正则直接跳过，纯文本段落零正则扫描；
+    2. 候选匹配按 (起点, 正则顺序) 排序后线性消解重叠：与旧实现相同，
+       与「最早加入且仍覆盖当前起点」的已选匹配比较，更长者胜出。
+       已结束于当前起点之前的匹配不可能再与后续候选重叠，移出活动窗口，
+       因此不再需要对全部已选匹配做 O(n²) 扫描与 ``list.remove``。
+    """
 
     if not text:
         return []
 
-    parts = []
-    current_pos = 0
+    # 查找所有格式标记的位置（跳过触发字符不在文本中的正则）
+    candidates = []
+    for order, (pattern, format_dict) in enumerate(format_patterns):
+        compiled, trigger = _compile_inline(pattern)
+        if trigger is not None and trigger not in text:
+            continue
+        for match in compiled.finditer(text):
+            candidates.append((match.start(), order, match.end(), match.group(1), format_dict))
+
+    if not candidates:
+        return [(text, {})]
 
-    # 查找所有格式标记的位置
-    all_matches = []
-    for pattern, format_dict in format_patterns:
-        for match in re.finditer(pattern, text):
-            all_matches.append({
-                'start': match.start(),
-                'end': match.end(),
-                'text': match.group(1),
-                'format': format_dict,
-                'full_match': match.group(0)
-            })
-
-    # 按开始位置排序
-    all_matches.sort(key=lambda x: x['start'])
+    # 按开始位置排序（同起点保持正则声明顺序）
+    candidates.sort(key=lambda c: (c[0], c[1]))
 
     # 处理重叠的匹配（选择最长的匹配）
-    filtered_matches = []
-    for match in all_matches:
-        # 检查是否与已有匹配重叠
-        overlap = False
-        for existing in filtered_matches:
-            if (match['start'] < existing['end'] and match['end'] > existing['start']):
-                # 有重叠，选择更长的匹配
-                if len(match['full_match']) > len(existing['full_match']):
-                    filtered_matches.remove(existing)
-                    filtered_matches.append(match)
-                overlap = True
-                break
-        if not overlap:
-            filtered_matches.append(match)
-
-    # 重新按位置排序
-    filtered_matches.sort(key=lambda x: x['start'])
+    # active: 仍可能与后续候选重叠的已选匹配，按加入顺序排列
+    # kept: 已选匹配，(start, seq, end, text, format)，seq 为加入顺序
+    kept = {}
+    active = []
+    seq = 0
+    for start, _order, end, inner, format_dict in candidates:
+        active = [s for s in active if kept[s][2] > start]
+        if active:
+            existing_seq = active[0]
+            existing = kept[existing_seq]
+            if end - start > existing[2] - existing[0]:
+                del kept[existing_seq]
+                active.pop(0)
+                kept[seq] = (start, seq, end, inner, format_dict)
+                active.append(seq)
+                seq += 1
+            continue
+        kept[seq] = (start, seq, end, inner, format_dict)
+        active.append(seq)
+        seq += 1
 
     # 构建文本部分列表
-    for match in filtered_matches:
+    parts = []
+    current_pos = 0
+    for start, _seq, end, inner, format_dict in sorted(kept.values()):
         # 添加前面的普通文本
-        if current_pos < match['start']:
-            normal_text = text[current_pos:match['start']]
-            if normal_text:
-                parts.append((normal_text, {}))
+        if current_pos < start:
+            parts.append((text[current_pos:start], {}))
 
         # 添加格式化文本
-        parts.append((match['text'], match['format']))
-        current_pos = match['end']
+        parts.append((inner, format_dict))
+        current_pos = end
 
     # 添加剩余的普通文本
     if current_pos < len(text):
-        remaining_text = text[current_pos:]
-        if remaining_text:
-            parts.append((remaining_text, {}))
-
-    # 如果没有找到任何格式，返回整个文本作为普通文本
-    if not parts:
-        parts.append((text, {}))
+        parts.append((text[current_pos:], {}))
 
     return parts
 
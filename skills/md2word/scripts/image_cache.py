@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+外链图片缓存模块
+在构建文档前扫描 Markdown 中的外链图片，用有界线程池并发下载到本地磁盘缓存，
+构建阶段直接从缓存读取，转换耗时不再是各图片网络延迟之和。
+
+缓存策略：
+1. 每个 URL 以 sha256 命名，存放 `<key>.img`（图片字节）与 `<key>.json`（ETag / Last-Modified 等元数据）
+2. 缓存命中时发送条件请求（If-None-Match / If-Modified-Since），304 直接复用本地文件
+3. 网络失败但存在旧缓存时降级使用旧缓存
+4. 同一进程内每个 URL 只请求一次（预取后构建阶段零网络）
+5. 缓存目录不可写时，已下载的图片保留在内存中供本次构建使用
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'md2word', 'images')
+DEFAULT_WORKERS = 6
+DOWNLOAD_TIMEOUT = 20
+
+# 与 create_word_document 中整行图片语法一致：![alt](url)
+_IMAGE_LINE_PATTERN = re.compile(r'^!\[([^\]]*)\]\((.+)\)$')
+
+
+def find_remote_image_urls(lines):
+    """扫描 Markdown 行，返回外链图片 URL 列表（按出现顺序去重；代码块内的不算）"""
+    urls = []
+    seen = set()
+    in_fence = False
+    for line in lines:
+        stripped = line.strip()
+        # 与 create_word_document 一致：``` 开头的行开启/关闭代码块（含 mermaid）
+        if stripped.startswith('```'):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = _IMAGE_LINE_PATTERN.match(stripped)
+        if not match:
+            continue
+        url = match.group(2).strip()
+        if url.startswith(('http://', 'https://')) and url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+class RemoteImageCache:
+    """外链图片磁盘缓存（线程安全，按 URL 记忆本次运行的结果）"""
+
+    def __init__(self, cache_dir=None, workers=DEFAULT_WORKERS, timeout=DOWNLOAD_TIMEOUT):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.workers = max(1, int(workers or 1))
+        self.timeout = timeout
+        self._resolved = {}
+        self._memory = {}  # 缓存写入失败时的图片字节（仅本进程）
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f'{key}.img'),
+                os.path.join(self.cache_dir, f'{key}.json'))
+
+    def _url_lock(self, url):
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomic(self, path, data, mode='wb'):
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def fetch(self, url):
+        """返回 URL 对应的本地缓存文件路径；下载失败且无旧缓存时返回 None"""
+        with self._lock:
+            if url in self._resolved:
+                return self._resolved[url]
+
+        with self._url_lock(url):
+            with self._lock:
+                if url in self._resolved:
+                    return self._resolved[url]
+            path = self._fetch_uncached(url)
+            with self._lock:
+                self._resolved[url] = path
+            return path
+
+    def _fetch_uncached(self, url):
+        data_path, meta_path = self._paths(url)
+        has_cached = os.path.exists(data_path)
+        meta = self._read_meta(meta_path) if has_cached else {}
+
+        headers = {'User-Agent': USER_AGENT}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                image_data = response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and has_cached:
+                return data_path
+            if has_cached:
+                print(f"⚠️  图片下载失败，使用本地缓存: {url[:80]}... ({e})")
+                return data_path
+            print(f"⚠️  图片下载失败: {url[:80]}... ({e})")
+            return None
+        except Exception as e:
+            if has_cached:
+                print(f"⚠️  图片下载失败，使用本地缓存: {url[:80]}... ({e})")
+                return data_path
+            print(f"⚠️  图片下载失败: {url[:80]}... ({e})")
+            return None
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_atomic(data_path, image_data)
+            self._write_atomic(meta_path, json.dumps({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }, ensure_ascii=False), mode='w')
+        except OSError as e:
+            print(f"⚠️  图片缓存写入失败，本次使用内存中的图片: {e}")
+            with self._lock:
+                self._memory[url] = image_data
+            return None
+        return data_path
+
+    def read(self, url):
+        """返回 URL 对应的图片字节；下载失败且无旧缓存时返回 None"""
+        path = self.fetch(url)
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    return f.read()
+            except OSError:
+                pass
+        with self._lock:
+            return self._memory.get(url)
+
+    def prefetch(self, urls):
+        """并发预取一组 URL（有界线程池），返回成功数"""
+        pending = [u for u in urls if u not in self._resolved]
+        if not pending:
+            return 0
+        print(f"🌐 预取外部图片: {len(pending)} 张（并发 {min(self.workers, len(pending))}）")
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+            results = list(pool.map(self.fetch, pending))
+        return sum(1 for url, path in zip(pending, results) if path or url in self._memory)
+
+
+_active_cache = None
+
+
+def get_image_cache(config=None):
+    """返回进程级外链图片缓存；缓存目录与并发数读 image.remote_cache_dir / image.download_workers"""
+    global _active_cache
+    if _active_cache is None:
+        image_config = config.get('image', {}) if config is not None else {}
+        cache_dir = image_config.get('remote_cache_dir') or os.environ.get('MD2WORD_IMAGE_CACHE')
+        if cache_dir:
+            cache_dir = os.path.expanduser(cache_dir)
+        _active_cache = RemoteImageCache(
+            cache_dir=cache_dir,
+            workers=image_config.get('download_workers', DEFAULT_WORKERS),
+        )
+    return _active_cache
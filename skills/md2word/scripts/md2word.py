@@ -12,7 +12,6 @@ import argparse
 import re
 import glob
 import tempfile
-import urllib.request
 import urllib.parse
 import io
 
@@ -46,6 +45,7 @@ from table_handler import (
 )
 from chart_handler import create_mermaid_chart
 from svg_handler import render_inline_svg
+from image_cache import find_remote_image_urls, get_image_cache
 from footnote_handler import (
     FootnoteManager, extract_footnote_defs, NOTE_REF_RE,
     set_footnote_restart_per_section,
@@ -150,13 +150,11 @@ def insert_image_to_word(doc, image):
 
 
 def download_external_image(url):
-    """从URL下载图片并返回PIL Image对象"""
+    """从URL下载图片并返回PIL Image对象（经磁盘缓存，已预取的 URL 不再发起请求）"""
+    image_data = get_image_cache(get_config()).read(url)
+    if not image_data:
+        return None
     try:
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        with urllib.request.urlopen(req, timeout=20) as response:
-            image_data = response.read()
         image = Image.open(io.BytesIO(image_data))
         image.load()  # 确保数据已加载
         return image
@@ -692,6 +690,8 @@ def create_word_document(md_file_path, output_path, template_file=None, config:
     content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
 
     lines = content.split('\n')
+    # 外链图片：构建前并发预取到磁盘缓存，构建阶段直接读缓存
+    get_image_cache(config).prefetch(find_remote_image_urls(lines))
     # 脚注/尾注：提取 [^id]: 定义行（从正文移除），建立 FootnoteManager
     global _active_fn_manager
     fn_defs, lines = extract_footnote_defs(lines)
@@ -438,7 +438,7 @@ def parse_table_cell_formatting(cell, text, is_header=False, md_file_path=None):
 
 def _render_text_into_cell(cell, text, is_header):
     """将格式化文本（不含图片 markdown 语法）写入表格 cell"""
-    from formatter import convert_quotes_to_chinese, parse_formatted_text
+    from formatter import INLINE_FORMAT_PATTERNS, convert_quotes_to_chinese, parse_formatted_text
 
     # 转换引号
     text = convert_quotes_to_chinese(text)
@@ -447,25 +447,7 @@ def _render_text_into_cell(cell, text, is_header):
     parts_by_br = re.split(r'<br\s*/?>', text, flags=re.IGNORECASE)
 
     # 解析格式
-    format_patterns = [
-        (r'\*\*\*(.*?)\*\*\*', {'bold': True, 'italic': True}),
-        (r'___(.*?)___', {'bold': True, 'italic': True}),
-        (r'\*\*(.*?)\*\*', {'bold': True}),
-        (r'__(.*?)__', {'bold': True}),
-        (r'(?<!\*)\*([^*\n]+?)\*(?!\*)', {'italic': True}),
-        (r'(?<!_)_([^_\n]+?)_(?!_)', {'italic': True}),
-        (r'<strong>(.*?)</strong>', {'bold': True}),
-        (r'<b>(.*?)</b>', {'bold': True}),
-        (r'<em>(.*?)</em>', {'italic': True}),
-        (r'<i>(.*?)</i>', {'italic': True}),
-        (r'<u>(.*?)</u>', {'underline': True}),
-        (r'~~(.*?)~~', {'strikethrough': True}),
-        (r'<s>(.*?)</s>', {'strikethrough': True}),
-        (r'<del>(.*?)</del>', {'strikethrough': True}),
-        (r'<strike>(.*?)</strike>', {'strikethrough': True}),
-        (r'`([^`\n]+)`', {'code': True}),
-        (r'\$([^$\n]+?)\$', {'math': True}),  # LaTeX数学公式支持
-    ]
+    format_patterns = INLINE_FORMAT_PATTERNS
 
     for idx, segment in enumerate(parts_by_br):
         if idx > 0:
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """md2word 已知出版逃逸的回归测试。"""
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from tempfile import TemporaryDirectory
+import random
 import sys
+import threading
 import unittest
 import zipfile
 
@@ -14,7 +17,9 @@ HERE = Path(__file__).resolve().parent
 if str(HERE) not in sys.path:
     sys.path.insert(0, str(HERE))
 
-from formatter import convert_quotes_to_chinese  # noqa: E402
+from bench_inline_formatting import legacy_parse_formatted_text  # noqa: E402
+from image_cache import RemoteImageCache, find_remote_image_urls  # noqa: E402
+from formatter import INLINE_FORMAT_PATTERNS, convert_quotes_to_chinese, parse_formatted_text  # noqa: E402
 from footnote_handler import (  # noqa: E402
     FootnoteManager,
     _footnote_text_to_runs_xml,
@@ -73,6 +78,120 @@ class Md2WordRegressionTest(unittest.TestCase):
         self.assertFalse(hasattr(md2word, "ALLOW_REMOTE_IMAGES"), "外链图片下载开关已移除，保持默认下载")
 
 
+INLINE_CORPUS = [
+    "",
+    "纯中文段落，没有任何格式标记。",
+    "甲方应于**签约后 5 日内**支付*首期款*，逾期按 `0.05%/日` 计收违约金。",
+    "***粗斜体*** 与 ___粗斜体___ 以及 __加粗__ 和 _斜体_",
+    "**a *b* c** 嵌套 <b>粗</b><i>斜</i><u>下划线</u>",
+    "<strong>S</strong><em>E</em><s>删</s><del>删</del><strike>删</strike>~~删~~",
+    "公式 $E=mc^2$ 与代码 `a*b*c` 混排",
+    "$a `bb$ ccc` 重叠时取更长匹配",
+    "***a** 未闭合、**未闭合、*孤立星号、file_name_here、snake_case_var",
+    "连续 **A** **B** **C**，结尾 **D**",
+]
+
+
+class InlineTokenizerRegressionTest(unittest.TestCase):
+    def assert_same_as_legacy(self, text):
+        self.assertEqual(
+            parse_formatted_text(text, INLINE_FORMAT_PATTERNS),
+            legacy_parse_formatted_text(text, INLINE_FORMAT_PATTERNS),
+            msg=repr(text),
+        )
+
+    def test_corpus_matches_legacy_implementation(self):
+        for text in INLINE_CORPUS:
+            self.assert_same_as_legacy(text)
+
+    def test_random_markup_matches_legacy_implementation(self):
+        rng = random.Random(20261019)
+        alphabet = ["*", "**", "_", "__", "`", "$", "~~", "<b>", "</b>", "<u>", "</u>", "a", "中", " ", "\n"]
+        for _ in range(3000):
+            self.assert_same_as_legacy("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 24))))
+
+    def test_plain_text_returns_single_run(self):
+        self.assertEqual(parse_formatted_text("合同正文", INLINE_FORMAT_PATTERNS), [("合同正文", {})])
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        type(self).requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/missing.png":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"PNG-BYTES" + self.path.encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RemoteImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        _ImageHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_find_remote_image_urls_only_picks_whole_line_remote_images(self):
+        lines = [
+            f"![a]({self.base}/a.png)",
+            "  ![b](local.png)",
+            f"正文 ![c]({self.base}/c.png)",
+            f"![a again]({self.base}/a.png)",
+            "```markdown",
+            f"![fenced]({self.base}/fenced.png)",
+            "```",
+        ]
+        self.assertEqual(find_remote_image_urls(lines), [f"{self.base}/a.png"])
+
+    def test_prefetch_downloads_once_and_revalidates_with_etag(self):
+        with TemporaryDirectory() as temp:
+            urls = [f"{self.base}/{i}.png" for i in range(5)]
+            cache = RemoteImageCache(cache_dir=temp, workers=3)
+            self.assertEqual(cache.prefetch(urls), 5)
+            # 同一进程内重复取用不再请求
+            path = cache.fetch(urls[0])
+            self.assertEqual(Path(path).read_bytes(), b"PNG-BYTES/0.png")
+            self.assertEqual(len(_ImageHandler.requests_seen), 5)
+
+            # 新进程（新缓存对象）命中磁盘缓存，发送条件请求并复用 304
+            rebuilt = RemoteImageCache(cache_dir=temp, workers=3)
+            self.assertEqual(rebuilt.fetch(urls[0]), path)
+            self.assertEqual(_ImageHandler.requests_seen[-1], ("/0.png", '"v1"'))
+
+    def test_unwritable_cache_keeps_downloaded_bytes(self):
+        with TemporaryDirectory() as temp:
+            blocker = Path(temp) / "not-a-dir"
+            blocker.write_text("")
+            cache = RemoteImageCache(cache_dir=str(blocker / "images"))
+            url = f"{self.base}/0.png"
+            self.assertEqual(cache.prefetch([url]), 1)
+            self.assertEqual(cache.read(url), b"PNG-BYTES/0.png")
+            self.assertEqual(len(_ImageHandler.requests_seen), 1)
+
+    def test_failed_download_returns_none(self):
+        with TemporaryDirectory() as temp:
+            cache = RemoteImageCache(cache_dir=temp)
+            self.assertIsNone(cache.fetch(f"{self.base}/missing.png"))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
 
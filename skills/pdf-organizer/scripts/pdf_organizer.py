@@ -4,12 +4,15 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -18,6 +21,10 @@ from typing import Any
 INVALID_FILENAME_CHARS = r'<>:"/\\|?*'
 SKILL_DIR = Path(__file__).resolve().parent.parent
 ARCHIVE_ROOT = SKILL_DIR / "archive"
+INSPECT_CACHE_DIR = ARCHIVE_ROOT / ".inspect_cache"
+# Bump when detector output changes so stale cached inspections are ignored.
+INSPECT_CACHE_VERSION = 1
+INSPECT_CHUNK_PAGES = 16
 SPECIFIC_TITLE_PATTERN = re.compile(
     r"(专项法律服务合同|委托代理合同|授权委托书|律师事务所函|民事起诉状|起诉状|"
     r"证据目录|答辩状|申请书|告知书|通知书|裁定书|判决书|调解书|决定书)"
@@ -27,6 +34,12 @@ DATE_PATTERN = re.compile(r"(?:19|20)\d{2}\s*[年./-]\s*\d{1,2}\s*[月./-]\s*\d{
 PAGE_TOTAL_PATTERN = re.compile(r"第\s*(\d{1,3})\s*页\s*共\s*(\d{1,3})\s*页")
 SLASH_PAGE_PATTERN = re.compile(r"(?<!\d)(\d{1,3})\s*/\s*(\d{1,3})(?!\d)")
 COMPANY_PATTERN = re.compile(r"([\u4e00-\u9fa5A-Za-z0-9（）()]{2,30}(?:公司|律所|事务所|委员会|法院|检察院))")
+PARTY_PREFIX_PATTERNS = [
+    re.compile(prefix + r"[:：]?\s*([\u4e00-\u9fa5A-Za-z0-9（）()]{2,20})")
+    for prefix in ["原告", "被告", "甲方", "乙方", "委托人", "委托方"]
+]
+CLOSING_KEYWORDS = ["以下无正文", "具状人", "此致", "签订日期", "签约日期", "委托人签字", "盖章"]
+FORM_KEYWORDS = ["要素式", "当事人信息", "诉讼请求的依据", "证据和证据来源"]
 
 
 def load_pypdf():
@@ -39,6 +52,18 @@ def load_pypdf():
     return PdfReader, PdfWriter
 
 
+def load_fitz():
+    """Return the PyMuPDF module, or None when it is not installed (callers fall back to pypdf)."""
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        try:
+            import fitz
+        except ImportError:
+            return None
+    return fitz
+
+
 def read_json(path: Path) -> dict[str, Any]:
     try:
         with path.open("r", encoding="utf-8") as f:
@@ -107,8 +132,10 @@ def sanitize_filename(name: str, fallback: str) -> str:
     return stem
 
 
-def unique_path(path: Path) -> Path:
-    if not path.exists():
+def unique_path(path: Path, reserved: set[Path] | None = None) -> Path:
+    """Return path, or the first "name N.pdf" variant not on disk and not already in reserved."""
+    reserved = reserved or set()
+    if not path.exists() and path not in reserved:
         return path
     stem = path.stem
     suffix = path.suffix
@@ -116,7 +143,7 @@ def unique_path(path: Path) -> Path:
     counter = 1
     while True:
         candidate = parent / f"{stem} {counter}{suffix}"
-        if not candidate.exists():
+        if not candidate.exists() and candidate not in reserved:
             return candidate
         counter += 1
 
@@ -294,8 +321,9 @@ def significant_lines(text: str, limit: int = 12) -> list[str]:
     return lines
 
 
-def detect_page_label(text: str) -> dict[str, int] | None:
-    compact = compact_text(text)
+def detect_page_label(text: str, compact: str | None = None) -> dict[str, int] | None:
+    if compact is None:
+        compact = compact_text(text)
     match = PAGE_TOTAL_PATTERN.search(compact)
     if not match:
         match = SLASH_PAGE_PATTERN.search(compact)
@@ -360,8 +388,13 @@ def detect_document_type(title: str | None, text: str) -> str:
     return title or "待确认"
 
 
-def detect_signals(text: str, title: str | None, page_label: dict[str, int] | None) -> list[str]:
-    body = compact_text(text)
+def detect_signals(
+    text: str,
+    title: str | None,
+    page_label: dict[str, int] | None,
+    compact: str | None = None,
+) -> list[str]:
+    body = compact_text(text) if compact is None else compact
     signals: list[str] = []
     if title:
         signals.append("title")
@@ -369,9 +402,9 @@ def detect_signals(text: str, title: str | None, page_label: dict[str, int] | No
         signals.append("page-reset")
     if page_label and page_label.get("current") == page_label.get("total"):
         signals.append("page-end")
-    if any(keyword in body for keyword in ["以下无正文", "具状人", "此致", "签订日期", "签约日期", "委托人签字", "盖章"]):
+    if any(keyword in body for keyword in CLOSING_KEYWORDS):
         signals.append("closing")
-    if any(keyword in body for keyword in ["要素式", "当事人信息", "诉讼请求的依据", "证据和证据来源"]):
+    if any(keyword in body for keyword in FORM_KEYWORDS):
         signals.append("form-like")
     return signals
 
@@ -387,18 +420,19 @@ def detect_dates(text: str, limit: int = 3) -> list[str]:
     return dates
 
 
-def detect_party_candidates(text: str, limit: int = 6) -> list[str]:
+def detect_party_candidates(text: str, limit: int = 6, lines: list[str] | None = None) -> list[str]:
+    if lines is None:
+        lines = significant_lines(text, limit=80)
     candidates: list[str] = []
-    for line in significant_lines(text, limit=80):
+    for line in lines:
         for match in COMPANY_PATTERN.finditer(line):
             value = match.group(1).strip(" ：:，,。；;、")
             if value not in candidates and 4 <= len(value) <= 35:
                 candidates.append(value)
             if len(candidates) >= limit:
                 return candidates
-    for prefix in ["原告", "被告", "甲方", "乙方", "委托人", "委托方"]:
-        pattern = re.compile(prefix + r"[:：]?\s*([\u4e00-\u9fa5A-Za-z0-9（）()]{2,20})")
-        for line in significant_lines(text, limit=80):
+    for pattern in PARTY_PREFIX_PATTERNS:
+        for line in lines:
             match = pattern.search(line)
             if not match:
                 continue
@@ -410,14 +444,53 @@ def detect_party_candidates(text: str, limit: int = 6) -> list[str]:
     return candidates
 
 
-def inspect_pdf(pdf_path: Path, include_text: bool = False) -> dict[str, Any]:
-    PdfReader, _ = load_pypdf()
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF does not exist: {pdf_path}")
+def inspect_page_text(page_no: int, raw_text: str, rotation: int, extraction_error: str = "") -> dict[str, Any]:
+    """Run every page detector in one pass, sharing the cleaned text, compact text and lines."""
+    text = clean_extracted_text(raw_text)
+    compact = compact_text(text)
+    lines = significant_lines(text, limit=80)
+    page_label = detect_page_label(text, compact=compact)
+    title = detect_title(lines[:12])
+    item: dict[str, Any] = {
+        "page": page_no,
+        "rotation": rotation,
+        "text_chars": len(compact),
+        "first_lines": lines[:8],
+        "title_candidate": title,
+        "document_type_candidate": detect_document_type(title, text),
+        "page_label": page_label,
+        "date_candidates": detect_dates(text),
+        "party_candidates": detect_party_candidates(text, lines=lines),
+        "signals": detect_signals(text, title, page_label, compact=compact),
+    }
+    if extraction_error:
+        item["extraction_error"] = extraction_error
+    item["text"] = text
+    return item
+
 
+def inspect_page_range(pdf_path: str, start: int, end: int) -> list[dict[str, Any]]:
+    """Inspect pages [start, end) with PyMuPDF; runs inside inspection worker processes."""
+    fitz = load_fitz()
+    items: list[dict[str, Any]] = []
+    with fitz.open(pdf_path) as doc:
+        for index in range(start, end):
+            page = doc.load_page(index)
+            try:
+                raw_text = page.get_text()
+            except Exception as exc:  # noqa: BLE001
+                raw_text = ""
+                extraction_error = str(exc)
+            else:
+                extraction_error = ""
+            items.append(inspect_page_text(index + 1, raw_text, page.rotation, extraction_error))
+    return items
+
+
+def inspect_pages_pypdf(pdf_path: Path) -> list[dict[str, Any]]:
+    PdfReader, _ = load_pypdf()
     reader = PdfReader(str(pdf_path))
-    pages: list[dict[str, Any]] = []
-    missing_text_pages: list[int] = []
+    items: list[dict[str, Any]] = []
     for index, page in enumerate(reader.pages, start=1):
         try:
             raw_text = page.extract_text() or ""
@@ -426,35 +499,97 @@ def inspect_pdf(pdf_path: Path, include_text: bool = False) -> dict[str, Any]:
             extraction_error = str(exc)
         else:
             extraction_error = ""
+        items.append(inspect_page_text(index, raw_text, page.get("/Rotate") or 0, extraction_error))
+    return items
 
-        text = clean_extracted_text(raw_text)
-        lines = significant_lines(text)
-        page_label = detect_page_label(text)
-        title = detect_title(lines)
-        text_chars = len(compact_text(text))
-        if text_chars < 20:
-            missing_text_pages.append(index)
-        item: dict[str, Any] = {
-            "page": index,
-            "rotation": page.get("/Rotate") or 0,
-            "text_chars": text_chars,
-            "first_lines": lines[:8],
-            "title_candidate": title,
-            "document_type_candidate": detect_document_type(title, text),
-            "page_label": page_label,
-            "date_candidates": detect_dates(text),
-            "party_candidates": detect_party_candidates(text),
-            "signals": detect_signals(text, title, page_label),
-        }
-        if extraction_error:
-            item["extraction_error"] = extraction_error
-        if include_text:
-            item["text"] = text
-        pages.append(item)
+
+def default_jobs() -> int:
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def inspect_pages(pdf_path: Path, jobs: int) -> list[dict[str, Any]]:
+    """Extract and inspect every page; PyMuPDF page chunks run in a process pool when jobs > 1."""
+    fitz = load_fitz()
+    if fitz is None:
+        return inspect_pages_pypdf(pdf_path)
+
+    with fitz.open(str(pdf_path)) as doc:
+        page_count = doc.page_count
+    chunk = max(INSPECT_CHUNK_PAGES, -(-page_count // (jobs * 4)))
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    if jobs <= 1 or len(ranges) <= 1:
+        return [item for start, end in ranges for item in inspect_page_range(str(pdf_path), start, end)]
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(ranges)))
+    except (OSError, NotImplementedError):
+        return [item for start, end in ranges for item in inspect_page_range(str(pdf_path), start, end)]
+    with pool:
+        chunks = pool.map(
+            inspect_page_range,
+            [str(pdf_path)] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+        )
+        return [item for items in chunks for item in items]
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def inspect_cache_path(pdf_path: Path, extractor: str) -> Path:
+    return INSPECT_CACHE_DIR / f"{file_digest(pdf_path)}.{extractor}.v{INSPECT_CACHE_VERSION}.json"
+
+
+def read_inspect_cache(cache_path: Path) -> list[dict[str, Any]] | None:
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return pages if isinstance(pages, list) else None
+
+
+def write_inspect_cache(cache_path: Path, pages: list[dict[str, Any]]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(pages, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # The cache is an optimization; inspection results are still returned.
+
+
+def inspect_pdf(
+    pdf_path: Path,
+    include_text: bool = False,
+    jobs: int | None = None,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF does not exist: {pdf_path}")
+    extractor = "pymupdf" if load_fitz() else "pypdf"
+    if extractor == "pypdf":
+        load_pypdf()
+
+    cache_path = inspect_cache_path(pdf_path, extractor) if use_cache else None
+    pages = read_inspect_cache(cache_path) if cache_path else None
+    if pages is None:
+        pages = inspect_pages(pdf_path, jobs or default_jobs())
+        if cache_path:
+            write_inspect_cache(cache_path, pages)
+
+    missing_text_pages = [page["page"] for page in pages if page["text_chars"] < 20]
+    if not include_text:
+        pages = [{key: value for key, value in page.items() if key != "text"} for page in pages]
 
     return {
         "file": str(pdf_path),
-        "page_count": len(reader.pages),
+        "page_count": len(pages),
         "created_at": datetime.now().isoformat(timespec="seconds"),
         "text_layer": {
             "has_text_layer": bool(pages) and len(missing_text_pages) < len(pages),
@@ -610,57 +745,35 @@ def write_json_output(data: dict[str, Any], output_path: str | None) -> None:
         print(content, end="")
 
 
-def copy_pdf(input_file: Path, output_file: Path, dry_run: bool) -> None:
-    if dry_run:
-        return
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(input_file, output_file)
-
-
-def split_pdf(source_pdf: Path, output_file: Path, pages: list[int], dry_run: bool) -> None:
-    if dry_run:
-        return
-    PdfReader, PdfWriter = load_pypdf()
-    reader = PdfReader(str(source_pdf))
-    writer = PdfWriter()
-    total_pages = len(reader.pages)
-    for page in pages:
-        if page > total_pages:
-            raise ValueError(f"Page out of bounds: {page} > {total_pages}")
-        writer.add_page(reader.pages[page - 1])
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("wb") as f:
-        writer.write(f)
+def pdf_page_count(path: Path, cache: dict[Path, int]) -> int:
+    """Page count of a PDF, read once per file."""
+    if path not in cache:
+        fitz = load_fitz()
+        if fitz is not None:
+            with fitz.open(str(path)) as doc:
+                cache[path] = doc.page_count
+        else:
+            PdfReader, _ = load_pypdf()
+            cache[path] = len(PdfReader(str(path)).pages)
+    return cache[path]
 
 
-def merge_pdf_items(items: list[dict[str, Any]], output_file: Path, base_dir: Path, dry_run: bool) -> str:
+def plan_merge_items(
+    items: list[dict[str, Any]], base_dir: Path, dry_run: bool, page_counts: dict[Path, int]
+) -> tuple[str, list[tuple[str, list[int] | None]]]:
+    """Resolve merge items to (source label, [(pdf path, pages, or None for every page)])."""
     labels: list[str] = []
-    if dry_run:
-        for item in items:
-            file_path = resolve_path(item.get("file") or item.get("input_file"), base_dir)
-            pages = str(item.get("pages") or "")
-            labels.append(f"{file_path}{':' + pages if pages else ''}")
-        return "; ".join(labels)
-
-    PdfReader, PdfWriter = load_pypdf()
-    writer = PdfWriter()
+    parts: list[tuple[str, list[int] | None]] = []
     for item in items:
         file_path = resolve_path(item.get("file") or item.get("input_file"), base_dir)
-        if not file_path or not file_path.exists():
-            raise FileNotFoundError(f"Input PDF does not exist: {file_path}")
-        reader = PdfReader(str(file_path))
         pages_spec = item.get("pages")
-        if pages_spec:
-            page_numbers = parse_pages(str(pages_spec), len(reader.pages))
-        else:
-            page_numbers = list(range(1, len(reader.pages) + 1))
-        for page_number in page_numbers:
-            writer.add_page(reader.pages[page_number - 1])
+        if not dry_run:
+            if not file_path or not file_path.exists():
+                raise FileNotFoundError(f"Input PDF does not exist: {file_path}")
+            pages = parse_pages(str(pages_spec), pdf_page_count(file_path, page_counts)) if pages_spec else None
+            parts.append((str(file_path), pages))
         labels.append(f"{file_path}{':' + str(pages_spec) if pages_spec else ''}")
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("wb") as f:
-        writer.write(f)
-    return "; ".join(labels)
+    return "; ".join(labels), parts
 
 
 def normalize_source_items(segment: dict[str, Any]) -> list[dict[str, Any]]:
@@ -726,23 +839,6 @@ def run_text_layer_checks(paths: list[Path], max_pages: int) -> list[dict[str, A
     return [check_pdf_text_layer(path, max_pages=max_pages) for path in paths]
 
 
-def rotate_pdf(input_file: Path, output_file: Path, angle: int) -> None:
-    angle = normalize_angle(angle)
-    if angle == 0:
-        if input_file != output_file:
-            shutil.copy2(input_file, output_file)
-        return
-    PdfReader, PdfWriter = load_pypdf()
-    reader = PdfReader(str(input_file))
-    writer = PdfWriter()
-    for page in reader.pages:
-        page.rotate(angle)
-        writer.add_page(page)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("wb") as f:
-        writer.write(f)
-
-
 def deskew_pdf(input_file: Path, output_file: Path) -> None:
     ocrmypdf = shutil.which("ocrmypdf")
     if not ocrmypdf:
@@ -761,38 +857,171 @@ def deskew_pdf(input_file: Path, output_file: Path) -> None:
         raise RuntimeError(f"ocrmypdf deskew failed: {message}")
 
 
-def apply_transforms(output_file: Path, segment: dict[str, Any], manifest: dict[str, Any]) -> list[str]:
-    transforms: list[str] = []
+def segment_transforms(segment: dict[str, Any], manifest: dict[str, Any]) -> dict[str, Any]:
+    """Resolve rotate / normalize_a4 / deskew for a segment; segment values override manifest defaults."""
     rotation = segment.get("rotate") if "rotate" in segment else segment.get("rotation")
     if rotation is None:
         rotation = manifest.get("rotate") if "rotate" in manifest else manifest.get("rotation")
-    deskew = bool(segment.get("deskew", manifest.get("deskew", False)))
+    return {
+        "rotate": normalize_angle(rotation) if rotation is not None else 0,
+        "normalize_a4": bool(segment.get("normalize_a4", manifest.get("normalize_a4", False))),
+        "deskew": bool(segment.get("deskew", manifest.get("deskew", False))),
+    }
 
-    if rotation is not None:
-        angle = normalize_angle(rotation)
-        if angle:
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                tmp_path = Path(tmp.name)
-            try:
-                rotate_pdf(output_file, tmp_path, angle)
-                shutil.move(str(tmp_path), output_file)
-            finally:
-                tmp_path.unlink(missing_ok=True)
-            transforms.append(f"rotate {angle}")
 
-    if deskew:
+# Source PDFs opened by this process, shared by every segment it builds
+_OPEN_SOURCES: dict[str, Any] = {}
+
+
+def open_source(path: str) -> Any:
+    if path not in _OPEN_SOURCES:
+        fitz = load_fitz()
+        if fitz is not None:
+            _OPEN_SOURCES[path] = fitz.open(path)
+        else:
+            PdfReader, _ = load_pypdf()
+            _OPEN_SOURCES[path] = PdfReader(path)
+    return _OPEN_SOURCES[path]
+
+
+def close_sources() -> None:
+    for doc in _OPEN_SOURCES.values():
+        close = getattr(doc, "close", None)
+        if close:
+            close()
+    _OPEN_SOURCES.clear()
+
+
+def page_runs(pages: list[int]) -> list[tuple[int, int]]:
+    """Group 1-based page numbers into (first, last) runs of consecutive pages."""
+    runs: list[tuple[int, int]] = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def normalize_a4_document(fitz: Any, doc: Any) -> Any:
+    """Return a new document with every page of doc scaled and centered on an A4 page."""
+    normalized = fitz.open()
+    for page in doc:
+        page.remove_rotation()  # bake /Rotate into the content so page.rect is what the reader sees
+        rect = page.rect
+        target_w, target_h = A4_LANDSCAPE if rect.width > rect.height else A4_PORTRAIT
+        new_page = normalized.new_page(width=target_w, height=target_h)
+        new_page.show_pdf_page(new_page.rect, doc, page.number)
+    return normalized
+
+
+def write_segment_fitz(fitz: Any, job: dict[str, Any]) -> None:
+    out = fitz.open()
+    try:
+        for path, pages in job["parts"]:
+            src = open_source(path)
+            runs = page_runs(pages) if pages else [(1, src.page_count)] if src.page_count else []
+            for first, last in runs:
+                out.insert_pdf(src, from_page=first - 1, to_page=last - 1)
+        if job["rotate"]:
+            for page in out:
+                page.set_rotation((page.rotation + job["rotate"]) % 360)
+        if job["normalize_a4"]:
+            assembled = out
+            out = normalize_a4_document(fitz, assembled)  # pages are copied, so the original can go
+            assembled.close()
+        out.save(job["output"], garbage=3, deflate=True)
+    finally:
+        out.close()
+
+
+def write_segment_pypdf(job: dict[str, Any]) -> None:
+    _, PdfWriter = load_pypdf()
+    writer = PdfWriter()
+    for path, pages in job["parts"]:
+        reader = open_source(path)
+        for page_number in pages or range(1, len(reader.pages) + 1):
+            page = writer.add_page(reader.pages[page_number - 1])
+            if job["rotate"]:
+                page.rotate(job["rotate"])
+    if job["normalize_a4"]:
+        normalized = PdfWriter()
+        for page in writer.pages:
+            if page.rotation:
+                page.transfer_rotation_to_content()
+            normalize_page_a4(normalized, page)
+        writer = normalized
+    with open(job["output"], "wb") as f:
+        writer.write(f)
+
+
+def build_segment(job: dict[str, Any]) -> list[str]:
+    """Write one output PDF straight from its source pages; returns the transforms applied.
+
+    Pages are copied from the shared source handles with rotation / A4 normalization
+    applied in the same pass, and the output is written once. Whole-file copies without
+    transforms are plain file copies. Deskew still runs ocrmypdf on the written file.
+    """
+    output = Path(job["output"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    transforms: list[str] = []
+    if job["rotate"]:
+        transforms.append(f"rotate {job['rotate']}")
+    if job["normalize_a4"]:
+        transforms.append("normalize_a4")
+
+    parts = job["parts"]
+    if not transforms and len(parts) == 1 and parts[0][1] is None:
+        shutil.copy2(parts[0][0], output)
+    else:
+        fitz = load_fitz()
+        if fitz is not None:
+            write_segment_fitz(fitz, job)
+        else:
+            write_segment_pypdf(job)
+
+    if job["deskew"]:
         with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
             tmp_path = Path(tmp.name)
         try:
-            deskew_pdf(output_file, tmp_path)
-            shutil.move(str(tmp_path), output_file)
+            deskew_pdf(output, tmp_path)
+            shutil.move(str(tmp_path), output)
         finally:
             tmp_path.unlink(missing_ok=True)
         transforms.append("deskew")
-
     return transforms
 
 
+def run_segment_job(job: dict[str, Any]) -> tuple[list[str], str | None]:
+    """Build one segment, returning (transforms, error) instead of raising; runs in worker processes."""
+    try:
+        return build_segment(job), None
+    except Exception as exc:  # noqa: BLE001
+        return [], str(exc)
+
+
+def run_segment_jobs(jobs: list[dict[str, Any]], workers: int) -> list[tuple[list[str], str | None]]:
+    """Build every segment; independent segments run in a process pool when workers > 1.
+
+    Each process opens a source PDF once and reuses it for all the segments it builds;
+    neighbouring segments are handed out together so they share those handles.
+    """
+    workers = min(workers, len(jobs))
+    if workers > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            pool = None
+        if pool is not None:
+            with pool:
+                chunksize = max(1, -(-len(jobs) // (workers * 4)))
+                return list(pool.map(run_segment_job, jobs, chunksize=chunksize))
+    try:
+        return [run_segment_job(job) for job in jobs]
+    finally:
+        close_sources()
+
+
 def suggested_downstream_skills(segment: dict[str, Any]) -> list[str]:
     """根据文书类别返回路由标签，不绑定具体 Skill 名称。"""
     doc_type = str(segment.get("document_type") or segment.get("title") or "")
@@ -990,18 +1219,21 @@ def process_manifest(args: argparse.Namespace) -> int:
         print("\n".join(report_lines))
         return 1
 
+    page_counts: dict[Path, int] = {}
     if source_pdf and needs_source_split and not args.dry_run:
-        PdfReader, _ = load_pypdf()
-        total_pages = len(PdfReader(str(source_pdf)).pages)
+        total_pages = pdf_page_count(source_pdf, page_counts)
 
-    resolved_segments: list[dict[str, Any]] = []
     report_lines = build_report_header(manifest_path, output_dir, archive_dir, args.dry_run, text_check_lines)
     warnings: list[str] = failures[:] if text_check_mode == "warn" else []
     errors: list[str] = []
 
+    # Pass 1: resolve every segment to its source pages and output name; no PDF is written yet.
+    rows: list[dict[str, Any]] = []
+    segment_jobs: list[dict[str, Any]] = []
+    reserved_paths: set[Path] = set()
     for index, segment in enumerate(segments, start=1):
         if not isinstance(segment, dict):
-            errors.append(f"Segment {index} must be an object.")
+            rows.append({"index": index, "error": f"Segment {index} must be an object."})
             continue
 
         segment_id = str(segment.get("id") or f"D{index:03d}")
@@ -1009,59 +1241,87 @@ def process_manifest(args: argparse.Namespace) -> int:
         source_items = normalize_source_items(segment)
         pages_spec = segment.get("pages")
         target_name = segment_filename(segment, index)
-        target_path = unique_path(output_dir / target_name)
-        confidence = str(segment.get("confidence") or "")
-        needs_review = bool(segment.get("needs_review", False))
-        status = "planned" if args.dry_run else "ok"
-        action = "copy"
-        source_label = ""
-        pages_label = str(pages_spec or "")
-        transforms: list[str] = []
+        target_path = unique_path(output_dir / target_name, reserved_paths)
+        row = {
+            "index": index,
+            "segment": segment,
+            "segment_id": segment_id,
+            "target_path": target_path,
+            "status": "planned" if args.dry_run else "ok",
+            "action": "copy",
+            "source_label": "",
+            "pages_label": str(pages_spec or ""),
+            "transforms": [],
+            "job": None,
+            "error": None,
+        }
+        rows.append(row)
 
         try:
             if source_items:
-                action = "merge"
-                source_label = merge_pdf_items(source_items, target_path, manifest_dir, args.dry_run)
-                pages_label = "mixed"
+                row["action"] = "merge"
+                row["source_label"], parts = plan_merge_items(source_items, manifest_dir, args.dry_run, page_counts)
+                row["pages_label"] = "mixed"
             elif input_file:
                 if not input_file.exists():
                     raise FileNotFoundError(f"Input PDF does not exist: {input_file}")
-                source_label = str(input_file)
-                copy_pdf(input_file, target_path, args.dry_run)
+                row["source_label"] = str(input_file)
+                parts = [(str(input_file), None)]
             elif pages_spec:
                 if not source_pdf:
                     raise ValueError("source_pdf is required when segment uses pages.")
                 pages = parse_pages(str(pages_spec), total_pages)
-                source_label = str(source_pdf)
-                pages_label = ",".join(str(page) for page in pages)
-                split_pdf(source_pdf, target_path, pages, args.dry_run)
-                action = "split"
+                row["source_label"] = str(source_pdf)
+                row["pages_label"] = ",".join(str(page) for page in pages)
+                parts = [(str(source_pdf), pages)]
+                row["action"] = "split"
             else:
                 raise ValueError("Segment must contain input_file, source_items/input_files, or pages.")
             if not args.dry_run:
-                transforms = apply_transforms(target_path, segment, manifest)
-                if transforms:
-                    action = f"{action}+{'+'.join(transforms)}"
+                row["job"] = len(segment_jobs)
+                segment_jobs.append({"output": str(target_path), "parts": parts, **segment_transforms(segment, manifest)})
+            reserved_paths.add(target_path)
         except Exception as exc:  # noqa: BLE001
-            status = f"error: {exc}"
-            errors.append(f"{segment_id}: {exc}")
+            row["error"] = str(exc)
 
+    # Pass 2: build the outputs, each source opened once per worker process.
+    results = run_segment_jobs(segment_jobs, args.jobs) if segment_jobs else []
+
+    resolved_segments: list[dict[str, Any]] = []
+    for row in rows:
+        index = row["index"]
+        if "segment" not in row:
+            errors.append(row["error"])
+            continue
+        if row["job"] is not None:
+            transforms, row["error"] = results[row["job"]]
+            if transforms:
+                row["transforms"] = transforms
+                row["action"] = f"{row['action']}+{'+'.join(transforms)}"
+        if row["error"]:
+            row["status"] = f"error: {row['error']}"
+            errors.append(f"{row['segment_id']}: {row['error']}")
+
+        segment = row["segment"]
+        target_path = row["target_path"]
+        confidence = str(segment.get("confidence") or "")
+        needs_review = bool(segment.get("needs_review", False))
         resolved_segment = dict(segment)
         resolved_segment.update(
             {
-                "id": segment_id,
+                "id": row["segment_id"],
                 "output_file": str(target_path),
-                "resolved_source": source_label,
-                "resolved_pages": pages_label,
-                "action": action,
-                "transforms": transforms,
-                "status": status,
+                "resolved_source": row["source_label"],
+                "resolved_pages": row["pages_label"],
+                "action": row["action"],
+                "transforms": row["transforms"],
+                "status": row["status"],
             }
         )
         resolved_segments.append(resolved_segment)
         report_lines.append(
-            f"| {index} | {segment_id} | `{source_label}` | {pages_label} | "
-            f"`{target_path.name}` | {action} | {confidence} | {needs_review} | {status} |"
+            f"| {index} | {row['segment_id']} | `{row['source_label']}` | {row['pages_label']} | "
+            f"`{target_path.name}` | {row['action']} | {confidence} | {needs_review} | {row['status']} |"
         )
 
     resolved = dict(manifest)
@@ -1113,16 +1373,24 @@ def check_text_layer_command(paths: list[str], max_pages: int) -> int:
     return 1 if failures else 0
 
 
-def inspect_command(pdf_path: str, output_path: str | None, include_text: bool) -> int:
-    inspection = inspect_pdf(Path(pdf_path).expanduser().resolve(), include_text=include_text)
+def inspect_command(pdf_path: str, output_path: str | None, include_text: bool, jobs: int, use_cache: bool) -> int:
+    inspection = inspect_pdf(
+        Path(pdf_path).expanduser().resolve(), include_text=include_text, jobs=jobs, use_cache=use_cache
+    )
     write_json_output(inspection, output_path)
     missing_pages = inspection.get("text_layer", {}).get("missing_or_low_text_pages") or []
     return 1 if len(missing_pages) == inspection.get("page_count") else 0
 
 
-def suggest_manifest_command(pdf_path: str, output_dir: str | None, output_path: str | None) -> int:
+def suggest_manifest_command(
+    pdf_path: str,
+    output_dir: str | None,
+    output_path: str | None,
+    jobs: int,
+    use_cache: bool,
+) -> int:
     source_pdf = Path(pdf_path).expanduser().resolve()
-    inspection = inspect_pdf(source_pdf, include_text=False)
+    inspection = inspect_pdf(source_pdf, include_text=False, jobs=jobs, use_cache=use_cache)
     missing_pages = inspection.get("text_layer", {}).get("missing_or_low_text_pages") or []
     if len(missing_pages) == inspection.get("page_count"):
         print(
@@ -1141,39 +1409,45 @@ A4_PORTRAIT = (595.0, 842.0)
 A4_LANDSCAPE = (842.0, 595.0)
 
 
+def normalize_page_a4(writer: Any, page: Any) -> dict[str, Any]:
+    """把单页等比缩放居中放到新的 A4 页面（横图→A4 横版，竖图→A4 竖版），返回该页统计。"""
+    from pypdf import Transformation
+
+    box = page.mediabox
+    w = float(box.width)
+    h = float(box.height)
+
+    is_landscape = w > h
+    target_w, target_h = A4_LANDSCAPE if is_landscape else A4_PORTRAIT
+
+    scale = min(target_w / w, target_h / h)
+    scaled_w = w * scale
+    scaled_h = h * scale
+    tx = (target_w - scaled_w) / 2
+    ty = (target_h - scaled_h) / 2
+
+    new_page = writer.add_blank_page(width=target_w, height=target_h)
+    op = Transformation().scale(scale, scale).translate(tx, ty)
+    new_page.merge_transformed_page(page, op)
+
+    return {
+        "original_size": f"{w:.0f}x{h:.0f}",
+        "orientation": "landscape" if is_landscape else "portrait",
+        "target_size": f"{target_w:.0f}x{target_h:.0f}",
+        "scale": round(scale, 4),
+    }
+
+
 def normalize_a4_pdf(input_file: Path, output_file: Path | None = None) -> dict[str, Any]:
     """将 PDF 每页标准化为 A4 尺寸：横图→A4 横版，竖图→A4 竖版，等比缩放居中。"""
-    from pypdf import PdfReader, PdfWriter, Transformation
+    from pypdf import PdfReader, PdfWriter
 
     reader = PdfReader(str(input_file))
     writer = PdfWriter()
     page_stats: list[dict[str, Any]] = []
 
     for page_idx, page in enumerate(reader.pages):
-        box = page.mediabox
-        w = float(box.width)
-        h = float(box.height)
-
-        is_landscape = w > h
-        target_w, target_h = A4_LANDSCAPE if is_landscape else A4_PORTRAIT
-
-        scale = min(target_w / w, target_h / h)
-        scaled_w = w * scale
-        scaled_h = h * scale
-        tx = (target_w - scaled_w) / 2
-        ty = (target_h - scaled_h) / 2
-
-        new_page = writer.add_blank_page(width=target_w, height=target_h)
-        op = Transformation().scale(scale, scale).translate(tx, ty)
-        new_page.merge_transformed_page(page, op)
-
-        page_stats.append({
-            "page": page_idx + 1,
-            "original_size": f"{w:.0f}x{h:.0f}",
-            "orientation": "landscape" if is_landscape else "portrait",
-            "target_size": f"{target_w:.0f}x{target_h:.0f}",
-            "scale": round(scale, 4),
-        })
+        page_stats.append({"page": page_idx + 1, **normalize_page_a4(writer, page)})
 
     target = output_file or input_file
     target.parent.mkdir(parents=True, exist_ok=True)
@@ -1258,6 +1532,17 @@ def main() -> int:
     parser.add_argument("--inspect", help="Inspect one PDF and output page-level evidence as JSON.")
     parser.add_argument("--include-text", action="store_true", help="Include full extracted page text in --inspect output.")
     parser.add_argument("--suggest-manifest", help="Generate a draft organize_manifest.json from one OCR PDF.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=default_jobs(),
+        help="Worker processes for page inspection and manifest execution (defaults to CPU count, at most 8).",
+    )
+    parser.add_argument(
+        "--no-inspect-cache",
+        action="store_true",
+        help="Re-inspect pages instead of reusing archive/.inspect_cache results for the same file.",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Preview planned outputs without writing PDFs")
     parser.add_argument(
         "--normalize-a4",
@@ -1278,14 +1563,20 @@ def main() -> int:
 
     if args.text_check_pages < 1:
         parser.error("--text-check-pages must be greater than 0")
+    if args.jobs < 1:
+        parser.error("--jobs must be greater than 0")
     if args.check_text_layer:
         return check_text_layer_command(args.check_text_layer, args.text_check_pages)
     if args.normalize_a4:
         return normalize_a4_command(args.normalize_a4, args.in_place, args.normalize_output_dir)
     if args.inspect:
-        return inspect_command(args.inspect, args.inspect_output, args.include_text)
+        return inspect_command(
+            args.inspect, args.inspect_output, args.include_text, args.jobs, not args.no_inspect_cache
+        )
     if args.suggest_manifest:
-        return suggest_manifest_command(args.suggest_manifest, args.output_dir, args.manifest_output)
+        return suggest_manifest_command(
+            args.suggest_manifest, args.output_dir, args.manifest_output, args.jobs, not args.no_inspect_cache
+        )
     if not args.manifest:
         parser.error("--manifest is required unless --check-text-layer, --inspect, or --suggest-manifest is used")
     return process_manifest(args)
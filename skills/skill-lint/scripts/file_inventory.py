@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""skill-lint 各门禁共享的候选文件清单：一次目录遍历 + 按 stat 缓存的摘要与文本。
+
+harness_failure_audit / security_scan / harness_evidence_gate / instruction_stability_gate
+原先各自 rglob 候选树并重新读取、重新哈希每个文件。本模块统一提供：
+
+- walk()：只做 lstat 的目录遍历，返回按路径分段排序的 FileEntry（与 sorted(root.rglob("*"))
+  的顺序一致，清单聚合摘要不变）；符号链接如实标记、不跟随，由调用方按各自规则处理。
+- digest() / read_text() / lines()：首次访问时读一次字节，同时得到 sha256 与文本；
+  同一进程内按 (路径, stat 键) 记忆，后续门禁直接复用。
+- sidecar：摘要按 (size, mtime_ns, ctime_ns, inode) 持久化到
+  $SKILL_LINT_CACHE_DIR/inventory（默认 ~/.cache/skill-lint/inventory），
+  跨进程运行整套门禁时未改动文件不再重新哈希。ctime 与 inode 无法被 touch/utime 回拨，
+  保留 mtime 的同尺寸改写也会使缓存失效；缓存目录不在候选树内，不会污染清单。
+  最近 RACY_WINDOW_NS 内改动的文件不缓存（见下），门禁前后两次清单比对仍能发现篡改。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+CACHE_VERSION = 1
+CACHE_DIR_ENV = "SKILL_LINT_CACHE_DIR"
+# 与 git 的 racy-entry 处理同理：最近 2 秒内改动过的文件，同一时间戳粒度内可能再被改写而 stat 不变，
+# 其摘要/文本不记忆、不落盘，每次都重新读取
+RACY_WINDOW_NS = 2_000_000_000
+
+StatKey = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    root: Path
+    path: Path
+    relative: str
+    parts: tuple[str, ...]
+    is_symlink: bool
+    is_file: bool  # 普通文件（符号链接恒为 False）
+    size: int
+    mtime_ns: int
+    stat_key: StatKey
+
+    @property
+    def name(self) -> str:
+        return self.parts[-1]
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+
+def cache_root() -> Path:
+    """skill-lint 缓存根目录：$SKILL_LINT_CACHE_DIR，否则 $XDG_CACHE_HOME 或 ~/.cache 下的 skill-lint。"""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base).expanduser() / "skill-lint"
+
+
+def walk(root: Path, prune: Optional[Callable[[str], bool]] = None) -> list[FileEntry]:
+    """遍历 root 下全部条目（不跟随符号链接），按路径分段排序。
+
+    prune 对目录名返回 True 时不下钻该目录（调用方仍需按自己的规则过滤返回条目）。
+    """
+    root = Path(root)
+    entries: list[FileEntry] = []
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
+        base = Path(dirpath)
+        rel_base = base.relative_to(root).parts
+        kept: list[str] = []
+        for name in dirnames:
+            path = base / name
+            if path.is_symlink():
+                _append(entries, root, path, rel_base + (name,))
+            elif prune is None or not prune(name):
+                kept.append(name)
+        dirnames[:] = kept
+        for name in filenames:
+            _append(entries, root, base / name, rel_base + (name,))
+    entries.sort(key=lambda entry: entry.parts)
+    return entries
+
+
+def _append(entries: list[FileEntry], root: Path, path: Path, parts: tuple[str, ...]) -> None:
+    try:
+        info = path.lstat()
+    except OSError:
+        return  # 遍历期间被删除
+    is_symlink = stat.S_ISLNK(info.st_mode)
+    entries.append(FileEntry(
+        root=root,
+        path=path,
+        relative="/".join(parts),
+        parts=parts,
+        is_symlink=is_symlink,
+        is_file=stat.S_ISREG(info.st_mode),
+        size=info.st_size,
+        mtime_ns=info.st_mtime_ns,
+        stat_key=(info.st_size, info.st_mtime_ns, info.st_ctime_ns, info.st_ino),
+    ))
+
+
+# ---------------------------------------------------------------------------
+# 内容：摘要 / 文本（进程内记忆 + 跨进程 sidecar）
+# ---------------------------------------------------------------------------
+
+_digests: dict[tuple[str, StatKey], str] = {}
+_texts: dict[tuple[str, StatKey], str] = {}
+_lines: dict[tuple[str, StatKey], tuple[str, ...]] = {}
+_sidecars: dict[str, "_Sidecar"] = {}
+
+
+def _universal_newlines(text: str) -> str:
+    """与 Path.read_text 的通用换行模式一致：\\r\\n、\\r 统一为 \\n。"""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _cacheable(entry: FileEntry) -> bool:
+    _, mtime_ns, ctime_ns, _ = entry.stat_key
+    return time.time_ns() - max(mtime_ns, ctime_ns) > RACY_WINDOW_NS
+
+
+def _remember(entry: FileEntry, value: str) -> str:
+    if _cacheable(entry):
+        _digests[(str(entry.path), entry.stat_key)] = value
+        _sidecar_for(entry).record(entry, value)
+    return value
+
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def digest(entry: FileEntry) -> str:
+    """文件内容 sha256；stat 未变时直接复用进程内或 sidecar 中的结果。"""
+    key = (str(entry.path), entry.stat_key)
+    value = _digests.get(key)
+    if value is None:
+        value = _sidecar_for(entry).lookup(entry) if _cacheable(entry) else None
+        if value is not None:
+            _digests[key] = value
+        else:
+            # 只要摘要时分块读取，运行产物中的大文件不整体载入内存
+            value = _remember(entry, _hash_file(entry.path))
+    return value
+
+
+def read_text(entry: FileEntry) -> str:
+    """按 UTF-8（errors=replace）读取文本，结果与 path.read_text(errors="replace") 一致。"""
+    key = (str(entry.path), entry.stat_key)
+    text = _texts.get(key)
+    if text is None:
+        data = entry.path.read_bytes()
+        if key not in _digests:
+            _remember(entry, hashlib.sha256(data).hexdigest())
+        text = _universal_newlines(data.decode("utf-8", errors="replace"))
+        if _cacheable(entry):
+            _texts[key] = text
+    return text
+
+
+def lines(entry: FileEntry) -> tuple[str, ...]:
+    key = (str(entry.path), entry.stat_key)
+    value = _lines.get(key)
+    if value is None:
+        value = tuple(read_text(entry).splitlines())
+        if _cacheable(entry):
+            _lines[key] = value
+    return value
+
+
+def manifest(entries: Iterable[FileEntry]) -> list[dict[str, str]]:
+    """门禁清单格式：[{path, sha256}]，顺序即 entries 顺序。"""
+    items = [{"path": entry.relative, "sha256": digest(entry)} for entry in entries]
+    save()
+    return items
+
+
+class _Sidecar:
+    """单个候选根目录的摘要缓存文件：relative -> [size, mtime_ns, ctime_ns, inode, sha256]。"""
+
+    def __init__(self, root: Path):
+        key = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:24]
+        self.root = root
+        self.path = cache_root() / "inventory" / f"{key}.json"
+        self.files: dict[str, list] = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("cache_version") == CACHE_VERSION:
+            files = data.get("files")
+            if isinstance(files, dict):
+                self.files = files
+
+    def lookup(self, entry: FileEntry) -> Optional[str]:
+        record = self.files.get(entry.relative)
+        if isinstance(record, list) and len(record) == 5 and tuple(record[:4]) == entry.stat_key:
+            return record[4]
+        return None
+
+    def record(self, entry: FileEntry, value: str) -> None:
+        relative = entry.relative
+        record = [*entry.stat_key, value]
+        if self.files.get(relative) != record:
+            self.files[relative] = record
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        payload = {"cache_version": CACHE_VERSION, "root": str(self.root), "files": self.files}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 缓存只是加速手段，写失败不影响门禁结果
+            return
+        self.dirty = False
+
+
+def _sidecar_for(entry: FileEntry) -> _Sidecar:
+    key = str(entry.root)
+    sidecar = _sidecars.get(key)
+    if sidecar is None:
+        sidecar = _sidecars[key] = _Sidecar(entry.root)
+    return sidecar
+
+
+def save() -> None:
+    """把本进程新算出的摘要写回各 sidecar。"""
+    for sidecar in _sidecars.values():
+        sidecar.save()
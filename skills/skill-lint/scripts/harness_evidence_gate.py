@@ -14,6 +14,8 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
+import file_inventory
+
 
 SCHEMA_VERSION = 2
 REQUIRED_LAYERS = (
@@ -59,14 +61,6 @@ class GateError(Exception):
     """审查证据不满足门禁。"""
 
 
-def sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def safe_resolve(root: Path, relative: str, label: str) -> Path:
     raw = Path(relative)
     if raw.is_absolute() or not relative or ".." in raw.parts:
@@ -88,16 +82,16 @@ def discover_candidate_files(root: Path) -> list[dict[str, str]]:
     if not root.is_dir() or not (root / "SKILL.md").is_file():
         raise GateError(f"候选目录不存在或缺少 SKILL.md: {root}")
 
-    manifest: list[dict[str, str]] = []
-    for path in sorted(root.rglob("*")):
-        relative = path.relative_to(root)
-        if any(part in SKIP_DIRS for part in relative.parts):
+    entries: list[file_inventory.FileEntry] = []
+    for entry in file_inventory.walk(root, prune=lambda name: name in SKIP_DIRS):
+        if any(part in SKIP_DIRS for part in entry.parts):
             continue
-        if path.is_symlink():
-            raise GateError(f"候选范围内不允许符号链接: {relative.as_posix()}")
-        if not path.is_file() or path.suffix == ".pyc" or ".local." in path.name:
+        if entry.is_symlink:
+            raise GateError(f"候选范围内不允许符号链接: {entry.relative}")
+        if not entry.is_file or entry.suffix == ".pyc" or ".local." in entry.name:
             continue
-        manifest.append({"path": relative.as_posix(), "sha256": sha256_file(path)})
+        entries.append(entry)
+    manifest = file_inventory.manifest(entries)
 
     if not manifest:
         raise GateError("候选文件清单为空")
@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
+import file_inventory
 
 SCHEMA_VERSION = 1
 SKIP_DIRS = {
@@ -69,22 +70,25 @@ def _is_test_path(relative: Path) -> bool:
 
 def _read_sources(candidate_root: Path) -> list[SourceFile]:
     sources: list[SourceFile] = []
-    for path in sorted(candidate_root.rglob("*")):
-        if path.is_symlink() or not path.is_file():
+    entries = file_inventory.walk(
+        candidate_root, prune=lambda name: name in SKIP_DIRS or name.startswith(".worktree")
+    )
+    for entry in entries:
+        if entry.is_symlink or not entry.is_file:
             continue
-        relative = path.relative_to(candidate_root)
-        if _is_skipped(relative) or path.suffix.lower() not in TEXT_SUFFIXES:
+        relative = Path(entry.relative)
+        if _is_skipped(relative) or entry.suffix.lower() not in TEXT_SUFFIXES:
             continue
-        text = path.read_text(encoding="utf-8", errors="replace")
         sources.append(
             SourceFile(
-                path=path,
-                relative=relative.as_posix(),
-                text=text,
-                lines=tuple(text.splitlines()),
+                path=entry.path,
+                relative=entry.relative,
+                text=file_inventory.read_text(entry),
+                lines=file_inventory.lines(entry),
                 is_test=_is_test_path(relative),
             )
         )
+    file_inventory.save()
     return sources
 
 
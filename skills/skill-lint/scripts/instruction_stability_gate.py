@@ -18,6 +18,7 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
+import file_inventory
 from harness_failure_audit import audit_candidate
 
 
@@ -229,16 +230,16 @@ def candidate_manifest(root: Path) -> list[dict[str, str]]:
     root = root.resolve()
     if not root.is_dir() or not (root / "SKILL.md").is_file():
         raise GateError(f"候选目录不存在或缺少 SKILL.md: {root}")
-    files: list[dict[str, str]] = []
-    for path in sorted(root.rglob("*")):
-        relative = path.relative_to(root)
-        if any(part in SKIP_DIRS for part in relative.parts):
+    entries: list[file_inventory.FileEntry] = []
+    for entry in file_inventory.walk(root, prune=lambda name: name in SKIP_DIRS):
+        if any(part in SKIP_DIRS for part in entry.parts):
             continue
-        if path.is_symlink():
-            raise GateError(f"候选范围内不允许符号链接: {relative.as_posix()}")
-        if not path.is_file() or path.suffix == ".pyc" or ".local." in path.name:
+        if entry.is_symlink:
+            raise GateError(f"候选范围内不允许符号链接: {entry.relative}")
+        if not entry.is_file or entry.suffix == ".pyc" or ".local." in entry.name:
             continue
-        files.append({"path": relative.as_posix(), "sha256": sha256_file(path)})
+        entries.append(entry)
+    files = file_inventory.manifest(entries)
     if not files:
         raise GateError("候选文件清单为空")
     return files
@@ -248,13 +249,13 @@ def tree_manifest(root: Path) -> list[dict[str, str]]:
     root = root.resolve()
     if not root.is_dir():
         raise GateError(f"运行产物根目录不存在: {root}")
-    files: list[dict[str, str]] = []
-    for path in sorted(root.rglob("*")):
-        relative = path.relative_to(root)
-        if path.is_symlink():
-            raise GateError(f"运行产物不允许符号链接: {relative.as_posix()}")
-        if path.is_file():
-            files.append({"path": relative.as_posix(), "sha256": sha256_file(path)})
+    entries: list[file_inventory.FileEntry] = []
+    for entry in file_inventory.walk(root):
+        if entry.is_symlink:
+            raise GateError(f"运行产物不允许符号链接: {entry.relative}")
+        if entry.is_file:
+            entries.append(entry)
+    files = file_inventory.manifest(entries)
     if not files:
         raise GateError("运行产物范围为空")
     return files
@@ -23,7 +23,11 @@
 
 用法：
   python3 scripts/security_scan.py audit --candidate-root /path/to/skill [--output out.json] [--online]
-  python3 scripts/security_scan.py batch --root /path/to/skills [--output out.json] [--online]
+  python3 scripts/security_scan.py batch --root /path/to/skills [--output out.json] [--online] [--jobs N]
+
+  两种模式都默认启用单文件结果缓存（按内容 sha256，位于 ~/.cache/skill-lint/security-scan，
+  可用 --cache-dir 或 SKILL_LINT_CACHE_DIR（skill-lint 缓存根目录）指定，--no-cache 关闭）：集合中只有一个 Skill
+  改动时，其余未改动文件直接复用上次结果。batch 默认按 CPU 核数并行扫描各 Skill。
 
 退出码：
   0  PASS（无 critical/high，允许 medium/low）
@@ -37,14 +41,18 @@ from __future__ import annotations
 
 import argparse
 import ast
+import hashlib
 import json
 import os
 import re
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
+import file_inventory
+
 SCHEMA_VERSION = 1
 
 SKIP_DIRS = {
@@ -132,6 +140,7 @@ class SourceFile:
     lines: tuple[str, ...]
     is_test: bool
     is_public_doc: bool  # SKILL.md / README / references 等面向用户的文档
+    sha256: str = ""     # 文件字节摘要（来自共享 file_inventory，供结果缓存复用）
 
 
 def _is_skipped(relative: Path) -> bool:
@@ -169,51 +178,37 @@ MCP_FILE_NAMES = {"mcp.json", ".mcp.json", "mcp-servers.json", "mcp-config.json"
 TEXT_SUFFIXES = PY_SUFFIXES | SH_SUFFIXES | DOC_SUFFIXES | DEP_FILE_NAMES
 
 
-def _iter_regular_files(candidate_root: Path) -> Iterable[Path]:
-    """递归列出普通文件，不跟随符号链接（避免把外部私有仓库目录扫进来）。"""
-    for dirpath, dirnames, filenames in os.walk(candidate_root, followlinks=False):
-        dirpath_path = Path(dirpath)
-        # 跳过符号链接目录与 SKIP_DIRS（就地裁剪，避免下钻）
-        dirnames[:] = [
-            d for d in dirnames
-            if d not in SKIP_DIRS and not (dirpath_path / d).is_symlink()
-        ]
-        for name in filenames:
-            path = dirpath_path / name
-            if path.is_symlink():
-                continue
-            yield path
+def _iter_regular_files(candidate_root: Path) -> Iterable[file_inventory.FileEntry]:
+    """递归列出普通文件，不跟随符号链接（避免把外部私有仓库目录扫进来），SKIP_DIRS 不下钻。"""
+    for entry in file_inventory.walk(candidate_root, prune=lambda name: name in SKIP_DIRS):
+        if entry.is_file and not entry.is_symlink:
+            yield entry
 
 
 def _read_sources(candidate_root: Path) -> list[SourceFile]:
     sources: list[SourceFile] = []
-    for path in sorted(_iter_regular_files(candidate_root)):
-        if not path.is_file():
-            continue
-        relative = path.relative_to(candidate_root)
+    for entry in _iter_regular_files(candidate_root):
+        relative = Path(entry.relative)
         if _is_skipped(relative):
             continue
-        if path.name in DEP_FILE_NAMES or path.name in MCP_FILE_NAMES or path.suffix.lower() in TEXT_SUFFIXES:
-            text = path.read_text(encoding="utf-8", errors="replace")
+        if entry.name in DEP_FILE_NAMES or entry.name in MCP_FILE_NAMES or entry.suffix.lower() in TEXT_SUFFIXES:
             sources.append(
                 SourceFile(
-                    path=path,
-                    relative=relative.as_posix(),
-                    text=text,
-                    lines=tuple(text.splitlines()),
+                    path=entry.path,
+                    relative=entry.relative,
+                    text=file_inventory.read_text(entry),
+                    lines=file_inventory.lines(entry),
                     is_test=_is_test_path(relative),
                     is_public_doc=_is_public_doc(relative),
+                    sha256=file_inventory.digest(entry),
                 )
             )
+    file_inventory.save()
     return sources
 
 
 def _discover_skill_roots(collection_root: Path) -> list[Path]:
-    roots: list[Path] = []
-    for path in sorted(_iter_regular_files(collection_root)):
-        if path.name == "SKILL.md" and path.is_file():
-            roots.append(path.parent)
-    return roots
+    return [entry.path.parent for entry in _iter_regular_files(collection_root) if entry.name == "SKILL.md"]
 
 
 # ---------------------------------------------------------------------------
@@ -324,248 +319,274 @@ def _resolve_call_base(func: ast.AST) -> tuple[str, str]:
     return "", ".".join(reversed(chain))
 
 
-def _collect_capabilities_ast(source: SourceFile) -> list[CapabilitySignal]:
-    findings: list[CapabilitySignal] = []
-    try:
-        tree = ast.parse(source.text)
-    except SyntaxError:
-        findings.append(
-            CapabilitySignal(
-                capability="syntax_error", category="Dangerous Code Execution",
-                severity="info", file=source.relative, line=1, code="",
-                message=f"无法解析 Python 语法（{source.relative}），跳过 AST 扫描。",
-                is_test=source.is_test, confidence=0.9,
-            )
-        )
-        return findings
+_LINE_SPLIT_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+\Z")
 
-    def _line(node: ast.AST) -> int:
-        return getattr(node, "lineno", 1)
 
-    def _code_lines(node: ast.AST) -> str:
-        lineno = _line(node)
-        return source.lines[lineno - 1].strip() if 0 < lineno <= len(source.lines) else ""
+class _SourceSegments:
+    """ast.get_source_segment 的按文件缓存版本。
 
-    for node in ast.walk(tree):
-        # subprocess.run / call / Popen ...
-        if isinstance(node, ast.Call):
-            func = node.func
-            fname = getattr(func, "attr", None) or getattr(func, "id", None)
-            base, chain = _resolve_call_base(func)
+    标准库实现每次调用都会把整份源码重新切行，对每个 Call 节点取参数片段时
+    退化为 O(节点数 × 文件长度)；这里只切一次行，并按需缓存每行的 UTF-8 编码
+    （AST 的 col_offset 是字节偏移），返回值与 ast.get_source_segment 一致。
+    """
 
-            # subprocess 执行
-            if fname in SUBPROCESS_NAMES and base == "subprocess":
-                shell = False
-                for kw in node.keywords:
-                    if kw.arg == "shell" and isinstance(kw.value, ast.Constant):
-                        shell = bool(kw.value.value)
-                sev = "high" if shell else "medium"
-                findings.append(
-                    CapabilitySignal(
-                        capability="subprocess", category="Dangerous Code Execution",
-                        severity=sev, file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message=f"subprocess.{fname} 调用外部进程（shell={shell}）。"
-                                + ("shell=True 有命令注入风险，应改用参数数组。" if shell else "命令应使用参数数组，避免拼接不可信输入。"),
-                        is_test=source.is_test, confidence=0.93,
-                    )
+    def __init__(self, text: str):
+        self._lines = _LINE_SPLIT_RE.findall(text)
+        self._encoded: dict[int, bytes] = {}
+
+    def _line_bytes(self, index: int) -> bytes:
+        encoded = self._encoded.get(index)
+        if encoded is None:
+            encoded = self._encoded[index] = self._lines[index].encode()
+        return encoded
+
+    def get(self, node: ast.AST) -> Optional[str]:
+        try:
+            if node.end_lineno is None or node.end_col_offset is None:
+                return None
+            lineno = node.lineno - 1
+            end_lineno = node.end_lineno - 1
+            col_offset = node.col_offset
+            end_col_offset = node.end_col_offset
+        except AttributeError:
+            return None
+        if end_lineno == lineno:
+            return self._line_bytes(lineno)[col_offset:end_col_offset].decode()
+        first = self._line_bytes(lineno)[col_offset:].decode()
+        last = self._line_bytes(end_lineno)[:end_col_offset].decode()
+        return "".join([first, *self._lines[lineno + 1:end_lineno], last])
+
+
+def _node_line(node: ast.AST) -> int:
+    return getattr(node, "lineno", 1)
+
+
+def _node_code(source: SourceFile, node: ast.AST) -> str:
+    lineno = _node_line(node)
+    return source.lines[lineno - 1].strip() if 0 < lineno <= len(source.lines) else ""
+
+
+def _capability_node(source: SourceFile, segments: _SourceSegments, node: ast.AST,
+                     findings: list[CapabilitySignal]) -> None:
+    """单个 AST 节点上的能力信号判定（由 _analyze_python 在共享遍历中逐节点调用）。"""
+    # subprocess.run / call / Popen ...
+    if isinstance(node, ast.Call):
+        func = node.func
+        fname = getattr(func, "attr", None) or getattr(func, "id", None)
+        base, chain = _resolve_call_base(func)
+
+        # subprocess 执行
+        if fname in SUBPROCESS_NAMES and base == "subprocess":
+            shell = False
+            for kw in node.keywords:
+                if kw.arg == "shell" and isinstance(kw.value, ast.Constant):
+                    shell = bool(kw.value.value)
+            sev = "high" if shell else "medium"
+            findings.append(
+                CapabilitySignal(
+                    capability="subprocess", category="Dangerous Code Execution",
+                    severity=sev, file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message=f"subprocess.{fname} 调用外部进程（shell={shell}）。"
+                            + ("shell=True 有命令注入风险，应改用参数数组。" if shell else "命令应使用参数数组，避免拼接不可信输入。"),
+                    is_test=source.is_test, confidence=0.93,
                 )
-            # os.system / os.popen
-            elif fname in OS_SYSTEM and base == "os":
-                sev = "high" if fname == "system" else "medium"
-                findings.append(
-                    CapabilitySignal(
-                        capability="subprocess", category="Dangerous Code Execution",
-                        severity=sev, file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message=f"os.{fname} 通过 shell 执行命令，若拼接不可信输入存在命令注入风险。",
-                        is_test=source.is_test, confidence=0.95,
-                    )
+            )
+        # os.system / os.popen
+        elif fname in OS_SYSTEM and base == "os":
+            sev = "high" if fname == "system" else "medium"
+            findings.append(
+                CapabilitySignal(
+                    capability="subprocess", category="Dangerous Code Execution",
+                    severity=sev, file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message=f"os.{fname} 通过 shell 执行命令，若拼接不可信输入存在命令注入风险。",
+                    is_test=source.is_test, confidence=0.95,
+                )
+            )
+        # 网络外传
+        elif fname in NETWORK_CALLS and base in {
+            "requests", "httpx", "aiohttp", "urllib", "socket", "websocket", "wget",
+        }:
+            findings.append(
+                CapabilitySignal(
+                    capability="network", category="Data Exfiltration",
+                    severity="medium", file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message=f"{base}.{chain} 发起外部网络请求（外传/下载）。",
+                    is_test=source.is_test, confidence=0.9,
+                )
+            )
+        # eval / exec
+        elif fname in {"eval", "exec"} and not isinstance(func, ast.Attribute):
+            findings.append(
+                CapabilitySignal(
+                    capability="dynamic_import", category="Dangerous Code Execution",
+                    severity="high", file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message=f"{fname}() 动态执行代码，属高风险动态导入/混淆信号。",
+                    is_test=source.is_test, confidence=0.9,
                 )
-            # 网络外传
-            elif fname in NETWORK_CALLS and base in {
-                "requests", "httpx", "aiohttp", "urllib", "socket", "websocket", "wget",
-            }:
+            )
+        # 动态导入
+        elif fname in {"__import__", "import_module"} or (
+            fname == "import_module" and base == "importlib"
+        ):
+            findings.append(
+                CapabilitySignal(
+                    capability="dynamic_import", category="Dangerous Code Execution",
+                    severity="medium", file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message="动态导入（__import__ / importlib.import_module），需确认导入源可信。",
+                    is_test=source.is_test, confidence=0.85,
+                )
+            )
+        # 安装类（subprocess 参数含 pip install）
+        elif fname in SUBPROCESS_NAMES and base == "subprocess":
+            args_text = segments.get(node) or ""
+            if INSTALL_RE.search(args_text):
                 findings.append(
                     CapabilitySignal(
-                        capability="network", category="Data Exfiltration",
-                        severity="medium", file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message=f"{base}.{chain} 发起外部网络请求（外传/下载）。",
-                        is_test=source.is_test, confidence=0.9,
+                        capability="install", category="Supply Chain",
+                        severity="high", file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message="脚本运行时通过 subprocess 自动安装依赖（pip/npm/playwright），"
+                                "未固定版本，存在供应链风险且无显式用户确认。",
+                        is_test=source.is_test, confidence=0.93,
                     )
                 )
-            # eval / exec
-            elif fname in {"eval", "exec"} and not isinstance(func, ast.Attribute):
+            if DOWNLOAD_EXEC_RE.search(args_text):
                 findings.append(
                     CapabilitySignal(
-                        capability="dynamic_import", category="Dangerous Code Execution",
-                        severity="high", file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message=f"{fname}() 动态执行代码，属高风险动态导入/混淆信号。",
-                        is_test=source.is_test, confidence=0.9,
+                        capability="install", category="Supply Chain",
+                        severity="critical", file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message="检测到 '下载并执行远程代码'（curl|sh 或 wget|bash）模式，属 Hard Fail。",
+                        is_test=source.is_test, confidence=0.97,
                     )
                 )
-            # 动态导入
-            elif fname in {"__import__", "import_module"} or (
-                fname == "import_module" and base == "importlib"
-            ):
+            if PRIVILEGE_RE.search(args_text):
                 findings.append(
                     CapabilitySignal(
-                        capability="dynamic_import", category="Dangerous Code Execution",
-                        severity="medium", file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message="动态导入（__import__ / importlib.import_module），需确认导入源可信。",
+                        capability="privilege", category="Privilege Escalation",
+                        severity="high", file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message="subprocess 命令中含 sudo/chmod 777 等权限提升信号。",
                         is_test=source.is_test, confidence=0.85,
                     )
                 )
-            # 安装类（subprocess 参数含 pip install）
-            elif fname in SUBPROCESS_NAMES and base == "subprocess":
-                args_text = ast.get_source_segment(source.text, node) or ""
-                if INSTALL_RE.search(args_text):
-                    findings.append(
-                        CapabilitySignal(
-                            capability="install", category="Supply Chain",
-                            severity="high", file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message="脚本运行时通过 subprocess 自动安装依赖（pip/npm/playwright），"
-                                    "未固定版本，存在供应链风险且无显式用户确认。",
-                            is_test=source.is_test, confidence=0.93,
-                        )
-                    )
-                if DOWNLOAD_EXEC_RE.search(args_text):
-                    findings.append(
-                        CapabilitySignal(
-                            capability="install", category="Supply Chain",
-                            severity="critical", file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message="检测到 '下载并执行远程代码'（curl|sh 或 wget|bash）模式，属 Hard Fail。",
-                            is_test=source.is_test, confidence=0.97,
-                        )
-                    )
-                if PRIVILEGE_RE.search(args_text):
-                    findings.append(
-                        CapabilitySignal(
-                            capability="privilege", category="Privilege Escalation",
-                            severity="high", file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message="subprocess 命令中含 sudo/chmod 777 等权限提升信号。",
-                            is_test=source.is_test, confidence=0.85,
-                        )
-                    )
 
-            # 环境变量读取（os.environ.get / os.getenv / os.environ['X']）
-            elif base == "os" and (
-                chain in {"get", "getenv", "environ.get"} or chain.startswith("environ.get")
-            ):
+        # 环境变量读取（os.environ.get / os.getenv / os.environ['X']）
+        elif base == "os" and (
+            chain in {"get", "getenv", "environ.get"} or chain.startswith("environ.get")
+        ):
+            findings.append(
+                CapabilitySignal(
+                    capability="credential", category="Credential Access",
+                    severity="low", file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message="读取环境变量（os.environ.get / os.getenv），用于定位外部工具或读取账号凭证。",
+                    is_test=source.is_test, confidence=0.9,
+                )
+            )
+
+    # os.environ 下标读取（os.environ['X'] / os.environ.get 已在上方 Call 分支处理）
+    if isinstance(node, ast.Subscript):
+        base, chain = _resolve_call_base(node.value)
+        if base == "os" and chain == "environ":
+            findings.append(
+                CapabilitySignal(
+                    capability="credential", category="Credential Access",
+                    severity="low", file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message="读取环境变量 os.environ[...]。",
+                    is_test=source.is_test, confidence=0.9,
+                )
+            )
+
+    # open() / write_text 等敏感路径访问
+    if isinstance(node, ast.Call):
+        func = node.func
+        fname = getattr(func, "attr", None) or getattr(func, "id", None)
+        arg_texts: list[str] = []
+        for arg in node.args:
+            seg = segments.get(arg)
+            if seg:
+                arg_texts.append(seg)
+        joined = " ".join(arg_texts)
+        lowered = joined.lower()
+        if fname == "open" or (fname == "write_text" and isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in {"Path", "p"}):
+            sensitive_hit = next(
+                (p for p in SENSITIVE_PATH_PATTERNS if re.search(p, lowered, re.IGNORECASE)),
+                None,
+            )
+            if sensitive_hit:
                 findings.append(
                     CapabilitySignal(
-                        capability="credential", category="Credential Access",
-                        severity="low", file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message="读取环境变量（os.environ.get / os.getenv），用于定位外部工具或读取账号凭证。",
+                        capability="filesystem", category="Sensitive File Access",
+                        severity="high" if re.search(r"\.env|id_rsa|\.pem|\.aws|\.ssh", lowered) else "medium",
+                        file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message=f"访问敏感路径（匹配 {sensitive_hit}）：{joined[:100]}",
                         is_test=source.is_test, confidence=0.9,
                     )
                 )
-
-        # os.environ 下标读取（os.environ['X'] / os.environ.get 已在上方 Call 分支处理）
-        if isinstance(node, ast.Subscript):
-            base, chain = _resolve_call_base(node.value)
-            if base == "os" and chain == "environ":
+            write_mode = any(kw.arg == "mode" and isinstance(kw.value, ast.Constant) and kw.value.value in {"w", "a", "x", "wb", "ab"} for kw in node.keywords)
+            if not write_mode:
+                for arg in node.args:
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and arg.value in {"w", "a", "x", "wb", "ab"}:
+                        write_mode = True
+            if write_mode:
                 findings.append(
                     CapabilitySignal(
-                        capability="credential", category="Credential Access",
-                        severity="low", file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message="读取环境变量 os.environ[...]。",
+                        capability="filesystem", category="File Write",
+                        severity="info", file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message=f"写文件（open 模式 w/a/x）：{joined[:100]}",
                         is_test=source.is_test, confidence=0.9,
                     )
                 )
 
-        # open() / write_text 等敏感路径访问
-        if isinstance(node, ast.Call):
-            func = node.func
-            fname = getattr(func, "attr", None) or getattr(func, "id", None)
-            arg_texts: list[str] = []
-            for arg in node.args:
-                seg = ast.get_source_segment(source.text, arg)
-                if seg:
-                    arg_texts.append(seg)
-            joined = " ".join(arg_texts)
-            lowered = joined.lower()
-            if fname == "open" or (fname == "write_text" and isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in {"Path", "p"}):
-                sensitive_hit = next(
-                    (p for p in SENSITIVE_PATH_PATTERNS if re.search(p, lowered, re.IGNORECASE)),
-                    None,
+    # 删除操作（仅 os.shutil 系；XML Element.remove 等非文件删除不算）
+    if isinstance(node, ast.Call):
+        func = node.func
+        fname = getattr(func, "attr", None)
+        if fname in {"rmtree", "remove", "unlink"} and isinstance(func, ast.Attribute):
+            base, chain = _resolve_call_base(func)
+            if base not in {"os", "shutil"}:
+                return
+            if chain == "rmtree" or (chain in {"remove", "unlink"} and base == "shutil"):
+                sev, cap, msg = "medium", "delete", (
+                    f"{base}.{chain}() 递归/批量删除，需确认删除边界（不应无确认删除用户数据）。"
                 )
-                if sensitive_hit:
-                    findings.append(
-                        CapabilitySignal(
-                            capability="filesystem", category="Sensitive File Access",
-                            severity="high" if re.search(r"\.env|id_rsa|\.pem|\.aws|\.ssh", lowered) else "medium",
-                            file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message=f"访问敏感路径（匹配 {sensitive_hit}）：{joined[:100]}",
-                            is_test=source.is_test, confidence=0.9,
-                        )
-                    )
-                write_mode = any(kw.arg == "mode" and isinstance(kw.value, ast.Constant) and kw.value.value in {"w", "a", "x", "wb", "ab"} for kw in node.keywords)
-                if not write_mode:
-                    for arg in node.args:
-                        if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and arg.value in {"w", "a", "x", "wb", "ab"}:
-                            write_mode = True
-                if write_mode:
-                    findings.append(
-                        CapabilitySignal(
-                            capability="filesystem", category="File Write",
-                            severity="info", file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message=f"写文件（open 模式 w/a/x）：{joined[:100]}",
-                            is_test=source.is_test, confidence=0.9,
-                        )
-                    )
+            else:
+                sev, cap, msg = "info", "delete", (
+                    f"{base}.{chain}() 删除单个文件（通常为临时文件清理）。"
+                )
+            findings.append(
+                CapabilitySignal(
+                    capability=cap, category="Destructive File Operation",
+                    severity=sev, file=source.relative, line=_node_line(node),
+                    code=_node_code(source, node),
+                    message=msg,
+                    is_test=source.is_test, confidence=0.85,
+                )
+            )
 
-        # 删除操作（仅 os.shutil 系；XML Element.remove 等非文件删除不算）
-        if isinstance(node, ast.Call):
-            func = node.func
-            fname = getattr(func, "attr", None)
-            if fname in {"rmtree", "remove", "unlink"} and isinstance(func, ast.Attribute):
-                base, chain = _resolve_call_base(func)
-                if base not in {"os", "shutil"}:
-                    continue
-                if chain == "rmtree" or (chain in {"remove", "unlink"} and base == "shutil"):
-                    sev, cap, msg = "medium", "delete", (
-                        f"{base}.{chain}() 递归/批量删除，需确认删除边界（不应无确认删除用户数据）。"
-                    )
-                else:
-                    sev, cap, msg = "info", "delete", (
-                        f"{base}.{chain}() 删除单个文件（通常为临时文件清理）。"
-                    )
+    # playwright（浏览器自动化）
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.name.split(".")[0] in {"playwright", "selenium"}:
                 findings.append(
                     CapabilitySignal(
-                        capability=cap, category="Destructive File Operation",
-                        severity=sev, file=source.relative, line=_line(node),
-                        code=_code_lines(node),
-                        message=msg,
-                        is_test=source.is_test, confidence=0.85,
+                        capability="browser", category="Browser Automation",
+                        severity="info", file=source.relative, line=_node_line(node),
+                        code=_node_code(source, node),
+                        message="使用浏览器自动化库（playwright/selenium），会在本机启动浏览器。",
+                        is_test=source.is_test, confidence=0.9,
                     )
                 )
 
-        # playwright（浏览器自动化）
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                if alias.name.split(".")[0] in {"playwright", "selenium"}:
-                    findings.append(
-                        CapabilitySignal(
-                            capability="browser", category="Browser Automation",
-                            severity="info", file=source.relative, line=_line(node),
-                            code=_code_lines(node),
-                            message="使用浏览器自动化库（playwright/selenium），会在本机启动浏览器。",
-                            is_test=source.is_test, confidence=0.9,
-                        )
-                    )
-
-    return findings
 
 
 # ---------------------------------------------------------------------------
@@ -957,24 +978,29 @@ def _scan_scope_creep(sources: list[SourceFile]) -> list[CapabilitySignal]:
     if not purpose:
         return findings
 
+    # 宣称用途已提到该类别 -> 已披露；与行无关，只判定一次
+    active_rules = [
+        (category, [re.compile(p, re.IGNORECASE) for p in rule["patterns"]])
+        for category, rule in HIGH_IMPACT_ACTIONS.items()
+        if not any(k in purpose for k in rule["excused_by"])
+    ]
+    if not active_rules:
+        return findings
+
     for source in sources:
         if not source.is_public_doc:
             continue
         for lineno, line in enumerate(source.lines, 1):
-            lowered = line.lower()
-            for category, rule in HIGH_IMPACT_ACTIONS.items():
-                # 宣称用途已提到该类别 -> 已披露
-                if any(k in purpose for k in rule["excused_by"]):
-                    continue
-                for pattern in rule["patterns"]:
-                    if re.search(pattern, line, re.IGNORECASE):
+            for category, patterns in active_rules:
+                for pattern in patterns:
+                    if pattern.search(line):
                         sev = "high" if category == "publish" else "medium"
                         findings.append(
                             CapabilitySignal(
                                 capability="scope_creep", category="Description-Behavior Mismatch",
                                 severity=sev, file=source.relative, line=lineno,
                                 code=line.strip()[:220],
-                                message=f"检测到'{category}'类高风险动作（{pattern}），"
+                                message=f"检测到'{category}'类高风险动作（{pattern.pattern}），"
                                         f"但技能宣称用途（{purpose[:40]}...）未披露该能力。"
                                         "用户调用本技能时可能意外触发发布/仓库变更/提权/外传，需在文档披露或移除。",
                                 is_test=source.is_test, confidence=0.8,
@@ -988,18 +1014,22 @@ def _scan_scope_creep(sources: list[SourceFile]) -> list[CapabilitySignal]:
 # Taint Tracking（文件内数据流：env/argv/input/network/file -> subprocess）
 # ---------------------------------------------------------------------------
 
-def _collect_taint_ast(source: SourceFile) -> list[CapabilitySignal]:
+class _TaintTracker:
     """简化流不敏感污点分析：追踪外部来源变量是否流入 subprocess 命令/参数。
-    对应 SkillSpector 的 Taint Tracking（如 os.environ.get -> subprocess.run）。"""
-    findings: list[CapabilitySignal] = []
-    try:
-        tree = ast.parse(source.text)
-    except SyntaxError:
-        return findings
+    对应 SkillSpector 的 Taint Tracking（如 os.environ.get -> subprocess.run）。
+
+    在共享遍历中逐节点 record()：赋值节点更新污点表，subprocess 调用先暂存；
+    遍历结束后 findings() 再用完整污点表检查暂存的调用（流不敏感，与遍历顺序无关）。
+    """
 
-    # name -> 污点来源标签（env/argv/input/network/file）；一旦污染则保持（sticky）
-    tainted: dict[str, str] = {}
+    def __init__(self, source: SourceFile, segments: _SourceSegments):
+        self.source = source
+        self.segments = segments
+        # name -> 污点来源标签（env/argv/input/network/file）；一旦污染则保持（sticky）
+        self.tainted: dict[str, str] = {}
+        self.calls: list[ast.Call] = []
 
+    @staticmethod
     def is_taint_source(expr: ast.AST) -> str | None:
         if isinstance(expr, ast.Call):
             base, chain = _resolve_call_base(expr.func)
@@ -1022,13 +1052,14 @@ def _collect_taint_ast(source: SourceFile) -> list[CapabilitySignal]:
                 return "argv"
         return None
 
-    def expr_taint(expr: ast.AST) -> str | None:
+    def expr_taint(self, expr: ast.AST) -> str | None:
+        expr_taint = self.expr_taint
         if isinstance(expr, ast.Name):
-            return tainted.get(expr.id)
+            return self.tainted.get(expr.id)
         if isinstance(expr, ast.Constant):
             return None
         if isinstance(expr, ast.Call):
-            src = is_taint_source(expr)
+            src = self.is_taint_source(expr)
             if src:
                 return src
             # .strip()/.replace()/.format()/os.path.join() 等在污染值上的方法调用
@@ -1051,8 +1082,14 @@ def _collect_taint_ast(source: SourceFile) -> list[CapabilitySignal]:
             return expr_taint(expr.value)
         return None
 
-    # 第一遍：收集赋值污点（流不敏感近似，顺序遍历）
-    for node in ast.walk(tree):
+    def record(self, node: ast.AST) -> None:
+        # subprocess 调用：暂存，待污点表完整后再检查
+        if isinstance(node, ast.Call):
+            base, _ = _resolve_call_base(node.func)
+            if base == "subprocess" and getattr(node.func, "attr", None) in SUBPROCESS_NAMES and node.args:
+                self.calls.append(node)
+            return
+        # 赋值污点（流不敏感近似，顺序遍历）
         targets: list[ast.AST] = []
         value = None
         if isinstance(node, ast.Assign):
@@ -1061,51 +1098,43 @@ def _collect_taint_ast(source: SourceFile) -> list[CapabilitySignal]:
         elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
             targets = [node.target]
             value = node.value
-        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
-            targets = [node.target]
-            value = None
         if value is None:
-            continue
-        src = expr_taint(value)
+            return
+        src = self.expr_taint(value)
         for target in targets:
             if isinstance(target, ast.Name):
                 if src:
-                    tainted[target.id] = src
+                    self.tainted[target.id] = src
                 # src 为 None 时保持已有污点（sticky），避免被无害重赋值抹掉
 
-    # 第二遍：subprocess 调用参数检查
-    for node in ast.walk(tree):
-        if not isinstance(node, ast.Call):
-            continue
-        base, chain = _resolve_call_base(node.func)
-        fname = getattr(node.func, "attr", None)
-        if not (base == "subprocess" and fname in SUBPROCESS_NAMES):
-            continue
-        if not node.args:
-            continue
-        first = node.args[0]
-        hits: list[tuple[str, str]] = []
-        if isinstance(first, (ast.List, ast.Tuple)):
-            for el in first.elts:
-                src = expr_taint(el)
+    def findings(self) -> list[CapabilitySignal]:
+        source = self.source
+        findings: list[CapabilitySignal] = []
+        for node in self.calls:
+            fname = node.func.attr
+            first = node.args[0]
+            hits: list[tuple[str, str]] = []
+            if isinstance(first, (ast.List, ast.Tuple)):
+                for el in first.elts:
+                    src = self.expr_taint(el)
+                    if src:
+                        hits.append((src, self.segments.get(el) or ""))
+            else:
+                src = self.expr_taint(first)
                 if src:
-                    hits.append((src, ast.get_source_segment(source.text, el) or ""))
-        else:
-            src = expr_taint(first)
-            if src:
-                hits.append((src, ast.get_source_segment(source.text, first) or ""))
-        for src, seg in hits:
-            findings.append(
-                CapabilitySignal(
-                    capability="taint", category="Taint Tracking",
-                    severity="medium", file=source.relative, line=getattr(node, "lineno", 1),
-                    code=ast.get_source_segment(source.text, node) or "",
-                    message=f"污点流：来自 '{src}' 的值流入 subprocess.{fname} 命令/参数（{seg[:60]}）。"
-                            "若输入来自外部不可信源，存在命令注入/参数注入风险。",
-                    is_test=source.is_test, confidence=0.7,
+                    hits.append((src, self.segments.get(first) or ""))
+            for src, seg in hits:
+                findings.append(
+                    CapabilitySignal(
+                        capability="taint", category="Taint Tracking",
+                        severity="medium", file=source.relative, line=getattr(node, "lineno", 1),
+                        code=self.segments.get(node) or "",
+                        message=f"污点流：来自 '{src}' 的值流入 subprocess.{fname} 命令/参数（{seg[:60]}）。"
+                                "若输入来自外部不可信源，存在命令注入/参数注入风险。",
+                        is_test=source.is_test, confidence=0.7,
+                    )
                 )
-            )
-    return findings
+        return findings
 
 
 # ---------------------------------------------------------------------------
@@ -1160,42 +1189,65 @@ def _scan_unicode_deception(sources: list[SourceFile]) -> list[CapabilitySignal]
 # 文件系统枚举（扫描用户主目录/敏感目录）
 # ---------------------------------------------------------------------------
 
-def _collect_fs_enumeration_ast(source: SourceFile) -> list[CapabilitySignal]:
-    findings: list[CapabilitySignal] = []
+ENUM_SENSITIVE_RE = re.compile(
+    r"expanduser|['\"](?:~|/Users/|/home/|/etc/|/root)|\.ssh|\.aws|\.gnupg|\.env|/Users/",
+    re.IGNORECASE,
+)
+
+
+def _enumeration_node(source: SourceFile, segments: _SourceSegments, node: ast.AST,
+                      findings: list[CapabilitySignal]) -> None:
+    if not isinstance(node, ast.Call):
+        return
+    base, chain = _resolve_call_base(node.func)
+    fname = getattr(node.func, "attr", None) or getattr(node.func, "id", None)
+    is_enum = (
+        (base == "os" and fname in {"walk", "listdir", "scandir"})
+        or (base == "glob" and fname in {"glob", "iglob"})
+        or (base == "pathlib" and fname == "glob")
+    )
+    if not is_enum:
+        return
+    seg = segments.get(node) or ""
+    if ENUM_SENSITIVE_RE.search(seg):
+        findings.append(
+            CapabilitySignal(
+                capability="enumerate", category="File System Enumeration",
+                severity="medium", file=source.relative, line=getattr(node, "lineno", 1),
+                code=seg[:220],
+                message="递归/枚举目录，且路径涉及用户主目录或敏感目录（~/.ssh/.aws/.env 等），"
+                        "可能枚举用户文件系统（对应 SkillSpector File System Enumeration）。",
+                is_test=source.is_test, confidence=0.8,
+            )
+        )
+
+
+def _analyze_python(source: SourceFile) -> list[CapabilitySignal]:
+    """一次 ast.parse + 一次 ast.walk 同时产出能力、污点、目录枚举三类信号。
+
+    输出顺序与分别遍历时一致：能力信号 -> 污点流 -> 目录枚举。
+    """
     try:
         tree = ast.parse(source.text)
     except SyntaxError:
-        return findings
+        return [
+            CapabilitySignal(
+                capability="syntax_error", category="Dangerous Code Execution",
+                severity="info", file=source.relative, line=1, code="",
+                message=f"无法解析 Python 语法（{source.relative}），跳过 AST 扫描。",
+                is_test=source.is_test, confidence=0.9,
+            )
+        ]
 
-    ENUM_SENSITIVE_RE = re.compile(
-        r"expanduser|['\"](?:~|/Users/|/home/|/etc/|/root)|\.ssh|\.aws|\.gnupg|\.env|/Users/",
-        re.IGNORECASE,
-    )
+    segments = _SourceSegments(source.text)
+    capabilities: list[CapabilitySignal] = []
+    enumeration: list[CapabilitySignal] = []
+    taint = _TaintTracker(source, segments)
     for node in ast.walk(tree):
-        if not isinstance(node, ast.Call):
-            continue
-        base, chain = _resolve_call_base(node.func)
-        fname = getattr(node.func, "attr", None) or getattr(node.func, "id", None)
-        is_enum = (
-            (base == "os" and fname in {"walk", "listdir", "scandir"})
-            or (base == "glob" and fname in {"glob", "iglob"})
-            or (base == "pathlib" and fname == "glob")
-        )
-        if not is_enum:
-            continue
-        seg = ast.get_source_segment(source.text, node) or ""
-        if ENUM_SENSITIVE_RE.search(seg):
-            findings.append(
-                CapabilitySignal(
-                    capability="enumerate", category="File System Enumeration",
-                    severity="medium", file=source.relative, line=getattr(node, "lineno", 1),
-                    code=seg[:220],
-                    message="递归/枚举目录，且路径涉及用户主目录或敏感目录（~/.ssh/.aws/.env 等），"
-                            "可能枚举用户文件系统（对应 SkillSpector File System Enumeration）。",
-                    is_test=source.is_test, confidence=0.8,
-                )
-            )
-    return findings
+        _capability_node(source, segments, node, capabilities)
+        taint.record(node)
+        _enumeration_node(source, segments, node, enumeration)
+    return capabilities + taint.findings() + enumeration
 
 
 # ---------------------------------------------------------------------------
@@ -1260,33 +1312,156 @@ def _dedup_findings(findings: list[CapabilitySignal]) -> list[CapabilitySignal]:
     return unique
 
 
-def scan_candidate(candidate_root: Path, online: bool = False) -> dict[str, Any]:
+# ---------------------------------------------------------------------------
+# 单文件结果缓存（按内容 sha256；只重扫改动过的文件）
+# ---------------------------------------------------------------------------
+
+CACHE_VERSION = 1
+# 单文件即可判定的扫描项；按此顺序拼回全量 findings，保证与无缓存时顺序一致
+PER_FILE_PARTS = ("code", "secrets", "prompt", "unicode", "mcp")
+
+_analyzer_digest: str | None = None
+
+
+def default_cache_dir() -> Path:
+    return file_inventory.cache_root() / "security-scan"
+
+
+def _get_analyzer_digest() -> str:
+    """扫描器自身源码的摘要：规则改动后旧缓存自动失效，无需手工维护版本号。"""
+    global _analyzer_digest
+    if _analyzer_digest is None:
+        _analyzer_digest = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _analyzer_digest
+
+
+def _scan_source(source: SourceFile, online: bool) -> dict[str, list[CapabilitySignal]]:
+    """单文件扫描：返回 PER_FILE_PARTS 各项的 findings。"""
+    code: list[CapabilitySignal] = []
+    if source.path.suffix in PY_SUFFIXES:
+        code.extend(_analyze_python(source))
+    elif source.path.suffix in SH_SUFFIXES:
+        code.extend(_collect_capabilities_shell(source))
+    if source.path.name in DEP_FILE_NAMES:
+        code.extend(_scan_dependencies(source, online))
+    return {
+        "code": code,
+        "secrets": _scan_hardcoded_secrets([source]),
+        "prompt": _scan_prompt_injection([source]),
+        "unicode": _scan_unicode_deception([source]),
+        "mcp": _scan_mcp_wildcard([source]),
+    }
+
+
+class _ScanCache:
+    """每个 Skill 一个 JSON 缓存文件：relative -> {sha256, parts}。
+
+    --online 的 OSV 结果随时间变化，不走缓存。写入用临时文件 + os.replace，
+    并发 batch 中各 worker 处理不同 Skill，互不争用同一缓存文件。
+    """
+
+    def __init__(self, cache_dir: Path, candidate_root: Path):
+        key = hashlib.sha256(str(candidate_root).encode("utf-8")).hexdigest()[:24]
+        self.path = cache_dir / f"{key}.json"
+        self.candidate_root = candidate_root
+        self.entries: dict[str, Any] = {}
+        self.fresh: dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("cache_version") == CACHE_VERSION
+            and data.get("analyzer") == _get_analyzer_digest()
+            and isinstance(data.get("files"), dict)
+        ):
+            self.entries = data["files"]
+
+    def scan(self, source: SourceFile, online: bool) -> dict[str, list[CapabilitySignal]]:
+        digest = source.sha256 or hashlib.sha256(source.text.encode("utf-8", errors="surrogatepass")).hexdigest()
+        entry = self.entries.get(source.relative)
+        if entry and entry.get("sha256") == digest:
+            try:
+                parts = {
+                    name: [CapabilitySignal(**item) for item in entry["parts"][name]]
+                    for name in PER_FILE_PARTS
+                }
+            except (KeyError, TypeError):
+                parts = None
+            if parts is not None:
+                self.hits += 1
+                self.fresh[source.relative] = entry
+                return parts
+        self.misses += 1
+        parts = _scan_source(source, online)
+        self.fresh[source.relative] = {
+            "sha256": digest,
+            "parts": {name: [asdict(f) for f in parts[name]] for name in PER_FILE_PARTS},
+        }
+        return parts
+
+    def save(self) -> None:
+        # 只保留本次仍存在的文件，已删除文件的条目随之清理
+        if not self.misses and set(self.fresh) == set(self.entries):
+            return
+        payload = {
+            "cache_version": CACHE_VERSION,
+            "analyzer": _get_analyzer_digest(),
+            "candidate_root": str(self.candidate_root),
+            "files": self.fresh,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 缓存只是加速手段，写失败不影响扫描结果
+            pass
+
+
+def scan_candidate(
+    candidate_root: Path,
+    online: bool = False,
+    cache_dir: Path | None = None,
+) -> dict[str, Any]:
+    """审查单个 Skill。cache_dir 非空且离线时复用未改动文件的单文件扫描结果。"""
+    return _scan_candidate(candidate_root, online, cache_dir)[0]
+
+
+def _scan_candidate(
+    candidate_root: Path,
+    online: bool,
+    cache_dir: Path | None,
+) -> tuple[dict[str, Any], dict[str, int]]:
     candidate_root = candidate_root.expanduser().resolve()
     skill_md = candidate_root / "SKILL.md"
     if not skill_md.is_file():
         raise ValueError(f"未发现 SKILL.md: {candidate_root}")
 
     sources = _read_sources(candidate_root)
-    findings: list[CapabilitySignal] = []
+    cache = _ScanCache(cache_dir, candidate_root) if cache_dir is not None and not online else None
+    per_file = [
+        cache.scan(source, online) if cache is not None else _scan_source(source, online)
+        for source in sources
+    ]
+    if cache is not None:
+        cache.save()
 
-    for source in sources:
-        if source.path.suffix in PY_SUFFIXES:
-            findings.extend(_collect_capabilities_ast(source))
-            findings.extend(_collect_taint_ast(source))
-            findings.extend(_collect_fs_enumeration_ast(source))
-        elif source.path.suffix in SH_SUFFIXES:
-            findings.extend(_collect_capabilities_shell(source))
-        if source.path.name in DEP_FILE_NAMES:
-            findings.extend(_scan_dependencies(source, online))
-
-    findings.extend(_scan_hardcoded_secrets(sources))
-    findings.extend(_scan_prompt_injection(sources))
-    findings.extend(_scan_unicode_deception(sources))
-    findings.extend(_scan_mcp_wildcard(sources))
+    findings: list[CapabilitySignal] = []
+    for name in PER_FILE_PARTS:
+        for parts in per_file:
+            findings.extend(parts[name])
     findings.extend(_scan_scope_creep(sources))
     findings.extend(_scan_disclosure(sources, findings))
 
     findings = _dedup_findings(findings)
+    stats = {"files": len(sources), "cache_hits": 0, "cache_misses": 0}
+    if cache is not None:
+        stats.update(cache_hits=cache.hits, cache_misses=cache.misses)
 
     critical = sum(1 for f in findings if f.severity == "critical")
     high = sum(1 for f in findings if f.severity == "high")
@@ -1295,7 +1470,7 @@ def scan_candidate(candidate_root: Path, online: bool = False) -> dict[str, Any]
     info = sum(1 for f in findings if f.severity == "info")
 
     status = "FAIL" if (critical or high) else ("WARN" if (medium or low) else "PASS")
-    return {
+    report = {
         "schema_version": SCHEMA_VERSION,
         "mode": "audit",
         "candidate_root": str(candidate_root),
@@ -1311,29 +1486,60 @@ def scan_candidate(candidate_root: Path, online: bool = False) -> dict[str, Any]
         },
         "findings": [f.to_dict() for f in findings],
     }
+    return report, stats
+
+
+def _error_report(root: Path, exc: ValueError) -> dict[str, Any]:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "mode": "audit",
+        "candidate_root": str(root),
+        "status": "ERROR",
+        "summary": {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0, "total": 0, "skills": 0},
+        "error": str(exc),
+        "findings": [],
+    }
+
+
+def _scan_root(root: Path, online: bool, cache_dir: Path | None) -> tuple[dict[str, Any], dict[str, int]]:
+    """batch 的单个任务（进程池 worker 入口，需为模块级函数以便 pickle）。"""
+    try:
+        return _scan_candidate(root, online, cache_dir)
+    except ValueError as exc:
+        return _error_report(root, exc), {"files": 0, "cache_hits": 0, "cache_misses": 0}
+
+
+def scan_collection(
+    collection_root: Path,
+    online: bool = False,
+    cache_dir: Path | None = None,
+    jobs: int = 1,
+) -> dict[str, Any]:
+    """递归审查 Skill 集合。jobs > 1 时按 Skill 分发到进程池，报告顺序与串行一致。"""
+    return _scan_collection(collection_root, online, cache_dir, jobs)[0]
 
 
-def scan_collection(collection_root: Path, online: bool = False) -> dict[str, Any]:
+def _scan_collection(
+    collection_root: Path,
+    online: bool,
+    cache_dir: Path | None,
+    jobs: int,
+) -> tuple[dict[str, Any], dict[str, int]]:
     collection_root = collection_root.expanduser().resolve()
     roots = _discover_skill_roots(collection_root)
     if not roots:
         raise ValueError(f"集合中未发现任何 SKILL.md: {collection_root}")
-    reports = []
-    for root in roots:
-        try:
-            reports.append(scan_candidate(root, online=online))
-        except ValueError as exc:
-            reports.append(
-                {
-                    "schema_version": SCHEMA_VERSION,
-                    "mode": "audit",
-                    "candidate_root": str(root),
-                    "status": "ERROR",
-                    "summary": {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0, "total": 0, "skills": 0},
-                    "error": str(exc),
-                    "findings": [],
-                }
-            )
+    workers = min(max(1, jobs), len(roots))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_root, roots, [online] * len(roots), [cache_dir] * len(roots)))
+    else:
+        results = [_scan_root(root, online, cache_dir) for root in roots]
+    reports = [report for report, _ in results]
+    stats = {
+        key: sum(item[key] for _, item in results)
+        for key in ("files", "cache_hits", "cache_misses")
+    }
     totals = {
         "skills": len(reports),
         "failed_skills": sum(r["status"] == "FAIL" for r in reports),
@@ -1352,7 +1558,7 @@ def scan_collection(collection_root: Path, online: bool = False) -> dict[str, An
         "status": "FAIL" if totals["failed_skills"] else ("WARN" if totals["warning_skills"] else "PASS"),
         "summary": totals,
         "skills": reports,
-    }
+    }, stats
 
 
 def _write_output(report: dict[str, Any], output: str | None) -> None:
@@ -1372,21 +1578,38 @@ def build_parser() -> argparse.ArgumentParser:
     audit_parser.add_argument("--candidate-root", required=True)
     audit_parser.add_argument("--output")
     audit_parser.add_argument("--online", action="store_true", help="联网查询 OSV 已知漏洞（默认离线）")
+    _add_cache_arguments(audit_parser)
 
     batch_parser = subparsers.add_parser("batch", help="递归审查 Skill 集合")
     batch_parser.add_argument("--root", required=True)
     batch_parser.add_argument("--output")
     batch_parser.add_argument("--online", action="store_true", help="联网查询 OSV 已知漏洞（默认离线）")
+    batch_parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="并行扫描的进程数（按 Skill 分发，默认 CPU 核数；1 为串行）",
+    )
+    _add_cache_arguments(batch_parser)
     return parser
 
 
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        help=f"单文件结果缓存目录（默认 ${file_inventory.CACHE_DIR_ENV}/security-scan 或 ~/.cache/skill-lint/security-scan）",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="不读写单文件结果缓存，全量重新分析")
+
+
 def main() -> int:
     args = build_parser().parse_args()
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else default_cache_dir()
     try:
         if args.command == "audit":
-            report = scan_candidate(Path(args.candidate_root), online=args.online)
+            report, stats = _scan_candidate(Path(args.candidate_root), args.online, cache_dir)
         else:
-            report = scan_collection(Path(args.root), online=args.online)
+            report, stats = _scan_collection(Path(args.root), args.online, cache_dir, args.jobs)
     except ValueError as exc:
         print(f"❌ 范围错误: {exc}", file=sys.stderr)
         return 2
@@ -1395,6 +1618,11 @@ def main() -> int:
         return 2
 
     _write_output(report, args.output)
+    if stats["cache_hits"] or stats["cache_misses"]:
+        print(
+            f"🗂️ 扫描 {stats['files']} 个文件，缓存命中 {stats['cache_hits']}，重新分析 {stats['cache_misses']}",
+            file=sys.stderr,
+        )
     if args.command == "audit":
         return 1 if report["status"] == "FAIL" else 0
     return 1 if report["status"] == "FAIL" else 0
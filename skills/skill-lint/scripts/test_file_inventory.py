@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""file_inventory.py 的共享文件清单回归测试：遍历顺序、文本一致性、sidecar 复用与失效。"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import file_inventory  # noqa: E402
+
+
+class FileInventoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp.name) / "candidate"
+        self.root.mkdir()
+        self.cache = tempfile.TemporaryDirectory()
+        self._saved_env = os.environ.get(file_inventory.CACHE_DIR_ENV)
+        os.environ[file_inventory.CACHE_DIR_ENV] = self.cache.name
+        self._saved_window = file_inventory.RACY_WINDOW_NS
+        self._reset_process_state()
+
+    def tearDown(self) -> None:
+        file_inventory.RACY_WINDOW_NS = self._saved_window
+        if self._saved_env is None:
+            os.environ.pop(file_inventory.CACHE_DIR_ENV, None)
+        else:
+            os.environ[file_inventory.CACHE_DIR_ENV] = self._saved_env
+        self._reset_process_state()
+        self.cache.cleanup()
+        self.temp.cleanup()
+
+    @staticmethod
+    def _reset_process_state() -> None:
+        """模拟新进程：清空进程内记忆，只剩磁盘 sidecar。"""
+        file_inventory._digests.clear()
+        file_inventory._texts.clear()
+        file_inventory._lines.clear()
+        file_inventory._sidecars.clear()
+
+    def _write(self, relative: str, data: bytes) -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def test_walk_order_matches_sorted_rglob(self) -> None:
+        for relative in ("a-b/x.md", "a/b.md", "A.md", "a/c/d.py", "skip/e.md"):
+            self._write(relative, b"x\n")
+        (self.root / "link").symlink_to(self.root / "a")
+
+        entries = file_inventory.walk(self.root)
+        expected = [p.relative_to(self.root).as_posix() for p in sorted(self.root.rglob("*"))
+                    if p.is_symlink() or p.is_file()]
+        self.assertEqual([e.relative for e in entries], expected)
+        self.assertTrue(next(e for e in entries if e.relative == "link").is_symlink)
+
+        pruned = file_inventory.walk(self.root, prune=lambda name: name == "skip")
+        self.assertNotIn("skip/e.md", [e.relative for e in pruned])
+
+    def test_read_text_matches_path_read_text(self) -> None:
+        path = self._write("doc.md", "第一行\r\n第二行\r第三行\n".encode("utf-8") + b"\xff\xfe tail")
+        entry = file_inventory.walk(self.root)[0]
+        self.assertEqual(
+            file_inventory.read_text(entry), path.read_text(encoding="utf-8", errors="replace")
+        )
+        self.assertEqual(file_inventory.lines(entry), tuple(path.read_text(errors="replace").splitlines()))
+
+    def test_sidecar_reused_across_processes_and_invalidated_on_change(self) -> None:
+        file_inventory.RACY_WINDOW_NS = 0
+        path = self._write("SKILL.md", b"version one\n")
+        first = file_inventory.manifest(file_inventory.walk(self.root))
+
+        self._reset_process_state()
+        original_hash = file_inventory._hash_file
+        file_inventory._hash_file = lambda _path: self.fail("未改动文件不应重新哈希")
+        try:
+            self.assertEqual(file_inventory.manifest(file_inventory.walk(self.root)), first)
+        finally:
+            file_inventory._hash_file = original_hash
+
+        # 同尺寸改写并回拨 mtime：ctime/inode 变化仍使缓存失效
+        info = path.stat()
+        path.write_bytes(b"version two\n")
+        os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns))
+        self._reset_process_state()
+        changed = file_inventory.manifest(file_inventory.walk(self.root))
+        self.assertNotEqual(changed[0]["sha256"], first[0]["sha256"])
+
+    def test_recently_modified_files_are_not_cached(self) -> None:
+        self._write("SKILL.md", b"fresh\n")
+        entry = file_inventory.walk(self.root)[0]
+        file_inventory.digest(entry)
+        file_inventory.save()
+        self.assertEqual(file_inventory._digests, {})
+        self.assertFalse((Path(self.cache.name) / "inventory").exists())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
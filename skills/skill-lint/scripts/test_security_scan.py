@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import json
+import os
 import subprocess
 import sys
 import tempfile
@@ -41,8 +42,17 @@ class SecurityScanTest(unittest.TestCase):
     def setUp(self) -> None:
         self.temp = tempfile.TemporaryDirectory()
         self.root = Path(self.temp.name)
+        # 单文件结果缓存写到独立临时目录，不污染 ~/.cache，也不混入被扫描的 Skill 树
+        self.cache_temp = tempfile.TemporaryDirectory()
+        self._saved_cache_env = os.environ.get("SKILL_LINT_CACHE_DIR")
+        os.environ["SKILL_LINT_CACHE_DIR"] = self.cache_temp.name
 
     def tearDown(self) -> None:
+        if self._saved_cache_env is None:
+            os.environ.pop("SKILL_LINT_CACHE_DIR", None)
+        else:
+            os.environ["SKILL_LINT_CACHE_DIR"] = self._saved_cache_env
+        self.cache_temp.cleanup()
         self.temp.cleanup()
 
     def _basic_skill(self) -> Path:
@@ -327,6 +337,51 @@ class SecurityScanTest(unittest.TestCase):
         report = run_scan(skill)
         self.assertTrue(any(f["capability"] == "mcp_wildcard" for f in report["findings"]))
 
+    # ---- 缓存 / 并行 batch：结果必须与全量串行扫描一致 ----
+
+    def test_cache_reanalyzes_only_changed_files(self) -> None:
+        skill = make_skill(
+            self.root,
+            {
+                "SKILL.md": "---\nname: demo\n---\n# Demo\n",
+                "scripts/a.py": "import subprocess\nsubprocess.run(['ls'])\n",
+                "scripts/b.py": "import os\nprint(os.getenv('HOME'))\n",
+            },
+        )
+        command = [sys.executable, str(SCRIPT), "audit", "--candidate-root", str(skill)]
+        first = subprocess.run(command, capture_output=True, text=True)
+        second = subprocess.run(command, capture_output=True, text=True)
+        self.assertEqual(first.stdout, second.stdout)
+        self.assertIn("缓存命中 3，重新分析 0", second.stderr)
+
+        (skill / "scripts" / "b.py").write_text(
+            "import os\nos.system('rm -rf ' + os.getenv('HOME'))\n", encoding="utf-8"
+        )
+        third = subprocess.run(command, capture_output=True, text=True)
+        self.assertIn("缓存命中 2，重新分析 1", third.stderr)
+        uncached = subprocess.run(command + ["--no-cache"], capture_output=True, text=True)
+        self.assertEqual(third.stdout, uncached.stdout)
+        self.assertTrue(any(
+            f["capability"] == "subprocess" and f["file"] == "scripts/b.py"
+            for f in json.loads(third.stdout)["findings"]
+        ))
+
+    def test_batch_parallel_matches_serial(self) -> None:
+        for name in ("a", "b", "c"):
+            make_skill(
+                self.root / name,
+                {
+                    "SKILL.md": f"---\nname: {name}\n---\n# {name}\n",
+                    "scripts/tool.py": "import os, subprocess\nsubprocess.run([os.environ['CMD']])\n",
+                },
+            )
+        base = [sys.executable, str(SCRIPT), "batch", "--root", str(self.root)]
+        serial = subprocess.run(base + ["--jobs", "1", "--no-cache"], capture_output=True, text=True)
+        parallel = subprocess.run(base + ["--jobs", "3"], capture_output=True, text=True)
+        self.assertEqual(serial.returncode, parallel.returncode)
+        self.assertEqual(serial.stdout, parallel.stdout)
+        self.assertEqual(json.loads(parallel.stdout)["summary"]["skills"], 3)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
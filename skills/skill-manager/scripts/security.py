@@ -6,13 +6,20 @@
 用于识别 skill 中可能存在的恶意代码或安全隐患。
 """
 
+import os
 import re
 import json
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
 
 @dataclass
 class SecurityFinding:
@@ -482,6 +489,219 @@ PROMPT_SECURITY_PATTERNS = {
 }
 
 
+# 单次遍历扫描参数
+MAX_SCAN_BYTES = 4 * 1024 * 1024  # 单文件最多读取 4 MiB，超出部分不扫描（记入 scan_stats.truncated）
+BINARY_SNIFF_BYTES = 8192  # 前 8 KiB 含 NUL 视为二进制文件，跳过
+
+# 各检测项覆盖的文件类型（与逐项 rglob 时期的范围一致）
+CODE_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.go', '.rs',
+                   '.java', '.sh', '.bash', '.ps1', '.rb', '.php'}
+NETWORK_SCAN_EXTENSIONS = {'.py', '.js', '.ts', '.jsx', '.tsx', '.json',
+                           '.md', '.yml', '.yaml', '.sh'}
+SECRET_SKIP_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.ico',
+                          '.pdf', '.zip', '.tar', '.gz'}
+CREDENTIAL_SCAN_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.sh', '.bash', '.ps1'}
+SCRIPT_EXTENSIONS = {'.py', '.js', '.sh', '.bash', '.ps1'}
+# 已知文本类型即使含 NUL 也照常扫描（隐藏控制字符本身就是 hidden_instruction 的检测对象）
+TEXT_EXTENSIONS = CODE_EXTENSIONS | NETWORK_SCAN_EXTENSIONS | {'.txt', '.toml', '.cfg', '.ini', '.env'}
+
+SENSITIVE_PATHS = [
+    '~/.ssh', '~/.aws', '~/.gnupg', '.env', '.pem', '.key',
+    '/etc/passwd', '/etc/shadow', '/etc/hosts',
+    'id_rsa', 'id_ed25519', 'authorized_keys',
+    '.bashrc', '.zshrc', '.profile',
+]
+
+# 权限声明检测：脚本中体现的能力信号
+CAPABILITY_SIGNALS = {
+    'local_code_execution': [r'\.sh\b', r'\.ps1\b', r'child_process',
+                             r'subprocess', r'execFileSync', r'os\.system'],
+    'scheduled_task': [r'crontab', r'launchctl\s+load', r'LaunchAgents',
+                       r'ScheduledTask', r'schtasks'],
+    'env_var_read': [r'process\.env\[', r'os\.environ', r'\$\{\w+:', r'WB_CHECKIN_'],
+    'local_session_db': [r'state\.vscdb', r'ItemTable', r'globalStorage'],
+}
+
+SELF_UPDATE_PATTERNS = [
+    r'do-update', r'check-update', r'自更新', r'自动更新',
+    r'raw\.githubusercontent\.com', r'从 GitHub .*(下载|更新)',
+    r'下载.*MANIFEST.*替换', r'自动检测.*版本.*GitHub',
+]
+
+
+def _required_literals(items) -> Optional[List[str]]:
+    """从正则语法树中取出任何匹配都必然包含的字面量（多个候选时任一出现即可）
+
+    只认顺序必经的字面量片段；分支要求每个分支都能给出字面量，可选/可零次重复的部分跳过。
+    无法确定或最短候选不足 3 个字符时返回 None（此时不做预筛）。
+    """
+    best = None
+    run: List[str] = []
+
+    def consider(candidates):
+        nonlocal best
+        if not candidates:
+            return
+        if best is None or min(map(len, candidates)) > min(map(len, best)):
+            best = candidates
+
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        consider([''.join(run)] if run else None)
+        run = []
+        if op is _sre_parse.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is _sre_parse.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                consider(sorted({n for alt in alternatives for n in alt}))
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2]))
+    consider([''.join(run)] if run else None)
+
+    if best is None or min(map(len, best)) < 3:
+        return None
+    return best
+
+
+class _PatternSet:
+    """同一类别的一组正则，启动时编译一次，并为每条模式提取必经字面量。
+
+    扫描时先在小写全文里用 str.find 定位字面量所在行，只对这些行执行正则；
+    没有可用字面量的模式才逐行匹配。产出顺序（模式 → 行）与逐条模式逐行扫描完全一致。
+    """
+
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE):
+        self.compiled: List[Tuple[str, re.Pattern, Optional[List[str]]]] = []
+        for pattern in patterns:
+            try:
+                regex = re.compile(pattern, flags)
+                needles = _required_literals(_sre_parse.parse(pattern, flags))
+            except re.error:
+                continue
+            if needles is not None:
+                needles = [n.lower() for n in needles]
+            self.compiled.append((pattern, regex, needles))
+
+    def search(self, entry: '_ScannedFile') -> bool:
+        """任一模式是否在文件中出现"""
+        for _, regex, needles in self.compiled:
+            if needles is not None and not any(n in entry.lowered for n in needles):
+                continue
+            if regex.search(entry.text):
+                return True
+        return False
+
+    def line_matches(self, entry: '_ScannedFile'):
+        """按（模式, 行）顺序产出 (pattern, 行号, 行内容, match)"""
+        lines = entry.lines
+        for pattern, regex, needles in self.compiled:
+            if needles is None:
+                candidates = range(len(lines))
+            else:
+                candidates = entry.lines_containing(needles)
+            for idx in candidates:
+                match = regex.search(lines[idx])
+                if match:
+                    yield pattern, idx + 1, lines[idx], match
+
+
+def _compile_categories(rules: Dict, flags: int = re.IGNORECASE) -> Dict[str, _PatternSet]:
+    return {category: _PatternSet(config['patterns'], flags)
+            for category, config in rules.items() if 'patterns' in config}
+
+
+_DANGEROUS_SETS = _compile_categories(DANGEROUS_PATTERNS)
+_SKILL_RISK_SETS = _compile_categories(SKILL_RISKS)
+_CREDENTIAL_SETS = _compile_categories(CREDENTIAL_EXPOSURE)
+_PROMPT_SETS = _compile_categories(PROMPT_SECURITY_PATTERNS, re.IGNORECASE | re.MULTILINE)
+_CAPABILITY_SETS = {cap: _PatternSet(pats) for cap, pats in CAPABILITY_SIGNALS.items()}
+_SELF_UPDATE_RES = [re.compile(p, re.IGNORECASE) for p in SELF_UPDATE_PATTERNS]
+
+_URL_RE = re.compile(r'https?://[^\s\'"<>]+')
+_WS_RE = re.compile(r'wss?://[^\s\'"<>]+')
+_CRED_COMMENT_PREFIXES = ('*', '#', '//', '/*', 'REM', '::')
+_CRED_ERROR_LINE_RE = re.compile(r'\b(ERR|失败|未知原因|长度)\b')
+_WRITES_FILES_RE = re.compile(r'write_text|open\([^)]*,\s*[\'"]w|Path\([^)]*\)\.write|'
+                              r'\.dump\(|\.to_csv|os\.mkdir|Path\.mkdir')
+_SENDS_EXTERNAL_RE = re.compile(r'requests\.(post|get)|api_post|api_get|fetch\(|'
+                                r'urllib.*request|httpx\.(post|get)', re.IGNORECASE)
+_AUTO_INSTALL_RE = re.compile(r'npm\s+install\s+electron', re.IGNORECASE)
+_PY_FALLBACK_RE = re.compile(r'execFileSync\s*\(\s*["\']python3', re.IGNORECASE)
+
+
+@dataclass
+class _ScannedFile:
+    """单次遍历中读取的文件（只读一次，分发给全部检测项）"""
+    rel_path: str
+    suffix: str
+    text: str
+    _lines: Optional[List[str]] = None
+    _lowered: Optional[str] = None
+    _line_starts: Optional[List[int]] = None
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def lowered(self) -> str:
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return self._lowered
+
+    def lines_containing(self, needles: List[str]) -> List[int]:
+        """小写全文中含任一字面量的行号（0 起，升序）"""
+        lowered = self.lowered
+        if self._line_starts is None:
+            # lower() 可能改变个别字符长度，行边界按小写文本自身的换行位置计算
+            starts = [0]
+            pos = lowered.find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = lowered.find('\n', pos + 1)
+            self._line_starts = starts
+        starts = self._line_starts
+        hits = set()
+        for needle in needles:
+            pos = lowered.find(needle)
+            while pos != -1:
+                idx = bisect_right(starts, pos) - 1
+                hits.add(idx)
+                next_start = starts[idx + 1] if idx + 1 < len(starts) else len(lowered)
+                pos = lowered.find(needle, next_start)
+        return sorted(hits)
+
+
+@dataclass
+class _ScanState:
+    """单次遍历的累积结果，由各 _detect_* / _analyze_* 方法汇总成报告"""
+    skill_md: Optional[str] = None
+    dangerous: List[SecurityFinding] = field(default_factory=list)
+    skill_risks: Dict[str, List[SecurityFinding]] = field(
+        default_factory=lambda: {c: [] for c in _SKILL_RISK_SETS})
+    credential: Dict[str, List[SecurityFinding]] = field(
+        default_factory=lambda: {c: [] for c in _CREDENTIAL_SETS})
+    prompt: List[Tuple[Dict, SecurityFinding]] = field(default_factory=list)
+    prompt_files: int = 0
+    secrets: List[Dict] = field(default_factory=list)
+    external_urls: List[Dict] = field(default_factory=list)
+    websockets: List[Dict] = field(default_factory=list)
+    sensitive_paths: List[Dict] = field(default_factory=list)
+    capabilities: Set[str] = field(default_factory=set)
+    writes_files: bool = False
+    sends_external: bool = False
+    auto_install: bool = False
+    py_fallback: bool = False
+    files_scanned: int = 0
+    binary_skipped: int = 0
+    truncated: List[str] = field(default_factory=list)
+
+
 class SecurityAnalyzer:
     """AI Agent/Skill 安全分析器"""
 
@@ -498,14 +718,19 @@ class SecurityAnalyzer:
         self.findings: List[SecurityFinding] = []
         self.exclude_dirs = {'.git', 'node_modules', '__pycache__', 'venv', '.venv',
                              'dist', 'build', 'target', '.cache', 'vendor'}
+        self._scan = _ScanState()
 
     def analyze(self) -> Dict:
         """执行完整安全分析
 
+        仓库只遍历一次、每个文件只读取一次，由 _scan_repository 分发给全部检测项；
+        各 _detect_* / _analyze_* 方法再从累积结果汇总各自的报告段落。
+
         Returns:
             安全分析结果
         """
         self.findings = []
+        self._scan = self._scan_repository()
 
         # 执行各项检测
         skill_structure = self._analyze_skill_structure()
@@ -536,6 +761,11 @@ class SecurityAnalyzer:
             'permission_declaration': permission_decl,
             'context_mismatch': context_match,
             'self_update_persistence': self_update_persist,
+            'scan_stats': {
+                'files_scanned': self._scan.files_scanned,
+                'binary_skipped': self._scan.binary_skipped,
+                'truncated': self._scan.truncated,
+            },
             'findings': self._serialize_findings(),
         }
 
@@ -611,107 +841,112 @@ class SecurityAnalyzer:
 
         return ""
 
-    def _detect_dangerous_patterns(self) -> Dict:
-        """检测危险代码模式"""
-        results = defaultdict(list)
-
-        # 获取所有代码文件
-        code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.go', '.rs',
-                           '.java', '.sh', '.bash', '.ps1', '.rb', '.php'}
-        code_files = []
-        for ext in code_extensions:
-            code_files.extend(self.repo_path.rglob(f'*{ext}'))
+    def _iter_files(self):
+        """单次遍历仓库：剪掉排除目录，每个文件只读一次（限长、二进制嗅探），产出 _ScannedFile"""
+        scan = self._scan
+        for root, dirnames, filenames in os.walk(self.repo_path):
+            dirnames[:] = sorted(d for d in dirnames if d not in self.exclude_dirs)
+            for name in sorted(filenames):
+                path = Path(root) / name
+                suffix = path.suffix
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read(MAX_SCAN_BYTES + 1)
+                except OSError:
+                    continue
 
-        # 过滤排除目录
-        code_files = [f for f in code_files
-                      if not any(exc in f.parts for exc in self.exclude_dirs)]
+                if suffix not in TEXT_EXTENSIONS and b'\0' in data[:BINARY_SNIFF_BYTES]:
+                    scan.binary_skipped += 1
+                    continue
+                rel_path = str(path.relative_to(self.repo_path))
+                if len(data) > MAX_SCAN_BYTES:
+                    data = data[:MAX_SCAN_BYTES]
+                    scan.truncated.append(rel_path)
+
+                # 与 read_text(errors='ignore') 一致：忽略非法字节并统一换行符
+                text = data.decode('utf-8', errors='ignore')
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+                scan.files_scanned += 1
+                yield _ScannedFile(rel_path=rel_path, suffix=suffix, text=text)
+
+    def _scan_repository(self) -> _ScanState:
+        """遍历一次仓库，把每个文件分发给各检测项"""
+        self._scan = _ScanState()
+        for entry in self._iter_files():
+            suffix = entry.suffix
+            if entry.rel_path == 'SKILL.md':
+                self._scan.skill_md = entry.text
+            if suffix in CODE_EXTENSIONS:
+                self._scan_file_for_patterns(entry)
+            self._scan_skill_risks(entry)
+            if suffix in NETWORK_SCAN_EXTENSIONS:
+                self._scan_network(entry)
+            self._scan_sensitive_paths(entry)
+            if suffix not in SECRET_SKIP_EXTENSIONS:
+                self._scan_secrets(entry)
+            if suffix == '.md':
+                self._scan.prompt_files += 1
+                self._scan_prompt_content(entry)
+            if suffix in CREDENTIAL_SCAN_EXTENSIONS:
+                self._scan_credential_exposure(entry)
+            if suffix in SCRIPT_EXTENSIONS:
+                self._scan_script_capabilities(entry)
+        return self._scan
+
+    @staticmethod
+    def _finding_entry(finding: SecurityFinding) -> Dict:
+        return {
+            'file': finding.file,
+            'line': finding.line,
+            'code': finding.code,
+            'severity': finding.severity,
+            'message': finding.message,
+        }
 
-        for file_path in code_files:
-            self._scan_file_for_patterns(file_path, results)
+    def _detect_dangerous_patterns(self) -> Dict:
+        """检测危险代码模式（含 Skill 特有风险）"""
+        results = defaultdict(list)
+        for finding in self._scan.dangerous:
+            self.findings.append(finding)
+            results[finding.category].append(self._finding_entry(finding))
 
-        # 合并 Skill 特有检测
-        self._scan_skill_risks(results)
+        # 合并 Skill 特有检测（按类别汇总，顺序同旧版"逐类别遍历仓库"）
+        for found in self._scan.skill_risks.values():
+            for finding in found:
+                self.findings.append(finding)
+                results[finding.category].append(self._finding_entry(finding))
 
         return dict(results)
 
-    def _scan_file_for_patterns(self, file_path: Path, results: Dict):
+    def _scan_file_for_patterns(self, entry: _ScannedFile):
         """扫描文件中的危险模式"""
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            lines = content.split('\n')
-            rel_path = str(file_path.relative_to(self.repo_path))
-
-            for category, config in DANGEROUS_PATTERNS.items():
-                for pattern in config['patterns']:
-                    try:
-                        regex = re.compile(pattern, re.IGNORECASE)
-                        for i, line in enumerate(lines, 1):
-                            if regex.search(line):
-                                finding = SecurityFinding(
-                                    category=category,
-                                    severity=config['severity'],
-                                    file=rel_path,
-                                    line=i,
-                                    code=line.strip()[:100],
-                                    message=config['message'],
-                                    pattern=pattern,
-                                )
-                                self.findings.append(finding)
-                                results[category].append({
-                                    'file': rel_path,
-                                    'line': i,
-                                    'code': line.strip()[:100],
-                                    'severity': config['severity'],
-                                    'message': config['message'],
-                                })
-                    except re.error:
-                        pass
-        except Exception:
-            pass
-
-    def _scan_skill_risks(self, results: Dict):
+        for category, patterns in _DANGEROUS_SETS.items():
+            config = DANGEROUS_PATTERNS[category]
+            for pattern, i, line, _ in patterns.line_matches(entry):
+                self._scan.dangerous.append(SecurityFinding(
+                    category=category,
+                    severity=config['severity'],
+                    file=entry.rel_path,
+                    line=i,
+                    code=line.strip()[:100],
+                    message=config['message'],
+                    pattern=pattern,
+                ))
+
+    def _scan_skill_risks(self, entry: _ScannedFile):
         """扫描 Skill 特有风险"""
-        for category, config in SKILL_RISKS.items():
-            if 'patterns' not in config:
-                continue
-
-            for file_path in self.repo_path.rglob('*'):
-                if not file_path.is_file():
-                    continue
-                if any(exc in file_path.parts for exc in self.exclude_dirs):
-                    continue
-
-                try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    lines = content.split('\n')
-                    rel_path = str(file_path.relative_to(self.repo_path))
-
-                    for pattern in config['patterns']:
-                        try:
-                            regex = re.compile(pattern, re.IGNORECASE)
-                            for i, line in enumerate(lines, 1):
-                                if regex.search(line):
-                                    finding = SecurityFinding(
-                                        category=f'skill_{category}',
-                                        severity=config['severity'],
-                                        file=rel_path,
-                                        line=i,
-                                        code=line.strip()[:100],
-                                        message=config['message'],
-                                        pattern=pattern,
-                                    )
-                                    self.findings.append(finding)
-                                    results[f'skill_{category}'].append({
-                                        'file': rel_path,
-                                        'line': i,
-                                        'code': line.strip()[:100],
-                                        'severity': config['severity'],
-                                        'message': config['message'],
-                                    })
-                        except re.error:
-                            pass
-                except Exception:
-                    pass
+        for category, patterns in _SKILL_RISK_SETS.items():
+            config = SKILL_RISKS[category]
+            for pattern, i, line, _ in patterns.line_matches(entry):
+                self._scan.skill_risks[category].append(SecurityFinding(
+                    category=f'skill_{category}',
+                    severity=config['severity'],
+                    file=entry.rel_path,
+                    line=i,
+                    code=line.strip()[:100],
+                    message=config['message'],
+                    pattern=pattern,
+                ))
 
     def _analyze_dependencies(self) -> Dict:
         """分析依赖安全"""
@@ -785,61 +1020,41 @@ class SecurityAnalyzer:
                     })
         return high_risk
 
+    def _scan_network(self, entry: _ScannedFile):
+        """收集文件中的外部 URL 与 WebSocket 地址"""
+        for url in _URL_RE.findall(entry.text):
+            # 过滤常见的安全 URL
+            if not any(safe in url for safe in
+                       ['github.com', 'example.com', 'localhost', '127.0.0.1',
+                        'docs.', 'help.', 'readme']):
+                self._scan.external_urls.append({
+                    'file': entry.rel_path,
+                    'url': url[:100],
+                })
+
+        for url in _WS_RE.findall(entry.text):
+            self._scan.websockets.append({
+                'file': entry.rel_path,
+                'url': url[:100],
+            })
+
     def _analyze_network_activity(self) -> Dict:
         """分析网络活动"""
         result = {
             'external_urls': [],
-            'websockets': [],
+            'websockets': list(self._scan.websockets),
             'api_endpoints': [],
             'warnings': [],
         }
 
-        url_pattern = r'https?://[^\s\'"<>]+'
-        ws_pattern = r'wss?://[^\s\'"<>]+'
-
-        for file_path in self.repo_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-            if any(exc in file_path.parts for exc in self.exclude_dirs):
-                continue
-            if file_path.suffix not in {'.py', '.js', '.ts', '.jsx', '.tsx', '.json',
-                                         '.md', '.yml', '.yaml', '.sh'}:
-                continue
-
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                rel_path = str(file_path.relative_to(self.repo_path))
-
-                # 检测 URL
-                urls = re.findall(url_pattern, content)
-                for url in urls:
-                    # 过滤常见的安全 URL
-                    if not any(safe in url for safe in
-                               ['github.com', 'example.com', 'localhost', '127.0.0.1',
-                                'docs.', 'help.', 'readme']):
-                        result['external_urls'].append({
-                            'file': rel_path,
-                            'url': url[:100],
-                        })
-
-                # 检测 WebSocket
-                ws_urls = re.findall(ws_pattern, content)
-                for url in ws_urls:
-                    result['websockets'].append({
-                        'file': rel_path,
-                        'url': url[:100],
-                    })
-
-            except Exception:
-                pass
-
-        # 去重
+        # 去重；按 URL 排序后再截断，结果与文件遍历顺序无关
         seen_urls = set()
         unique_urls = []
-        for item in result['external_urls']:
+        for item in self._scan.external_urls:
             if item['url'] not in seen_urls:
                 seen_urls.add(item['url'])
                 unique_urls.append(item)
+        unique_urls.sort(key=lambda item: item['url'])
         result['external_urls'] = unique_urls[:20]  # 限制数量
 
         if result['external_urls']:
@@ -847,41 +1062,23 @@ class SecurityAnalyzer:
 
         return result
 
+    def _scan_sensitive_paths(self, entry: _ScannedFile):
+        """记录文件中引用的敏感路径"""
+        for sensitive in SENSITIVE_PATHS:
+            if sensitive in entry.text:
+                self._scan.sensitive_paths.append({
+                    'file': entry.rel_path,
+                    'path': sensitive,
+                })
+
     def _analyze_file_operations(self) -> Dict:
         """分析文件操作"""
         result = {
-            'sensitive_paths': [],
+            'sensitive_paths': list(self._scan.sensitive_paths),
             'file_operations': [],
             'warnings': [],
         }
 
-        sensitive_paths = [
-            '~/.ssh', '~/.aws', '~/.gnupg', '.env', '.pem', '.key',
-            '/etc/passwd', '/etc/shadow', '/etc/hosts',
-            'id_rsa', 'id_ed25519', 'authorized_keys',
-            '.bashrc', '.zshrc', '.profile',
-        ]
-
-        for file_path in self.repo_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-            if any(exc in file_path.parts for exc in self.exclude_dirs):
-                continue
-
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                rel_path = str(file_path.relative_to(self.repo_path))
-
-                for sensitive in sensitive_paths:
-                    if sensitive in content:
-                        result['sensitive_paths'].append({
-                            'file': rel_path,
-                            'path': sensitive,
-                        })
-
-            except Exception:
-                pass
-
         if result['sensitive_paths']:
             result['warnings'].append(
                 f"发现 {len(result['sensitive_paths'])} 处敏感路径引用"
@@ -889,53 +1086,28 @@ class SecurityAnalyzer:
 
         return result
 
+    def _scan_secrets(self, entry: _ScannedFile):
+        """按 hardcoded_secrets 规则扫描硬编码凭证"""
+        patterns = _DANGEROUS_SETS.get('hardcoded_secrets')
+        if patterns is None:
+            return
+        for _, i, line, match in patterns.line_matches(entry):
+            # 脱敏处理
+            masked_line = self._mask_secret(line, match.group())
+            self._scan.secrets.append({
+                'file': entry.rel_path,
+                'line': i,
+                'type': 'potential_secret',
+                'masked': masked_line[:100],
+            })
+
     def _detect_secrets(self) -> Dict:
         """检测硬编码的敏感信息"""
         result = {
-            'findings': [],
+            'findings': list(self._scan.secrets),
             'warnings': [],
         }
 
-        # 使用 hardcoded_secrets 规则
-        if 'hardcoded_secrets' not in DANGEROUS_PATTERNS:
-            return result
-
-        patterns = DANGEROUS_PATTERNS['hardcoded_secrets']['patterns']
-
-        for file_path in self.repo_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-            if any(exc in file_path.parts for exc in self.exclude_dirs):
-                continue
-            # 跳过某些文件类型
-            if file_path.suffix in {'.png', '.jpg', '.jpeg', '.gif', '.ico',
-                                    '.pdf', '.zip', '.tar', '.gz'}:
-                continue
-
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                lines = content.split('\n')
-                rel_path = str(file_path.relative_to(self.repo_path))
-
-                for pattern in patterns:
-                    try:
-                        regex = re.compile(pattern, re.IGNORECASE)
-                        for i, line in enumerate(lines, 1):
-                            match = regex.search(line)
-                            if match:
-                                # 脱敏处理
-                                masked_line = self._mask_secret(line, match.group())
-                                result['findings'].append({
-                                    'file': rel_path,
-                                    'line': i,
-                                    'type': 'potential_secret',
-                                    'masked': masked_line[:100],
-                                })
-                    except re.error:
-                        pass
-            except Exception:
-                pass
-
         if result['findings']:
             result['warnings'].append(
                 f"发现 {len(result['findings'])} 处可能的硬编码凭证"
@@ -950,6 +1122,31 @@ class SecurityAnalyzer:
             return line.replace(secret, masked)
         return line
 
+    def _scan_credential_exposure(self, entry: _ScannedFile):
+        """扫描单个脚本的凭据暴露面（每类按 (file, line) 去重）"""
+        for category, patterns in _CREDENTIAL_SETS.items():
+            config = CREDENTIAL_EXPOSURE[category]
+            seen = set()  # 按 (file, line, category) 去重
+            for pattern, i, line, _ in patterns.line_matches(entry):
+                stripped = line.strip()
+                # 跳过注释行与错误消息/失败回显行，降低误报
+                if stripped.startswith(_CRED_COMMENT_PREFIXES):
+                    continue
+                if _CRED_ERROR_LINE_RE.search(line):
+                    continue
+                if i in seen:
+                    continue
+                seen.add(i)
+                self._scan.credential[category].append(SecurityFinding(
+                    category=f'cred_exposure_{category}',
+                    severity=config['severity'],
+                    file=entry.rel_path,
+                    line=i,
+                    code=stripped[:100],
+                    message=config['message'],
+                    pattern=pattern,
+                ))
+
     def _detect_credential_exposure(self) -> Dict:
         """检测凭据暴露面（参考 NVIDIA SkillSpector）
 
@@ -958,54 +1155,10 @@ class SecurityAnalyzer:
         """
         result = {'findings': [], 'warnings': []}
 
-        code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.sh', '.bash', '.ps1'}
-        for category, config in CREDENTIAL_EXPOSURE.items():
-            for file_path in self.repo_path.rglob('*'):
-                if not file_path.is_file() or file_path.suffix not in code_extensions:
-                    continue
-                if any(exc in file_path.parts for exc in self.exclude_dirs):
-                    continue
-                try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    lines = content.split('\n')
-                    rel_path = str(file_path.relative_to(self.repo_path))
-                    seen = set()  # 按 (file, line, category) 去重
-                    for pattern in config['patterns']:
-                        try:
-                            regex = re.compile(pattern, re.IGNORECASE)
-                            for i, line in enumerate(lines, 1):
-                                stripped = line.strip()
-                                # 跳过注释行与错误消息/失败回显行，降低误报
-                                if stripped.startswith(('*', '#', '//', '/*', 'REM', '::')):
-                                    continue
-                                if re.search(r'\b(ERR|失败|未知原因|长度)\b', line):
-                                    continue
-                                if regex.search(line):
-                                    dup_key = (rel_path, i, category)
-                                    if dup_key in seen:
-                                        continue
-                                    seen.add(dup_key)
-                                    finding = SecurityFinding(
-                                        category=f'cred_exposure_{category}',
-                                        severity=config['severity'],
-                                        file=rel_path,
-                                        line=i,
-                                        code=line.strip()[:100],
-                                        message=config['message'],
-                                        pattern=pattern,
-                                    )
-                                    self.findings.append(finding)
-                                    result['findings'].append({
-                                        'file': rel_path,
-                                        'line': i,
-                                        'code': line.strip()[:100],
-                                        'severity': config['severity'],
-                                        'message': config['message'],
-                                    })
-                        except re.error:
-                            pass
-                except Exception:
-                    pass
+        for found in self._scan.credential.values():
+            for finding in found:
+                self.findings.append(finding)
+                result['findings'].append(self._finding_entry(finding))
 
         if result['findings']:
             result['warnings'].append(
@@ -1013,6 +1166,20 @@ class SecurityAnalyzer:
             )
         return result
 
+    def _scan_script_capabilities(self, entry: _ScannedFile):
+        """记录脚本体现的能力信号（写文件、外发请求、权限声明相关能力、重型凭据链路）"""
+        scan = self._scan
+        text = entry.text
+        if not scan.writes_files and entry.suffix in {'.py', '.js', '.sh', '.ps1'}:
+            scan.writes_files = _WRITES_FILES_RE.search(text) is not None
+        if not scan.sends_external and entry.suffix in {'.py', '.js'}:
+            scan.sends_external = _SENDS_EXTERNAL_RE.search(text) is not None
+        for cap, patterns in _CAPABILITY_SETS.items():
+            if cap not in scan.capabilities and patterns.search(entry):
+                scan.capabilities.add(cap)
+        scan.auto_install = scan.auto_install or _AUTO_INSTALL_RE.search(text) is not None
+        scan.py_fallback = scan.py_fallback or _PY_FALLBACK_RE.search(text) is not None
+
     def _detect_self_update_and_persistence(self) -> Dict:
         """检测自更新供应链风险与静默持久化/外传缺用户告知（参考 NVIDIA SkillSpector）
 
@@ -1025,24 +1192,15 @@ class SecurityAnalyzer:
         对检索类 skill 是必要能力，关键在是否向用户说清。
         """
         result = {'findings': [], 'warnings': []}
-        skill_md = self.repo_path / 'SKILL.md'
-        if not skill_md.exists():
-            return result
-        try:
-            skill_content = skill_md.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+        skill_content = self._scan.skill_md
+        if skill_content is None:
             return result
 
         # --- 1) 自更新 / 远程代码拉取检测（仅扫描 SKILL.md 当前能力声明，排除历史记录文档） ---
         # 自更新属历史叙述的 CHANGELOG/DECISIONS 不参与判定，避免"已移除"记录被误报。
         skill_only = skill_content
-        self_update_patterns = [
-            r'do-update', r'check-update', r'自更新', r'自动更新',
-            r'raw\.githubusercontent\.com', r'从 GitHub .*(下载|更新)',
-            r'下载.*MANIFEST.*替换', r'自动检测.*版本.*GitHub',
-        ]
-        for pat in self_update_patterns:
-            m = re.search(pat, skill_only, re.IGNORECASE)
+        for pat, regex in zip(SELF_UPDATE_PATTERNS, _SELF_UPDATE_RES):
+            m = regex.search(skill_only)
             if m:
                 # 上下文含"移除/删除/已废弃/不执行/禁止"等否定词则视为已清理或反向声明，不报
                 ctx_start = max(0, m.start() - 40)
@@ -1059,25 +1217,8 @@ class SecurityAnalyzer:
                 })
                 break  # 同一条问题不重复报
 
-        # --- 2) 静默持久化检测：扫描脚本是否自动写文件，且 SKILL.md 未明示"会写文件/可关闭" ---
-        writes_files = False
-        code_exts = {'.py', '.js', '.sh', '.ps1'}
-        for ext in code_exts:
-            for fp in self.repo_path.rglob(f'*{ext}'):
-                if any(exc in fp.parts for exc in self.exclude_dirs):
-                    continue
-                try:
-                    txt = fp.read_text(encoding='utf-8', errors='ignore')
-                    if re.search(r'write_text|open\([^)]*,\s*[\'"]w|Path\([^)]*\)\.write|'
-                                 r'\.dump\(|\.to_csv|os\.mkdir|Path\.mkdir', txt):
-                        writes_files = True
-                        break
-                except Exception:
-                    pass
-            if writes_files:
-                break
-
-        if writes_files:
+        # --- 2) 静默持久化检测：脚本是否自动写文件，且 SKILL.md 未明示"会写文件/可关闭" ---
+        if self._scan.writes_files:
             # SKILL.md 是否明示了"会写文件"且提供关闭方式
             disclosed = re.search(r'归档|落盘|写入|write|报告.*副本|--no-report|--no-cwd-report|'
                                   r'archive/', skill_content, re.IGNORECASE)
@@ -1101,23 +1242,7 @@ class SecurityAnalyzer:
                 })
 
         # --- 3) 外传敏感文本无隐私警示 ---
-        sends_external = False
-        for ext in {'.py', '.js'}:
-            for fp in self.repo_path.rglob(f'*{ext}'):
-                if any(exc in fp.parts for exc in self.exclude_dirs):
-                    continue
-                try:
-                    txt = fp.read_text(encoding='utf-8', errors='ignore')
-                    if re.search(r'requests\.(post|get)|api_post|api_get|fetch\(|'
-                                 r'urllib.*request|httpx\.(post|get)', txt, re.IGNORECASE):
-                        sends_external = True
-                        break
-                except Exception:
-                    pass
-            if sends_external:
-                break
-
-        if sends_external:
+        if self._scan.sends_external:
             priv_warn = re.search(r'脱敏|敏感|隐私|请勿.*分享|勿.*提交|保密|最小化|minim',
                                   skill_content, re.IGNORECASE)
             if not priv_warn:
@@ -1143,45 +1268,17 @@ class SecurityAnalyzer:
         """
         result = {'missing': [], 'warnings': []}
 
-        # 1) 扫描脚本中体现的能力信号
-        capability_signals = {
-            'local_code_execution': [r'\.sh\b', r'\.ps1\b', r'child_process',
-                                     r'subprocess', r'execFileSync', r'os\.system'],
-            'scheduled_task': [r'crontab', r'launchctl\s+load', r'LaunchAgents',
-                               r'ScheduledTask', r'schtasks'],
-            'env_var_read': [r'process\.env\[', r'os\.environ', r'\$\{\w+:', r'WB_CHECKIN_'],
-            'local_session_db': [r'state\.vscdb', r'ItemTable', r'globalStorage'],
-        }
-
-        skill_md = self.repo_path / 'SKILL.md'
-        if not skill_md.exists():
-            return result
-
-        try:
-            skill_content = skill_md.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+        skill_content = self._scan.skill_md
+        if skill_content is None:
             return result
 
-        # 收集所有脚本文件内容（用于判断 skill 是否真的用到这些能力）
-        script_text = ""
-        for ext in {'.py', '.js', '.sh', '.bash', '.ps1'}:
-            for fp in self.repo_path.rglob(f'*{ext}'):
-                if any(exc in fp.parts for exc in self.exclude_dirs):
-                    continue
-                try:
-                    script_text += fp.read_text(encoding='utf-8', errors='ignore') + "\n"
-                except Exception:
-                    pass
-
         # 能力是否在文档中声明：搜索权限/能力/所需/声明相关段落
         decl_keywords = ['权限', '所需权限', '能力声明', '声明', 'permission',
                          'requires', '需要', '访问', '本地执行', '定时']
         has_decl_section = any(k in skill_content for k in decl_keywords)
 
-        detected_caps = []
-        for cap, pats in capability_signals.items():
-            if any(re.search(p, script_text, re.IGNORECASE) for p in pats):
-                detected_caps.append(cap)
+        # 脚本中体现的能力信号（遍历时已逐文件收集）
+        detected_caps = [cap for cap in CAPABILITY_SIGNALS if cap in self._scan.capabilities]
 
         if detected_caps and not has_decl_section:
             result['missing'].append({
@@ -1203,12 +1300,8 @@ class SecurityAnalyzer:
         """
         result = {'findings': [], 'warnings': []}
 
-        skill_md = self.repo_path / 'SKILL.md'
-        if not skill_md.exists():
-            return result
-        try:
-            content = skill_md.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+        content = self._scan.skill_md
+        if content is None:
             return result
 
         description = self._extract_description(content).lower()
@@ -1216,19 +1309,9 @@ class SecurityAnalyzer:
         lightweight_signals = ['签到', 'check-in', 'checkin', '简单', 'simple',
                                '每日', 'daily', '积分', 'credits']
 
-        script_text = ""
-        for ext in {'.py', '.js', '.sh', '.bash', '.ps1'}:
-            for fp in self.repo_path.rglob(f'*{ext}'):
-                if any(exc in fp.parts for exc in self.exclude_dirs):
-                    continue
-                try:
-                    script_text += fp.read_text(encoding='utf-8', errors='ignore') + "\n"
-                except Exception:
-                    pass
-
         is_lightweight = any(s in description for s in lightweight_signals)
-        auto_install = bool(re.search(r'npm\s+install\s+electron', script_text, re.IGNORECASE))
-        py_fallback = bool(re.search(r'execFileSync\s*\(\s*["\']python3', script_text, re.IGNORECASE))
+        auto_install = self._scan.auto_install
+        py_fallback = self._scan.py_fallback
 
         if is_lightweight and (auto_install or py_fallback):
             reasons = []
@@ -1254,29 +1337,17 @@ class SecurityAnalyzer:
         检测提示注入、数据收集指令、执行指令等恶意模式
         """
         result = {
-            'files_analyzed': 0,
+            'files_analyzed': self._scan.prompt_files,
             'findings': [],
             'warnings': [],
             'categories_found': set(),
         }
 
-        # 获取所有 Markdown 文件
-        md_files = list(self.repo_path.rglob('*.md'))
-        # 过滤排除目录
-        md_files = [f for f in md_files
-                    if not any(exc in f.parts for exc in self.exclude_dirs)]
-
-        for file_path in md_files:
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                rel_path = str(file_path.relative_to(self.repo_path))
-                result['files_analyzed'] += 1
-
-                # 对每个文件应用提示词安全检测规则
-                self._scan_prompt_content(content, rel_path, result)
-
-            except Exception:
-                pass
+        for finding, security_finding in self._scan.prompt:
+            result['findings'].append(finding)
+            result['categories_found'].add(finding['category'])
+            # 同时添加到全局 findings 列表
+            self.findings.append(security_finding)
 
         # 转换 set 为 list 以便 JSON 序列化
         result['categories_found'] = list(result['categories_found'])
@@ -1289,44 +1360,30 @@ class SecurityAnalyzer:
 
         return result
 
-    def _scan_prompt_content(self, content: str, file_path: str, result: Dict):
+    def _scan_prompt_content(self, entry: _ScannedFile):
         """扫描 Markdown 内容中的提示词安全风险"""
-        lines = content.split('\n')
-
-        for category, config in PROMPT_SECURITY_PATTERNS.items():
-            for pattern in config['patterns']:
-                try:
-                    regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-                    for i, line in enumerate(lines, 1):
-                        match = regex.search(line)
-                        if match:
-                            # 记录发现
-                            finding = {
-                                'file': file_path,
-                                'line': i,
-                                'category': category,
-                                'severity': config['severity'],
-                                'message': config['message'],
-                                'matched_text': match.group()[:50],  # 限制长度
-                                'code': line.strip()[:100],
-                            }
-                            result['findings'].append(finding)
-                            result['categories_found'].add(category)
-
-                            # 同时添加到全局 findings 列表
-                            security_finding = SecurityFinding(
-                                category=f'prompt_{category}',
-                                severity=config['severity'],
-                                file=file_path,
-                                line=i,
-                                code=line.strip()[:100],
-                                message=f"[提示词安全] {config['message']}",
-                                pattern=pattern,
-                            )
-                            self.findings.append(security_finding)
-
-                except re.error:
-                    pass
+        for category, patterns in _PROMPT_SETS.items():
+            config = PROMPT_SECURITY_PATTERNS[category]
+            for pattern, i, line, match in patterns.line_matches(entry):
+                finding = {
+                    'file': entry.rel_path,
+                    'line': i,
+                    'category': category,
+                    'severity': config['severity'],
+                    'message': config['message'],
+                    'matched_text': match.group()[:50],  # 限制长度
+                    'code': line.strip()[:100],
+                }
+                security_finding = SecurityFinding(
+                    category=f'prompt_{category}',
+                    severity=config['severity'],
+                    file=entry.rel_path,
+                    line=i,
+                    code=line.strip()[:100],
+                    message=f"[提示词安全] {config['message']}",
+                    pattern=pattern,
+                )
+                self._scan.prompt.append((finding, security_finding))
 
     def _calculate_risk_summary(self) -> Dict:
         """计算风险汇总"""
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""元典开放平台 HTTP 客户端：连接复用 + 429/5xx 退避重试。
+
+每个线程持有一条到 API 主机的 keep-alive 连接（http.client），同一进程内的连续调用
+与 batch 并发调用都不再为每次请求重新做 TCP/TLS 握手。连接被服务端关闭时自动重连。
+
+检索接口按次计费且不幂等：网络错误只在请求发出前（建连/发送失败）重试；请求已发出后
+（如读超时）不再重发，以免重复计费，只有服务端明确返回 429/5xx 时才退避重试。
+
+只依赖标准库；遵循 HTTPS_PROXY / NO_PROXY（经 CONNECT 隧道），与 urlopen 行为一致。
+"""
+
+import http.client
+import json
+import random
+import ssl
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# keep-alive 连接可能在空闲期间被服务端关闭：复用时发送失败，或发出后未收到任何响应字节
+# 即断开（RemoteDisconnected）。服务端并未处理该请求，重连后重发一次即可
+
+
+class _NotSentError(Exception):
+    """请求未能发出（建连或发送失败），可安全重试"""
+
+
+class ApiError(Exception):
+    """API 请求最终失败（重试耗尽或不可重试的错误）。status 为 HTTP 状态码，网络错误时为 None"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def _retry_after_seconds(value):
+    """解析 Retry-After（秒数或 HTTP 日期），无法解析返回 None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ApiClient:
+    """线程安全的 keep-alive JSON 客户端（每线程一条连接）"""
+
+    def __init__(self, base_url, timeout=60, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+
+    def _new_connection(self):
+        proxy = None
+        if not proxy_bypass(self.host):
+            proxy = getproxies().get(self.scheme)
+        if self.scheme == "https":
+            if proxy:
+                proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+                conn = http.client.HTTPSConnection(
+                    proxy_parts.hostname, proxy_parts.port or 8080,
+                    timeout=self.timeout, context=self._ssl_context)
+                conn.set_tunnel(self.host, self.port or 443)
+            else:
+                conn = http.client.HTTPSConnection(
+                    self.host, self.port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._new_connection()
+        return conn
+
+    def _reset_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _send_once(self, method, path, body, headers):
+        """发送一次请求；复用的连接已失效时重连并重发一次。返回 (status, reason, headers, data)
+
+        建连/发送失败抛 _NotSentError；请求发出后的网络错误原样抛出（调用方不重试）。
+        """
+        for attempt in range(2):
+            reused = getattr(self._local, "conn", None) is not None
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+            except (OSError, http.client.HTTPException) as e:
+                self._reset_connection()
+                if reused and attempt == 0:
+                    continue
+                raise _NotSentError(e) from e
+            try:
+                resp = conn.getresponse()
+                data = resp.read()
+            except http.client.RemoteDisconnected:
+                self._reset_connection()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                self._reset_connection()
+                raise
+            if resp.will_close:
+                self._reset_connection()
+            return resp.status, resp.reason, resp.headers, data
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = self.backoff_base * (2 ** attempt)
+            delay += random.uniform(0, delay / 2)
+        time.sleep(min(delay, self.backoff_max))
+
+    def request(self, method, path, body=None, headers=None):
+        """发送请求并解析 JSON 响应；429/5xx 与请求发出前的网络错误按指数退避重试，最终失败抛 ApiError"""
+        payload = None
+        if body is not None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        headers = dict(headers or {})
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, reason, resp_headers, data = self._send_once(method, path, payload, headers)
+            except _NotSentError as e:
+                last_error = ApiError(f"网络错误: {e}")
+                if attempt < self.max_retries:
+                    self._backoff(attempt)
+                    continue
+                raise last_error from e.__cause__
+            except (OSError, http.client.HTTPException) as e:
+                raise ApiError(f"网络错误（请求已发出，为避免重复计费不重试）: {e}") from e
+
+            if status in RETRY_STATUS and attempt < self.max_retries:
+                self._backoff(attempt, _retry_after_seconds(resp_headers.get("Retry-After")))
+                continue
+            if status >= 400:
+                raise ApiError(f"HTTP 错误 {status}: {reason}", status=status)
+            try:
+                return json.loads(data.decode("utf-8"))
+            except ValueError as e:
+                raise ApiError(f"响应不是合法 JSON: {e}", status=status) from e
+        raise last_error
+
+    def close(self):
+        """关闭所有线程创建过的连接"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
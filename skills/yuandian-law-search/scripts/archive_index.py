@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""archive/ 检索归档的 SQLite 索引。
+
+归档 JSON 仍是唯一事实来源；索引记录 指纹 → 归档路径 的映射与列表所需元数据
+（时间、端点、project、查询文本、状态、来源 URL 数），并对查询文本和同名 .md 报告正文建全文索引，
+随 `_archive_save` / `ingest` / 报告落盘增量写入，可随时删除后由 `archive-reindex` 从 JSON 全量重建。
+
+增量同步：索引记录每个已知目录的 mtime。查询前只 stat 这些目录，
+mtime 变化的目录才重新列举（手工拷入 / 删除的归档也能被发现），不再逐个解析全部 JSON。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+INDEX_DIRNAME = ".index"
+INDEX_FILENAME = "archive.sqlite"
+SCHEMA_VERSION = 2
+SKIP_FILES = {"version_check.json"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER);
+CREATE TABLE IF NOT EXISTS records (
+    path TEXT PRIMARY KEY,
+    name TEXT,
+    project TEXT,
+    fingerprint TEXT,
+    endpoint TEXT,
+    timestamp TEXT,
+    query_text TEXT,
+    status TEXT,
+    source_url_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_records_fingerprint ON records (fingerprint, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_name ON records (name);
+CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records (timestamp);
+CREATE TABLE IF NOT EXISTS record_text (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    query_text TEXT,
+    report_text TEXT
+);
+"""
+
+# trigram 分词支持中文子串匹配（≥3 字）；短于 3 字的关键词回退为 record_text 顺序扫描
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS record_fts USING fts5(
+    query_text, report_text, content='record_text', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS record_text_ai AFTER INSERT ON record_text BEGIN
+    INSERT INTO record_fts (rowid, query_text, report_text) VALUES (new.id, new.query_text, new.report_text);
+END;
+CREATE TRIGGER IF NOT EXISTS record_text_ad AFTER DELETE ON record_text BEGIN
+    INSERT INTO record_fts (record_fts, rowid, query_text, report_text)
+    VALUES ('delete', old.id, old.query_text, old.report_text);
+END;
+CREATE TRIGGER IF NOT EXISTS record_text_au AFTER UPDATE ON record_text BEGIN
+    INSERT INTO record_fts (record_fts, rowid, query_text, report_text)
+    VALUES ('delete', old.id, old.query_text, old.report_text);
+    INSERT INTO record_fts (rowid, query_text, report_text) VALUES (new.id, new.query_text, new.report_text);
+END;
+"""
+
+_ENTRY_COLUMNS = ("path", "name", "project", "endpoint", "timestamp", "query_text", "status", "source_url_count")
+
+
+class ArchiveIndex:
+    """归档指纹索引（线程安全；路径统一存为相对 archive 根的 POSIX 路径）"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = Path(archive_dir)
+        # 索引放在隐藏子目录：SQLite 日志文件的创建/删除不会改动 archive 根目录 mtime
+        self.db_path = self.archive_dir / INDEX_DIRNAME / INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._conn = None
+        self._synced = False
+        self.has_fts = False
+
+    # ── 连接与结构 ──
+
+    def _connect(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.executescript("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                # 结构升级：索引可从 JSON 重建，直接丢弃旧表
+                for (table,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'meta' "
+                    "AND name NOT LIKE 'record_fts_%'"
+                ).fetchall():
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite 未编译 FTS5 / trigram（< 3.34）：全文检索回退为顺序扫描
+                self.has_fts = False
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _rel(self, path):
+        return Path(path).resolve().relative_to(self.archive_dir.resolve()).as_posix()
+
+    # ── 写入 ──
+
+    def _upsert(self, conn, rel, record, report_text=None):
+        query = record.get("query", {})
+        response = record.get("response")
+        status = response.get("status", "") if isinstance(response, dict) else ""
+        query_text = json.dumps(query, ensure_ascii=False)
+        if report_text is None:
+            report_text = _read_text((self.archive_dir / rel).with_suffix(".md"))
+        conn.execute(
+            "INSERT OR REPLACE INTO records (path, name, project, fingerprint, endpoint, timestamp, "
+            "query_text, status, source_url_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                rel, rel.rsplit("/", 1)[-1], rel.rsplit("/", 1)[0] if "/" in rel else "",
+                record.get("fingerprint", ""), record.get("endpoint", ""), record.get("timestamp", ""),
+                query_text, str(status), len(record.get("source_urls") or []),
+            ),
+        )
+        conn.execute("DELETE FROM record_text WHERE path = ?", (rel,))
+        conn.execute(
+            "INSERT INTO record_text (path, query_text, report_text) VALUES (?, ?, ?)",
+            (rel, query_text, report_text),
+        )
+
+    def _delete(self, conn, rel):
+        conn.execute("DELETE FROM records WHERE path = ?", (rel,))
+        conn.execute("DELETE FROM record_text WHERE path = ?", (rel,))
+
+    def add(self, path, record):
+        """登记一条刚写入的归档记录，并刷新其所在目录的 mtime"""
+        self.sync()
+        with self._lock:
+            conn = self._connect()
+            path = Path(path)
+            self._upsert(conn, self._rel(path), record)
+            self._mark_dir(conn, path.parent)
+            conn.commit()
+
+    def _mark_dir(self, conn, directory):
+        directory = Path(directory)
+        while True:
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                return
+            rel = "." if directory.resolve() == self.archive_dir.resolve() else self._rel(directory)
+            known = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (rel,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (rel, mtime_ns))
+            # 新建的项目子目录会改变上级目录 mtime，上级目录也需同步登记
+            if rel == "." or known is not None:
+                return
+            directory = directory.parent
+
+    # ── 同步 ──
+
+    def _scan_dir(self, conn, directory):
+        """重新列举单个目录：登记新增 JSON、移除已删除的 JSON，返回子目录列表"""
+        rel_dir = "." if directory == self.archive_dir else self._rel(directory)
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        on_disk = set()
+        subdirs = []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return subdirs
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(Path(entry.path))
+            elif entry.name.endswith(".json") and entry.name not in SKIP_FILES:
+                on_disk.add(prefix + entry.name)
+
+        known = {
+            row[0] for row in conn.execute(
+                "SELECT path FROM records WHERE path LIKE ? ESCAPE '\\' AND path NOT LIKE ? ESCAPE '\\'",
+                (_like_prefix(prefix) + "%", _like_prefix(prefix) + "%/%"),
+            )
+        }
+        for rel in known - on_disk:
+            self._delete(conn, rel)
+        for rel in on_disk - known:
+            record = _read_record(self.archive_dir / rel)
+            if record is not None:
+                self._upsert(conn, rel, record)
+        conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)",
+            (rel_dir, directory.stat().st_mtime_ns),
+        )
+        return subdirs
+
+    def sync(self, force=False):
+        """按目录 mtime 增量同步索引；force=True 时清空后全量重建"""
+        with self._lock:
+            if self._synced and not force:
+                return
+            if not self.archive_dir.exists():
+                return
+            conn = self._connect()
+            if force:
+                conn.executescript("DELETE FROM dirs; DELETE FROM records; DELETE FROM record_text;")
+            known_dirs = dict(conn.execute("SELECT path, mtime_ns FROM dirs"))
+            pending = [self.archive_dir]
+            seen = set()
+            while pending:
+                directory = pending.pop()
+                rel = "." if directory == self.archive_dir else self._rel(directory)
+                seen.add(rel)
+                try:
+                    mtime_ns = directory.stat().st_mtime_ns
+                except OSError:
+                    continue
+                if known_dirs.get(rel) == mtime_ns:
+                    # 目录本身未变：子目录集合不变，但子目录内容可能变化，继续检查已知子目录
+                    child_prefix = "" if rel == "." else rel + "/"
+                    pending.extend(
+                        self.archive_dir / d for d in known_dirs
+                        if d != "." and d.startswith(child_prefix) and "/" not in d[len(child_prefix):]
+                    )
+                    continue
+                pending.extend(self._scan_dir(conn, directory))
+            for rel in set(known_dirs) - seen:
+                conn.execute("DELETE FROM dirs WHERE path = ?", (rel,))
+                for (path,) in conn.execute(
+                    "SELECT path FROM records WHERE path LIKE ? ESCAPE '\\'", (_like_prefix(rel + "/") + "%",)
+                ).fetchall():
+                    self._delete(conn, path)
+            conn.commit()
+            self._synced = True
+
+    # ── 查询 ──
+
+    def lookup(self, fingerprint, max_age_days=None):
+        """按指纹返回最新归档 (record, path)；未命中或均已过期返回 (None, None)"""
+        self.sync()
+        with self._lock:
+            conn = self._connect()
+            sql = "SELECT path FROM records WHERE fingerprint = ?"
+            params = [fingerprint]
+            if max_age_days is not None:
+                cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+                sql += " AND timestamp >= ?"
+                params.append(cutoff)
+            rows = conn.execute(sql + " ORDER BY timestamp DESC, path DESC", params).fetchall()
+        for (rel,) in rows:
+            path = self.archive_dir / rel
+            record = _read_record(path)
+            if record is not None and record.get("fingerprint") == fingerprint:
+                return record, path
+            # 归档已被删除或改写：移除陈旧索引项
+            with self._lock:
+                self._delete(self._connect(), rel)
+                self._conn.commit()
+        return None, None
+
+    def set_report(self, path, report_text):
+        """登记归档对应 .md 报告的正文，供全文检索"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE record_text SET report_text = ? WHERE path = ?", (report_text, self._rel(path)))
+            conn.commit()
+
+    def entries(self, keyword=None, full_text=False, limit=None):
+        """按时间倒序返回归档元数据（dict 列表）。
+
+        keyword 默认匹配查询内容与端点；full_text=True 时同时检索 .md 报告正文。
+        """
+        self.sync()
+        sql = f"SELECT {', '.join(_ENTRY_COLUMNS)} FROM records"
+        params = []
+        if keyword:
+            keyword = keyword.lower()
+            conditions = ["instr(lower(endpoint), ?) > 0"]
+            params.append(keyword)
+            text_sql, text_params = self._text_match(keyword, full_text)
+            conditions.append(f"path IN ({text_sql})")
+            params.extend(text_params)
+            sql += " WHERE " + " OR ".join(conditions)
+        sql += " ORDER BY timestamp DESC, path DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [dict(zip(_ENTRY_COLUMNS, row)) for row in rows]
+
+    def _text_match(self, keyword, full_text):
+        """返回 (子查询 SQL, 参数)：≥3 字走 FTS5 trigram 索引，否则顺序扫描 record_text"""
+        if self.has_fts and len(keyword) >= 3:
+            column = "" if full_text else "query_text : "
+            sql = (
+                "SELECT t.path FROM record_text t JOIN record_fts f ON f.rowid = t.id "
+                "WHERE record_fts MATCH ?"
+            )
+            return sql, [column + '"' + keyword.replace('"', '""') + '"']
+        sql = "SELECT path FROM record_text WHERE instr(lower(query_text), ?) > 0"
+        if full_text:
+            return sql + " OR instr(lower(report_text), ?) > 0", [keyword, keyword]
+        return sql, [keyword]
+
+    def find_by_name(self, name, project=None):
+        """按归档文件名（不含目录）返回元数据，未找到返回 None
+
+        指定 project 时优先取该 project 下最新一条；该 project 下没有时，仅当其他 project
+        中恰好只有一条同名归档才返回它，同名冲突时返回 None，不串用别的 project 的记录。
+        """
+        self.sync()
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {', '.join(_ENTRY_COLUMNS)} FROM records WHERE name = ? "
+                "ORDER BY timestamp DESC, path DESC",
+                (name,),
+            ).fetchall()
+        entries = [dict(zip(_ENTRY_COLUMNS, row)) for row in rows]
+        if project is None:
+            return entries[0] if entries else None
+        own = [e for e in entries if e["project"] == project]
+        if own:
+            return own[0]
+        return entries[0] if len(entries) == 1 else None
+
+    def get(self, path):
+        """按归档文件路径返回其元数据；不在 archive 下或未索引返回 None"""
+        try:
+            rel = self._rel(path)
+        except ValueError:
+            return None
+        self.sync()
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {', '.join(_ENTRY_COLUMNS)} FROM records WHERE path = ?", (rel,)
+            ).fetchone()
+        return dict(zip(_ENTRY_COLUMNS, row)) if row else None
+
+    def paths_without_sources(self, endpoints):
+        """返回指定端点中尚无 source_urls 的归档路径（供 backfill-urls 增量回填）"""
+        self.sync()
+        endpoints = list(endpoints)
+        if not endpoints:
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT path FROM records WHERE source_url_count = 0 "
+                f"AND endpoint IN ({', '.join('?' * len(endpoints))}) ORDER BY path",
+                endpoints,
+            ).fetchall()
+        return [self.archive_dir / row[0] for row in rows]
+
+    def count(self):
+        self.sync()
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+
+def _like_prefix(prefix):
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _read_text(path):
+    try:
+        return Path(path).read_text("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _read_record(path):
+    try:
+        record = json.loads(Path(path).read_text("utf-8"))
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+    return record if isinstance(record, dict) else None
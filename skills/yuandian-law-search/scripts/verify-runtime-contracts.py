@@ -5,7 +5,13 @@
 import contextlib
 import io
 import json
+import os
 import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 
 import query_filter_validator as validator
 import yd_search
@@ -77,6 +83,138 @@ def _capture_case_payloads():
     return calls
 
 
+def _check_archive_index():
+    """临时 archive 下验证归档索引：命中、列表/全文检索、按端点过期、手工拷入发现、删除后失效"""
+    original_dir = yd_search.ARCHIVE_DIR
+    original_project = yd_search._resolve_project
+    with tempfile.TemporaryDirectory() as temp:
+        yd_search.ARCHIVE_DIR = Path(temp) / "archive"
+        yd_search._resolve_project = lambda: "verify"
+        try:
+            body = {"query": "违约金调整"}
+            saved = yd_search._archive_save("/open/law_vector_search", body, {"extra": {"fatiao": []}})
+            response, path = yd_search._archive_lookup("/open/law_vector_search", body)
+            _require(response == {"extra": {"fatiao": []}} and path == saved, "索引未命中刚归档的查询")
+
+            yd_search._archive_write_report(saved, "违约金酌减规则：以实际损失为基础", "10 积分", no_cwd_report=True)
+            index = yd_search._get_archive_index()
+            _require(len(index.entries(keyword="违约金调整")) == 1, "archive-list 未按查询内容命中")
+            _require(not index.entries(keyword="酌减规则"), "未开启 --full-text 时误检索报告正文")
+            _require(len(index.entries(keyword="酌减规则", full_text=True)) == 1, "全文检索未命中报告正文")
+            _require(len(index.entries(keyword="酌减", full_text=True)) == 1, "短关键词全文检索未命中")
+            _require(index.find_by_name(Path(saved).name)["endpoint"] == "/open/law_vector_search", "按文件名定位归档失败")
+            other_dir = yd_search.ARCHIVE_DIR / "other"
+            other_dir.mkdir()
+            other = dict(json.loads(Path(saved).read_text("utf-8")), endpoint="/open/rh_ft_search",
+                         timestamp=(datetime.now() + timedelta(minutes=1)).isoformat(timespec="seconds"))
+            (other_dir / Path(saved).name).write_text(json.dumps(other, ensure_ascii=False), "utf-8")
+            yd_search._archive_index = None
+            index = yd_search._get_archive_index()
+            _require(index.find_by_name(Path(saved).name, project="verify")["project"] == "verify",
+                     "同名归档串用了其他 project 的记录")
+            _require(index.find_by_name(Path(saved).name, project="third") is None, "同名冲突时未拒绝猜测")
+            _require(index.get(saved)["endpoint"] == "/open/law_vector_search", "按路径定位归档失败")
+            (other_dir / Path(saved).name).unlink()
+            yd_search._archive_index = None
+
+            old = json.loads(Path(saved).read_text("utf-8"))
+            old["timestamp"] = (datetime.now() - timedelta(days=400)).isoformat(timespec="seconds")
+            Path(saved).write_text(json.dumps(old, ensure_ascii=False), "utf-8")
+            yd_search._archive_index = None
+            yd_search._get_archive_index().sync(force=True)
+            _require(yd_search._archive_lookup("/open/law_vector_search", body) == (None, None), "过期法条检索仍命中缓存")
+
+            copied_dir = yd_search.ARCHIVE_DIR / "copied"
+            copied_dir.mkdir()
+            copied = dict(old, timestamp=datetime.now().isoformat(timespec="seconds"))
+            (copied_dir / "20260101_000000_违约金调整.json").write_text(json.dumps(copied, ensure_ascii=False), "utf-8")
+            yd_search._archive_index = None
+            _require(yd_search._archive_lookup("/open/law_vector_search", body)[0] is not None, "手工拷入的归档未被增量发现")
+
+            (copied_dir / "20260101_000000_违约金调整.json").unlink()
+            yd_search._archive_index = None
+            _require(yd_search._archive_lookup("/open/law_vector_search", body) == (None, None), "已删除的归档仍命中缓存")
+        finally:
+            yd_search.ARCHIVE_DIR = original_dir
+            yd_search._resolve_project = original_project
+            yd_search._archive_index = None
+
+
+class _FakeApiHandler(BaseHTTPRequestHandler):
+    """本地假 API：记录连接与请求，按 flaky 次数先返回 503 再成功"""
+
+    protocol_version = "HTTP/1.1"
+    state = {}
+
+    def do_GET(self):
+        state = self.state
+        with state["lock"]:
+            state["connections"].add(self.client_address)
+            state["paths"].append(self.path)
+            flaky = state["flaky"] > 0
+            if flaky:
+                state["flaky"] -= 1
+        if flaky:
+            body = b"{}"
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+        else:
+            body = json.dumps({"data": {"lst": [], "total": 0}}).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _check_batch_client():
+    """本地假 API 上验证：连接复用、503 重试、batch 按企业全部分项并发归档"""
+    state = {"lock": threading.Lock(), "connections": set(), "paths": [], "flaky": 1}
+    _FakeApiHandler.state = state
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    original = (yd_search.BASE_URL, yd_search.ARCHIVE_DIR, yd_search._resolve_project)
+    original_key = os.environ.get("YD_API_KEY")
+    with tempfile.TemporaryDirectory() as temp:
+        yd_search.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+        yd_search.ARCHIVE_DIR = Path(temp) / "archive"
+        yd_search._resolve_project = lambda: "verify"
+        yd_search._http_client = None
+        yd_search._archive_index = None
+        os.environ["YD_API_KEY"] = "test-placeholder"
+        try:
+            client = yd_search._get_http_client()
+            client.backoff_base = 0
+            for _ in range(3):
+                yd_search.api_get("/open/rh_enterprise_base", {"uscc": "X"}, use_cache=False)
+            _require(len(state["paths"]) == 4, "503 未重试或请求数异常")
+            _require(len(state["connections"]) == 1, "连续请求未复用 keep-alive 连接")
+
+            parser = yd_search.build_parser()
+            args = parser.parse_args(["--no-cwd-report", "batch", "--uscc", "X", "--jobs", "4"])
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                yd_search._get_http_client().backoff_base = 0
+                args.func(args)
+            archived = list((yd_search.ARCHIVE_DIR / "verify").glob("*.json"))
+            _require(len(archived) == len(yd_search.ENTERPRISE_LIST_TYPES), "batch 未逐个归档全部企业分项")
+            _require(len(state["connections"]) <= 1 + 4, "batch 连接数超过并发上限")
+        finally:
+            yd_search.BASE_URL, yd_search.ARCHIVE_DIR, yd_search._resolve_project = original
+            yd_search._http_client = None
+            yd_search._archive_index = None
+            if original_key is None:
+                os.environ.pop("YD_API_KEY", None)
+            else:
+                os.environ["YD_API_KEY"] = original_key
+            server.shutdown()
+            server.server_close()
+
+
 def main():
     checks = []
     try:
@@ -126,6 +264,12 @@ def main():
         wrong_type = {"interface": "case", "filters": "--ay 商业秘密纠纷"}
         _require(validator.validate_queries([wrong_type], "wrong-type"), "错误 filters 类型未被阻断")
         checks.append("invalid-filter-type")
+
+        _check_archive_index()
+        checks.append("archive-fingerprint-index")
+
+        _check_batch_client()
+        checks.append("pooled-client-batch")
     except Exception as exc:
         print(json.dumps({"status": "FAIL", "error": str(exc), "checks": checks}, ensure_ascii=False))
         return 1
@@ -3,23 +3,49 @@
 
 import argparse
 import hashlib
+import io
 import json
 import os
 import re
+import shlex
 import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 
+from api_client import ApiClient, ApiError
+from archive_index import INDEX_DIRNAME, ArchiveIndex
+
 BASE_URL = "https://open.chineselaw.com"
 TIMEOUT = 60
 COST_PER_CALL = "本次调用消耗 10 积分"
 SKILL_ROOT = Path(__file__).parent.parent
 ARCHIVE_DIR = SKILL_ROOT / "archive"
 
+# 归档缓存有效期（天）：超期的归档仍保留在 archive/，但不再作为缓存命中，触发重新请求。
+# 未列出的端点（如案例详情、幻觉检测）沿用永久缓存。
+CACHE_TTL_DAYS = {
+    "/open/law_vector_search": 30,
+    "/open/rh_ft_search": 30,
+    "/open/rh_ft_detail": 30,
+    "/open/rh_fg_search": 30,
+    "/open/rh_fg_detail": 30,
+    "/open/case_vector_search": 90,
+    "/open/rh_ptal_search": 90,
+    "/open/rh_qwal_search": 90,
+}
+ENTERPRISE_CACHE_TTL_DAYS = 7
+
+_archive_index = None
+_archive_index_lock = threading.Lock()
+_archive_name_lock = threading.Lock()
+_http_client_lock = threading.Lock()
+_http_client = None
+BATCH_DEFAULT_JOBS = 4
+
 
 def load_api_key():
     """从环境变量或 .env 文件加载 API Key"""
@@ -93,21 +119,37 @@ def _make_archive_name(endpoint, payload):
     return f"{ts}_{summary}.json"
 
 
+def _get_archive_index():
+    """返回进程级归档指纹索引（archive/.index/archive.sqlite）"""
+    global _archive_index
+    with _archive_index_lock:
+        if _archive_index is None or _archive_index.archive_dir != ARCHIVE_DIR:
+            _archive_index = ArchiveIndex(ARCHIVE_DIR)
+        return _archive_index
+
+
+def _cache_ttl_days(endpoint):
+    """返回端点的缓存有效期（天），None 表示永久有效"""
+    if endpoint in CACHE_TTL_DAYS:
+        return CACHE_TTL_DAYS[endpoint]
+    if endpoint.startswith(("/open/rh_enterprise", "/open/rh_company")):
+        return ENTERPRISE_CACHE_TTL_DAYS
+    return None
+
+
 def _archive_lookup(endpoint, payload):
-    """在归档中查找相同查询，命中返回 (response, archive_path)，未命中返回 (None, None)"""
+    """在归档中查找相同查询，命中返回 (response, archive_path)，未命中返回 (None, None)
+
+    经指纹索引 O(1) 定位，只读取命中的那一份归档；超过端点有效期的归档不作为命中。
+    """
     if not ARCHIVE_DIR.exists():
         return None, None
 
     fingerprint = _query_fingerprint(endpoint, payload)
-    # 按时间倒序遍历，优先命中最新归档
-    for path in sorted(ARCHIVE_DIR.rglob("*.json"), reverse=True):
-        try:
-            record = json.loads(path.read_text("utf-8"))
-            if record.get("fingerprint") == fingerprint:
-                return record.get("response"), str(path)
-        except (json.JSONDecodeError, KeyError):
-            continue
-    return None, None
+    record, path = _get_archive_index().lookup(fingerprint, max_age_days=_cache_ttl_days(endpoint))
+    if record is None:
+        return None, None
+    return record.get("response"), str(path)
 
 
 YD_BASE = "https://ydzk.chineselaw.com"
@@ -122,116 +164,142 @@ def _normalize_url(raw):
     return f"{YD_BASE}{raw}"
 
 
-def _enrich_source_urls(endpoint, response):
-    """从 API 响应中提取/构造来源 URL 列表"""
-    urls = []
-    if not isinstance(response, dict):
-        return urls
+def _source_urls_law_vector_search(response, urls):
+    """法条语义检索 law_vector_search"""
+    for item in _iter_items(response, "extra.fatiao"):
+        fgid = item.get("fgid", "")
+        num = item.get("num", "")
+        title = item.get("fgtitle", "")
+        if fgid:
+            url = f"{YD_BASE}/zxt/statuteDetail/detailPage/{fgid}"
+            if num:
+                tid = num.replace("第", "").replace("条", "")
+                url += f"?text={tid}"
+            urls.append({"title": f"{title} {num}", "type": "法条", "url": url})
+
 
-    # ── 法条语义检索 law_vector_search ──
-    if endpoint == "/open/law_vector_search":
-        for item in _iter_items(response, "extra.fatiao"):
+def _source_urls_rh_ft_detail(response, urls):
+    """法条详情 rh_ft_detail"""
+    data = response.get("data")
+    if isinstance(data, dict):
+        raw = data.get("url", "")
+        url = _normalize_url(raw)
+        if url:
+            urls.append({"title": data.get("title", ""), "type": "法条", "url": url})
+
+
+def _source_urls_rh_ft_search(response, urls):
+    """法条关键词检索 rh_ft_search"""
+    for item in _iter_items(response, "data"):
+        raw = item.get("url", "")
+        url = _normalize_url(raw)
+        if not url:
             fgid = item.get("fgid", "")
-            num = item.get("num", "")
-            title = item.get("fgtitle", "")
             if fgid:
+                tid = item.get("tid", "")
                 url = f"{YD_BASE}/zxt/statuteDetail/detailPage/{fgid}"
-                if num:
-                    tid = num.replace("第", "").replace("条", "")
+                if tid:
                     url += f"?text={tid}"
-                urls.append({"title": f"{title} {num}", "type": "法条", "url": url})
-
-    # ── 法条详情 rh_ft_detail ──
-    elif endpoint == "/open/rh_ft_detail":
-        data = response.get("data")
-        if isinstance(data, dict):
-            raw = data.get("url", "")
-            url = _normalize_url(raw)
-            if url:
-                urls.append({"title": data.get("title", ""), "type": "法条", "url": url})
-
-    # ── 法条关键词检索 rh_ft_search ──
-    elif endpoint == "/open/rh_ft_search":
-        for item in _iter_items(response, "data"):
-            raw = item.get("url", "")
-            url = _normalize_url(raw)
-            if not url:
-                fgid = item.get("fgid", "")
-                if fgid:
-                    tid = item.get("tid", "")
-                    url = f"{YD_BASE}/zxt/statuteDetail/detailPage/{fgid}"
-                    if tid:
-                        url += f"?text={tid}"
-            if url:
-                urls.append({"title": item.get("title", item.get("ftmc", "")), "type": "法条", "url": url})
-
-    # ── 法规详情 rh_fg_detail ──
-    elif endpoint == "/open/rh_fg_detail":
-        data = response.get("data")
-        if isinstance(data, dict):
-            raw = data.get("url", "")
-            url = _normalize_url(raw)
-            fgid = data.get("id") or data.get("fgid", "")
-            if not url and fgid:
-                url = f"{YD_BASE}/zxt/statuteDetail/detailPage/{fgid}"
-            if url:
-                urls.append({"title": data.get("title", data.get("fgmc", "")), "type": "法规", "url": url})
-
-    # ── 案例语义检索 case_vector_search ──
-    elif endpoint == "/open/case_vector_search":
-        for item in _iter_items(response, "extra.wenshu"):
-            scid = item.get("scid", "")
-            if scid:
-                urls.append({
-                    "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
-                    "type": "案例",
-                    "url": f"{YD_BASE}/ydzk/caseDetail/case/{scid}",
-                })
-
-    # ── 案例关键词检索 rh_ptal_search ──
-    elif endpoint == "/open/rh_ptal_search":
-        for item in _iter_items(response, "data.lst"):
-            raw = item.get("url", "")
-            url = _normalize_url(raw)
-            cid = item.get("id", "")
-            if not url and cid:
-                url = f"{YD_BASE}/ydzk/caseDetail/case/{cid}"
-            if url:
-                urls.append({
-                    "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
-                    "type": "案例",
-                    "url": url,
-                })
-
-    # ── 案例详情 rh_case_details ──
-    elif endpoint == "/open/rh_case_details":
-        for item in _iter_items(response, "data"):
-            raw = item.get("url", "")
-            url = _normalize_url(raw)
-            if url:
-                urls.append({
-                    "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
-                    "type": "案例",
-                    "url": url,
-                })
-
-    # ── 企业检索 rh_enterpriseSearch ──
-    elif endpoint == "/open/rh_enterpriseSearch":
-        for item in _iter_items(response, "data"):
-            raw = item.get("url", "")
-            url = _normalize_url(raw)
-            if url:
-                urls.append({"title": item.get("企业名称", ""), "type": "企业", "url": url})
-
-    # ── 企业基本信息 rh_enterpriseBaseInfo ──
-    elif endpoint == "/open/rh_enterpriseBaseInfo":
-        data = response.get("data")
-        if isinstance(data, dict):
-            raw = data.get("url", "")
-            url = _normalize_url(raw)
-            if url:
-                urls.append({"title": data.get("企业名称", ""), "type": "企业", "url": url})
+        if url:
+            urls.append({"title": item.get("title", item.get("ftmc", "")), "type": "法条", "url": url})
+
+
+def _source_urls_rh_fg_detail(response, urls):
+    """法规详情 rh_fg_detail"""
+    data = response.get("data")
+    if isinstance(data, dict):
+        raw = data.get("url", "")
+        url = _normalize_url(raw)
+        fgid = data.get("id") or data.get("fgid", "")
+        if not url and fgid:
+            url = f"{YD_BASE}/zxt/statuteDetail/detailPage/{fgid}"
+        if url:
+            urls.append({"title": data.get("title", data.get("fgmc", "")), "type": "法规", "url": url})
+
+
+def _source_urls_case_vector_search(response, urls):
+    """案例语义检索 case_vector_search"""
+    for item in _iter_items(response, "extra.wenshu"):
+        scid = item.get("scid", "")
+        if scid:
+            urls.append({
+                "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
+                "type": "案例",
+                "url": f"{YD_BASE}/ydzk/caseDetail/case/{scid}",
+            })
+
+
+def _source_urls_rh_ptal_search(response, urls):
+    """案例关键词检索 rh_ptal_search"""
+    for item in _iter_items(response, "data.lst"):
+        raw = item.get("url", "")
+        url = _normalize_url(raw)
+        cid = item.get("id", "")
+        if not url and cid:
+            url = f"{YD_BASE}/ydzk/caseDetail/case/{cid}"
+        if url:
+            urls.append({
+                "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
+                "type": "案例",
+                "url": url,
+            })
+
+
+def _source_urls_rh_case_details(response, urls):
+    """案例详情 rh_case_details"""
+    for item in _iter_items(response, "data"):
+        raw = item.get("url", "")
+        url = _normalize_url(raw)
+        if url:
+            urls.append({
+                "title": f"{item.get('title', '')}（{item.get('ah', '')}）",
+                "type": "案例",
+                "url": url,
+            })
+
+
+def _source_urls_rh_enterpriseSearch(response, urls):
+    """企业检索 rh_enterpriseSearch"""
+    for item in _iter_items(response, "data"):
+        raw = item.get("url", "")
+        url = _normalize_url(raw)
+        if url:
+            urls.append({"title": item.get("企业名称", ""), "type": "企业", "url": url})
+
+
+def _source_urls_rh_enterpriseBaseInfo(response, urls):
+    """企业基本信息 rh_enterpriseBaseInfo"""
+    data = response.get("data")
+    if isinstance(data, dict):
+        raw = data.get("url", "")
+        url = _normalize_url(raw)
+        if url:
+            urls.append({"title": data.get("企业名称", ""), "type": "企业", "url": url})
+
+
+# 各端点的来源 URL 提取规则；键即能提取来源 URL 的端点，SOURCE_URL_ENDPOINTS 由此导出
+_SOURCE_URL_EXTRACTORS = {
+    "/open/law_vector_search": _source_urls_law_vector_search,
+    "/open/rh_ft_detail": _source_urls_rh_ft_detail,
+    "/open/rh_ft_search": _source_urls_rh_ft_search,
+    "/open/rh_fg_detail": _source_urls_rh_fg_detail,
+    "/open/case_vector_search": _source_urls_case_vector_search,
+    "/open/rh_ptal_search": _source_urls_rh_ptal_search,
+    "/open/rh_case_details": _source_urls_rh_case_details,
+    "/open/rh_enterpriseSearch": _source_urls_rh_enterpriseSearch,
+    "/open/rh_enterpriseBaseInfo": _source_urls_rh_enterpriseBaseInfo,
+}
+# backfill-urls 增量回填的候选范围
+SOURCE_URL_ENDPOINTS = tuple(_SOURCE_URL_EXTRACTORS)
+
 
+def _enrich_source_urls(endpoint, response):
+    """从 API 响应中提取/构造来源 URL 列表"""
+    urls = []
+    extract = _SOURCE_URL_EXTRACTORS.get(endpoint)
+    if extract is None or not isinstance(response, dict):
+        return urls
+    extract(response, urls)
     return urls
 
 
@@ -263,6 +331,20 @@ def _resolve_project():
     return datetime.now().strftime("%Y%m%d")
 
 
+def _reserve_archive_path(project_dir, filename):
+    """独占创建归档文件名；batch 并发下同一秒内的同名查询追加 _2、_3 后缀避免互相覆盖"""
+    stem = filename[:-len(".json")]
+    with _archive_name_lock:
+        for n in range(1, 1000):
+            path = project_dir / (filename if n == 1 else f"{stem}_{n}.json")
+            try:
+                with open(path, "x", encoding="utf-8"):
+                    return path
+            except FileExistsError:
+                continue
+    raise FileExistsError(f"归档文件名冲突过多: {filename}")
+
+
 def _archive_save(endpoint, payload, response):
     """将查询和响应归档（按 project 子目录归类）"""
     ARCHIVE_DIR.mkdir(exist_ok=True)
@@ -270,7 +352,8 @@ def _archive_save(endpoint, payload, response):
     filename = _make_archive_name(endpoint, payload)
     project_dir = ARCHIVE_DIR / _resolve_project()
     project_dir.mkdir(parents=True, exist_ok=True)
-    path = project_dir / filename
+    path = _reserve_archive_path(project_dir, filename)
+    filename = path.name
 
     source_urls = _enrich_source_urls(endpoint, response)
 
@@ -284,6 +367,7 @@ def _archive_save(endpoint, payload, response):
         "response": response,
     }
     path.write_text(json.dumps(record, ensure_ascii=False, indent=2), "utf-8")
+    _get_archive_index().add(path, record)
     return str(path)
 
 
@@ -374,6 +458,7 @@ def _archive_write_report(archive_path, formatted_text, cost_label,
     # 1) archive 副本（必写）
     archive_md_path = json_path.with_suffix(".md")
     archive_md_path.write_text(md_content, "utf-8")
+    _get_archive_index().set_report(json_path, md_content)
 
     # 2) CWD 副本（best-effort，--no-cwd-report 时跳过）
     #    优先用 yd-run 透传的用户原始工作目录（YD_USER_CWD），
@@ -406,6 +491,37 @@ def _archive_write_report(archive_path, formatted_text, cost_label,
     return str(archive_md_path), cwd_md_str
 
 
+def _get_http_client():
+    """返回进程级 keep-alive 客户端（每线程复用一条连接，429/5xx 自动退避重试）"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = ApiClient(BASE_URL, timeout=TIMEOUT)
+        return _http_client
+
+
+def _api_request(method, endpoint, payload, headers, use_cache=True):
+    """归档查重 → 请求 → 归档落盘；请求最终失败抛 ApiError（batch 按任务捕获，不终止进程）"""
+    if use_cache:
+        cached, _ = _archive_lookup(endpoint, payload)
+        if cached is not None:
+            return cached, True, None
+
+    if method == "GET":
+        path = endpoint
+        qs = urlencode({k: v for k, v in payload.items() if v})
+        if qs:
+            path = f"{path}?{qs}"
+        result = _get_http_client().request("GET", path, headers=headers)
+    else:
+        result = _get_http_client().request("POST", endpoint, body=payload, headers=headers)
+
+    archive_path = None
+    if use_cache:
+        archive_path = _archive_save(endpoint, payload, result)
+    return result, False, archive_path
+
+
 def api_post(endpoint, body, use_cache=True):
     """发送 POST 请求到元典开放平台 API（支持归档查重）
 
@@ -414,29 +530,12 @@ def api_post(endpoint, body, use_cache=True):
         - cached: True 表示命中 archive，未发起实际请求
         - archive_path: cache miss 时为新落盘的 .json 路径；cache hit 时为 None
     """
-    if use_cache:
-        cached, _ = _archive_lookup(endpoint, body)
-        if cached is not None:
-            return cached, True, None
-
-    url = f"{BASE_URL}{endpoint}"
-    data = json.dumps(body, ensure_ascii=False).encode("utf-8")
-    req = Request(url, data=data, headers=_common_headers())
     try:
-        with urlopen(req, timeout=TIMEOUT) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-    except HTTPError as e:
-        print(f"HTTP 错误 {e.code}: {e.reason}", file=sys.stderr)
-        sys.exit(1)
-    except URLError as e:
-        print(f"网络错误: {e.reason}", file=sys.stderr)
+        return _api_request("POST", endpoint, body, _common_headers(), use_cache=use_cache)
+    except ApiError as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
 
-    archive_path = None
-    if use_cache:
-        archive_path = _archive_save(endpoint, body, result)
-    return result, False, archive_path
-
 
 def api_get(endpoint, params=None, use_cache=True):
     """发送 GET 请求到元典开放平台 API（支持归档查重）
@@ -444,36 +543,16 @@ def api_get(endpoint, params=None, use_cache=True):
     Returns:
         (result, cached, archive_path) 三元组（语义同 api_post）
     """
-    if use_cache:
-        cached, _ = _archive_lookup(endpoint, params or {})
-        if cached is not None:
-            return cached, True, None
-
-    url = f"{BASE_URL}{endpoint}"
-    if params:
-        qs = urlencode({k: v for k, v in params.items() if v})
-        if qs:
-            url = f"{url}?{qs}"
     headers = {
         "X-API-Key": load_api_key(),
         "Accept": "application/json",
     }
-    req = Request(url, headers=headers)
     try:
-        with urlopen(req, timeout=TIMEOUT) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-    except HTTPError as e:
-        print(f"HTTP 错误 {e.code}: {e.reason}", file=sys.stderr)
-        sys.exit(1)
-    except URLError as e:
-        print(f"网络错误: {e.reason}", file=sys.stderr)
+        return _api_request("GET", endpoint, params or {}, headers, use_cache=use_cache)
+    except ApiError as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
 
-    archive_path = None
-    if use_cache:
-        archive_path = _archive_save(endpoint, params or {}, result)
-    return result, False, archive_path
-
 
 # ── 格式化输出 ──────────────────────────────────────────────
 
@@ -1123,6 +1202,7 @@ def cmd_ingest(args):
     }
     json_path.parent.mkdir(parents=True, exist_ok=True)
     json_path.write_text(json.dumps(record, ensure_ascii=False, indent=2), "utf-8")
+    _get_archive_index().add(json_path, record)
 
     # 4. 走 _archive_write_report 生成 .md（archive + CWD）
     archive_md, cwd_md = _archive_write_report(
@@ -1513,59 +1593,40 @@ def cmd_enterprise_detail(args):
 
 
 def cmd_archive_list(args):
-    """列出历史检索记录"""
+    """列出历史检索记录（读取归档索引，不解析归档 JSON）"""
     if not ARCHIVE_DIR.exists():
         print("尚无检索记录。")
         return
 
-    files = ARCHIVE_DIR.rglob("*.json")
-    keyword = args.keyword.lower() if args.keyword else None
-    entries = []
-
-    for f in files:
-        if f.name == "version_check.json":
-            continue
-        try:
-            data = json.loads(f.read_text("utf-8"))
-        except (json.JSONDecodeError, OSError):
-            continue
-
-        ts = data.get("timestamp", "")[:16]
-        endpoint = data.get("endpoint", "")
-        query = data.get("query", {})
-        query_str = json.dumps(query, ensure_ascii=False)
-        status = data.get("response", {}).get("status", "")
-
-        if keyword:
-            if keyword not in query_str.lower() and keyword not in endpoint.lower():
-                continue
-
-        entries.append({
-            "rel": str(f.relative_to(ARCHIVE_DIR)),
-            "time": ts,
-            "endpoint": endpoint,
-            "query_summary": query_str[:80],
-            "status": status,
-        })
+    entries = _get_archive_index().entries(
+        keyword=args.keyword, full_text=args.full_text, limit=args.limit,
+    )
 
     if not entries:
         print("没有找到匹配的检索记录。")
         return
 
-    entries.sort(key=lambda e: e["time"], reverse=True)
-    for e in entries[:args.limit]:
-        print(f"{e['time']}  {e['endpoint']}  [{e['rel']}]")
-        print(f"  {e['query_summary']}")
+    for e in entries:
+        print(f"{e['timestamp'][:16]}  {e['endpoint']}  [{e['path']}]")
+        print(f"  {e['query_text'][:80]}")
         print()
 
 
-def cmd_backfill_urls(_args):
-    """回填现有 archive 记录的 source_urls"""
+def cmd_backfill_urls(args):
+    """回填现有 archive 记录的 source_urls
+
+    默认只处理索引中尚无 source_urls、且端点支持来源提取的归档；
+    --all 时逐个重算全部归档（来源 URL 规则调整后使用）。
+    """
     if not ARCHIVE_DIR.exists():
         print("archive 目录不存在。")
         return
 
-    files = sorted(ARCHIVE_DIR.rglob("*.json"))
+    index = _get_archive_index()
+    if args.all:
+        files = sorted(p for p in ARCHIVE_DIR.rglob("*.json") if INDEX_DIRNAME not in p.parts)
+    else:
+        files = index.paths_without_sources(SOURCE_URL_ENDPOINTS)
     updated = 0
     skipped = 0
 
@@ -1591,6 +1652,7 @@ def cmd_backfill_urls(_args):
                 if k in record:
                     ordered[k] = record[k]
             f.write_text(json.dumps(ordered, ensure_ascii=False, indent=2), "utf-8")
+            index.add(f, ordered)
             updated += 1
             print(f"  已更新: {f.name} ({len(new_urls)} 条 URL)")
         else:
@@ -1599,6 +1661,152 @@ def cmd_backfill_urls(_args):
     print(f"\n完成: 更新 {updated} 个文件，跳过 {skipped} 个文件")
 
 
+def cmd_archive_reindex(_args):
+    """从 archive/ 下的 JSON 全量重建指纹索引"""
+    if not ARCHIVE_DIR.exists():
+        print("archive 目录不存在。")
+        return
+    index = _get_archive_index()
+    index.sync(force=True)
+    print(f"完成: 已索引 {index.count()} 条归档记录（{index.db_path.relative_to(SKILL_ROOT)}）")
+
+
+class _ThreadOutput:
+    """batch 并发时按线程收集输出：登记了缓冲区的工作线程写入各自缓冲，其余线程照常输出"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self, buffer):
+        self._local.buffer = buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _batch_read_lines(path_str):
+    """读取列表文件（相对路径按用户工作目录解析，'-' 为 stdin），忽略空行与 # 注释"""
+    if path_str == "-":
+        text = sys.stdin.read()
+    else:
+        path = Path(path_str)
+        if not path.is_absolute():
+            path = Path(os.environ.get("YD_USER_CWD") or str(Path.cwd())) / path
+        try:
+            text = path.read_text("utf-8")
+        except OSError as e:
+            print(f"错误：无法读取 {path}：{e}", file=sys.stderr)
+            sys.exit(1)
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def _batch_jobs(args):
+    """把 batch 参数展开为子命令参数列表"""
+    jobs = []
+    if args.file:
+        for line in _batch_read_lines(args.file):
+            jobs.append(shlex.split(line))
+
+    case_numbers = list(args.ah or [])
+    if args.ah_file:
+        case_numbers.extend(_batch_read_lines(args.ah_file))
+    for ah in case_numbers:
+        jobs.append(["case-detail", "--type", args.case_type, "--ah", ah])
+
+    if args.uscc:
+        types = args.types or list(ENTERPRISE_LIST_TYPES)
+        unknown = [t for t in types if t not in ENTERPRISE_LIST_TYPES]
+        if unknown:
+            print(f"未知类型: {', '.join(unknown)}", file=sys.stderr)
+            print(f"可用类型: {', '.join(ENTERPRISE_LIST_TYPES.keys())}", file=sys.stderr)
+            sys.exit(1)
+        for t in types:
+            job = ["enterprise-list", "--type", t, "--uscc", args.uscc]
+            if args.size:
+                job += ["--size", str(args.size)]
+            jobs.append(job)
+    return jobs
+
+
+def _batch_run_one(parser, argv, outputs):
+    """在工作线程内执行一个子命令，输出写入独立缓冲；返回 (ok, stdout, stderr)"""
+    out, err = io.StringIO(), io.StringIO()
+    outputs[0].capture(out)
+    outputs[1].capture(err)
+    try:
+        job_args = parser.parse_args(argv)
+        if job_args.command in (None, "batch"):
+            print("错误：batch 任务必须是单个检索子命令", file=sys.stderr)
+            return False, out.getvalue(), err.getvalue()
+        job_args.func(job_args)
+        return True, out.getvalue(), err.getvalue()
+    except SystemExit as e:
+        return e.code in (None, 0), out.getvalue(), err.getvalue()
+    except Exception as e:  # 单个任务失败不影响其余任务
+        print(f"错误：{type(e).__name__}: {e}", file=sys.stderr)
+        return False, out.getvalue(), err.getvalue()
+    finally:
+        outputs[0].release()
+        outputs[1].release()
+
+
+def cmd_batch(args):
+    """并发执行一批检索子命令（共享 keep-alive 连接池），每个任务照常归档并生成报告"""
+    jobs = _batch_jobs(args)
+    if not jobs:
+        print("错误：请提供 --file、--ah/--ah-file 或 --uscc", file=sys.stderr)
+        sys.exit(1)
+
+    global_flags = []
+    if args.no_report:
+        global_flags.append("--no-report")
+    if args.no_cwd_report:
+        global_flags.append("--no-cwd-report")
+
+    parser = build_parser()
+    workers = max(1, min(args.jobs, len(jobs)))
+    print(f"批量执行 {len(jobs)} 个任务（并发 {workers}）", file=sys.stderr)
+
+    outputs = (_ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr))
+    original = (sys.stdout, sys.stderr)
+    sys.stdout, sys.stderr = outputs
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_batch_run_one, parser, global_flags + argv, outputs) for argv in jobs]
+            results = [f.result() for f in futures]
+    finally:
+        sys.stdout, sys.stderr = original
+        _get_http_client().close()
+
+    failed = []
+    for i, (argv, (ok, out, err)) in enumerate(zip(jobs, results), 1):
+        print(f"\n===== [{i}/{len(jobs)}] {shlex.join(argv)} =====")
+        if out:
+            print(out.rstrip())
+        if err:
+            print(err.rstrip(), file=sys.stderr)
+        if not ok:
+            failed.append(shlex.join(argv))
+
+    print(f"\n批量完成：成功 {len(jobs) - len(failed)} 个，失败 {len(failed)} 个")
+    for cmd in failed:
+        print(f"  - 失败: {cmd}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
 def cmd_raw(args):
     """原始 JSON 输出（用于调试）"""
     body = {"query": args.query}
@@ -1849,6 +2057,11 @@ def _consolidate_resolve_includes(include_str, cwd):
         for pattern in patterns:
             if pattern in md_path.name:
                 json_path = archive_dir / md_path.name.replace(".md", ".json")
+                if not json_path.exists():
+                    # 归档已按 project 归类：经索引按文件名定位子目录中的 JSON
+                    entry = _get_archive_index().find_by_name(json_path.name, project=_resolve_project())
+                    if entry:
+                        json_path = ARCHIVE_DIR / entry["path"]
                 json_p = json_path if json_path.exists() else None
                 # 提取 query_summary（从文件名扣除时间戳）
                 stem = md_path.stem
@@ -1886,9 +2099,12 @@ def _consolidate_extract_body(md_path):
 
 
 def _consolidate_extract_meta(json_path):
-    """从 per-call .json 提取元信息（时间/接口）。"""
+    """从 per-call .json 提取元信息（时间/接口）；优先读归档索引，免解析完整响应。"""
     if json_path is None:
         return {}
+    entry = _get_archive_index().get(json_path)
+    if entry:
+        return {"endpoint": entry["endpoint"], "timestamp": entry["timestamp"]}
     try:
         record = json.loads(json_path.read_text("utf-8"))
     except (json.JSONDecodeError, OSError):
@@ -2190,6 +2406,8 @@ def build_parser():
   %(prog)s enterprise-base --uscc "9144030071526726XG"
   %(prog)s enterprise-summary --uscc "9144030071526726XG"
   %(prog)s enterprise-list --type writ-list --uscc "9144030071526726XG" --page 1 --size 10
+  %(prog)s batch --ah "（2025）桂09民终192号" --ah "（2024）京01民终123号" --jobs 4
+  %(prog)s batch --uscc "9144030071526726XG"
 """
     )
     parser.add_argument("--no-report", action="store_true",
@@ -2335,13 +2553,31 @@ def build_parser():
     # ── archive-list ──
     p = sub.add_parser("archive-list", help="列出历史检索记录")
     p.add_argument("--keyword", help="按关键词筛选（匹配查询内容或端点）")
+    p.add_argument("--full-text", action="store_true", help="关键词同时检索报告正文（检索结果内容），不只匹配查询")
     p.add_argument("--limit", type=int, default=20, help="显示条数（默认20）")
     p.set_defaults(func=cmd_archive_list)
 
     # ── backfill-urls ──
     p = sub.add_parser("backfill-urls", help="回填现有 archive 的 source_urls")
+    p.add_argument("--all", action="store_true", help="重算全部归档（默认只处理尚无来源 URL 的归档）")
     p.set_defaults(func=cmd_backfill_urls)
 
+    # ── archive-reindex ──
+    p = sub.add_parser("archive-reindex", help="从 archive/ 的 JSON 全量重建缓存指纹索引")
+    p.set_defaults(func=cmd_archive_reindex)
+
+    # ── batch ──
+    p = sub.add_parser("batch", help="并发执行一批检索（案号列表 / 企业全部分项 / 命令列表文件）")
+    p.add_argument("--file", help="命令列表文件，每行一个子命令（如 'case-detail --ah \"（2025）桂09民终192号\"'）；'-' 读 stdin")
+    p.add_argument("--ah", action="append", help="案号，可多次指定，逐个执行 case-detail")
+    p.add_argument("--ah-file", help="案号列表文件，每行一个")
+    p.add_argument("--case-type", default="ptal", choices=["ptal", "qwal"], help="--ah 对应的案例库（默认 ptal）")
+    p.add_argument("--uscc", help="统一社会信用代码：对该企业执行 enterprise-list 的全部分项")
+    p.add_argument("--types", nargs="+", metavar="TYPE", help="配合 --uscc，仅查询指定分项（默认全部）")
+    p.add_argument("--size", type=int, help="配合 --uscc，每页条数（默认随检索策略）")
+    p.add_argument("--jobs", type=int, default=BATCH_DEFAULT_JOBS, help=f"并发数（默认 {BATCH_DEFAULT_JOBS}）")
+    p.set_defaults(func=cmd_batch)
+
     # ── strategy ──
     p = sub.add_parser("strategy", help="显示当前检索策略")
     p.set_defaults(func=cmd_strategy)